@@ -0,0 +1,657 @@
+#!/usr/bin/env python3
+"""
+Benchmarks de la Plateforme Football Analytics
+==============================================
+
+Mesure le débit des calculs vectorisés par rapport aux chemins scalaires.
+
+Usage:
+    python benchmark_analytics.py            # Tous les benchmarks
+    python benchmark_analytics.py xg         # Un benchmark précis
+"""
+
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+# Ajouter le répertoire racine au path
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent / 'database' / 'migrations'))
+
+from python_analytics.modules.metriques_rcs import MetriquesFootballRCS
+from python_analytics.modules.xg_grid import XGGrid
+from python_analytics.modules.heatmap_accumulator import HeatmapAccumulator
+from python_analytics.modules.performance_analyzer import FootballMetrics
+from python_analytics.modules.pass_network import PassNetwork
+from python_analytics.modules.parquet_store import ParquetStore
+from python_analytics.modules.scouting_engine import MarketValuePredictor, PlayerANNIndex, PlayerProfiler, ScoutingEngine
+from python_analytics.modules.model_registry import ModelRegistry, train as entrainer_modele
+from configs.database import DatabaseConfig, DatabaseManager
+from configs.season_stats import SeasonStatsMaintainer
+from synthetic_dataset import SyntheticDatasetGenerator, generate_shard, write_shard
+
+
+def mesurer(fonction: Callable, repetitions: int = 3) -> float:
+    """Retourne le meilleur temps d'exécution (secondes) sur plusieurs répétitions"""
+    meilleur = float('inf')
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+def afficher_debit(libelle: str, n_elements: int, duree: float, unite: str):
+    """Affiche une ligne de résultat au format commun"""
+    print(f"  {libelle:<28} n={n_elements:>9,}  {duree * 1000:>10.2f} ms  "
+          f"{n_elements / duree:>14,.0f} {unite}/s")
+
+
+def generer_tirs(n_tirs: int, graine: int = 42) -> pd.DataFrame:
+    """Génère un lot de tirs synthétiques"""
+    rng = np.random.default_rng(graine)
+    return pd.DataFrame({
+        'x_coordonnee': rng.uniform(50, 100, n_tirs),
+        'y_coordonnee': rng.uniform(0, 100, n_tirs),
+        'situation': rng.choice(['jeu_ouvert', 'contre', 'arret_jeu'], n_tirs),
+        'partie_corps': rng.choice(['pied_droit', 'pied_gauche', 'tete'], n_tirs),
+        'joueur_tireur': rng.choice(['Emanuel Emegha', 'Dilane Bakwa', 'Autre'], n_tirs)
+    })
+
+
+def benchmark_xg():
+    """Débit de calculer_xg_lot comparé à calculer_xg_tir"""
+    print("\n⚽ xG : calculer_xg_tir (boucle) vs calculer_xg_lot")
+    metriques = MetriquesFootballRCS()
+
+    tirs = generer_tirs(1_000)
+    duree = mesurer(lambda: [
+        metriques.calculer_xg_tir(t.x_coordonnee, t.y_coordonnee, t.situation,
+                                  t.partie_corps, t.joueur_tireur)
+        for t in tirs.itertuples(index=False)
+    ])
+    afficher_debit("scalaire (boucle Python)", len(tirs), duree, "tirs")
+
+    for n_tirs in (1_000, 100_000, 1_000_000):
+        tirs = generer_tirs(n_tirs)
+        duree = mesurer(lambda: metriques.calculer_xg_lot(tirs))
+        afficher_debit("calculer_xg_lot", n_tirs, duree, "tirs")
+
+
+def generer_passes(n_passes: int, graine: int = 42) -> pd.DataFrame:
+    """Génère un lot de passes synthétiques"""
+    rng = np.random.default_rng(graine)
+    return pd.DataFrame({
+        'x_passe': rng.uniform(0, 100, n_passes),
+        'y_passe': rng.uniform(0, 100, n_passes),
+        'x_reception': rng.uniform(0, 100, n_passes),
+        'y_reception': rng.uniform(0, 100, n_passes),
+        'type_passe': rng.choice(['normale', 'centre', 'passe_cle', 'relance'], n_passes),
+        'joueur_passeur': rng.choice(['Dilane Bakwa', 'Andrey Santos', 'Autre'], n_passes)
+    })
+
+
+def benchmark_xa():
+    """Débit de calculer_xa_lot sur un match et sur une saison de passes"""
+    print("\n🎯 xA : calculer_xa_passe (boucle) vs calculer_xa_lot")
+    metriques = MetriquesFootballRCS()
+
+    passes = generer_passes(1_500)
+    duree = mesurer(lambda: [
+        metriques.calculer_xa_passe(p.x_passe, p.y_passe, p.x_reception, p.y_reception,
+                                    p.type_passe, p.joueur_passeur)
+        for p in passes.itertuples(index=False)
+    ])
+    afficher_debit("scalaire (1 match)", len(passes), duree, "passes")
+
+    # 1 500 passes par match x 380 matchs par saison
+    for n_passes in (1_500, 1_500 * 380):
+        passes = generer_passes(n_passes)
+        duree = mesurer(lambda: metriques.calculer_xa_lot(passes))
+        afficher_debit("calculer_xa_lot", n_passes, duree, "passes")
+
+
+def generer_evenements_match(n_evenements: int = 3_000, graine: int = 42) -> pd.DataFrame:
+    """Génère les événements synthétiques d'un match"""
+    rng = np.random.default_rng(graine)
+    return pd.DataFrame({
+        'equipe': rng.choice(['RCS', 'Adversaire'], n_evenements),
+        'type_evenement': rng.choice(['passe', 'passe_reussie', 'tacle', 'tacle_reussi', 'interception',
+                                      'faute', 'degagement', 'duel_aerien'], n_evenements),
+        'x_coordonnee': rng.uniform(0, 100, n_evenements),
+        'y_coordonnee': rng.uniform(0, 100, n_evenements),
+        'x_reception': rng.uniform(0, 100, n_evenements),
+        'y_reception': rng.uniform(0, 100, n_evenements),
+        'minute': rng.integers(1, 95, n_evenements),
+        'reussi': rng.choice([True, False], n_evenements)
+    })
+
+
+def benchmark_resume_match():
+    """Quatre analyses séparées vs un seul MatchEventSummary sur un match de 3 000 événements"""
+    print("\n📊 Résumé de match : quatre analyses séparées vs calculer_resume_match")
+    metriques = MetriquesFootballRCS()
+    evenements = generer_evenements_match()
+
+    def analyses_separees():
+        metriques.calculer_ppda_equipe(evenements)
+        metriques.analyser_zones_recuperation(evenements)
+        metriques.calculer_metriques_possession(evenements)
+        metriques.calculer_metriques_defensives(evenements)
+
+    duree = mesurer(analyses_separees, repetitions=10)
+    afficher_debit("quatre méthodes", len(evenements), duree, "événements")
+    duree = mesurer(lambda: metriques.calculer_resume_match(evenements), repetitions=10)
+    afficher_debit("calculer_resume_match", len(evenements), duree, "événements")
+
+
+def benchmark_ppda_ligue():
+    """Table de pressing d'une saison : appels match par match vs un seul groupby"""
+    print("\n🔥 PPDA saison : calculer_ppda_equipe par (match, équipe) vs calculer_ppda_ligue")
+    metriques = MetriquesFootballRCS()
+
+    # 18 équipes, 306 matchs (aller-retour), 3 000 événements par match
+    equipes = [f'Equipe {i}' for i in range(18)]
+    calendrier = [(d, e) for d in equipes for e in equipes if d != e]
+    matchs = []
+    for numero, (domicile, exterieur) in enumerate(calendrier):
+        evenements = generer_evenements_match(graine=numero)
+        evenements['equipe'] = np.where(evenements['equipe'] == 'RCS', domicile, exterieur)
+        evenements['match'] = numero
+        matchs.append(evenements)
+    saison = pd.concat(matchs, ignore_index=True)
+
+    def appels_separes(n_matchs: int):
+        for numero, (domicile, exterieur) in enumerate(calendrier[:n_matchs]):
+            match = saison[saison['match'] == numero]
+            metriques.calculer_ppda_equipe(match, domicile)
+            metriques.calculer_ppda_equipe(match, exterieur)
+
+    # La boucle est mesurée sur 20 matchs puis extrapolée à la saison
+    duree = mesurer(lambda: appels_separes(20), repetitions=1) * len(calendrier) / 20
+    afficher_debit("appels séparés (extrapolé)", len(saison), duree, "événements")
+    duree = mesurer(lambda: metriques.calculer_ppda_ligue(saison))
+    afficher_debit("calculer_ppda_ligue", len(saison), duree, "événements")
+
+
+def benchmark_xg_grille():
+    """calculer_xg_lot analytique vs lectures interpolées dans une XGGrid mappée en mémoire"""
+    print("\n🗺️  Grille xG : géométrie analytique vs XGGrid (pas 0.25, memmap)")
+    metriques = MetriquesFootballRCS()
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = str(Path(dossier) / 'grille_xg.npy')
+        debut = time.perf_counter()
+        grille = XGGrid.load_or_build(chemin)
+        print(f"  construction + sauvegarde + memmap: {(time.perf_counter() - debut) * 1000:.1f} ms")
+
+        for n_tirs in (1_000, 100_000, 1_000_000):
+            tirs = generer_tirs(n_tirs)
+            duree = mesurer(lambda: metriques.calculer_xg_lot(tirs))
+            afficher_debit("analytique", n_tirs, duree, "tirs")
+            duree = mesurer(lambda: metriques.calculer_xg_lot(tirs, grille=grille))
+            afficher_debit("grille interpolée", n_tirs, duree, "tirs")
+        del grille
+
+
+def benchmark_heatmap_flux():
+    """Tracking 25 Hz d'un joueur sur une saison : blocs accumulés vs histogram2d global"""
+    print("\n🔥 Heatmap : np.histogram2d sur toutes les positions vs HeatmapAccumulator par match")
+    rng = np.random.default_rng(42)
+    positions_par_match = 90 * 60 * 25
+    matchs = [rng.uniform(0, 100, (positions_par_match, 2)) for _ in range(10)]
+    n_positions = positions_par_match * len(matchs)
+    bords = np.linspace(0, 100, 21)
+
+    def histogramme_global():
+        toutes = np.vstack(matchs)
+        np.histogram2d(toutes[:, 0], toutes[:, 1], bins=[bords, bords])
+
+    def accumulation():
+        saison = HeatmapAccumulator()
+        for positions in matchs:
+            saison.merge(HeatmapAccumulator().update(positions[:, 0], positions[:, 1]))
+
+    duree = mesurer(histogramme_global)
+    afficher_debit("histogram2d global", n_positions, duree, "positions")
+    duree = mesurer(accumulation)
+    afficher_debit("accumulateurs fusionnés", n_positions, duree, "positions")
+
+
+def benchmark_heatmaps_effectif():
+    """25 heatmaps par page : generer_heatmap_joueur par joueur vs generer_heatmaps_effectif"""
+    print("\n👥 Heatmaps effectif : 25 appels generer_heatmap_joueur vs generer_heatmaps_effectif")
+    metriques = MetriquesFootballRCS()
+    rng = np.random.default_rng(42)
+    joueurs = [f'Joueur {i}' for i in range(25)]
+    n_positions = 500_000
+    positions = pd.DataFrame({
+        'joueur': rng.choice(joueurs, n_positions),
+        'x_coordonnee': rng.uniform(0, 100, n_positions),
+        'y_coordonnee': rng.uniform(0, 100, n_positions)
+    })
+
+    duree = mesurer(lambda: [metriques.generer_heatmap_joueur(positions, j) for j in joueurs])
+    afficher_debit("appels par joueur", n_positions, duree, "positions")
+    duree = mesurer(lambda: metriques.generer_heatmaps_effectif(positions, joueurs))
+    afficher_debit("generer_heatmaps_effectif", n_positions, duree, "positions")
+
+
+@lru_cache(maxsize=4)
+def _fragment_synthetique(evenements_par_match: int, graine: int) -> Dict[str, pd.DataFrame]:
+    """Fragment (championnat, saison) du jeu synthétique partagé par les benchmarks"""
+    generateur = SyntheticDatasetGenerator(n_leagues=1, n_seasons=1, events_per_match=evenements_par_match,
+                                           seed=graine)
+    return generate_shard(generateur.shard_specs()[0])
+
+
+def generer_evenements_saison(n_evenements: int = 500_000, graine: int = 42) -> pd.DataFrame:
+    """Événements horodatés d'une saison de 380 matchs (schéma match_events), issus du jeu synthétique"""
+    evenements_par_match = -(-n_evenements // 380)
+    evenements = _fragment_synthetique(evenements_par_match, graine)['match_events']
+    return evenements.head(n_evenements).copy()
+
+
+def benchmark_xa_sequences():
+    """xA par séquences sur une saison de 500 000 événements : balayage par tir vs merge_asof"""
+    print("\n🎯 xA séquences : recherche de la passe par tir vs calculate_xa (merge_asof)")
+    metrics = FootballMetrics()
+    evenements = generer_evenements_saison()
+    passes = evenements[evenements['event_type'] == 'Pass'].reset_index(drop=True)
+    tirs = metrics.calculate_xg(evenements[evenements['event_type'] == 'Shot'])
+    horloge_passes = (passes['minute'] * 60 + passes['second_in_minute']).to_numpy()
+
+    def balayage_par_tir(n_tirs: int):
+        for tir in tirs.head(n_tirs).itertuples():
+            horloge = tir.minute * 60 + tir.second_in_minute
+            candidates = np.flatnonzero(
+                passes['success'].to_numpy() & (passes['match_id'].to_numpy() == tir.match_id) &
+                (passes['team_id'].to_numpy() == tir.team_id) &
+                (horloge_passes <= horloge) & (horloge_passes >= horloge - 15)
+            )
+            if len(candidates):
+                candidates[np.argmax(horloge_passes[candidates])]
+
+    # Le balayage est mesuré sur 50 tirs puis extrapolé à la saison
+    duree = mesurer(lambda: balayage_par_tir(50), repetitions=1) * len(tirs) / 50
+    afficher_debit("balayage par tir (extrapolé)", len(evenements), duree, "événements")
+    duree = mesurer(lambda: metrics.calculate_xa(passes, tirs))
+    afficher_debit("calculate_xa", len(evenements), duree, "événements")
+
+
+def benchmark_reseau_passes():
+    """Réseau de passes d'un match de 3 000 événements : auto-jointure SQL vs PassNetwork"""
+    print("\n🕸️  Réseau de passes : auto-jointure SQL sur la minute vs PassNetwork (un parcours)")
+    rng = np.random.default_rng(42)
+    n_evenements = 3_000
+    joueurs = pd.DataFrame({
+        'player_id': [f'P{i}' for i in range(22)],
+        'first_name': [f'Prenom{i}' for i in range(22)],
+        'last_name': [f'Nom{i}' for i in range(22)]
+    })
+    equipe_joueur = np.repeat(['RCSA', 'PSG'], 11)
+    tireur = rng.integers(0, 22, n_evenements)
+    evenements = pd.DataFrame({
+        'match_id': 'match_1',
+        'minute': rng.integers(0, 95, n_evenements),
+        'second_in_minute': rng.integers(0, 60, n_evenements),
+        'event_type': rng.choice(['Pass', 'Tackle', 'Shot', 'Foul'], n_evenements, p=[0.8, 0.1, 0.05, 0.05]),
+        'player_id': joueurs['player_id'].to_numpy()[tireur],
+        'team_id': equipe_joueur[tireur],
+        'success': rng.random(n_evenements) < 0.8
+    })
+
+    # Même requête que l'ancien TacticalAnalyzer._analyze_pass_network (SQLite en mémoire)
+    connexion = sqlite3.connect(':memory:')
+    evenements.to_sql('match_events', connexion, index=False)
+    joueurs.to_sql('players', connexion, index=False)
+    requete = """
+    SELECT
+        passer.first_name || ' ' || passer.last_name as passer_name,
+        receiver.first_name || ' ' || receiver.last_name as receiver_name,
+        COUNT(*) as pass_count
+    FROM match_events me1
+    JOIN players passer ON me1.player_id = passer.player_id
+    JOIN match_events me2 ON me1.match_id = me2.match_id
+        AND me2.minute = me1.minute
+        AND me2.event_type = 'Pass'
+        AND me2.player_id != me1.player_id
+        AND me2.team_id = me1.team_id
+    JOIN players receiver ON me2.player_id = receiver.player_id
+    WHERE me1.team_id = ? AND me1.match_id = ?
+    AND me1.event_type = 'Pass' AND me1.success = 1
+    GROUP BY passer.first_name, passer.last_name,
+            receiver.first_name, receiver.last_name
+    HAVING COUNT(*) >= 3
+    ORDER BY pass_count DESC
+    """
+
+    duree = mesurer(lambda: pd.read_sql(requete, connexion, params=['RCSA', 'match_1']), repetitions=5)
+    afficher_debit("auto-jointure SQL (SQLite)", n_evenements, duree, "événements")
+    duree = mesurer(lambda: PassNetwork.from_events(evenements, 'RCSA').summary(), repetitions=5)
+    afficher_debit("PassNetwork + centralités", n_evenements, duree, "événements")
+    connexion.close()
+
+
+def benchmark_chargement_copy():
+    """Chargement de 200 000 événements : DataFrame.to_sql vs bulk_copy (COPY depuis un tampon CSV)"""
+    print("\n📥 Chargement : to_sql (INSERT) vs bulk_copy (COPY FROM STDIN)")
+    evenements = generer_evenements_saison(200_000)
+    manager = DatabaseManager()
+
+    # Sérialisation CSV côté client, mesurable sans base
+    duree = mesurer(lambda: sum(1 for _ in manager._csv_buffers(evenements, 100_000)))
+    afficher_debit("sérialisation CSV", len(evenements), duree, "lignes")
+
+    if not manager.connect():
+        print("  ⚠️  PostgreSQL indisponible : comparaison to_sql / COPY ignorée")
+        return
+    try:
+        table = 'benchmark_match_events'
+        debut = time.perf_counter()
+        evenements.to_sql(table, manager.engine, if_exists='replace', index=False)
+        afficher_debit("to_sql", len(evenements), time.perf_counter() - debut, "lignes")
+        stats = manager.bulk_copy(evenements, table, if_exists='replace')
+        afficher_debit("bulk_copy", len(evenements), stats['seconds'], "lignes")
+        manager.execute_command(f"DROP TABLE IF EXISTS {table}")
+    finally:
+        manager.disconnect()
+
+
+class ConfigSQLite(DatabaseConfig):
+    """Configuration pointant vers un fichier SQLite (benchmarks sans PostgreSQL)"""
+
+    def __init__(self, chemin: str):
+        super().__init__()
+        self.chemin = chemin
+
+    def get_connection_string(self) -> str:
+        return f"sqlite:///{self.chemin}"
+
+
+def benchmark_cumuls_saison():
+    """Cumuls saisonniers sur 10 saisons : recalcul complet vs application d'une journée"""
+    print("\n📈 Cumuls saisonniers : recalcul complet vs deltas d'une journée (SQLite)")
+    rng = np.random.default_rng(42)
+    n_saisons, n_matchs_saison, n_lignes_match = 10, 380, 28
+    saisons = [f"{2015 + i}-{2016 + i}" for i in range(n_saisons)]
+    n_matchs = n_saisons * n_matchs_saison
+    matchs = pd.DataFrame({
+        'match_id': [f'M{i:05d}' for i in range(n_matchs)],
+        'league_id': np.repeat(saisons, n_matchs_saison),
+        'match_date': np.arange(n_matchs),
+        'home_team_id': [f'T{i}' for i in rng.integers(0, 20, n_matchs)],
+        'away_team_id': [f'T{i}' for i in rng.integers(0, 20, n_matchs)],
+        'home_score': rng.integers(0, 4, n_matchs),
+        'away_score': rng.integers(0, 4, n_matchs),
+        'status': 'Finished'
+    })
+    n_lignes = n_matchs * n_lignes_match
+    stats = pd.DataFrame({
+        'match_id': np.repeat(matchs['match_id'], n_lignes_match).to_numpy(),
+        'player_id': [f'P{i}' for i in rng.integers(0, 600, n_lignes)],
+        'team_id': [f'T{i}' for i in rng.integers(0, 20, n_lignes)],
+        'minutes_played': rng.integers(0, 91, n_lignes),
+        'goals': rng.integers(0, 2, n_lignes),
+        'assists': rng.integers(0, 2, n_lignes),
+        'xg': rng.uniform(0, 1, n_lignes),
+        'xa': rng.uniform(0, 1, n_lignes),
+        'rating': rng.uniform(5, 9, n_lignes),
+        'passes_completed': rng.integers(10, 40, n_lignes),
+        'passes_total': rng.integers(40, 50, n_lignes),
+        'tackles_won': rng.integers(0, 3, n_lignes),
+        'tackles_total': rng.integers(3, 6, n_lignes)
+    })
+    # La dernière journée n'est pas encore jouée
+    derniere_journee = matchs.index[-10:]
+    matchs.loc[derniere_journee, 'status'] = 'Scheduled'
+
+    with tempfile.TemporaryDirectory() as dossier:
+        manager = DatabaseManager(ConfigSQLite(str(Path(dossier) / 'cumuls.db')), pooled=True)
+        manager.connect()
+        manager.to_sql(pd.DataFrame({'league_id': saisons, 'season': saisons}), 'leagues')
+        manager.to_sql(matchs, 'matches')
+        manager.to_sql(stats, 'player_match_stats')
+        with manager.checkout() as connexion:
+            connexion.execute("CREATE INDEX idx_stats_match ON player_match_stats (match_id)")
+            connexion.execute("CREATE UNIQUE INDEX idx_matches_id ON matches (match_id)")
+        maintainer = SeasonStatsMaintainer(manager)
+        maintainer.create_tables()
+
+        rapport = maintainer.rebuild()
+        afficher_debit("recalcul complet", n_lignes, rapport['seconds'], "lignes")
+
+        with manager.checkout() as connexion:
+            connexion.execute("UPDATE matches SET status = 'Finished'")
+        rapport = maintainer.apply_new_matches()
+        afficher_debit(f"deltas ({rapport['matches']} matchs)", len(derniere_journee) * n_lignes_match,
+                       rapport['seconds'], "lignes")
+        assert maintainer.check_consistency()['consistent']
+        manager.disconnect()
+
+
+def benchmark_jeu_synthetique():
+    """Génération de 4 saisons à 3 000 événements par match : fragments séquentiels vs pool de processus"""
+    print("\n🏭 Jeu synthétique : 4 fragments (championnat, saison) en séquentiel vs en parallèle")
+    generateur = SyntheticDatasetGenerator(n_leagues=1, n_seasons=4)
+    n_evenements = 4 * generateur.matches_per_season * generateur.events_per_match
+
+    with tempfile.TemporaryDirectory() as dossier:
+        duree = mesurer(lambda: [write_shard(spec, dossier) for spec in generateur.shard_specs()], repetitions=1)
+        afficher_debit("séquentiel", n_evenements, duree, "événements")
+        duree = mesurer(lambda: generateur.generate(dossier), repetitions=1)
+        afficher_debit("ProcessPoolExecutor", n_evenements, duree, "événements")
+
+
+def benchmark_stockage_parquet():
+    """Événements d'un match (saison de 1 140 000 événements) : fichier de saison filtré vs partition du match"""
+    print("\n🗂️  Stockage Parquet : lecture d'un match dans le fichier de saison vs dans sa partition")
+    generateur = SyntheticDatasetGenerator(n_leagues=1, n_seasons=1, first_season=2024)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        manifeste = generateur.generate(Path(dossier) / 'source', processes=1)
+        store = ParquetStore(Path(dossier) / 'store')
+        store.import_directory(Path(dossier) / 'source')
+        fichier = manifeste.loc[manifeste['table'] == 'match_events', 'path'].iloc[0]
+        match_id = store.match_index().index[200]
+
+        def fichier_filtre():
+            evenements = pd.read_parquet(fichier)
+            return evenements[evenements['match_id'] == match_id]
+
+        duree = mesurer(fichier_filtre, repetitions=3)
+        afficher_debit("fichier de saison filtré", 3_000, duree, "événements")
+        duree = mesurer(lambda: store.match_events(match_id), repetitions=20)
+        afficher_debit("ParquetStore.match_events", 3_000, duree, "événements")
+
+
+def generer_base_joueurs(n_joueurs: int, graine: int = 42) -> pd.DataFrame:
+    """Génère une base de scouting multi-championnats (statistiques par 90 minutes)"""
+    rng = np.random.default_rng(graine)
+    return pd.DataFrame({
+        'player_id': [f'player_{i}' for i in range(n_joueurs)],
+        'name': [f'Joueur {i}' for i in range(n_joueurs)],
+        'age': rng.integers(17, 38, n_joueurs),
+        'position': rng.choice(['GK', 'CB', 'LB', 'RB', 'DM', 'CM', 'AM', 'LW', 'RW', 'ST'], n_joueurs),
+        'team': rng.choice([f'Club {i}' for i in range(100)], n_joueurs),
+        'goals_per_90': rng.exponential(0.3, n_joueurs),
+        'assists_per_90': rng.exponential(0.2, n_joueurs),
+        'xg_per_90': rng.exponential(0.25, n_joueurs),
+        'xa_per_90': rng.exponential(0.15, n_joueurs),
+        'pass_accuracy': rng.normal(80, 10, n_joueurs),
+        'passes_per_90': rng.normal(45, 20, n_joueurs),
+        'tackles_per_90': rng.exponential(2.5, n_joueurs),
+        'international_caps': rng.poisson(5, n_joueurs)
+    })
+
+
+def benchmark_similarite_joueurs():
+    """Joueurs similaires dans une base de 60 000 joueurs : iterrows sur le cluster vs index k-NN"""
+    print("\n👥 Joueurs similaires : distances ligne à ligne (iterrows) vs PlayerSimilarityIndex")
+    moteur = ScoutingEngine()
+    debut = time.perf_counter()
+    moteur.load_player_database(generer_base_joueurs(60_000))
+    afficher_debit("chargement + index", 60_000, time.perf_counter() - debut, "joueurs")
+    base = moteur.player_database
+    reference = base.iloc[0]
+    cluster = base[(base['player_cluster'] == reference['player_cluster']) & (base.index != 0)]
+
+    def distances_iterrows(n_joueurs: int):
+        stats_reference = reference[base.select_dtypes(include=[np.number]).columns]
+        for _, joueur in cluster.head(n_joueurs).iterrows():
+            stats_joueur = joueur[stats_reference.index]
+            np.sqrt(np.sum((stats_reference - stats_joueur) ** 2))
+
+    # Le chemin ligne à ligne est mesuré sur 1 000 joueurs puis extrapolé au cluster
+    duree = mesurer(lambda: distances_iterrows(1_000), repetitions=1) * len(cluster) / 1_000
+    afficher_debit("iterrows (extrapolé)", len(cluster), duree, "joueurs")
+    duree = mesurer(lambda: moteur.find_similar_players('player_0', 10), repetitions=20)
+    afficher_debit("find_similar_players", len(cluster), duree, "joueurs")
+    duree = mesurer(lambda: moteur.find_similar_players('player_0', 10, same_cluster=False,
+                                                        filters={'position': 'ST', 'age_max': 25}), repetitions=20)
+    afficher_debit("avec filtres", len(base), duree, "joueurs")
+
+
+def benchmark_sosies_vivier():
+    """Profils proches dans un vivier de 500 000 joueurs-saisons : index IVF approché vs recherche exacte"""
+    print("\n🌍 Sosies dans le vivier : recherche exacte vs PlayerANNIndex (IVF, un cœur)")
+    vivier = generer_base_joueurs(500_000)
+    colonnes = ['goals_per_90', 'assists_per_90', 'xg_per_90', 'xa_per_90', 'pass_accuracy',
+                'passes_per_90', 'tackles_per_90']
+    statistiques = vivier[colonnes].to_numpy()
+
+    debut = time.perf_counter()
+    index = PlayerANNIndex(feature_columns=colonnes).fit(statistiques[:450_000], vivier['player_id'][:450_000])
+    afficher_debit("construction (KMeans)", 450_000, time.perf_counter() - debut, "lignes")
+    debut = time.perf_counter()
+    index.add(statistiques[450_000:], vivier['player_id'][450_000:])
+    afficher_debit("insertion incrémentale", 50_000, time.perf_counter() - debut, "lignes")
+
+    duree = mesurer(lambda: index.exact_search(statistiques[0], 10), repetitions=5)
+    afficher_debit("recherche exacte", len(index), duree, "lignes")
+    duree = mesurer(lambda: index.search(statistiques[0], 10), repetitions=20)
+    afficher_debit(f"recherche IVF (n_probe={index.n_probe})", len(index), duree, "lignes")
+    print(index.recall_report(n_queries=100).to_string(index=False))
+
+
+def benchmark_valeur_marchande():
+    """Valeur marchande de 10 000 candidats : predict_value par ligne (apply) vs predict_values en lot"""
+    print("\n💰 Valeur marchande : predict_value ligne à ligne vs predict_values (lot, n_jobs=-1)")
+    predicteur = MarketValuePredictor()
+    predicteur.train_model(predicteur._generate_market_demo_data())
+    candidats = generer_base_joueurs(10_000)
+
+    # Le chemin ligne à ligne est mesuré sur 200 candidats puis extrapolé
+    echantillon = candidats.head(200)
+    duree = mesurer(lambda: echantillon.apply(lambda joueur: predicteur.predict_value(joueur.to_dict()), axis=1),
+                    repetitions=1) * len(candidats) / len(echantillon)
+    afficher_debit("predict_value (extrapolé)", len(candidats), duree, "joueurs")
+    duree = mesurer(lambda: predicteur.predict_values(candidats))
+    afficher_debit("predict_values", len(candidats), duree, "joueurs")
+
+
+def benchmark_demarrage_modeles():
+    """Démarrage à froid du prédicteur de valeur : entraînement dans le processus vs modèle publié"""
+    print("\n📦 Démarrage à froid : entraînement du RandomForest vs chargement depuis le registre")
+    joueur = {'age': 24, 'goals_per_90': 0.5}
+
+    def demarrage_entrainement():
+        MarketValuePredictor().predict_value(joueur)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        registre = ModelRegistry(dossier)
+        registre.publish('market_value', entrainer_modele(registre, 'market_value'))
+
+        def demarrage_registre():
+            MarketValuePredictor(registry=ModelRegistry(dossier)).predict_value(joueur)
+
+        duree = mesurer(demarrage_entrainement)
+        afficher_debit("entraînement à la demande", 1, duree, "démarrages")
+        duree = mesurer(demarrage_registre)
+        afficher_debit("registre (joblib mmap)", 1, duree, "démarrages")
+
+
+def generer_stats_profilage(n_lignes: int, graine: int = 42) -> pd.DataFrame:
+    """Statistiques de profilage (PlayerProfiler.PROFILE_METRICS) de joueurs-saisons"""
+    rng = np.random.default_rng(graine)
+    echelles = rng.uniform(0.5, 2.0, len(PlayerProfiler.PROFILE_METRICS))
+    return pd.DataFrame(rng.exponential(echelles, (n_lignes, len(echelles))),
+                        columns=PlayerProfiler.PROFILE_METRICS)
+
+
+def benchmark_profils_flux():
+    """Profilage d'une table de 1 000 000 joueurs-saisons : KMeans + PCA complets vs mode incrémental par blocs"""
+    print("\n🧬 Profils joueurs : create_player_profiles complet vs fit_stream (IncrementalPCA + MiniBatchKMeans)")
+    n_blocs, taille_bloc = 20, 50_000
+
+    def blocs():
+        # Chaque bloc est régénéré à la demande : la table n'est jamais entière en mémoire
+        return (generer_stats_profilage(taille_bloc, graine=bloc) for bloc in range(n_blocs))
+
+    def pic_memoire(fonction: Callable) -> float:
+        """Pic d'allocation en Mo (mesuré à part : tracemalloc ralentit l'exécution)"""
+        tracemalloc.start()
+        fonction()
+        pic = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+        return pic
+
+    def complet():
+        PlayerProfiler().create_player_profiles(pd.concat(list(blocs()), ignore_index=True))
+
+    profileur = PlayerProfiler(incremental=True)
+    for libelle, fonction in [("complet (table chargée)", complet),
+                              ("incrémental (blocs de 50 000)", lambda: profileur.fit_stream(blocs))]:
+        duree = mesurer(fonction, repetitions=1)
+        afficher_debit(f"{libelle}, pic {pic_memoire(fonction):.0f} Mo", n_blocs * taille_bloc, duree, "lignes")
+    nouveaux = generer_stats_profilage(5_000, graine=999)
+    duree = mesurer(lambda: profileur.partial_update(nouveaux))
+    afficher_debit("partial_update (nouveaux joueurs-saisons)", len(nouveaux), duree, "lignes")
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    'xg': benchmark_xg,
+    'xa': benchmark_xa,
+    'resume_match': benchmark_resume_match,
+    'ppda_ligue': benchmark_ppda_ligue,
+    'xg_grille': benchmark_xg_grille,
+    'heatmap_flux': benchmark_heatmap_flux,
+    'heatmaps_effectif': benchmark_heatmaps_effectif,
+    'xa_sequences': benchmark_xa_sequences,
+    'reseau_passes': benchmark_reseau_passes,
+    'chargement_copy': benchmark_chargement_copy,
+    'cumuls_saison': benchmark_cumuls_saison,
+    'jeu_synthetique': benchmark_jeu_synthetique,
+    'stockage_parquet': benchmark_stockage_parquet,
+    'similarite_joueurs': benchmark_similarite_joueurs,
+    'sosies_vivier': benchmark_sosies_vivier,
+    'valeur_marchande': benchmark_valeur_marchande,
+    'demarrage_modeles': benchmark_demarrage_modeles,
+    'profils_flux': benchmark_profils_flux,
+}
+
+
+def main():
+    """Lance les benchmarks demandés en ligne de commande"""
+    noms = sys.argv[1:] or list(BENCHMARKS)
+    inconnus = [nom for nom in noms if nom not in BENCHMARKS]
+    if inconnus:
+        print(f"❌ Benchmarks inconnus: {', '.join(inconnus)} (disponibles: {', '.join(BENCHMARKS)})")
+        sys.exit(1)
+
+    print("🏁 Benchmarks Football Analytics")
+    print("=" * 60)
+    for nom in noms:
+        BENCHMARKS[nom]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Accès Asynchrone à la Base de Données
+=====================================
+
+Compagnon asyncio de DatabaseManager pour les pages de dashboard et les
+collecteurs qui enchaînent plusieurs requêtes indépendantes : classement,
+statistiques joueurs et événements partent en parallèle au lieu de trois
+allers-retours successifs.
+
+Les requêtes s'exécutent sur le pool de connexions de DatabaseManager
+(psycopg2 libère le GIL pendant les entrées/sorties) via un pool de threads
+dimensionné sur la taille maximale du pool : aucune requête n'attend un thread
+sans qu'une connexion soit disponible.
+
+Usage:
+    async with AsyncDatabaseManager() as db:
+        standings, stats = await db.gather_sql([
+            ("SELECT * FROM team_performance_stats WHERE season = %s", ['2024-2025']),
+            ("SELECT * FROM player_season_stats WHERE season = %s", ['2024-2025'])
+        ])
+
+Author: Football Analytics Platform
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+try:
+    from .database import DatabaseManager
+except ImportError:
+    from database import DatabaseManager
+
+
+class AsyncDatabaseManager:
+    """Requêtes asynchrones sur le pool de connexions de DatabaseManager"""
+
+    def __init__(self, manager: Optional[DatabaseManager] = None):
+        """
+        Args:
+            manager: Gestionnaire synchrone poolé (créé en mode poolé sinon)
+        """
+        self.manager = manager or DatabaseManager(pooled=True)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(self.manager.config.pool_max_size, 1),
+            thread_name_prefix='async-db'
+        )
+
+    async def __aenter__(self) -> 'AsyncDatabaseManager':
+        if not await self.connect():
+            raise ConnectionError("Impossible de se connecter à la base de données")
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+    async def run(self, function: Callable, *args, **kwargs) -> Any:
+        """Exécute une fonction synchrone (requête, analyse) dans le pool de threads"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+
+    async def connect(self) -> bool:
+        """Établit la connexion (ouvre le pool) si nécessaire"""
+        if self.manager.engine is not None:
+            return True
+        return await self.run(self.manager.connect)
+
+    async def close(self):
+        """Ferme le pool de connexions et le pool de threads"""
+        await self.run(self.manager.disconnect)
+        self._executor.shutdown(wait=False)
+
+    async def read_sql(self, query: str, params: Any = None,
+                       dtypes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Lit une requête dans un DataFrame typé
+
+        Args:
+            query: Requête SELECT
+            params: Paramètres de la requête
+            dtypes: Types à appliquer aux colonnes (NUMERIC convertis en float64)
+
+        Returns:
+            DataFrame (vide en cas d'erreur, comme DatabaseManager.read_sql)
+        """
+        frame = await self.run(self.manager.read_sql, query, params)
+        return self.manager._typed_chunk(frame, dtypes)
+
+    async def gather_sql(self, queries: Sequence[Tuple[str, Any]],
+                         dtypes: Optional[Dict[str, str]] = None) -> List[pd.DataFrame]:
+        """
+        Lance plusieurs requêtes indépendantes en parallèle
+
+        Args:
+            queries: Couples (requête, paramètres)
+            dtypes: Types appliqués à chaque résultat
+
+        Returns:
+            DataFrames dans l'ordre des requêtes
+        """
+        return list(await asyncio.gather(*(self.read_sql(query, params, dtypes) for query, params in queries)))
+
+    async def execute_query(self, query: str, params: tuple = None) -> Optional[list]:
+        """Exécute une requête SELECT (lignes sous forme de dictionnaires)"""
+        return await self.run(self.manager.execute_query, query, params)
+
+    async def execute_command(self, command: str, params: tuple = None) -> bool:
+        """Exécute une commande INSERT/UPDATE/DELETE"""
+        return await self.run(self.manager.execute_command, command, params)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Métriques du pool de connexions sous-jacent"""
+        return self.manager.pool_stats()
@@ -8,14 +8,25 @@ Gestion des paramètres d'environnement et initialisation.
 Author: Football Analytics Platform
 """
 
+import io
+import json
 import os
+import threading
+import time
+import uuid
+from collections import deque
+from decimal import Decimal
+from contextlib import contextmanager
 import psycopg2
 from psycopg2.extras import RealDictCursor
+import numpy as np
 import pandas as pd
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
 from datetime import datetime
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List
 
 # Configuration du logging
 logging.basicConfig(
@@ -34,6 +45,14 @@ class DatabaseConfig:
         self.user = os.getenv('DB_USER', 'postgres')
         self.password = os.getenv('DB_PASSWORD', 'password')
         
+        # Pool de connexions (mode poolé optionnel)
+        self.pool_enabled = os.getenv('DB_POOL_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+        self.pool_min_size = int(os.getenv('DB_POOL_MIN_SIZE', '2'))
+        self.pool_max_size = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+        self.pool_timeout = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+        self.pool_recycle = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+        self.pool_pre_ping = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+        
     def get_connection_string(self) -> str:
         """Retourne la chaîne de connexion PostgreSQL"""
         return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
@@ -48,37 +67,183 @@ class DatabaseConfig:
             'password': self.password
         }
 
+class PoolMetrics:
+    """Temps d'attente des emprunts de connexion au pool"""
+    
+    def __init__(self, window: int = 1000):
+        """
+        Args:
+            window: Nombre d'emprunts récents conservés pour les percentiles
+        """
+        self._lock = threading.Lock()
+        self._recent_waits = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+    
+    def record_wait(self, seconds: float):
+        """Enregistre l'attente d'un emprunt réussi"""
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            self._recent_waits.append(seconds)
+    
+    def record_timeout(self):
+        """Enregistre un emprunt abandonné (pool saturé)"""
+        with self._lock:
+            self.timeouts += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Résumé des attentes en millisecondes"""
+        with self._lock:
+            recent = sorted(self._recent_waits)
+            p95 = recent[int(0.95 * (len(recent) - 1))] if recent else 0.0
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_mean_ms': 1000 * self.total_wait / self.checkouts if self.checkouts else 0.0,
+                'wait_p95_ms': 1000 * p95,
+                'wait_max_ms': 1000 * self.max_wait
+            }
+
+
 class DatabaseManager:
     """Gestionnaire de base de données"""
     
-    def __init__(self, config: Optional[DatabaseConfig] = None):
+    def __init__(self, config: Optional[DatabaseConfig] = None, pooled: Optional[bool] = None):
+        """
+        Args:
+            config: Configuration de la base (variables d'environnement par défaut)
+            pooled: Utiliser un pool de connexions (par défaut DB_POOL_ENABLED)
+        """
         self.config = config or DatabaseConfig()
+        self.pooled = self.config.pool_enabled if pooled is None else pooled
         self.connection = None
         self.engine = None
+        self.pool_metrics = PoolMetrics()
         
     def connect(self) -> bool:
         """Établit la connexion à la base de données"""
         try:
-            self.connection = psycopg2.connect(**self.config.get_connection_params())
-            self.engine = create_engine(self.config.get_connection_string())
+            if self.pooled:
+                self.engine = self._create_pooled_engine()
+                self._warm_pool()
+            else:
+                self.connection = psycopg2.connect(**self.config.get_connection_params())
+                self.engine = create_engine(self.config.get_connection_string())
             logger.info("✅ Connexion à la base de données établie")
             return True
         except Exception as e:
             logger.error(f"❌ Erreur de connexion à la base de données: {e}")
             return False
     
+    def _create_pooled_engine(self):
+        """Engine SQLAlchemy avec QueuePool (taille min/max, pre-ping, recyclage)"""
+        return create_engine(
+            self.config.get_connection_string(),
+            poolclass=QueuePool,
+            pool_size=self.config.pool_min_size,
+            max_overflow=max(self.config.pool_max_size - self.config.pool_min_size, 0),
+            pool_timeout=self.config.pool_timeout,
+            pool_recycle=self.config.pool_recycle,
+            pool_pre_ping=self.config.pool_pre_ping
+        )
+    
+    def _warm_pool(self):
+        """Ouvre les connexions minimales du pool dès la connexion"""
+        connections = [self.engine.raw_connection() for _ in range(self.config.pool_min_size)]
+        for connection in connections:
+            connection.close()
+    
     def disconnect(self):
         """Ferme la connexion à la base de données"""
         if self.connection:
             self.connection.close()
             logger.info("Connexion fermée")
+        if self.pooled and self.engine is not None:
+            self.engine.dispose()
+            logger.info("Pool de connexions fermé")
+    
+    def _ensure_connected(self):
+        """Connexion établie à la première utilisation ; erreur explicite si elle échoue"""
+        connected = self.engine is not None if self.pooled else self.connection is not None
+        if not connected and not self.connect():
+            raise ConnectionError("Connexion à la base de données impossible (voir DatabaseConfig)")
+    
+    def _timed_checkout(self, acquire):
+        """Emprunte une connexion en mesurant l'attente"""
+        start = time.perf_counter()
+        try:
+            connection = acquire()
+        except PoolTimeoutError:
+            self.pool_metrics.record_timeout()
+            raise
+        self.pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
+    
+    @contextmanager
+    def checkout(self):
+        """
+        Emprunte une connexion DB-API pour la durée du bloc
+        
+        En mode poolé, la connexion est validée (commit) ou annulée (rollback)
+        en sortie de bloc puis rendue au pool ; sinon la connexion unique est utilisée.
+        """
+        self._ensure_connected()
+        if not self.pooled:
+            yield self.connection
+            return
+        
+        connection = self._timed_checkout(self.engine.raw_connection)
+        try:
+            yield connection
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Curseur dont les commandes sont validées ensemble en sortie de bloc
+        
+        Une exception annule toutes les commandes du bloc (rollback).
+        """
+        with self.checkout() as connection:
+            cursor = connection.cursor()
+            try:
+                yield cursor
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """Métriques d'attente et état du pool"""
+        stats = self.pool_metrics.snapshot()
+        if self.pooled and self.engine is not None:
+            pool = self.engine.pool
+            stats.update({
+                'pool_size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'overflow': pool.overflow(),
+                'idle': pool.checkedin()
+            })
+        return stats
     
     def execute_query(self, query: str, params: tuple = None) -> Optional[list]:
         """Exécute une requête SELECT"""
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, params)
-                return cursor.fetchall()
+            with self.checkout() as connection:
+                with connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute(query, params)
+                    return cursor.fetchall()
         except Exception as e:
             logger.error(f"Erreur lors de l'exécution de la requête: {e}")
             return None
@@ -86,23 +251,126 @@ class DatabaseManager:
     def execute_command(self, command: str, params: tuple = None) -> bool:
         """Exécute une commande INSERT/UPDATE/DELETE"""
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(command, params)
-                self.connection.commit()
-                return True
+            with self.checkout() as connection:
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute(command, params)
+                    connection.commit()
+                    return True
+                except Exception:
+                    connection.rollback()
+                    raise
         except Exception as e:
             logger.error(f"Erreur lors de l'exécution de la commande: {e}")
-            self.connection.rollback()
             return False
     
     def read_sql(self, query: str, params: dict = None) -> pd.DataFrame:
         """Lit les données dans un DataFrame pandas"""
+        # SQLAlchemy interprète une liste comme plusieurs jeux de paramètres
+        if isinstance(params, list):
+            params = tuple(params)
         try:
+            self._ensure_connected()
+            if self.pooled:
+                with self._timed_checkout(self.engine.connect) as connection:
+                    return pd.read_sql(query, connection, params=params)
             return pd.read_sql(query, self.engine, params=params)
         except Exception as e:
             logger.error(f"Erreur lors de la lecture SQL: {e}")
             return pd.DataFrame()
     
+    def stream_sql(self, query: str, params: tuple = None, chunk_rows: int = 50_000,
+                   dtypes: Optional[Dict[str, str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Lit un résultat volumineux par blocs avec un curseur côté serveur
+        
+        Le résultat n'est jamais matérialisé en entier : PostgreSQL envoie
+        chunk_rows lignes à chaque fetchmany d'un curseur nommé.
+        
+        Args:
+            query: Requête SELECT
+            params: Paramètres de la requête
+            chunk_rows: Nombre de lignes par bloc
+            dtypes: Types à appliquer aux colonnes de chaque bloc
+                    (les NUMERIC sont convertis en float64 par défaut)
+        
+        Yields:
+            DataFrames d'au plus chunk_rows lignes
+        """
+        with self.checkout() as connection:
+            cursor = self._stream_cursor(connection, chunk_rows)
+            failed = False
+            try:
+                if params is None:
+                    cursor.execute(query)
+                else:
+                    cursor.execute(query, params)
+                columns = None
+                while True:
+                    rows = cursor.fetchmany(chunk_rows)
+                    if not rows:
+                        break
+                    if columns is None:
+                        columns = [column[0] for column in cursor.description]
+                    yield self._typed_chunk(pd.DataFrame.from_records(rows, columns=columns), dtypes)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                cursor.close()
+                if not self.pooled:
+                    # Connexion unique : termine la transaction ouverte par le curseur nommé
+                    # (sinon la session reste « idle in transaction »)
+                    if failed:
+                        connection.rollback()
+                    else:
+                        connection.commit()
+    
+    def _stream_cursor(self, connection, chunk_rows: int):
+        """Curseur nommé (côté serveur) pour psycopg2, curseur simple sinon"""
+        dbapi_connection = getattr(connection, 'dbapi_connection', connection)
+        if isinstance(dbapi_connection, psycopg2.extensions.connection):
+            cursor = connection.cursor(name=f"stream_{uuid.uuid4().hex}")
+            cursor.itersize = chunk_rows
+            return cursor
+        return connection.cursor()
+    
+    def _typed_chunk(self, chunk: pd.DataFrame, dtypes: Optional[Dict[str, str]]) -> pd.DataFrame:
+        """Convertit les Decimal en float64 puis applique les types demandés"""
+        for col in chunk.columns[chunk.dtypes == object]:
+            first = chunk[col].dropna()
+            if len(first) and isinstance(first.iloc[0], Decimal):
+                chunk[col] = chunk[col].astype('float64')
+        if dtypes:
+            chunk = chunk.astype({col: dtype for col, dtype in dtypes.items() if col in chunk.columns})
+        return chunk
+    
+    def read_sql_arrow(self, query: str, params: tuple = None, chunk_rows: int = 50_000,
+                       dtypes: Optional[Dict[str, str]] = None):
+        """
+        Lit un résultat dans une table Arrow, bloc par bloc
+        
+        Chaque bloc de stream_sql est converti en RecordBatch dès sa lecture :
+        seule la représentation colonnaire Arrow est conservée.
+        
+        Returns:
+            pyarrow.Table (nécessite pyarrow)
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("read_sql_arrow nécessite pyarrow (pip install pyarrow)") from e
+        
+        batches = [
+            pa.RecordBatch.from_pandas(chunk, preserve_index=False)
+            for chunk in self.stream_sql(query, params, chunk_rows, dtypes)
+        ]
+        if not batches:
+            return pa.table({})
+        # Les blocs peuvent différer (colonne entièrement nulle dans un bloc) : schémas unifiés
+        schema = pa.unify_schemas([batch.schema for batch in batches], promote_options='permissive')
+        return pa.Table.from_batches([batch.cast(schema) for batch in batches], schema=schema)
+    
     def to_sql(self, df: pd.DataFrame, table_name: str, if_exists: str = 'append') -> bool:
         """Écrit un DataFrame dans la base de données"""
         try:
@@ -113,11 +381,110 @@ class DatabaseManager:
             logger.error(f"❌ Erreur lors de l'écriture dans {table_name}: {e}")
             return False
 
+    def bulk_copy(self, df: pd.DataFrame, table_name: str, if_exists: str = 'append',
+                  conflict_columns: Optional[List[str]] = None,
+                  chunk_rows: int = 100_000) -> Optional[Dict[str, Any]]:
+        """
+        Charge un DataFrame avec COPY FROM STDIN (CSV en mémoire) au lieu d'INSERT
+        
+        Args:
+            df: Données à charger (colonnes = colonnes de la table)
+            table_name: Table cible
+            if_exists: 'append' (table existante) ou 'replace' (table recréée
+                       à partir des colonnes du DataFrame, comme to_sql)
+            conflict_columns: Clé d'unicité ; si fournie, les lignes passent par
+                              une table temporaire puis un upsert (rechargement idempotent)
+            chunk_rows: Lignes sérialisées par tampon CSV
+        
+        Returns:
+            Dictionnaire {rows, seconds, rows_per_second} ou None en cas d'erreur
+        """
+        start = time.perf_counter()
+        try:
+            self._ensure_connected()
+            if if_exists == 'replace':
+                df.head(0).to_sql(table_name, self.engine, if_exists='replace', index=False)
+            
+            columns = ', '.join(f'"{col}"' for col in df.columns)
+            with self.checkout() as connection:
+                try:
+                    with connection.cursor() as cursor:
+                        target = table_name
+                        if conflict_columns:
+                            target = f"_staging_{table_name}"
+                            cursor.execute(
+                                f'CREATE TEMP TABLE "{target}" (LIKE "{table_name}" INCLUDING DEFAULTS) ON COMMIT DROP'
+                            )
+                        copy_sql = f'COPY "{target}" ({columns}) FROM STDIN WITH (FORMAT csv, NULL \'\\N\')'
+                        for buffer in self._csv_buffers(df, chunk_rows):
+                            cursor.copy_expert(copy_sql, buffer)
+                        if conflict_columns:
+                            cursor.execute(self._upsert_sql(table_name, target, list(df.columns), conflict_columns))
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    raise
+        except Exception as e:
+            logger.error(f"❌ Erreur lors du chargement COPY dans {table_name}: {e}")
+            return None
+        
+        seconds = time.perf_counter() - start
+        stats = {
+            'rows': len(df),
+            'seconds': seconds,
+            'rows_per_second': len(df) / seconds if seconds > 0 else float('inf')
+        }
+        logger.info(f"✅ {len(df):,} lignes copiées dans {table_name} "
+                    f"({stats['rows_per_second']:,.0f} lignes/s)")
+        return stats
+    
+    def _csv_buffers(self, df: pd.DataFrame, chunk_rows: int) -> Iterator[io.StringIO]:
+        """Sérialise le DataFrame en tampons CSV compatibles COPY (NULL = \\N, JSON pour les dict)"""
+        json_columns = [
+            col for col in df.columns[df.dtypes == object]
+            if df[col].map(lambda value: isinstance(value, (dict, list))).any()
+        ]
+        # Entiers avec valeurs manquantes (float pour pandas) : écrits sans ".0" pour les colonnes INTEGER
+        integer_columns = [
+            col for col in df.columns[df.dtypes == 'float64']
+            if np.array_equal(df[col].dropna(), np.trunc(df[col].dropna()))
+        ]
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            if integer_columns:
+                chunk = chunk.astype({col: 'Int64' for col in integer_columns})
+            if json_columns:
+                chunk = chunk.assign(**{
+                    col: chunk[col].map(lambda value: json.dumps(value) if isinstance(value, (dict, list)) else value)
+                    for col in json_columns
+                })
+            buffer = io.StringIO()
+            chunk.to_csv(buffer, index=False, header=False, na_rep='\\N')
+            buffer.seek(0)
+            yield buffer
+    
+    def _upsert_sql(self, table_name: str, staging_table: str, columns: List[str],
+                    conflict_columns: List[str]) -> str:
+        """INSERT ... ON CONFLICT depuis la table temporaire"""
+        quoted = ', '.join(f'"{col}"' for col in columns)
+        keys = ', '.join(f'"{col}"' for col in conflict_columns)
+        updates = [f'"{col}" = EXCLUDED."{col}"' for col in columns if col not in conflict_columns]
+        action = f"DO UPDATE SET {', '.join(updates)}" if updates else "DO NOTHING"
+        return (f'INSERT INTO "{table_name}" ({quoted}) SELECT {quoted} FROM "{staging_table}" '
+                f'ON CONFLICT ({keys}) {action}')
+
 # Instance globale du gestionnaire de base de données
 db_manager = DatabaseManager()
 
 def get_db_connection():
-    """Fonction utilitaire pour obtenir une connexion DB"""
+    """
+    Fonction utilitaire pour obtenir une connexion DB
+    
+    En mode poolé, retourne l'engine : chaque pd.read_sql des analyseurs
+    emprunte alors une connexion au pool au lieu de partager une connexion unique.
+    """
+    if db_manager.pooled:
+        return get_db_engine()
     if not db_manager.connection:
         db_manager.connect()
     return db_manager.connection
@@ -0,0 +1,379 @@
+"""
+Gestion des Partitions par Saison
+=================================
+
+matches (partitionnée sur match_date) et player_match_stats (sur created_at)
+sont découpées en une partition par saison, du 1er juillet au 1er juillet
+suivant (borne haute exclue, donc sans trou entre deux saisons).
+
+player_match_stats est partitionnée sur sa date de saisie, pas sur la date du
+match : la partition d'une saison regroupe les statistiques saisies entre le
+1er juillet et le 30 juin, et une statistique saisie après la fin de saison
+tombe dans la partition suivante. Archiver « une saison » de cette table
+retire donc les lignes saisies pendant cette période, pas exactement celles
+des matchs de la saison.
+
+Le gestionnaire crée à l'avance les partitions des saisons à venir (les index
+de la table mère sont créés automatiquement sur chaque partition), corrige les
+bornes des partitions existantes et archive les saisons anciennes en Parquet
+compressé avant de les détacher. Les bornes restent des intervalles sur la
+colonne de partitionnement : les requêtes filtrant match_date sur une période
+ne parcourent que les partitions concernées (partition pruning).
+
+Usage:
+    partitions = SeasonPartitionManager(DatabaseManager())
+    partitions.ensure_future_partitions(seasons_ahead=2)
+    partitions.archive_season('player_match_stats', '2015-2016', 'archives/')
+
+    python partition_manager.py --archive 2015-2016                  # player_match_stats
+    python partition_manager.py --archive 2015-2016 --tables player_match_stats matches
+
+Author: Football Analytics Platform
+"""
+
+import json
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+try:
+    from .database import DatabaseManager
+except ImportError:
+    from database import DatabaseManager
+
+
+class SeasonPartitionManager:
+    """Création, correction et archivage des partitions saisonnières"""
+
+    # Table partitionnée -> colonne de partitionnement
+    PARTITIONED_TABLES = {
+        'matches': 'match_date',
+        'player_match_stats': 'created_at'
+    }
+    SEASON_START_MONTH = 7
+
+    # Tables dont match_id référence matches (create_schema.sql) : leurs lignes
+    # doivent être archivées avant les matchs qu'elles référencent
+    MATCH_REFERENCES = ['player_match_stats', 'match_events']
+
+    PARTITIONS_QUERY = """
+    SELECT child.relname AS partition, pg_get_expr(child.relpartbound, child.oid) AS bound
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = %s
+    ORDER BY child.relname
+    """
+
+    def __init__(self, manager: DatabaseManager):
+        """
+        Args:
+            manager: Gestionnaire de base connecté (PostgreSQL)
+        """
+        self.manager = manager
+
+    @classmethod
+    def season_bounds(cls, season: str) -> Tuple[date, date]:
+        """
+        Bornes d'une saison '2024-2025' : [2024-07-01, 2025-07-01[
+
+        Args:
+            season: Saison au format 'AAAA-AAAA'
+
+        Returns:
+            (début inclus, fin exclue)
+        """
+        match = re.fullmatch(r'(\d{4})-(\d{4})', season)
+        if not match or int(match.group(2)) != int(match.group(1)) + 1:
+            raise ValueError(f"Saison invalide: {season}")
+        start_year = int(match.group(1))
+        return date(start_year, cls.SEASON_START_MONTH, 1), date(start_year + 1, cls.SEASON_START_MONTH, 1)
+
+    @classmethod
+    def season_for_date(cls, day: Union[date, datetime]) -> str:
+        """Saison contenant une date ('2025-06-30' -> '2024-2025')"""
+        start_year = day.year if day.month >= cls.SEASON_START_MONTH else day.year - 1
+        return f"{start_year}-{start_year + 1}"
+
+    @classmethod
+    def partition_name(cls, table: str, season: str) -> str:
+        """Nom de la partition d'une saison ('matches', '2024-2025' -> 'matches_2024_2025')"""
+        cls.season_bounds(season)
+        return f"{table}_{season.replace('-', '_')}"
+
+    @classmethod
+    def parse_bound(cls, bound: str) -> Optional[Tuple[date, date]]:
+        """
+        Bornes d'une expression pg_get_expr(relpartbound)
+
+        Args:
+            bound: ex. "FOR VALUES FROM ('2024-07-01 00:00:00') TO ('2025-06-30 00:00:00')"
+
+        Returns:
+            (début, fin) ou None pour une partition DEFAULT ou des bornes MINVALUE/MAXVALUE
+        """
+        found = re.findall(r"'(\d{4}-\d{2}-\d{2})[^']*'", bound or '')
+        if len(found) != 2:
+            return None
+        return tuple(date.fromisoformat(value) for value in found)
+
+    def create_partition_sql(self, table: str, season: str) -> str:
+        """CREATE TABLE ... PARTITION OF pour une saison (idempotent)"""
+        start, end = self.season_bounds(season)
+        return (
+            f"CREATE TABLE IF NOT EXISTS {self.partition_name(table, season)} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+
+    def list_partitions(self, table: str) -> pd.DataFrame:
+        """
+        Partitions attachées à une table
+
+        Returns:
+            DataFrame [partition, bound, start, end, season]
+        """
+        self._check_table(table)
+        partitions = self.manager.read_sql(self.PARTITIONS_QUERY, (table,))
+        if partitions.empty:
+            return pd.DataFrame(columns=['partition', 'bound', 'start', 'end', 'season'])
+        bounds = partitions['bound'].map(self.parse_bound)
+        partitions['start'] = bounds.map(lambda bound: bound[0] if bound else None)
+        partitions['end'] = bounds.map(lambda bound: bound[1] if bound else None)
+        partitions['season'] = partitions['start'].map(lambda start: self.season_for_date(start) if start else None)
+        return partitions
+
+    def plan_future_seasons(self, existing: List[str], today: Optional[date] = None,
+                            seasons_ahead: int = 2) -> List[str]:
+        """
+        Saisons à créer : saison en cours et seasons_ahead suivantes, hors existantes
+
+        Args:
+            existing: Saisons déjà partitionnées
+            today: Date de référence (aujourd'hui par défaut)
+            seasons_ahead: Nombre de saisons créées à l'avance
+
+        Returns:
+            Saisons manquantes, dans l'ordre chronologique
+        """
+        current = int(self.season_for_date(today or date.today())[:4])
+        wanted = [f"{year}-{year + 1}" for year in range(current, current + seasons_ahead + 1)]
+        return [season for season in wanted if season not in set(existing)]
+
+    def ensure_future_partitions(self, seasons_ahead: int = 2, today: Optional[date] = None) -> List[str]:
+        """
+        Crée les partitions de la saison en cours et des saisons suivantes
+
+        Les index définis sur la table mère sont créés sur chaque nouvelle partition.
+
+        Returns:
+            Noms des partitions créées
+        """
+        created = []
+        with self.manager.transaction() as cursor:
+            for table in self.PARTITIONED_TABLES:
+                existing = self.list_partitions(table)['season'].dropna().tolist()
+                for season in self.plan_future_seasons(existing, today, seasons_ahead):
+                    cursor.execute(self.create_partition_sql(table, season))
+                    created.append(self.partition_name(table, season))
+        return created
+
+    def repair_season_bounds(self) -> List[str]:
+        """
+        Aligne les partitions saisonnières sur les bornes [1er juillet, 1er juillet[
+
+        Corrige notamment les bornes hautes au 30 juin qui excluaient ce jour :
+        la partition est détachée puis rattachée avec ses bornes canoniques dans
+        une même transaction (ses index sont rattachés à ceux de la table mère).
+
+        Returns:
+            Partitions corrigées
+        """
+        repaired = []
+        with self.manager.transaction() as cursor:
+            for table in self.PARTITIONED_TABLES:
+                for row in self.list_partitions(table).itertuples():
+                    if pd.isna(row.start):
+                        continue
+                    start, end = self.season_bounds(row.season)
+                    if (row.start, row.end) == (start, end):
+                        continue
+                    cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {row.partition}")
+                    cursor.execute(
+                        f"ALTER TABLE {table} ATTACH PARTITION {row.partition} "
+                        f"FOR VALUES FROM ('{start}') TO ('{end}')"
+                    )
+                    repaired.append(row.partition)
+        return repaired
+
+    def export_parquet(self, relation: str, path: Union[str, Path],
+                       chunk_rows: int = 100_000, compression: str = 'zstd') -> Dict[str, Any]:
+        """
+        Exporte une table dans un fichier Parquet compressé, bloc par bloc
+
+        Args:
+            relation: Table (ou partition) exportée
+            path: Fichier Parquet produit
+            chunk_rows: Lignes lues par bloc (curseur côté serveur)
+            compression: Codec Parquet
+
+        Returns:
+            Dictionnaire {path, rows, bytes}
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("export_parquet nécessite pyarrow (pip install pyarrow)") from e
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        writer = None
+        rows = 0
+        try:
+            for chunk in self.manager.stream_sql(f"SELECT * FROM {relation}", chunk_rows=chunk_rows):
+                chunk = self._parquet_ready(chunk)
+                if writer is None:
+                    batch = pa.Table.from_pandas(chunk, preserve_index=False)
+                    writer = pq.ParquetWriter(path, batch.schema, compression=compression)
+                else:
+                    batch = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+                writer.write_table(batch)
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            pq.write_table(pa.table({}), path, compression=compression)
+        return {'path': str(path), 'rows': rows, 'bytes': path.stat().st_size}
+
+    def archive_season(self, table: str, season: str, directory: Union[str, Path],
+                       drop: bool = True) -> Dict[str, Any]:
+        """
+        Archive une saison en Parquet puis la retire de la table partitionnée
+
+        La partition est exportée tant qu'elle est attachée ; le détachement,
+        le contrôle du nombre de lignes et la suppression forment ensuite une
+        seule transaction. Un export en échec ou incomplet laisse donc la
+        saison attachée et lisible depuis la table mère.
+
+        Pour matches, aucune ligne de MATCH_REFERENCES (player_match_stats,
+        match_events) ne doit encore référencer les matchs de la saison :
+        archiver player_match_stats et purger match_events d'abord (match_events
+        n'est pas partitionnée ; ce gestionnaire ne la purge pas). Les
+        partitions de player_match_stats suivent la date de saisie (voir le
+        module) : des statistiques saisies hors saison peuvent encore bloquer.
+
+        Args:
+            table: Table partitionnée
+            season: Saison archivée
+            directory: Répertoire des archives ({partition}.parquet)
+            drop: Supprimer la partition détachée après export
+
+        Returns:
+            Dictionnaire {partition, path, rows, bytes, dropped}
+        """
+        self._check_table(table)
+        partition = self.partition_name(table, season)
+        if table == 'matches':
+            self._check_match_references(partition)
+
+        export = self.export_parquet(partition, Path(directory) / f"{partition}.parquet")
+        with self.manager.transaction() as cursor:
+            cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {partition}")
+            cursor.execute(f"SELECT COUNT(*) FROM {partition}")
+            count = int(cursor.fetchone()[0])
+            if count != export['rows']:
+                # Rollback : la partition reste attachée
+                raise RuntimeError(f"Archive incomplète de {partition}: {export['rows']} lignes sur {count}")
+            if drop:
+                cursor.execute(f"DROP TABLE {partition}")
+        return {'partition': partition, **export, 'dropped': drop}
+
+    def _check_match_references(self, partition: str):
+        """Refuse l'archivage d'une partition de matches encore référencée"""
+        for referencing in self.MATCH_REFERENCES:
+            rows = self.manager.read_sql(
+                f"SELECT COUNT(*) AS n FROM {referencing} "
+                f"WHERE match_id IN (SELECT match_id FROM {partition})"
+            )
+            if rows.empty:
+                raise RuntimeError(f"Impossible de vérifier les références de {referencing} vers {partition}")
+            if int(rows['n'].iloc[0]):
+                raise RuntimeError(f"{int(rows['n'].iloc[0])} lignes de {referencing} référencent encore "
+                                   f"{partition} : les archiver avant les matchs")
+
+    def partitions_scanned(self, query: str, params: tuple = None) -> List[str]:
+        """
+        Partitions lues par le plan d'une requête (vérification du pruning)
+
+        Args:
+            query: Requête SELECT sur une table partitionnée
+            params: Paramètres de la requête
+
+        Returns:
+            Noms des relations parcourues par le plan
+        """
+        rows = self.manager.execute_query(f"EXPLAIN (FORMAT JSON) {query}", params)
+        plan = rows[0]['QUERY PLAN'] if rows else []
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        relations = []
+
+        def visit(node: Dict):
+            if 'Relation Name' in node:
+                relations.append(node['Relation Name'])
+            for child in node.get('Plans', []):
+                visit(child)
+
+        for entry in plan:
+            visit(entry['Plan'])
+        return sorted(set(relations))
+
+    def _check_table(self, table: str):
+        if table not in self.PARTITIONED_TABLES:
+            raise ValueError(f"Table non partitionnée par saison: {table}")
+
+    def _parquet_ready(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Convertit en texte les valeurs non sérialisables telles quelles (UUID, JSON)"""
+        for col in chunk.columns[chunk.dtypes == object]:
+            values = chunk[col].dropna()
+            if len(values) and isinstance(values.iloc[0], (dict, list)):
+                chunk[col] = chunk[col].map(json.dumps, na_action='ignore')
+            elif len(values) and not isinstance(values.iloc[0], (str, bytes)):
+                chunk[col] = chunk[col].astype(str).where(chunk[col].notna())
+        return chunk
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Partitions saisonnières de matches et player_match_stats")
+    parser.add_argument('--ahead', type=int, default=2, help="saisons créées à l'avance")
+    parser.add_argument('--repair', action='store_true', help="corrige les bornes des partitions existantes")
+    parser.add_argument('--archive', nargs='+', metavar='SAISON', default=[], help="saisons à archiver")
+    parser.add_argument('--archive-dir', default='archives', help="répertoire des archives Parquet")
+    parser.add_argument('--tables', nargs='+', choices=['player_match_stats', 'matches'],
+                        default=['player_match_stats'],
+                        help="tables archivées (matches : purger match_events d'abord)")
+    args = parser.parse_args()
+
+    manager = DatabaseManager()
+    if not manager.connect():
+        raise SystemExit("❌ Échec de la connexion")
+
+    partitions = SeasonPartitionManager(manager)
+    if args.repair:
+        print(f"🔧 Partitions corrigées: {partitions.repair_season_bounds()}")
+    print(f"✅ Partitions créées: {partitions.ensure_future_partitions(args.ahead)}")
+    for season in args.archive:
+        # player_match_stats avant matches (clé étrangère match_id)
+        for table in sorted(set(args.tables), key=['player_match_stats', 'matches'].index):
+            report = partitions.archive_season(table, season, args.archive_dir)
+            print(f"📦 {report['partition']}: {report['rows']:,} lignes -> {report['path']} "
+                  f"({report['bytes'] / 1024 ** 2:.1f} Mo)")
+
+    manager.disconnect()
@@ -0,0 +1,205 @@
+"""
+Registre de Requêtes Préparées
+==============================
+
+Les requêtes fréquentes des analyseurs (forme d'un joueur, comparaisons,
+heatmaps, compositions) sont enregistrées sous un nom, préparées une seule
+fois par connexion (PREPARE) puis exécutées par EXECUTE : PostgreSQL réutilise
+le plan au lieu de réanalyser le texte SQL à chaque appel. Les listes de
+joueurs sont liées comme un seul paramètre tableau (= ANY(%s)), le texte de la
+requête ne dépend donc pas du nombre de joueurs.
+
+Chaque requête alimente un histogramme de latence pour repérer celles qui
+dominent le temps passé en base.
+
+Author: Football Analytics Platform
+"""
+
+import itertools
+import re
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import psycopg2
+
+try:
+    from .database import DatabaseManager
+except ImportError:
+    from database import DatabaseManager
+
+
+class LatencyHistogram:
+    """Histogramme de latence à cases logarithmiques (millisecondes)"""
+
+    BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    def __init__(self):
+        # Dernière case : au-delà de la plus grande borne
+        self.counts = np.zeros(len(self.BUCKETS_MS) + 1, dtype=np.int64)
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float):
+        """Ajoute une mesure"""
+        elapsed_ms = seconds * 1000
+        self.counts[np.searchsorted(self.BUCKETS_MS, elapsed_ms)] += 1
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, q: float) -> float:
+        """Borne supérieure de la case contenant le quantile q (0-1)"""
+        if self.calls == 0:
+            return 0.0
+        position = int(np.searchsorted(np.cumsum(self.counts), q * self.calls))
+        return float(self.BUCKETS_MS[position]) if position < len(self.BUCKETS_MS) else self.max_ms
+
+    def summary(self) -> Dict[str, Any]:
+        """Résumé de l'histogramme"""
+        labels = [f'<={bound}ms' for bound in self.BUCKETS_MS] + [f'>{self.BUCKETS_MS[-1]}ms']
+        return {
+            'calls': self.calls,
+            'total_ms': self.total_ms,
+            'mean_ms': self.total_ms / self.calls if self.calls else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'max_ms': self.max_ms,
+            **dict(zip(labels, self.counts.tolist()))
+        }
+
+
+class QueryRegistry:
+    """Requêtes nommées, préparées par connexion, avec histogrammes de latence"""
+
+    def __init__(self, manager: DatabaseManager):
+        """
+        Args:
+            manager: Gestionnaire de base connecté (mode poolé ou connexion unique)
+        """
+        self.manager = manager
+        self._queries: Dict[str, Dict[str, Any]] = {}
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        # Noms déjà préparés sur chaque connexion psycopg2
+        self._prepared = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def register(self, name: str, query: str, param_types: Optional[Sequence[str]] = None):
+        """
+        Enregistre une requête nommée (sans effet si elle est déjà enregistrée à l'identique)
+
+        Args:
+            name: Nom de la requête (identifiant SQL)
+            query: Requête avec paramètres %s
+            param_types: Types PostgreSQL des paramètres (ex. ['uuid[]', 'integer']),
+                         nécessaires pour les tableaux ; inférés par PostgreSQL sinon
+        """
+        if not re.fullmatch(r'[a-z_][a-z0-9_]*', name):
+            raise ValueError(f"Nom de requête invalide: {name}")
+        param_types = list(param_types) if param_types else None
+        if param_types and len(param_types) != query.count('%s'):
+            raise ValueError(f"{name}: {len(param_types)} types pour {query.count('%s')} paramètres")
+        with self._lock:
+            existing = self._queries.get(name)
+            if existing is not None:
+                if existing['query'] != query or existing['param_types'] != param_types:
+                    raise ValueError(f"La requête {name} est déjà enregistrée avec un autre texte")
+                return
+            self._queries[name] = {'query': query, 'param_types': param_types}
+            self._histograms[name] = LatencyHistogram()
+
+    def read_sql(self, name: str, params: Sequence = (), query: Optional[str] = None,
+                 param_types: Optional[Sequence[str]] = None,
+                 dtypes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Exécute une requête enregistrée et retourne un DataFrame typé
+
+        Args:
+            name: Nom de la requête
+            params: Valeurs des paramètres (listes pour les tableaux)
+            query: Texte SQL, pour enregistrer la requête au premier appel
+            param_types: Types des paramètres (voir register)
+            dtypes: Types à appliquer aux colonnes du résultat
+        """
+        if query is not None:
+            self.register(name, query, param_types)
+        if name not in self._queries:
+            raise KeyError(f"Requête non enregistrée: {name}")
+
+        start = time.perf_counter()
+        with self.manager.checkout() as connection:
+            dbapi_connection = getattr(connection, 'dbapi_connection', connection)
+            cursor = connection.cursor()
+            failed = False
+            try:
+                if isinstance(dbapi_connection, psycopg2.extensions.connection):
+                    self._ensure_prepared(dbapi_connection, cursor, name)
+                    cursor.execute(self._execute_sql(name), tuple(params))
+                else:
+                    cursor.execute(self._portable_sql(name), tuple(params))
+                columns = [column[0] for column in cursor.description]
+                rows = cursor.fetchall()
+            except Exception:
+                failed = True
+                raise
+            finally:
+                cursor.close()
+                if not self.manager.pooled:
+                    # Connexion unique : termine la transaction ouverte par EXECUTE
+                    # (le mode poolé la termine au retour de la connexion)
+                    if failed:
+                        connection.rollback()
+                    else:
+                        connection.commit()
+        self._histograms[name].record(time.perf_counter() - start)
+
+        return self.manager._typed_chunk(pd.DataFrame.from_records(rows, columns=columns), dtypes)
+
+    def latency_report(self) -> pd.DataFrame:
+        """Latences par requête, triées par temps total décroissant"""
+        rows = [{'query': name, **histogram.summary()} for name, histogram in self._histograms.items()]
+        if not rows:
+            return pd.DataFrame(columns=['query', 'calls', 'total_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms'])
+        return pd.DataFrame(rows).sort_values('total_ms', ascending=False).reset_index(drop=True)
+
+    def _ensure_prepared(self, dbapi_connection, cursor, name: str):
+        """Prépare la requête sur cette connexion si ce n'est pas déjà fait"""
+        with self._lock:
+            prepared = self._prepared.setdefault(dbapi_connection, set())
+            if name in prepared:
+                return
+        cursor.execute(self._prepare_sql(name))
+        with self._lock:
+            prepared.add(name)
+
+    def _numbered_query(self, name: str) -> str:
+        """Remplace les %s par $1, $2... (et %% par %)"""
+        counter = itertools.count(1)
+        query = re.sub(r'%s', lambda _: f'${next(counter)}', self._queries[name]['query'])
+        return query.replace('%%', '%')
+
+    def _prepare_sql(self, name: str) -> str:
+        """Instruction PREPARE de la requête"""
+        param_types = self._queries[name]['param_types']
+        signature = f" ({', '.join(param_types)})" if param_types else ''
+        return f"PREPARE {name}{signature} AS {self._numbered_query(name)}"
+
+    def _execute_sql(self, name: str) -> str:
+        """Instruction EXECUTE avec les conversions de type des paramètres"""
+        entry = self._queries[name]
+        n_params = entry['query'].count('%s')
+        casts = entry['param_types'] or [None] * n_params
+        arguments = ', '.join('%s' if cast is None else f'%s::{cast}' for cast in casts)
+        return f"EXECUTE {name} ({arguments})" if n_params else f"EXECUTE {name}"
+
+    def _portable_sql(self, name: str) -> str:
+        """Texte SQL direct pour les pilotes sans PREPARE (placeholders '?' si nécessaire)"""
+        query = self._queries[name]['query']
+        engine = self.manager.engine
+        if engine is not None and engine.dialect.paramstyle == 'qmark':
+            query = query.replace('%s', '?')
+        return query
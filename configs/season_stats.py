@@ -0,0 +1,402 @@
+"""
+Statistiques Saisonnières Incrémentales
+=======================================
+
+Remplace le rafraîchissement complet des vues matérialisées player_season_stats
+et team_performance_stats par des tables de cumuls tenues à jour par deltas :
+chaque exécution n'agrège que les matchs terminés depuis le passage précédent
+et les ajoute par upsert aux lignes (joueur, équipe, saison) et (équipe, saison).
+Le coût d'une mise à jour dépend du nombre de nouveaux matchs, pas de
+l'historique.
+
+Les tables ne stockent que des grandeurs additives (sommes et effectifs) ;
+moyennes et pourcentages sont calculés par les vues player_season_stats et
+team_performance_stats, qui gardent les colonnes des anciennes vues matérialisées.
+Le registre season_stats_ledger note le lot dans lequel chaque match a été
+appliqué : un match n'est jamais compté deux fois.
+
+Usage:
+    maintainer = SeasonStatsMaintainer(DatabaseManager())
+    maintainer.apply_new_matches()      # après chaque journée
+    maintainer.check_consistency()      # contrôle contre un recalcul complet
+
+Author: Football Analytics Platform
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .database import DatabaseManager
+except ImportError:
+    from database import DatabaseManager
+
+
+class SeasonStatsMaintainer:
+    """Maintenance incrémentale des cumuls saisonniers joueurs et équipes"""
+
+    PLAYER_KEYS = ['player_id', 'team_id', 'season']
+    PLAYER_TOTALS = ['matches_played', 'total_minutes', 'total_goals', 'total_assists',
+                     'total_xg', 'total_xa', 'rating_sum', 'rating_count',
+                     'passes_completed', 'passes_total', 'tackles_won', 'tackles_total']
+    TEAM_KEYS = ['team_id', 'season']
+    TEAM_TOTALS = ['matches_played', 'goals_for', 'goals_against', 'points', 'wins', 'draws', 'losses']
+
+    # {uuid} : UUID sous PostgreSQL, TEXT ailleurs (même affinité que les clés
+    # des tables jointes, sinon SQLite ne peut pas utiliser leurs index)
+    TABLES_DDL = [
+        """
+        CREATE TABLE IF NOT EXISTS season_stats_ledger (
+            match_id {uuid} PRIMARY KEY,
+            batch_id INTEGER NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_season_stats_ledger_batch ON season_stats_ledger (batch_id)",
+        """
+        CREATE TABLE IF NOT EXISTS player_season_totals (
+            player_id {uuid} NOT NULL,
+            team_id {uuid} NOT NULL,
+            season VARCHAR(9) NOT NULL,
+            matches_played INTEGER NOT NULL DEFAULT 0,
+            total_minutes INTEGER NOT NULL DEFAULT 0,
+            total_goals INTEGER NOT NULL DEFAULT 0,
+            total_assists INTEGER NOT NULL DEFAULT 0,
+            total_xg DECIMAL(8,3) NOT NULL DEFAULT 0,
+            total_xa DECIMAL(8,3) NOT NULL DEFAULT 0,
+            rating_sum DECIMAL(8,1) NOT NULL DEFAULT 0,
+            rating_count INTEGER NOT NULL DEFAULT 0,
+            passes_completed INTEGER NOT NULL DEFAULT 0,
+            passes_total INTEGER NOT NULL DEFAULT 0,
+            tackles_won INTEGER NOT NULL DEFAULT 0,
+            tackles_total INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (player_id, team_id, season)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_player_season_totals_season ON player_season_totals (season)",
+        """
+        CREATE TABLE IF NOT EXISTS team_season_totals (
+            team_id {uuid} NOT NULL,
+            season VARCHAR(9) NOT NULL,
+            matches_played INTEGER NOT NULL DEFAULT 0,
+            goals_for INTEGER NOT NULL DEFAULT 0,
+            goals_against INTEGER NOT NULL DEFAULT 0,
+            points INTEGER NOT NULL DEFAULT 0,
+            wins INTEGER NOT NULL DEFAULT 0,
+            draws INTEGER NOT NULL DEFAULT 0,
+            losses INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (team_id, season)
+        )
+        """
+    ]
+
+    PLAYER_VIEW = """
+    player_season_stats AS
+    SELECT
+        pst.player_id,
+        p.first_name,
+        p.last_name,
+        pst.team_id,
+        t.name AS team_name,
+        pst.season,
+        pst.matches_played,
+        pst.total_minutes,
+        pst.total_goals,
+        pst.total_assists,
+        pst.total_xg,
+        pst.total_xa,
+        ROUND(pst.rating_sum / NULLIF(pst.rating_count, 0), 2) AS avg_rating,
+        CAST(pst.passes_completed AS FLOAT) / NULLIF(pst.passes_total, 0) * 100 AS pass_accuracy_pct,
+        CAST(pst.tackles_won AS FLOAT) / NULLIF(pst.tackles_total, 0) * 100 AS tackle_success_pct
+    FROM player_season_totals pst
+    JOIN players p ON p.player_id = pst.player_id
+    JOIN teams t ON t.team_id = pst.team_id
+    """
+
+    TEAM_VIEW = """
+    team_performance_stats AS
+    SELECT
+        tst.team_id,
+        t.name AS team_name,
+        tst.season,
+        tst.matches_played,
+        tst.goals_for,
+        tst.goals_against,
+        tst.points,
+        tst.wins,
+        tst.draws,
+        tst.losses
+    FROM team_season_totals tst
+    JOIN teams t ON t.team_id = tst.team_id
+    """
+
+    # Agrégats d'un ensemble de matchs du registre ({batch_filter} : un lot ou tous)
+    PLAYER_DELTA_QUERY = """
+    SELECT
+        pms.player_id,
+        pms.team_id,
+        l.season,
+        COUNT(*) AS matches_played,
+        SUM(pms.minutes_played) AS total_minutes,
+        COALESCE(SUM(pms.goals), 0) AS total_goals,
+        COALESCE(SUM(pms.assists), 0) AS total_assists,
+        COALESCE(SUM(pms.xg), 0) AS total_xg,
+        COALESCE(SUM(pms.xa), 0) AS total_xa,
+        COALESCE(SUM(pms.rating), 0) AS rating_sum,
+        COUNT(pms.rating) AS rating_count,
+        COALESCE(SUM(pms.passes_completed), 0) AS passes_completed,
+        COALESCE(SUM(pms.passes_total), 0) AS passes_total,
+        COALESCE(SUM(pms.tackles_won), 0) AS tackles_won,
+        COALESCE(SUM(pms.tackles_total), 0) AS tackles_total
+    FROM season_stats_ledger sl
+    JOIN player_match_stats pms ON pms.match_id = sl.match_id
+    JOIN matches m ON m.match_id = sl.match_id
+    JOIN leagues l ON l.league_id = m.league_id
+    WHERE pms.minutes_played > 0 {batch_filter}
+    GROUP BY pms.player_id, pms.team_id, l.season
+    """
+
+    # Chaque match compte une fois côté domicile et une fois côté extérieur
+    TEAM_DELTA_QUERY = """
+    SELECT
+        side.team_id,
+        side.season,
+        COUNT(*) AS matches_played,
+        COALESCE(SUM(side.scored), 0) AS goals_for,
+        COALESCE(SUM(side.conceded), 0) AS goals_against,
+        SUM(CASE WHEN side.scored > side.conceded THEN 3
+                 WHEN side.scored = side.conceded THEN 1 ELSE 0 END) AS points,
+        SUM(CASE WHEN side.scored > side.conceded THEN 1 ELSE 0 END) AS wins,
+        SUM(CASE WHEN side.scored = side.conceded THEN 1 ELSE 0 END) AS draws,
+        SUM(CASE WHEN side.scored < side.conceded THEN 1 ELSE 0 END) AS losses
+    FROM (
+        SELECT m.home_team_id AS team_id, l.season, m.home_score AS scored, m.away_score AS conceded
+        FROM season_stats_ledger sl
+        JOIN matches m ON m.match_id = sl.match_id
+        JOIN leagues l ON l.league_id = m.league_id
+        WHERE 1 = 1 {batch_filter}
+        UNION ALL
+        SELECT m.away_team_id AS team_id, l.season, m.away_score AS scored, m.home_score AS conceded
+        FROM season_stats_ledger sl
+        JOIN matches m ON m.match_id = sl.match_id
+        JOIN leagues l ON l.league_id = m.league_id
+        WHERE 1 = 1 {batch_filter}
+    ) side
+    WHERE side.team_id IS NOT NULL
+    GROUP BY side.team_id, side.season
+    """
+
+    # Un match terminé n'est inscrit qu'une fois ses statistiques joueurs chargées :
+    # inscrit plus tôt, il ne serait jamais réagrégé à leur arrivée
+    PENDING_MATCHES_QUERY = """
+    SELECT m.match_id
+    FROM matches m
+    WHERE m.status = 'Finished'
+      AND EXISTS (SELECT 1 FROM player_match_stats pms WHERE pms.match_id = m.match_id)
+      AND NOT EXISTS (SELECT 1 FROM season_stats_ledger sl WHERE sl.match_id = m.match_id)
+    ORDER BY m.match_date
+    """
+
+    def __init__(self, manager: DatabaseManager):
+        """
+        Args:
+            manager: Gestionnaire de base connecté
+        """
+        self.manager = manager
+
+    @property
+    def _is_postgres(self) -> bool:
+        return self.manager.engine is not None and self.manager.engine.dialect.name == 'postgresql'
+
+    def create_tables(self):
+        """
+        Crée les tables de cumuls, le registre et les vues de lecture
+
+        Sur PostgreSQL, les anciennes vues matérialisées du même nom sont
+        supprimées ; appeler rebuild() ensuite pour remplir les cumuls.
+        """
+        uuid_type = 'UUID' if self._is_postgres else 'TEXT'
+        statements = [ddl.format(uuid=uuid_type) for ddl in self.TABLES_DDL]
+        if self._is_postgres:
+            statements += [
+                "DROP MATERIALIZED VIEW IF EXISTS player_season_stats",
+                "DROP MATERIALIZED VIEW IF EXISTS team_performance_stats",
+                f"CREATE OR REPLACE VIEW {self.PLAYER_VIEW}",
+                f"CREATE OR REPLACE VIEW {self.TEAM_VIEW}"
+            ]
+        else:
+            statements += [f"CREATE VIEW IF NOT EXISTS {self.PLAYER_VIEW}",
+                           f"CREATE VIEW IF NOT EXISTS {self.TEAM_VIEW}"]
+        with self.manager.transaction() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def apply_new_matches(self, max_matches: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Applique aux cumuls les matchs terminés non encore comptés
+
+        Les matchs sont inscrits au registre sous un nouveau numéro de lot, puis
+        seuls les agrégats de ce lot sont ajoutés aux tables, dans une même
+        transaction : une erreur laisse cumuls et registre inchangés.
+
+        Args:
+            max_matches: Nombre maximal de matchs traités (les plus anciens d'abord)
+
+        Returns:
+            Dictionnaire {batch_id, matches, player_rows, team_rows, seconds}
+        """
+        start = time.perf_counter()
+        with self.manager.transaction() as cursor:
+            report = self._apply_batch(cursor, max_matches)
+        report['seconds'] = time.perf_counter() - start
+        return report
+
+    def rebuild(self) -> Dict[str, Any]:
+        """
+        Vide cumuls et registre puis recalcule tout l'historique en un seul lot
+
+        Suppression et recalcul forment une seule transaction : les lecteurs des
+        vues voient les anciens cumuls jusqu'à la validation, et un échec du
+        recalcul laisse cumuls et registre intacts.
+        """
+        start = time.perf_counter()
+        with self.manager.transaction() as cursor:
+            for table in ('player_season_totals', 'team_season_totals', 'season_stats_ledger'):
+                cursor.execute(f"DELETE FROM {table}")
+            report = self._apply_batch(cursor)
+        report['seconds'] = time.perf_counter() - start
+        return report
+
+    def _apply_batch(self, cursor, max_matches: Optional[int] = None) -> Dict[str, Any]:
+        """Inscrit les matchs en attente sous un nouveau lot et ajoute ses agrégats (transaction de l'appelant)"""
+        if self._is_postgres:
+            # Un seul lot à la fois : deux mises à jour concurrentes compteraient les mêmes matchs
+            cursor.execute("LOCK TABLE season_stats_ledger IN SHARE ROW EXCLUSIVE MODE")
+        cursor.execute(self.PENDING_MATCHES_QUERY)
+        match_ids = [row[0] for row in cursor.fetchall()][:max_matches]
+        if not match_ids:
+            return {'batch_id': None, 'matches': 0, 'player_rows': 0, 'team_rows': 0}
+
+        cursor.execute("SELECT COALESCE(MAX(batch_id), 0) + 1 FROM season_stats_ledger")
+        batch_id = int(cursor.fetchone()[0])
+        cursor.executemany(
+            self._sql("INSERT INTO season_stats_ledger (match_id, batch_id) VALUES (%s, %s)"),
+            [(match_id, batch_id) for match_id in match_ids]
+        )
+
+        batch_filter = 'AND sl.batch_id = %s'
+        cursor.execute(self._sql(self._upsert_sql(
+            'player_season_totals', self.PLAYER_KEYS, self.PLAYER_TOTALS,
+            self.PLAYER_DELTA_QUERY.format(batch_filter=batch_filter)
+        )), (batch_id,))
+        player_rows = cursor.rowcount
+        cursor.execute(self._sql(self._upsert_sql(
+            'team_season_totals', self.TEAM_KEYS, self.TEAM_TOTALS,
+            self.TEAM_DELTA_QUERY.format(batch_filter=batch_filter)
+        )), (batch_id, batch_id))
+        return {'batch_id': batch_id, 'matches': len(match_ids),
+                'player_rows': player_rows, 'team_rows': cursor.rowcount}
+
+    def check_consistency(self, tolerance: float = 1e-6) -> Dict[str, Any]:
+        """
+        Compare les cumuls à un recalcul complet sur les matchs du registre
+
+        Un écart signale une donnée corrigée après son application (stats d'un
+        match modifiées, score rectifié) : rebuild() remet les cumuls à niveau.
+
+        Args:
+            tolerance: Écart absolu toléré sur les colonnes décimales
+
+        Returns:
+            Dictionnaire {consistent, pending_matches, player_mismatches, team_mismatches}
+            où les écarts sont des DataFrames (clé, colonne, cumul, recalcul)
+        """
+        player_mismatches = self._compare(
+            'player_season_totals', self.PLAYER_KEYS, self.PLAYER_TOTALS,
+            self.PLAYER_DELTA_QUERY.format(batch_filter=''), tolerance
+        )
+        team_mismatches = self._compare(
+            'team_season_totals', self.TEAM_KEYS, self.TEAM_TOTALS,
+            self.TEAM_DELTA_QUERY.format(batch_filter=''), tolerance
+        )
+        pending = len(self.manager.read_sql(self.PENDING_MATCHES_QUERY))
+        return {
+            'consistent': player_mismatches.empty and team_mismatches.empty,
+            'pending_matches': pending,
+            'player_mismatches': player_mismatches,
+            'team_mismatches': team_mismatches
+        }
+
+    def _compare(self, table: str, keys: List[str], totals: List[str],
+                 recompute_query: str, tolerance: float) -> pd.DataFrame:
+        """Écarts colonne par colonne entre une table de cumuls et son recalcul"""
+        stored = self.manager.read_sql(f"SELECT {', '.join(keys + totals)} FROM {table}")
+        expected = self.manager.read_sql(recompute_query)
+        for frame in (stored, expected):
+            for col in keys:
+                frame[col] = frame[col].astype(str)
+            for col in totals:
+                frame[col] = pd.to_numeric(frame[col], errors='coerce').astype('float64')
+
+        merged = stored.merge(expected, on=keys, how='outer', suffixes=('_stored', '_expected'))
+        mismatches = []
+        for col in totals:
+            stored_values = merged[f'{col}_stored'].to_numpy()
+            expected_values = merged[f'{col}_expected'].to_numpy()
+            differs = ~np.isclose(stored_values, expected_values, rtol=0, atol=tolerance)
+            if differs.any():
+                mismatches.append(pd.DataFrame({
+                    **{key: merged.loc[differs, key].to_numpy() for key in keys},
+                    'column': col,
+                    'stored': stored_values[differs],
+                    'expected': expected_values[differs]
+                }))
+        if not mismatches:
+            return pd.DataFrame(columns=keys + ['column', 'stored', 'expected'])
+        return pd.concat(mismatches, ignore_index=True)
+
+    def _upsert_sql(self, table: str, keys: List[str], totals: List[str], delta_query: str) -> str:
+        """INSERT ... SELECT qui ajoute les deltas aux lignes existantes"""
+        columns = keys + totals
+        updates = ', '.join(f"{col} = {table}.{col} + excluded.{col}" for col in totals)
+        return (
+            f"INSERT INTO {table} ({', '.join(columns)}) {delta_query} "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}"
+        )
+
+    def _sql(self, query: str) -> str:
+        """Adapte les placeholders %s aux pilotes en style '?'"""
+        engine = self.manager.engine
+        if engine is not None and engine.dialect.paramstyle == 'qmark':
+            return query.replace('%s', '?')
+        return query
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mise à jour incrémentale des cumuls saisonniers")
+    parser.add_argument('--rebuild', action='store_true', help="recalcule tout l'historique")
+    parser.add_argument('--check', action='store_true', help="compare les cumuls à un recalcul complet")
+    args = parser.parse_args()
+
+    manager = DatabaseManager()
+    if not manager.connect():
+        raise SystemExit("❌ Échec de la connexion")
+
+    maintainer = SeasonStatsMaintainer(manager)
+    maintainer.create_tables()
+    report = maintainer.rebuild() if args.rebuild else maintainer.apply_new_matches()
+    print(f"✅ {report['matches']} matchs appliqués ({report['player_rows']} lignes joueurs, "
+          f"{report['team_rows']} lignes équipes) en {report['seconds']:.2f}s")
+
+    if args.check:
+        check = maintainer.check_consistency()
+        status = "✅ cohérents" if check['consistent'] else "❌ écarts détectés"
+        print(f"{status} ({len(check['player_mismatches'])} écarts joueurs, "
+              f"{len(check['team_mismatches'])} écarts équipes, {check['pending_matches']} matchs en attente)")
+
+    manager.disconnect()
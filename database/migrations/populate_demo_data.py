@@ -10,7 +10,8 @@ Author: Football Analytics Platform
 
 import sys
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'configs'))
+# configs/ est à la racine du dépôt, deux niveaux au-dessus de database/migrations/
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'configs'))
 
 import pandas as pd
 import numpy as np
@@ -254,6 +255,13 @@ class FootballDataGenerator:
         
         return pd.DataFrame(matches_data)
     
+    def _load(self, df: pd.DataFrame, table_name: str):
+        """Charge une table par COPY (table recréée comme avec to_sql replace)"""
+        stats = self.db.bulk_copy(df, table_name, if_exists='replace')
+        if stats is None:
+            raise RuntimeError(f"chargement de {table_name} impossible")
+        print(f"   {stats['rows']:,} lignes en {stats['seconds']:.2f}s ({stats['rows_per_second']:,.0f} lignes/s)")
+    
     def insert_all_data(self):
         """Insère toutes les données dans la base de données"""
         if not self.db.connect():
@@ -263,23 +271,23 @@ class FootballDataGenerator:
         try:
             print("🏆 Génération des championnats...")
             leagues_df = self.generate_leagues()
-            self.db.to_sql(leagues_df, 'leagues', if_exists='replace')
+            self._load(leagues_df, 'leagues')
             
             print("⚽ Génération des équipes...")
             teams_df = self.generate_teams()
-            self.db.to_sql(teams_df, 'teams', if_exists='replace')
+            self._load(teams_df, 'teams')
             
             print("🎯 Génération des positions...")
             positions_df = self.generate_positions()
-            self.db.to_sql(positions_df, 'positions', if_exists='replace')
+            self._load(positions_df, 'positions')
             
             print("👥 Génération des joueurs...")
             players_df = self.generate_players()
-            self.db.to_sql(players_df, 'players', if_exists='replace')
+            self._load(players_df, 'players')
             
             print("📅 Génération des matchs...")
             matches_df = self.generate_matches()
-            self.db.to_sql(matches_df, 'matches', if_exists='replace')
+            self._load(matches_df, 'matches')
             
             print("✅ Toutes les données ont été insérées avec succès!")
             
@@ -0,0 +1,621 @@
+"""
+Jeu de Données Synthétique à Grande Échelle
+===========================================
+
+Génère un jeu de données de test de charge conforme à create_schema.sql :
+plusieurs championnats sur plusieurs saisons (5 x 10 par défaut), 20 équipes
+de 25 joueurs, 380 matchs par saison et environ 3 000 événements par match,
+avec les statistiques joueurs et les données physiques (GPS) qui en découlent.
+
+Chaque couple (championnat, saison) forme un fragment généré indépendamment
+dans un pool de processus, avec son propre générateur aléatoire dérivé de la
+graine (même fragment, mêmes données quel que soit l'ordre d'exécution).
+Les tirages sont vectorisés sur tout le fragment : aucune boucle par événement.
+Les fragments sont écrits en Parquet (ou CSV) sous
+{sortie}/{table}/season={saison}/league={code}/ puis chargeables par COPY.
+
+Ce jeu sert de référence commune aux benchmarks (benchmark_analytics.py).
+
+Usage:
+    python synthetic_dataset.py data/load_test              # génère les fragments
+    python synthetic_dataset.py data/load_test --load       # génère puis charge en base
+    python synthetic_dataset.py data/small --leagues 1 --seasons 2 --events 500
+
+Author: Football Analytics Platform
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'configs'))
+
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+LEAGUES = [
+    ('L1', 'Ligue 1', 'France'),
+    ('PL', 'Premier League', 'Angleterre'),
+    ('LL', 'La Liga', 'Espagne'),
+    ('SA', 'Serie A', 'Italie'),
+    ('BL', 'Bundesliga', 'Allemagne')
+]
+
+POSITION_CODES = ['GK', 'CB', 'LB', 'RB', 'DM', 'CM', 'AM', 'LW', 'RW', 'ST']
+POSITION_LINES = ['Goalkeeper', 'Defence', 'Defence', 'Defence', 'Midfield',
+                  'Midfield', 'Midfield', 'Attack', 'Attack', 'Attack']
+# Répartition des joueurs de champ (les deux premiers joueurs de chaque effectif sont gardiens)
+OUTFIELD_WEIGHTS = np.array([0.18, 0.09, 0.09, 0.13, 0.17, 0.09, 0.08, 0.08, 0.09])
+
+# Types d'événements et fréquences (les buts sont ajoutés après les tirs cadrés)
+EVENT_TYPES = np.array(['Pass', 'Tackle', 'Foul', 'Shot', 'Throw-in', 'Corner',
+                        'Offside', 'Yellow Card', 'Red Card'])
+EVENT_WEIGHTS = np.array([0.8, 0.07, 0.035, 0.0085, 0.045, 0.0035, 0.0015, 0.0013, 0.00003])
+SUCCESS_RATES = {'Pass': 0.82, 'Tackle': 0.6, 'Shot': 0.33}
+GOAL_RATE_ON_TARGET = 0.32
+
+# Ordre de chargement (clés étrangères)
+TABLES = ['leagues', 'teams', 'positions', 'players', 'player_team_contracts',
+          'matches', 'player_match_stats', 'match_events', 'physical_data']
+
+# Colonnes de travail des tables de référence, absentes du schéma
+DIMENSION_KEYS = {
+    'leagues': ['league_code'],
+    'teams': ['league_code'],
+    'players': ['team_id', 'position_code']
+}
+
+SQUAD_SIZE = 14          # 11 titulaires + 3 remplaçants par équipe et par match
+STARTERS = 11
+
+
+def _uuids(rng: np.random.Generator, n: int) -> np.ndarray:
+    """UUID v4 tirés du générateur (reproductibles)"""
+    raw = rng.integers(0, 256, (n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    return np.array([str(uuid.UUID(bytes=row.tobytes())) for row in raw], dtype=object)
+
+
+def double_round_robin(n_teams: int) -> np.ndarray:
+    """
+    Calendrier aller-retour par la méthode du cercle
+
+    Returns:
+        Tableau (journées, matchs par journée, 2) d'indices (domicile, extérieur)
+    """
+    if n_teams % 2:
+        raise ValueError("Nombre d'équipes pair requis")
+    rotation = np.arange(n_teams)
+    first_leg = []
+    for round_index in range(n_teams - 1):
+        pairs = np.stack([rotation[:n_teams // 2], rotation[::-1][:n_teams // 2]], axis=1)
+        # Alterne domicile/extérieur d'une journée à l'autre
+        first_leg.append(pairs if round_index % 2 == 0 else pairs[:, ::-1])
+        rotation = np.concatenate([[rotation[0]], np.roll(rotation[1:], 1)])
+    first_leg = np.array(first_leg)
+    return np.concatenate([first_leg, first_leg[:, :, ::-1]])
+
+
+class SyntheticDatasetGenerator:
+    """Générateur parallèle de fragments (championnat, saison) au schéma de la base"""
+
+    def __init__(self, n_leagues: int = 5, n_seasons: int = 10, first_season: int = 2015,
+                 teams_per_league: int = 20, players_per_team: int = 25,
+                 events_per_match: int = 3_000, training_sessions_per_match: int = 3,
+                 seed: int = 42):
+        """
+        Args:
+            n_leagues: Nombre de championnats (5 au plus)
+            n_seasons: Nombre de saisons consécutives
+            first_season: Année de début de la première saison
+            teams_per_league: Équipes par championnat (pair)
+            players_per_team: Joueurs par effectif
+            events_per_match: Événements par match
+            training_sessions_per_match: Séances d'entraînement GPS par joueur et par match
+            seed: Graine commune ; chaque fragment dérive la sienne de (seed, championnat, saison)
+        """
+        if not 1 <= n_leagues <= len(LEAGUES):
+            raise ValueError(f"n_leagues doit être compris entre 1 et {len(LEAGUES)}")
+        if teams_per_league % 2 or players_per_team < SQUAD_SIZE + 2:
+            raise ValueError("teams_per_league doit être pair et players_per_team >= 16")
+        self.n_leagues = n_leagues
+        self.n_seasons = n_seasons
+        self.first_season = first_season
+        self.teams_per_league = teams_per_league
+        self.players_per_team = players_per_team
+        self.events_per_match = events_per_match
+        self.training_sessions_per_match = training_sessions_per_match
+        self.seed = seed
+        self._dimensions: Optional[Dict[str, pd.DataFrame]] = None
+
+    @property
+    def seasons(self) -> List[str]:
+        return [f"{year}-{year + 1}" for year in range(self.first_season, self.first_season + self.n_seasons)]
+
+    @property
+    def matches_per_season(self) -> int:
+        return self.teams_per_league * (self.teams_per_league - 1)
+
+    def dimensions(self) -> Dict[str, pd.DataFrame]:
+        """
+        Tables de référence communes à tous les fragments
+
+        Returns:
+            {leagues, teams, positions, players, player_team_contracts}
+        """
+        if self._dimensions is not None:
+            return self._dimensions
+        rng = np.random.default_rng([self.seed])
+
+        leagues = pd.DataFrame(
+            [(code, name, country, season) for code, name, country in LEAGUES[:self.n_leagues]
+             for season in self.seasons],
+            columns=['league_code', 'name', 'country', 'season']
+        )
+        leagues.insert(0, 'league_id', _uuids(rng, len(leagues)))
+        leagues['level'] = 1
+
+        n_teams = self.n_leagues * self.teams_per_league
+        league_codes = np.repeat([code for code, _, _ in LEAGUES[:self.n_leagues]], self.teams_per_league)
+        first_season_ids = leagues[leagues['season'] == self.seasons[0]].set_index('league_code')['league_id']
+        teams = pd.DataFrame({
+            'team_id': _uuids(rng, n_teams),
+            'name': [f"{code} Club {i % self.teams_per_league + 1:02d}" for i, code in enumerate(league_codes)],
+            'short_name': [f"{code}{i % self.teams_per_league + 1:02d}" for i, code in enumerate(league_codes)],
+            'league_id': first_season_ids.loc[league_codes].to_numpy(),
+            'stadium_capacity': rng.integers(15_000, 80_000, n_teams),
+            'budget_millions': rng.lognormal(4.3, 0.7, n_teams).round(2),
+            'league_code': league_codes
+        })
+
+        positions = pd.DataFrame({
+            'position_id': _uuids(rng, len(POSITION_CODES)),
+            'code': POSITION_CODES,
+            'name': POSITION_CODES,
+            'line': POSITION_LINES
+        })
+
+        n_players = n_teams * self.players_per_team
+        position_index = 1 + rng.choice(len(OUTFIELD_WEIGHTS), n_players, p=OUTFIELD_WEIGHTS)
+        position_index[np.arange(n_players) % self.players_per_team < 2] = 0
+        age_days = (rng.normal(26, 4, n_players).clip(17, 38) * 365.25).astype(int)
+        reference = date(self.first_season, 7, 1)
+        market_value = (rng.exponential(12, n_players) * (1 - np.abs(age_days / 365.25 - 27) * 0.03).clip(0.3)).clip(0.5, 200)
+        players = pd.DataFrame({
+            'player_id': _uuids(rng, n_players),
+            'first_name': rng.choice(['Lucas', 'Hugo', 'Nathan', 'Karim', 'Moussa', 'Thomas', 'Yanis',
+                                      'Marco', 'Pablo', 'Jonas', 'Luka', 'Kevin'], n_players),
+            'last_name': [f"Joueur{i:05d}" for i in range(n_players)],
+            'birth_date': [reference - timedelta(days=int(days)) for days in age_days],
+            'nationality': rng.choice(['France', 'Angleterre', 'Espagne', 'Italie', 'Allemagne',
+                                       'Sénégal', 'Brésil', 'Maroc'], n_players),
+            'height_cm': rng.normal(180, 6, n_players).clip(160, 205).astype(int),
+            'weight_kg': rng.normal(75, 6, n_players).clip(58, 100).astype(int),
+            'foot': rng.choice(['Right', 'Left', 'Both'], n_players, p=[0.7, 0.25, 0.05]),
+            'market_value_millions': market_value.round(1),
+            'jersey_number': np.arange(n_players) % self.players_per_team + 1,
+            'team_id': np.repeat(teams['team_id'].to_numpy(), self.players_per_team),
+            'position_code': np.array(POSITION_CODES)[position_index]
+        })
+
+        contracts = pd.DataFrame({
+            'contract_id': _uuids(rng, n_players),
+            'player_id': players['player_id'],
+            'team_id': players['team_id'],
+            'primary_position_id': positions['position_id'].to_numpy()[position_index],
+            'start_date': reference,
+            'end_date': None
+        })
+
+        self._dimensions = {
+            'leagues': leagues,
+            'teams': teams,
+            'positions': positions,
+            'players': players,
+            'player_team_contracts': contracts
+        }
+        return self._dimensions
+
+    def shard_specs(self) -> List[Dict[str, Any]]:
+        """Paramètres autonomes (sérialisables) de chaque fragment (championnat, saison)"""
+        dims = self.dimensions()
+        position_ids = dims['positions'].set_index('code')['position_id']
+        specs = []
+        for league_index, (code, _, _) in enumerate(LEAGUES[:self.n_leagues]):
+            teams = dims['teams'][dims['teams']['league_code'] == code]
+            roster = dims['players'][dims['players']['team_id'].isin(teams['team_id'])]
+            for season_index, season in enumerate(self.seasons):
+                league = dims['leagues']
+                league_id = league.loc[(league['league_code'] == code) & (league['season'] == season), 'league_id'].iloc[0]
+                specs.append({
+                    'league': code,
+                    'season': season,
+                    'seed': [self.seed, league_index, season_index],
+                    'league_id': league_id,
+                    'season_start': datetime(self.first_season + season_index, 8, 10),
+                    'team_ids': teams['team_id'].to_numpy(),
+                    'roster_ids': roster['player_id'].to_numpy().reshape(len(teams), self.players_per_team),
+                    'roster_position_ids': position_ids.loc[roster['position_code']].to_numpy().reshape(
+                        len(teams), self.players_per_team),
+                    'events_per_match': self.events_per_match,
+                    'training_sessions_per_match': self.training_sessions_per_match
+                })
+        return specs
+
+    def generate(self, output_dir, file_format: str = 'parquet',
+                 processes: Optional[int] = None) -> pd.DataFrame:
+        """
+        Écrit tables de référence et fragments, en parallèle
+
+        Args:
+            output_dir: Répertoire de sortie
+            file_format: 'parquet' (zstd) ou 'csv'
+            processes: Processus du pool (nombre de cœurs par défaut, 1 = séquentiel)
+
+        Returns:
+            Manifeste [table, season, league, path, rows]
+        """
+        if file_format not in ('parquet', 'csv'):
+            raise ValueError(f"Format non supporté: {file_format}")
+        output_dir = Path(output_dir)
+        manifest = []
+        for table, frame in self.dimensions().items():
+            columns = [col for col in frame.columns if col not in DIMENSION_KEYS.get(table, [])]
+            manifest.append(_write_table(frame[columns], output_dir / table, table, file_format))
+            manifest[-1].update({'season': None, 'league': None})
+
+        jobs = [(spec, str(output_dir), file_format) for spec in self.shard_specs()]
+        if processes == 1:
+            results = [write_shard(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                results = list(pool.map(write_shard, *zip(*jobs)))
+        for rows in results:
+            manifest.extend(rows)
+        return pd.DataFrame(manifest, columns=['table', 'season', 'league', 'path', 'rows'])
+
+    def load(self, manager, output_dir) -> pd.DataFrame:
+        """
+        Charge les fichiers générés par COPY, dans l'ordre des clés étrangères
+
+        Les postes déjà présents en base (insérés par create_schema.sql) sont
+        conservés : les identifiants générés sont remplacés par ceux de la base.
+
+        Args:
+            manager: DatabaseManager connecté
+            output_dir: Répertoire produit par generate()
+
+        Returns:
+            Débit par table [table, files, rows, seconds, rows_per_second]
+        """
+        output_dir = Path(output_dir)
+        existing = manager.read_sql("SELECT position_id, code FROM positions")
+        position_map = None
+        if not existing.empty:
+            generated = read_shard(next((output_dir / 'positions').rglob('positions.*')))
+            position_map = dict(zip(generated['position_id'],
+                                    generated['code'].map(existing.set_index('code')['position_id'].astype(str))))
+
+        report = []
+        for table in TABLES:
+            if table == 'positions' and position_map is not None:
+                continue
+            files = sorted((output_dir / table).rglob(f'{table}.*'))
+            rows, seconds = 0, 0.0
+            for path in files:
+                frame = read_shard(path)
+                if position_map is not None:
+                    for col in ('position_played_id', 'primary_position_id'):
+                        if col in frame.columns:
+                            frame[col] = frame[col].map(position_map)
+                stats = manager.bulk_copy(frame, table)
+                if stats is None:
+                    raise RuntimeError(f"Chargement de {path} impossible")
+                rows += stats['rows']
+                seconds += stats['seconds']
+            report.append({'table': table, 'files': len(files), 'rows': rows, 'seconds': seconds,
+                           'rows_per_second': rows / seconds if seconds else 0.0})
+        return pd.DataFrame(report)
+
+
+def generate_shard(spec: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
+    """
+    Génère les tables d'un fragment (championnat, saison) en mémoire
+
+    Args:
+        spec: Paramètres d'un fragment (voir SyntheticDatasetGenerator.shard_specs)
+
+    Returns:
+        {matches, player_match_stats, match_events, physical_data}
+    """
+    rng = np.random.default_rng(spec['seed'])
+    team_ids = spec['team_ids']
+    n_teams, n_roster = spec['roster_ids'].shape
+    events_per_match = spec['events_per_match']
+
+    # Calendrier : une journée par semaine, coup d'envoi entre vendredi et dimanche
+    schedule = double_round_robin(n_teams)
+    n_rounds, per_round, _ = schedule.shape
+    fixtures = schedule.reshape(-1, 2)
+    n_matches = len(fixtures)
+    matchday = np.repeat(np.arange(1, n_rounds + 1), per_round)
+    kickoff = (pd.Timestamp(spec['season_start']) + pd.to_timedelta((matchday - 1) * 7, unit='D')
+               + pd.to_timedelta(rng.integers(0, 3, n_matches), unit='D')
+               + pd.to_timedelta(rng.choice([13, 15, 17, 19, 21], n_matches), unit='h'))
+    match_ids = _uuids(rng, n_matches)
+
+    # Feuilles de match : un gardien titulaire puis 13 joueurs de champ (10 titulaires, 3 remplaçants)
+    goalkeeper = rng.integers(0, 2, (n_matches, 2))
+    outfield = np.argsort(rng.random((n_matches, 2, n_roster - 2)), axis=2)[:, :, :SQUAD_SIZE - 1] + 2
+    squad = np.concatenate([goalkeeper[:, :, None], outfield], axis=2)              # (matchs, 2, 14)
+    squad_team = fixtures[:, :, None].repeat(SQUAD_SIZE, axis=2)
+    squad_ids = spec['roster_ids'][squad_team, squad]
+    squad_positions = spec['roster_position_ids'][squad_team, squad]
+    # Les remplaçants (emplacements 11-13) entrent à la place des titulaires 8-10
+    sub_minute = rng.integers(55, 86, (n_matches, 2, SQUAD_SIZE - STARTERS))
+
+    # Événements : horloge triée par match, possession alternant par séquences
+    n_events = n_matches * events_per_match
+    clock = np.sort(rng.uniform(0, 95 * 60, (n_matches, events_per_match)), axis=1).ravel()
+    minute = (clock // 60).astype(np.int16)
+    second = (clock % 60).astype(np.int16)
+    match_index = np.repeat(np.arange(n_matches), events_per_match)
+    turnovers = rng.random((n_matches, events_per_match)) < 0.12
+    side = ((np.cumsum(turnovers, axis=1) + rng.integers(0, 2, (n_matches, 1))) % 2).ravel()
+
+    slot = rng.integers(0, STARTERS, n_events)
+    for substitute in range(SQUAD_SIZE - STARTERS):
+        replaced = STARTERS - (SQUAD_SIZE - STARTERS) + substitute
+        entered = minute >= sub_minute[match_index, side, substitute]
+        slot[(slot == replaced) & entered] = STARTERS + substitute
+
+    event_type = EVENT_TYPES[rng.choice(len(EVENT_TYPES), n_events, p=EVENT_WEIGHTS / EVENT_WEIGHTS.sum())]
+    success = pd.array(np.full(n_events, pd.NA), dtype='boolean')
+    for kind, rate in SUCCESS_RATES.items():
+        is_kind = event_type == kind
+        success[is_kind] = rng.random(int(is_kind.sum())) < rate
+
+    x = np.where(event_type == 'Shot', 100 - rng.gamma(2.0, 6.0, n_events).clip(0, 40),
+                 rng.beta(2.2, 2.0, n_events) * 100)
+    y = np.where(event_type == 'Shot', rng.normal(50, 12, n_events).clip(5, 95), rng.uniform(0, 100, n_events))
+
+    # Tir cadré converti : l'événement suivant du match devient le but
+    on_target = np.flatnonzero((event_type == 'Shot') & success.to_numpy(dtype=bool, na_value=False))
+    scored = on_target[rng.random(len(on_target)) < GOAL_RATE_ON_TARGET]
+    scored = scored[(scored + 1 < n_events) & (match_index[np.minimum(scored + 1, n_events - 1)] == match_index[scored])]
+    goal_rows = scored + 1
+    event_type[goal_rows] = 'Goal'
+    side[goal_rows], slot[goal_rows] = side[scored], slot[scored]
+    minute[goal_rows], second[goal_rows] = minute[scored], second[scored]
+    x[goal_rows], y[goal_rows] = x[scored], y[scored]
+    success[goal_rows] = True
+
+    match_events = pd.DataFrame({
+        'match_id': match_ids[match_index],
+        'minute': minute,
+        'second_in_minute': second,
+        'event_type': event_type,
+        'player_id': squad_ids[match_index, side, slot],
+        'team_id': team_ids[fixtures[match_index, side]],
+        'x_coordinate': x.round(2),
+        'y_coordinate': y.round(2),
+        'success': success,
+        'created_at': kickoff[match_index] + pd.to_timedelta(clock.astype(np.int64), unit='s')
+    })
+
+    # Score : buts de chaque côté (mi-temps : buts avant la 45e minute)
+    is_goal = event_type == 'Goal'
+    goals = np.bincount(match_index[is_goal] * 2 + side[is_goal], minlength=n_matches * 2).reshape(n_matches, 2)
+    first_half = is_goal & (minute < 45)
+    halftime = np.bincount(match_index[first_half] * 2 + side[first_half],
+                           minlength=n_matches * 2).reshape(n_matches, 2)
+    matches = pd.DataFrame({
+        'match_id': match_ids,
+        'league_id': spec['league_id'],
+        'home_team_id': team_ids[fixtures[:, 0]],
+        'away_team_id': team_ids[fixtures[:, 1]],
+        'match_date': kickoff,
+        'matchday': matchday,
+        'attendance': rng.integers(12_000, 75_000, n_matches),
+        'home_score': goals[:, 0],
+        'away_score': goals[:, 1],
+        'home_score_halftime': halftime[:, 0],
+        'away_score_halftime': halftime[:, 1],
+        'temperature': rng.integers(-2, 32, n_matches),
+        'status': 'Finished'
+    })
+
+    player_match_stats = _player_match_stats(rng, match_index, side, slot, event_type, success, x, y,
+                                             match_ids, team_ids[fixtures], squad_ids, squad_positions,
+                                             sub_minute, kickoff)
+    physical_data = _physical_data(rng, player_match_stats, spec['training_sessions_per_match'])
+    return {
+        'matches': matches,
+        'player_match_stats': player_match_stats,
+        'match_events': match_events,
+        'physical_data': physical_data
+    }
+
+
+def _player_match_stats(rng, match_index, side, slot, event_type, success, x, y, match_ids,
+                        match_teams, squad_ids, squad_positions, sub_minute, kickoff) -> pd.DataFrame:
+    """Statistiques par joueur et par match, agrégées depuis les événements (bincount)"""
+    n_matches = len(match_ids)
+    n_rows = n_matches * 2 * SQUAD_SIZE
+    code = (match_index * 2 + side) * SQUAD_SIZE + slot
+    succeeded = success.to_numpy(dtype=bool, na_value=False)
+
+    def count(mask):
+        return np.bincount(code[mask], minlength=n_rows)
+
+    is_pass, is_tackle, is_shot = event_type == 'Pass', event_type == 'Tackle', event_type == 'Shot'
+
+    # xG des tirs selon la distance au but ; xA à la passe réussie qui précède un tir de la même équipe
+    distance = np.hypot((100 - x) * 1.05, (50 - y) * 0.68)
+    shot_xg = np.where(is_shot, 1 / (1 + np.exp(0.2 * distance - 1.0)), 0.0)
+    previous = np.flatnonzero(is_shot)[1:] - 1 if is_shot[0] else np.flatnonzero(is_shot) - 1
+    previous = previous[previous >= 0]
+    assisted = previous[is_pass[previous] & succeeded[previous] & (code[previous] // SQUAD_SIZE == code[previous + 1] // SQUAD_SIZE)]
+    xa = np.bincount(code[assisted], weights=shot_xg[assisted + 1], minlength=n_rows)
+    # Passe décisive : le tir servi est suivi de son but
+    decisive = assisted[(assisted + 2 < len(code)) & (event_type[np.minimum(assisted + 2, len(code) - 1)] == 'Goal')]
+    assists = np.bincount(code[decisive], minlength=n_rows)
+    xg = np.bincount(code, weights=shot_xg, minlength=n_rows)
+
+    # Minutes : titulaires remplacés et remplaçants selon la minute d'entrée
+    minutes = np.zeros((n_matches, 2, SQUAD_SIZE), dtype=np.int64)
+    minutes[:, :, :STARTERS] = 90
+    minutes[:, :, STARTERS - sub_minute.shape[2]:STARTERS] = sub_minute
+    minutes[:, :, STARTERS:] = 90 - sub_minute
+    minutes = minutes.ravel()
+
+    goals = count(event_type == 'Goal')
+    passes_total, passes_completed = count(is_pass), count(is_pass & succeeded)
+    rating = (6.0 + 0.9 * goals + 0.8 * xa + 0.01 * passes_completed
+              + rng.normal(0, 0.6, n_rows)).clip(3, 10).round(1)
+
+    row_match = np.repeat(np.arange(n_matches), 2 * SQUAD_SIZE)
+    row_side = np.tile(np.repeat([0, 1], SQUAD_SIZE), n_matches)
+    return pd.DataFrame({
+        'match_id': match_ids[row_match],
+        'player_id': squad_ids.ravel(),
+        'team_id': match_teams[row_match, row_side],
+        'position_played_id': squad_positions.ravel(),
+        'minutes_played': minutes,
+        'is_starter': np.tile(np.arange(SQUAD_SIZE) < STARTERS, n_matches * 2),
+        'goals': goals,
+        'assists': assists,
+        'shots_total': count(is_shot),
+        'shots_on_target': count(is_shot & succeeded),
+        'xg': xg.round(3),
+        'xa': xa.round(3),
+        'passes_total': passes_total,
+        'passes_completed': passes_completed,
+        'passes_accuracy': (100 * passes_completed / np.maximum(passes_total, 1)).round(2),
+        'tackles_total': count(is_tackle),
+        'tackles_won': count(is_tackle & succeeded),
+        'fouls_committed': count(event_type == 'Foul'),
+        'yellow_cards': count(event_type == 'Yellow Card'),
+        'red_cards': count(event_type == 'Red Card'),
+        'touches': count(np.ones(len(code), dtype=bool)),
+        'distance_km': (minutes / 90 * rng.normal(10.4, 0.8, n_rows)).clip(0).round(2),
+        'sprints': (minutes / 90 * rng.poisson(22, n_rows)).astype(np.int64),
+        'top_speed_kmh': rng.normal(31, 1.8, n_rows).clip(24, 37).round(1),
+        'rating': rating,
+        # La table est partitionnée sur created_at : date du match
+        'created_at': kickoff[row_match]
+    })
+
+
+def _physical_data(rng, stats: pd.DataFrame, training_sessions: int) -> pd.DataFrame:
+    """Données GPS : une séance de match et des séances d'entraînement par joueur et par match"""
+    match_day = pd.to_datetime(stats['created_at']).dt.normalize()
+    sessions = [pd.DataFrame({'player_id': stats['player_id'], 'date': match_day.dt.date,
+                              'session_type': 'Match', 'minutes': stats['minutes_played'].to_numpy()})]
+    for days_before in range(1, training_sessions + 1):
+        sessions.append(pd.DataFrame({
+            'player_id': stats['player_id'],
+            'date': (match_day - pd.Timedelta(days=days_before)).dt.date,
+            'session_type': 'Recovery' if days_before == training_sessions else 'Training',
+            'minutes': rng.integers(45, 100, len(stats))
+        }))
+    physical = pd.concat(sessions, ignore_index=True)
+    n_rows = len(physical)
+    intensity = np.where(physical['session_type'] == 'Match', 1.0,
+                         np.where(physical['session_type'] == 'Training', 0.55, 0.25))
+    minutes = physical.pop('minutes').to_numpy()
+    total = (minutes * 115 * intensity * rng.normal(1, 0.08, n_rows)).clip(0)
+    heart_rate = rng.normal(140, 10, n_rows) * (0.8 + 0.2 * intensity)
+    physical['total_distance_m'] = total.astype(np.int64)
+    physical['high_intensity_distance_m'] = (total * rng.uniform(0.06, 0.12, n_rows) * intensity).astype(np.int64)
+    physical['sprint_distance_m'] = (total * rng.uniform(0.01, 0.04, n_rows) * intensity).astype(np.int64)
+    physical['accelerations'] = rng.poisson(45 * intensity)
+    physical['decelerations'] = rng.poisson(42 * intensity)
+    physical['max_speed_kmh'] = (rng.normal(30, 2, n_rows) * (0.85 + 0.15 * intensity)).round(1)
+    physical['avg_speed_kmh'] = (total / np.maximum(minutes, 1) * 0.06).round(1)
+    physical['training_load'] = (minutes * rng.integers(3, 9, n_rows) * intensity).astype(np.int64)
+    physical['heart_rate_avg'] = heart_rate.astype(np.int64)
+    physical['heart_rate_max'] = (heart_rate + rng.normal(38, 6, n_rows)).astype(np.int64)
+    physical['calories_burned'] = (minutes * rng.normal(11, 1.5, n_rows) * intensity).astype(np.int64)
+    physical['fatigue_score'] = rng.integers(1, 11, n_rows)
+    physical['sleep_hours'] = rng.normal(7.6, 0.8, n_rows).clip(4, 11).round(1)
+    physical['sleep_quality'] = rng.integers(1, 6, n_rows)
+    physical['muscle_soreness'] = rng.integers(1, 6, n_rows)
+    return physical
+
+
+def write_shard(spec: Dict[str, Any], output_dir: str, file_format: str = 'parquet') -> List[Dict[str, Any]]:
+    """Génère un fragment et l'écrit (exécuté dans un processus du pool)"""
+    rows = []
+    for table, frame in generate_shard(spec).items():
+        directory = Path(output_dir) / table / f"season={spec['season']}" / f"league={spec['league']}"
+        entry = _write_table(frame, directory, table, file_format)
+        entry.update({'season': spec['season'], 'league': spec['league']})
+        rows.append(entry)
+    return rows
+
+
+def _write_table(frame: pd.DataFrame, directory: Path, table: str, file_format: str) -> Dict[str, Any]:
+    """Écrit une table dans {directory}/{table}.parquet|csv"""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{table}.{file_format}"
+    if file_format == 'parquet':
+        frame.to_parquet(path, index=False, compression='zstd')
+    else:
+        frame.to_csv(path, index=False)
+    return {'table': table, 'path': str(path), 'rows': len(frame)}
+
+
+def read_shard(path) -> pd.DataFrame:
+    """Relit un fichier généré (Parquet ou CSV)"""
+    path = Path(path)
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Jeu de données synthétique pour les tests de charge")
+    parser.add_argument('output_dir', help="répertoire des fragments")
+    parser.add_argument('--leagues', type=int, default=5)
+    parser.add_argument('--seasons', type=int, default=10)
+    parser.add_argument('--events', type=int, default=3_000, help="événements par match")
+    parser.add_argument('--format', choices=['parquet', 'csv'], default='parquet')
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--load', action='store_true', help="charge les fragments en base (COPY)")
+    args = parser.parse_args()
+
+    print("🚀 GÉNÉRATION DU JEU DE DONNÉES DE CHARGE")
+    print("=" * 50)
+    generator = SyntheticDatasetGenerator(n_leagues=args.leagues, n_seasons=args.seasons,
+                                          events_per_match=args.events, seed=args.seed)
+    start = time.perf_counter()
+    manifest = generator.generate(args.output_dir, args.format, args.processes)
+    elapsed = time.perf_counter() - start
+    totals = manifest.groupby('table', sort=False)['rows'].sum()
+    for table, rows in totals.items():
+        print(f"  • {table}: {rows:,} lignes")
+    print(f"✅ {len(manifest)} fichiers en {elapsed:.1f}s "
+          f"({totals.get('match_events', 0) / elapsed:,.0f} événements/s)")
+
+    if args.load:
+        from database import DatabaseManager
+
+        manager = DatabaseManager()
+        if not manager.connect():
+            raise SystemExit("❌ Impossible de se connecter à la base de données")
+        try:
+            print("\n📥 Chargement par COPY...")
+            print(generator.load(manager, args.output_dir).to_string(index=False))
+        finally:
+            manager.disconnect()
@@ -112,10 +112,11 @@ CREATE TABLE matches (
 ) PARTITION BY RANGE (match_date);
 
 -- Partitions par saison pour optimiser les performances
+-- (du 1er juillet au 1er juillet suivant exclu ; saisons suivantes : configs/partition_manager.py)
 CREATE TABLE matches_2024_2025 PARTITION OF matches
-    FOR VALUES FROM ('2024-07-01') TO ('2025-06-30');
+    FOR VALUES FROM ('2024-07-01') TO ('2025-07-01');
 CREATE TABLE matches_2025_2026 PARTITION OF matches
-    FOR VALUES FROM ('2025-07-01') TO ('2026-06-30');
+    FOR VALUES FROM ('2025-07-01') TO ('2026-07-01');
 
 -- Table des Performances Joueurs par Match (métriques détaillées)
 CREATE TABLE player_match_stats (
@@ -188,11 +189,11 @@ CREATE TABLE player_match_stats (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 ) PARTITION BY RANGE (created_at);
 
--- Partitions pour player_match_stats
+-- Partitions pour player_match_stats (mêmes bornes que matches)
 CREATE TABLE player_match_stats_2024_2025 PARTITION OF player_match_stats
-    FOR VALUES FROM ('2024-07-01') TO ('2025-06-30');
+    FOR VALUES FROM ('2024-07-01') TO ('2025-07-01');
 CREATE TABLE player_match_stats_2025_2026 PARTITION OF player_match_stats
-    FOR VALUES FROM ('2025-07-01') TO ('2026-06-30');
+    FOR VALUES FROM ('2025-07-01') TO ('2026-07-01');
 
 -- Table des Événements de Match (timeline détaillée)
 CREATE TABLE match_events (
@@ -268,6 +269,8 @@ CREATE TABLE transfers (
 );
 
 -- ===== INDEX OPTIMISÉS POUR ANALYTICS =====
+-- Index couvrants, partiels et BRIN mesurés sur les requêtes des analyseurs :
+-- python python_analytics/modules/index_advisor.py [--apply]
 
 -- Index sur les matchs pour requêtes fréquentes
 CREATE INDEX idx_matches_date ON matches (match_date);
@@ -293,66 +296,90 @@ CREATE INDEX idx_events_position ON match_events (x_coordinate, y_coordinate) WH
 CREATE INDEX idx_physical_player_date ON physical_data (player_id, date);
 CREATE INDEX idx_physical_load ON physical_data (training_load) WHERE session_type = 'Training';
 
--- ===== VUES MATÉRIALISÉES POUR KPI TEMPS RÉEL =====
+-- ===== CUMULS SAISONNIERS POUR KPI TEMPS RÉEL =====
+-- Tables de cumuls tenues à jour par deltas (configs/season_stats.py) :
+-- seuls les matchs terminés depuis la dernière mise à jour sont agrégés.
 
--- Vue des statistiques saisonnières par joueur
-CREATE MATERIALIZED VIEW player_season_stats AS
-SELECT 
-    p.player_id,
+-- Registre des matchs déjà comptés (numéro du lot d'application)
+CREATE TABLE season_stats_ledger (
+    match_id UUID PRIMARY KEY,
+    batch_id INTEGER NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_season_stats_ledger_batch ON season_stats_ledger (batch_id);
+
+-- Cumuls additifs par joueur, équipe et saison
+CREATE TABLE player_season_totals (
+    player_id UUID NOT NULL,
+    team_id UUID NOT NULL,
+    season VARCHAR(9) NOT NULL,
+    matches_played INTEGER NOT NULL DEFAULT 0,
+    total_minutes INTEGER NOT NULL DEFAULT 0,
+    total_goals INTEGER NOT NULL DEFAULT 0,
+    total_assists INTEGER NOT NULL DEFAULT 0,
+    total_xg DECIMAL(8,3) NOT NULL DEFAULT 0,
+    total_xa DECIMAL(8,3) NOT NULL DEFAULT 0,
+    rating_sum DECIMAL(8,1) NOT NULL DEFAULT 0, -- AVG(rating) = rating_sum / rating_count
+    rating_count INTEGER NOT NULL DEFAULT 0,
+    passes_completed INTEGER NOT NULL DEFAULT 0,
+    passes_total INTEGER NOT NULL DEFAULT 0,
+    tackles_won INTEGER NOT NULL DEFAULT 0,
+    tackles_total INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (player_id, team_id, season)
+);
+CREATE INDEX idx_player_season_totals_season ON player_season_totals (season);
+
+-- Cumuls par équipe et saison
+CREATE TABLE team_season_totals (
+    team_id UUID NOT NULL,
+    season VARCHAR(9) NOT NULL,
+    matches_played INTEGER NOT NULL DEFAULT 0,
+    goals_for INTEGER NOT NULL DEFAULT 0,
+    goals_against INTEGER NOT NULL DEFAULT 0,
+    points INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    draws INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (team_id, season)
+);
+
+-- Vue des statistiques saisonnières par joueur (moyennes et ratios dérivés des cumuls)
+CREATE VIEW player_season_stats AS
+SELECT
+    pst.player_id,
     p.first_name,
     p.last_name,
-    t.name as team_name,
-    l.season,
-    COUNT(pms.stat_id) as matches_played,
-    SUM(pms.minutes_played) as total_minutes,
-    SUM(pms.goals) as total_goals,
-    SUM(pms.assists) as total_assists,
-    SUM(pms.xg) as total_xg,
-    SUM(pms.xa) as total_xa,
-    ROUND(AVG(pms.rating), 2) as avg_rating,
-    SUM(pms.passes_completed)::FLOAT / NULLIF(SUM(pms.passes_total), 0) * 100 as pass_accuracy_pct,
-    SUM(pms.tackles_won)::FLOAT / NULLIF(SUM(pms.tackles_total), 0) * 100 as tackle_success_pct
-FROM players p
-JOIN player_match_stats pms ON p.player_id = pms.player_id
-JOIN matches m ON pms.match_id = m.match_id
-JOIN teams t ON pms.team_id = t.team_id
-JOIN leagues l ON m.league_id = l.league_id
-WHERE pms.minutes_played > 0
-GROUP BY p.player_id, p.first_name, p.last_name, t.name, l.season;
-
--- Index sur la vue matérialisée
-CREATE INDEX idx_player_season_stats_player ON player_season_stats (player_id);
-CREATE INDEX idx_player_season_stats_season ON player_season_stats (season);
+    pst.team_id,
+    t.name AS team_name,
+    pst.season,
+    pst.matches_played,
+    pst.total_minutes,
+    pst.total_goals,
+    pst.total_assists,
+    pst.total_xg,
+    pst.total_xa,
+    ROUND(pst.rating_sum / NULLIF(pst.rating_count, 0), 2) AS avg_rating,
+    CAST(pst.passes_completed AS FLOAT) / NULLIF(pst.passes_total, 0) * 100 AS pass_accuracy_pct,
+    CAST(pst.tackles_won AS FLOAT) / NULLIF(pst.tackles_total, 0) * 100 AS tackle_success_pct
+FROM player_season_totals pst
+JOIN players p ON p.player_id = pst.player_id
+JOIN teams t ON t.team_id = pst.team_id;
 
 -- Vue des performances par équipe
-CREATE MATERIALIZED VIEW team_performance_stats AS
-SELECT 
-    t.team_id,
-    t.name as team_name,
-    l.season,
-    COUNT(DISTINCT m.match_id) as matches_played,
-    SUM(CASE WHEN m.home_team_id = t.team_id THEN m.home_score ELSE m.away_score END) as goals_for,
-    SUM(CASE WHEN m.home_team_id = t.team_id THEN m.away_score ELSE m.home_score END) as goals_against,
-    SUM(CASE 
-        WHEN (m.home_team_id = t.team_id AND m.home_score > m.away_score) OR 
-             (m.away_team_id = t.team_id AND m.away_score > m.home_score) THEN 3
-        WHEN m.home_score = m.away_score THEN 1
-        ELSE 0 
-    END) as points,
-    COUNT(CASE 
-        WHEN (m.home_team_id = t.team_id AND m.home_score > m.away_score) OR 
-             (m.away_team_id = t.team_id AND m.away_score > m.home_score) THEN 1 
-    END) as wins,
-    COUNT(CASE WHEN m.home_score = m.away_score THEN 1 END) as draws,
-    COUNT(CASE 
-        WHEN (m.home_team_id = t.team_id AND m.home_score < m.away_score) OR 
-             (m.away_team_id = t.team_id AND m.away_score < m.home_score) THEN 1 
-    END) as losses
-FROM teams t
-JOIN matches m ON t.team_id = m.home_team_id OR t.team_id = m.away_team_id
-JOIN leagues l ON m.league_id = l.league_id
-WHERE m.status = 'Finished'
-GROUP BY t.team_id, t.name, l.season;
+CREATE VIEW team_performance_stats AS
+SELECT
+    tst.team_id,
+    t.name AS team_name,
+    tst.season,
+    tst.matches_played,
+    tst.goals_for,
+    tst.goals_against,
+    tst.points,
+    tst.wins,
+    tst.draws,
+    tst.losses
+FROM team_season_totals tst
+JOIN teams t ON t.team_id = tst.team_id;
 
 -- ===== TRIGGERS POUR MISE À JOUR AUTOMATIQUE =====
 
@@ -377,14 +404,8 @@ CREATE TRIGGER update_matches_updated_at
     FOR EACH ROW 
     EXECUTE FUNCTION update_updated_at_column();
 
--- Fonction de rafraîchissement des vues matérialisées
-CREATE OR REPLACE FUNCTION refresh_materialized_views()
-RETURNS void AS $$
-BEGIN
-    REFRESH MATERIALIZED VIEW CONCURRENTLY player_season_stats;
-    REFRESH MATERIALIZED VIEW CONCURRENTLY team_performance_stats;
-END;
-$$ LANGUAGE plpgsql;
+-- Mise à jour des cumuls saisonniers : python configs/season_stats.py
+-- (applique les matchs terminés non encore comptés)
 
 -- ===== DONNÉES D'EXEMPLE POUR LES POSITIONS =====
 INSERT INTO positions (code, name, line, zone) VALUES
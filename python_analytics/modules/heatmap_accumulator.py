@@ -0,0 +1,150 @@
+"""
+Accumulateur de Heatmaps
+========================
+
+Construit des heatmaps de positions de façon incrémentale : les positions
+(tracking 10-25 Hz, événements) sont consommées par blocs, seuls les comptages
+par case et les moments (moyenne, variance) des coordonnées sont conservés.
+Les accumulateurs de plusieurs matchs se fusionnent et se sauvegardent, ce qui
+donne des heatmaps de saison sans relire les positions brutes.
+
+Author: Football Analytics Platform
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Iterable, Tuple
+
+
+class HeatmapAccumulator:
+    """Heatmap 2D et statistiques de position mises à jour par blocs"""
+
+    def __init__(self,
+                 n_bins_x: int = 20,
+                 n_bins_y: int = 20,
+                 x_range: Tuple[float, float] = (0, 100),
+                 y_range: Tuple[float, float] = (0, 100)):
+        """
+        Args:
+            n_bins_x: Nombre de cases en X
+            n_bins_y: Nombre de cases en Y
+            x_range: Bornes du terrain en X
+            y_range: Bornes du terrain en Y
+        """
+        self.x_edges = np.linspace(x_range[0], x_range[1], n_bins_x + 1)
+        self.y_edges = np.linspace(y_range[0], y_range[1], n_bins_y + 1)
+        self.counts = np.zeros((n_bins_x, n_bins_y), dtype=np.int64)
+
+        # Moments des coordonnées (algorithme de Welford par blocs)
+        self.n_positions = 0
+        self.mean = np.zeros(2)
+        self.m2 = np.zeros(2)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame],
+                    x_col: str = 'x_coordonnee', y_col: str = 'y_coordonnee',
+                    **kwargs) -> 'HeatmapAccumulator':
+        """Construit un accumulateur à partir d'un itérable de DataFrames de positions"""
+        accumulator = cls(**kwargs)
+        for chunk in chunks:
+            accumulator.update(chunk[x_col].to_numpy(), chunk[y_col].to_numpy())
+        return accumulator
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Dimensions de la grille (cases X, cases Y)"""
+        return self.counts.shape
+
+    def bin_indices(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calcule les indices de case comme np.histogram2d
+
+        Returns:
+            (indices X, indices Y, masque des positions dans le terrain)
+        """
+        n_x, n_y = self.shape
+        ix = np.searchsorted(self.x_edges, x, side='right') - 1
+        iy = np.searchsorted(self.y_edges, y, side='right') - 1
+        # La borne supérieure appartient à la dernière case
+        ix[x == self.x_edges[-1]] = n_x - 1
+        iy[y == self.y_edges[-1]] = n_y - 1
+        inside = (ix >= 0) & (ix < n_x) & (iy >= 0) & (iy < n_y)
+        return ix, iy, inside
+
+    def update(self, x: np.ndarray, y: np.ndarray) -> 'HeatmapAccumulator':
+        """
+        Ajoute un bloc de positions
+
+        Args:
+            x: Coordonnées X du bloc
+            y: Coordonnées Y du bloc (les positions avec une coordonnée manquante sont ignorées)
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        if len(x) == 0:
+            return self
+
+        ix, iy, inside = self.bin_indices(x, y)
+        linear = ix[inside] * self.shape[1] + iy[inside]
+        self.counts += np.bincount(linear, minlength=self.counts.size).reshape(self.shape)
+
+        positions = np.column_stack([x, y])
+        chunk_mean = positions.mean(axis=0)
+        chunk_m2 = ((positions - chunk_mean) ** 2).sum(axis=0)
+        self._combine_moments(len(x), chunk_mean, chunk_m2)
+        return self
+
+    def merge(self, other: 'HeatmapAccumulator') -> 'HeatmapAccumulator':
+        """Fusionne un autre accumulateur de même grille (ex. un autre match)"""
+        if not (np.array_equal(self.x_edges, other.x_edges) and np.array_equal(self.y_edges, other.y_edges)):
+            raise ValueError("Impossible de fusionner des heatmaps de grilles différentes")
+
+        self.counts += other.counts
+        if other.n_positions > 0:
+            self._combine_moments(other.n_positions, other.mean, other.m2)
+        return self
+
+    def _combine_moments(self, n_other: int, mean_other: np.ndarray, m2_other: np.ndarray):
+        """Combine les moments courants avec ceux d'un autre ensemble (formule de Chan)"""
+        n_total = self.n_positions + n_other
+        delta = mean_other - self.mean
+        self.mean = self.mean + delta * (n_other / n_total)
+        self.m2 = self.m2 + m2_other + delta ** 2 * (self.n_positions * n_other / n_total)
+        self.n_positions = n_total
+
+    @property
+    def std(self) -> np.ndarray:
+        """Écarts-types (X, Y) des positions, avec correction de Bessel comme pandas"""
+        if self.n_positions < 2:
+            return np.full(2, np.nan)
+        return np.sqrt(self.m2 / (self.n_positions - 1))
+
+    @property
+    def mobility_score(self) -> float:
+        """Score de mobilité : norme des écarts-types des positions"""
+        std_x, std_y = self.std
+        return float(np.sqrt(std_x ** 2 + std_y ** 2))
+
+    def histogram(self) -> np.ndarray:
+        """Heatmap au format np.histogram2d (comptages en float)"""
+        return self.counts.astype(np.float64)
+
+    def save(self, path: str):
+        """Sauvegarde l'accumulateur au format .npz"""
+        np.savez(path, counts=self.counts, x_edges=self.x_edges, y_edges=self.y_edges,
+                 n_positions=self.n_positions, mean=self.mean, m2=self.m2)
+
+    @classmethod
+    def load(cls, path: str) -> 'HeatmapAccumulator':
+        """Recharge un accumulateur sauvegardé"""
+        with np.load(path) as data:
+            accumulator = cls.__new__(cls)
+            accumulator.counts = data['counts']
+            accumulator.x_edges = data['x_edges']
+            accumulator.y_edges = data['y_edges']
+            accumulator.n_positions = int(data['n_positions'])
+            accumulator.mean = data['mean']
+            accumulator.m2 = data['m2']
+        return accumulator
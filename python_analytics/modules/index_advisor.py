@@ -0,0 +1,457 @@
+"""
+Conseiller d'Index pour les Requêtes des Analyseurs
+===================================================
+
+Exécute EXPLAIN ANALYZE sur chaque requête de PlayerPerformanceAnalyzer,
+TacticalAnalyzer et MatchEventCache avec des paramètres tirés de la base
+(joueurs, matchs et équipes réels), propose les index conçus pour ces
+requêtes puis mesure l'effet de leur création :
+
+- index couvrants (INCLUDE) pour que les heatmaps et compositions soient
+  servies par des parcours d'index seuls ;
+- index partiels sur les filtres constants des requêtes (coordonnées non
+  nulles, minutes_played > 0, contrats en cours) ;
+- index BRIN sur les colonnes temporelles, remplies dans l'ordre chronologique
+  (quelques pages d'index pour toute une saison).
+
+Usage:
+    advisor = IndexAdvisor(DatabaseManager())
+    report = advisor.report(apply=True)   # latences avant / après
+
+Author: Football Analytics Platform
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .performance_analyzer import PlayerPerformanceAnalyzer, TacticalAnalyzer
+    from .match_event_cache import MatchEventCache
+except ImportError:
+    from performance_analyzer import PlayerPerformanceAnalyzer, TacticalAnalyzer
+    from match_event_cache import MatchEventCache
+
+
+@dataclass
+class IndexProposal:
+    """Index proposé pour une ou plusieurs requêtes d'analyseur"""
+    name: str
+    table: str
+    definition: str
+    kind: str
+    reason: str
+    queries: List[str] = field(default_factory=list)
+
+    @property
+    def ddl(self) -> str:
+        """Instruction de création (idempotente)"""
+        return f"CREATE INDEX IF NOT EXISTS {self.name} ON {self.table} {self.definition}"
+
+    @property
+    def key_columns(self) -> List[str]:
+        """Colonnes clés d'un index B-tree (hors INCLUDE) ; vide pour BRIN, GIN..."""
+        if self.definition.lstrip().upper().startswith('USING') and 'btree' not in self.definition.lower():
+            return []
+        found = re.search(r'\(([^)]*)\)', self.definition)
+        return [column.strip() for column in found.group(1).split(',')] if found else []
+
+    def serves_sort(self, sort: str) -> bool:
+        """
+        Vrai si un parcours de l'index rend déjà l'ordre d'un tri du plan
+
+        Args:
+            sort: Tri résumé par summarize_plan, ex. 'match_events(=match_id, minute, second_in_minute)'
+                  (colonnes préfixées de '=' : fixées par une égalité)
+        """
+        found = re.fullmatch(r'(\w+)\((.*)\)', sort.strip())
+        if not found:
+            return False
+        table, items = found.group(1), [item.strip() for item in found.group(2).split(',') if item.strip()]
+        if table != self.table and not table.startswith(f'{self.table}_'):
+            return False
+        fixed = {item[1:] for item in items if item.startswith('=')}
+        keys = [item for item in items if not item.startswith('=')]
+        # Un index ascendant sert un tri entièrement ASC ou entièrement DESC (parcours inverse)
+        if not keys or len({key.upper().endswith(' DESC') for key in keys}) > 1:
+            return False
+        columns = [re.sub(r'\s+(ASC|DESC)$', '', key, flags=re.IGNORECASE) for key in keys]
+        index_columns = self.key_columns
+        start = 0
+        while start < len(index_columns) and index_columns[start] in fixed:
+            start += 1
+        return index_columns[start:start + len(columns)] == columns
+
+
+class IndexAdvisor:
+    """EXPLAIN ANALYZE des requêtes d'analyseur, propositions d'index et rapport avant/après"""
+
+    PROPOSALS = [
+        IndexProposal(
+            'idx_events_player_match_xy', 'match_events',
+            '(player_id, match_id) INCLUDE (x_coordinate, y_coordinate, event_type) '
+            'WHERE x_coordinate IS NOT NULL AND y_coordinate IS NOT NULL',
+            'covering',
+            "Heatmaps : filtre joueur (+ match), coordonnées lues dans l'index",
+            ['match_heatmap', 'recent_heatmap']
+        ),
+        IndexProposal(
+            'idx_events_match_clock', 'match_events',
+            '(match_id, minute, second_in_minute)',
+            'btree',
+            "Événements d'un match déjà triés sur l'horloge (pas de tri)",
+            ['match_events']
+        ),
+        IndexProposal(
+            'idx_player_stats_player_played', 'player_match_stats',
+            '(player_id) INCLUDE (match_id, team_id) WHERE minutes_played > 0',
+            'partial',
+            "Forme d'un joueur : seuls les matchs joués sont indexés",
+            ['player_form']
+        ),
+        IndexProposal(
+            'idx_player_stats_lineup', 'player_match_stats',
+            '(match_id, team_id) INCLUDE (player_id, position_played_id, minutes_played) '
+            'WHERE minutes_played > 0',
+            'covering',
+            "Composition d'une équipe sur un match sans lecture de la table",
+            ['team_lineup']
+        ),
+        IndexProposal(
+            'idx_contracts_current', 'player_team_contracts',
+            '(player_id) INCLUDE (primary_position_id) WHERE end_date IS NULL',
+            'partial',
+            "Poste actuel des joueurs comparés (contrats en cours seulement)",
+            ['compare_players']
+        ),
+        IndexProposal(
+            'idx_matches_date_brin', 'matches',
+            'USING brin (match_date) WITH (pages_per_range = 32)',
+            'brin',
+            "Matchs insérés par date : filtre match_date >= ... sur quelques pages",
+            ['recent_heatmap']
+        ),
+        IndexProposal(
+            'idx_events_created_brin', 'match_events',
+            'USING brin (created_at)',
+            'brin',
+            "Événements ajoutés chronologiquement : purges et exports par période",
+            []
+        ),
+        IndexProposal(
+            'idx_player_stats_created_brin', 'player_match_stats',
+            'USING brin (created_at)',
+            'brin',
+            "Statistiques ajoutées chronologiquement : lectures par période",
+            []
+        )
+    ]
+
+    # Un joueur ayant joué, son match, son équipe et la date du match
+    SAMPLE_QUERY = """
+        SELECT pms.player_id, pms.match_id, pms.team_id, m.match_date
+        FROM player_match_stats pms
+        JOIN matches m ON m.match_id = pms.match_id
+        WHERE pms.minutes_played > 0
+        ORDER BY random()
+        LIMIT %s
+        """
+
+    EXISTING_INDEXES_QUERY = "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()"
+
+    def __init__(self, manager, sample_size: int = 20, proposals: Optional[List[IndexProposal]] = None):
+        """
+        Args:
+            manager: DatabaseManager connecté à une base PostgreSQL remplie
+            sample_size: Nombre de jeux de paramètres tirés pour chaque requête
+            proposals: Index proposés (PROPOSALS par défaut)
+        """
+        self.manager = manager
+        self.sample_size = sample_size
+        self.proposals = list(self.PROPOSALS if proposals is None else proposals)
+
+    @staticmethod
+    def analyzer_queries() -> Dict[str, Tuple[str, Callable[[Any], tuple]]]:
+        """
+        Requêtes des analyseurs et construction de leurs paramètres
+
+        Returns:
+            {nom: (requête, fonction échantillon -> paramètres)}, l'échantillon
+            ayant les attributs player_id, match_id, team_id et match_date
+        """
+        return {
+            'player_form': (PlayerPerformanceAnalyzer.PLAYER_FORM_QUERY,
+                            lambda sample: (sample.player_id, 10)),
+            'compare_players': (PlayerPerformanceAnalyzer.COMPARE_PLAYERS_QUERY,
+                                lambda sample: ([sample.player_id],)),
+            'match_heatmap': (PlayerPerformanceAnalyzer.MATCH_HEATMAP_QUERY,
+                              lambda sample: (sample.player_id, sample.match_id)),
+            'recent_heatmap': (PlayerPerformanceAnalyzer.RECENT_HEATMAP_QUERY,
+                               lambda sample: (sample.player_id,
+                                                sample.match_date.to_pydatetime() - timedelta(days=90))),
+            'team_lineup': (TacticalAnalyzer.LINEUP_QUERY,
+                            lambda sample: (sample.team_id, sample.match_id)),
+            'player_names': (TacticalAnalyzer.PLAYER_NAMES_QUERY,
+                             lambda sample: ([sample.player_id],)),
+            'match_events': (MatchEventCache.FETCH_QUERY,
+                             lambda sample: (sample.match_id,))
+        }
+
+    def sample_parameters(self) -> pd.DataFrame:
+        """Tire des couples (joueur, match, équipe, date) réels"""
+        samples = self.manager.read_sql(self.SAMPLE_QUERY, (self.sample_size,))
+        if samples.empty:
+            raise ValueError("Aucune statistique joueur en base : générer une saison synthétique d'abord")
+        for col in ('player_id', 'match_id', 'team_id'):
+            samples[col] = samples[col].astype(str)
+        samples['match_date'] = pd.to_datetime(samples['match_date'])
+        return samples
+
+    def explain(self, query: str, params: Sequence) -> Dict[str, Any]:
+        """
+        EXPLAIN (ANALYZE, BUFFERS) d'une requête
+
+        Returns:
+            Résumé du plan (voir summarize_plan)
+        """
+        with self.manager.transaction() as cursor:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", tuple(params))
+            plan = cursor.fetchone()[0]
+        return self.summarize_plan(plan)
+
+    @staticmethod
+    def summarize_plan(plan) -> Dict[str, Any]:
+        """
+        Résume un plan EXPLAIN (FORMAT JSON)
+
+        Returns:
+            Dictionnaire {execution_ms, planning_ms, shared_blocks, seq_scans,
+            indexes, sorts, sort_keys}, sort_keys décrivant chaque tri par
+            'table(=colonne fixée, clé de tri, ...)' (voir IndexProposal.serves_sort)
+        """
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        entry = plan[0]
+        seq_scans, indexes, sort_keys = set(), set(), set()
+        sorts = 0
+
+        def visit(node: Dict):
+            nonlocal sorts
+            if node.get('Node Type') == 'Seq Scan':
+                seq_scans.add(node.get('Relation Name'))
+            if 'Index Name' in node:
+                indexes.add(node['Index Name'])
+            if node.get('Node Type') in ('Sort', 'Incremental Sort'):
+                sorts += 1
+                sort_keys.update(IndexAdvisor._describe_sort(node))
+            for child in node.get('Plans', []):
+                visit(child)
+
+        visit(entry['Plan'])
+        root = entry['Plan']
+        return {
+            'execution_ms': entry.get('Execution Time', np.nan),
+            'planning_ms': entry.get('Planning Time', np.nan),
+            'shared_blocks': root.get('Shared Hit Blocks', 0) + root.get('Shared Read Blocks', 0),
+            'seq_scans': sorted(seq_scans),
+            'indexes': sorted(indexes),
+            'sorts': sorts,
+            'sort_keys': sorted(sort_keys)
+        }
+
+    @staticmethod
+    def _describe_sort(node: Dict) -> List[str]:
+        """Tri d'un nœud Sort par table : 'table(=colonne fixée, clé, ...)'"""
+        relations, fixed = {}, {}
+
+        def scans(child: Dict):
+            if 'Relation Name' in child:
+                alias = child.get('Alias', child['Relation Name'])
+                relations[alias] = child['Relation Name']
+                conditions = ' '.join(child.get(key, '') for key in ('Index Cond', 'Filter', 'Recheck Cond'))
+                # Colonne = constante ou paramètre (pas une condition de jointure)
+                fixed.setdefault(child['Relation Name'], set()).update(
+                    re.findall(r"(?:\w+\.)?(\w+) = (?:'|\$|\d)", conditions))
+            for grandchild in child.get('Plans', []):
+                scans(grandchild)
+
+        for child in node.get('Plans', []):
+            scans(child)
+
+        keys: Dict[str, List[str]] = {}
+        for key in node.get('Sort Key', []):
+            qualifier, _, column = key.rpartition('.')
+            if qualifier:
+                # Partitions d'une table mère : alias 'm_1', 'm_2'... pour le qualificatif 'm'
+                candidates = [relation for alias, relation in relations.items()
+                              if alias == qualifier or re.fullmatch(rf'{re.escape(qualifier)}_\d+', alias)]
+            else:
+                candidates = list(relations.values())
+            if len(set(candidates)) != 1:
+                continue
+            keys.setdefault(candidates[0], []).append(column)
+        return [f"{relation}({', '.join([f'={column}' for column in sorted(fixed.get(relation, ()))] + columns)})"
+                for relation, columns in keys.items()]
+
+    def measure(self, samples: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Mesure chaque requête sur tous les jeux de paramètres
+
+        Returns:
+            DataFrame par requête [query, runs, p50_ms, p95_ms, mean_blocks,
+            seq_scans, indexes, sorts, sort_keys]
+        """
+        samples = self.sample_parameters() if samples is None else samples
+        rows = []
+        for name, (query, build_params) in self.analyzer_queries().items():
+            plans = [self.explain(query, build_params(sample)) for sample in samples.itertuples()]
+            timings = np.array([plan['execution_ms'] for plan in plans])
+            rows.append({
+                'query': name,
+                'runs': len(plans),
+                'p50_ms': float(np.percentile(timings, 50)),
+                'p95_ms': float(np.percentile(timings, 95)),
+                'mean_blocks': float(np.mean([plan['shared_blocks'] for plan in plans])),
+                'seq_scans': ', '.join(sorted({table for plan in plans for table in plan['seq_scans']})),
+                'indexes': ', '.join(sorted({index for plan in plans for index in plan['indexes']})),
+                'sorts': int(sum(plan['sorts'] for plan in plans)),
+                'sort_keys': '; '.join(sorted({key for plan in plans for key in plan['sort_keys']}))
+            })
+        return pd.DataFrame(rows)
+
+    def propose(self, baseline: Optional[pd.DataFrame] = None) -> List[IndexProposal]:
+        """
+        Index proposés absents de la base
+
+        Args:
+            baseline: Mesures de measure() (plans actuels) ; sans mesures, tous
+                      les index absents sont proposés
+        """
+        existing = set(self.manager.read_sql(self.EXISTING_INDEXES_QUERY)['indexname'])
+        return self.select_proposals(self.proposals, existing, baseline)
+
+    @staticmethod
+    def select_proposals(proposals: Sequence[IndexProposal], existing: set,
+                         baseline: Optional[pd.DataFrame] = None) -> List[IndexProposal]:
+        """
+        Filtre les propositions selon les index existants et les plans mesurés
+
+        Un index ciblant des requêtes n'est retenu que si l'une d'elles parcourt
+        séquentiellement sa table (ou l'une de ses partitions), ou trie des
+        lignes de cette table dans l'ordre de ses colonnes clés ; les index
+        BRIN sans requête ciblée sont toujours retenus.
+        """
+        missing = [proposal for proposal in proposals if proposal.name not in existing]
+        if baseline is None:
+            return missing
+
+        plans = baseline.set_index('query')
+
+        def needs_index(proposal: IndexProposal, query: str) -> bool:
+            if query not in plans.index:
+                return False
+            scanned = [table for table in plans.loc[query, 'seq_scans'].split(', ') if table]
+            on_table = any(table == proposal.table or table.startswith(f'{proposal.table}_')
+                           for table in scanned)
+            sort_keys = plans.loc[query, 'sort_keys'] if 'sort_keys' in plans.columns else ''
+            return on_table or any(proposal.serves_sort(sort) for sort in (sort_keys or '').split(';')
+                                   if sort.strip())
+
+        return [proposal for proposal in missing
+                if not proposal.queries or any(needs_index(proposal, query) for query in proposal.queries)]
+
+    def apply(self, proposals: Sequence[IndexProposal]):
+        """Crée les index proposés puis met à jour les statistiques des tables"""
+        with self.manager.transaction() as cursor:
+            for proposal in proposals:
+                cursor.execute(proposal.ddl)
+            for table in sorted({proposal.table for proposal in proposals}):
+                cursor.execute(f"ANALYZE {table}")
+
+    def drop(self, proposals: Sequence[IndexProposal]):
+        """Supprime des index proposés (retour à l'état initial)"""
+        with self.manager.transaction() as cursor:
+            for proposal in proposals:
+                cursor.execute(f"DROP INDEX IF EXISTS {proposal.name}")
+
+    def report(self, apply: bool = False) -> Dict[str, Any]:
+        """
+        Mesure, propose et (optionnellement) applique puis remesure
+
+        Les mêmes paramètres sont rejoués avant et après création des index.
+
+        Args:
+            apply: Créer les index proposés et mesurer l'effet
+
+        Returns:
+            Dictionnaire {proposals, before, after, comparison}
+        """
+        samples = self.sample_parameters()
+        before = self.measure(samples)
+        proposals = self.propose(before)
+        after = None
+        if apply and proposals:
+            self.apply(proposals)
+            after = self.measure(samples)
+        return {
+            'proposals': proposals,
+            'before': before,
+            'after': after,
+            'comparison': self.compare(before, after) if after is not None else None
+        }
+
+    @staticmethod
+    def compare(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+        """
+        Latences avant/après par requête
+
+        Returns:
+            DataFrame [query, p50_before_ms, p50_after_ms, p95_before_ms,
+            p95_after_ms, speedup, indexes_after]
+        """
+        merged = before.merge(after, on='query', suffixes=('_before', '_after'))
+        comparison = pd.DataFrame({
+            'query': merged['query'],
+            'p50_before_ms': merged['p50_ms_before'],
+            'p50_after_ms': merged['p50_ms_after'],
+            'p95_before_ms': merged['p95_ms_before'],
+            'p95_after_ms': merged['p95_ms_after'],
+            'speedup': merged['p50_ms_before'] / merged['p50_ms_after'].where(merged['p50_ms_after'] > 0),
+            'indexes_after': merged['indexes_after']
+        })
+        return comparison.sort_values('speedup', ascending=False).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from configs.database import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE des requêtes d'analyseur et index proposés")
+    parser.add_argument('--apply', action='store_true', help="crée les index proposés et remesure")
+    parser.add_argument('--samples', type=int, default=20, help="jeux de paramètres par requête")
+    args = parser.parse_args()
+
+    manager = DatabaseManager()
+    if not manager.connect():
+        raise SystemExit("❌ Échec de la connexion")
+
+    result = IndexAdvisor(manager, sample_size=args.samples).report(apply=args.apply)
+    print("📊 Avant :")
+    print(result['before'].to_string(index=False))
+    print("\n💡 Index proposés :")
+    for proposal in result['proposals']:
+        print(f"  [{proposal.kind}] {proposal.ddl}\n      {proposal.reason}")
+    if result['comparison'] is not None:
+        print("\n🚀 Avant / après :")
+        print(result['comparison'].to_string(index=False))
+
+    manager.disconnect()
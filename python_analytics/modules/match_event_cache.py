@@ -0,0 +1,160 @@
+"""
+Cache des Événements de Match
+=============================
+
+Garde en mémoire les événements des derniers matchs consultés pour que
+formation, réseau de passes et PPDA d'un même match soient servis par une
+seule requête sur match_events. Seules les colonnes utiles sont lues, avec des
+types compacts (catégories pour les identifiants, entiers courts pour l'horloge).
+
+Le cache est borné en mémoire : au-delà de max_bytes, les matchs les moins
+récemment consultés sont évincés (LRU). Un match absent n'est lu qu'une fois
+même si plusieurs threads le demandent en même temps ; une lecture en échec
+ou vide n'est pas mise en cache.
+
+Author: Football Analytics Platform
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import pandas as pd
+
+
+class MatchEventCache:
+    """Cache LRU des événements par match, borné en mémoire"""
+
+    # Colonnes lues et types appliqués après chargement
+    DTYPES = {
+        'minute': 'int16',
+        'second_in_minute': 'int8',
+        'event_type': 'category',
+        'player_id': 'category',
+        'team_id': 'category',
+        'x_coordinate': 'float64',
+        'y_coordinate': 'float64',
+        'success': 'boolean'
+    }
+
+    FETCH_QUERY = f"""
+        SELECT {', '.join(DTYPES)}
+        FROM match_events
+        WHERE match_id = %s
+        ORDER BY minute, second_in_minute
+        """
+
+    def __init__(self, db_connection, max_bytes: int = 256 * 1024 ** 2):
+        """
+        Args:
+            db_connection: Connexion ou engine utilisé par pd.read_sql, ou gestionnaire
+                           exposant read_sql (DatabaseManager, ParquetStore)
+            max_bytes: Mémoire maximale occupée par les événements en cache
+        """
+        self.db = db_connection
+        self.max_bytes = max_bytes
+        self._frames: 'OrderedDict[str, pd.DataFrame]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Lectures en cours par match : les autres demandeurs attendent leur résultat
+        self._inflight: Dict[str, threading.Event] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def memory_bytes(self) -> int:
+        """Mémoire occupée par les événements en cache"""
+        return sum(self._sizes.values())
+
+    def get(self, match_id: str) -> pd.DataFrame:
+        """
+        Événements d'un match, triés par (minute, second_in_minute)
+
+        Le DataFrame retourné est partagé entre les appelants : ne pas le modifier.
+        
+        Raises:
+            RuntimeError: Lecture en échec (résultat sans les colonnes attendues,
+                          comme le DataFrame vide de DatabaseManager.read_sql)
+        """
+        key = str(match_id)
+        while True:
+            with self._lock:
+                if key in self._frames:
+                    self.hits += 1
+                    self._frames.move_to_end(key)
+                    return self._frames[key]
+                pending = self._inflight.get(key)
+                if pending is None:
+                    pending = self._inflight[key] = threading.Event()
+                    break
+            # Un autre thread lit ce match : attendre puis relire le cache
+            # (lecture en échec ou vide : ce thread tente à son tour)
+            pending.wait()
+
+        try:
+            fetched = self._fetch(match_id)
+            missing = [col for col in self.DTYPES if col not in fetched.columns]
+            if missing:
+                raise RuntimeError(f"Lecture des événements du match {key} en échec "
+                                   f"(colonnes absentes: {', '.join(missing)})")
+            events = self._typed(fetched)
+            with self._lock:
+                self.misses += 1
+                # Un match sans événements (pas encore saisi) sera relu au prochain appel
+                if len(events):
+                    self._frames[key] = events
+                    self._sizes[key] = int(events.memory_usage(deep=True).sum())
+                    self._evict()
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            pending.set()
+        return events
+
+    def invalidate(self, match_id: Optional[str] = None):
+        """Retire un match du cache (ou tout le cache), par ex. après une correction des données"""
+        with self._lock:
+            if match_id is None:
+                self._frames.clear()
+                self._sizes.clear()
+            else:
+                self._frames.pop(str(match_id), None)
+                self._sizes.pop(str(match_id), None)
+
+    def stats(self) -> Dict:
+        """Statistiques d'utilisation du cache"""
+        with self._lock:
+            return {
+                'matches': len(self._frames),
+                'memory_bytes': self.memory_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def _fetch(self, match_id: str) -> pd.DataFrame:
+        """Lit les colonnes utiles des événements d'un match"""
+        if hasattr(self.db, 'read_sql'):
+            return self.db.read_sql(self.FETCH_QUERY, (match_id,))
+        return pd.read_sql(self.FETCH_QUERY, self.db, params=(match_id,))
+
+    def _typed(self, events: pd.DataFrame) -> pd.DataFrame:
+        """Applique les types compacts aux colonnes présentes"""
+        events = events.copy()
+        if 'second_in_minute' in events.columns:
+            events['second_in_minute'] = events['second_in_minute'].fillna(0)
+        # Les UUID psycopg2 sont convertis en texte pour des catégories homogènes
+        for col in ('player_id', 'team_id'):
+            if col in events.columns:
+                events[col] = events[col].astype(str).where(events[col].notna())
+        dtypes = {col: dtype for col, dtype in self.DTYPES.items() if col in events.columns}
+        return events.astype(dtypes).reset_index(drop=True)
+
+    def _evict(self):
+        """Évince les matchs les moins récents au-delà du plafond mémoire (garde le dernier chargé)"""
+        while len(self._frames) > 1 and self.memory_bytes > self.max_bytes:
+            oldest, _ = self._frames.popitem(last=False)
+            del self._sizes[oldest]
+            self.evictions += 1
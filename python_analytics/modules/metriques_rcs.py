@@ -11,10 +11,15 @@ Auteur: Football Analytics Platform
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import math
 from datetime import datetime, timedelta
 
+try:
+    from .heatmap_accumulator import HeatmapAccumulator
+except ImportError:
+    from heatmap_accumulator import HeatmapAccumulator
+
 class MetriquesFootballRCS:
     """
     Classe de calcul des métriques football avancées pour le RCS
@@ -56,6 +61,29 @@ class MetriquesFootballRCS:
             'tete': 0.95,
             'penalty': 0.76  # Taux de réussite penalty Ligue 1
         }
+        
+        # Bonus xA selon le type de passe
+        self.bonus_types_passe = {
+            'passe_cle': 1.8,      # Passe décisive directe
+            'centre': 1.3,         # Centre dans la surface
+            'passe_profondeur': 1.5, # Passe en profondeur
+            'normale': 1.0,
+            'relance': 0.7
+        }
+        
+        # Bonus individuels des finisseurs et créateurs reconnus du RCS
+        self.bonus_finisseurs = {
+            'Emanuel Emegha': 1.15,
+            'Dilane Bakwa': 1.10,
+            'Félix Lemaréchal': 1.05,
+            'Sékou Mara': 1.08
+        }
+        self.bonus_createurs = {
+            'Dilane Bakwa': 1.20,
+            'Andrey Santos': 1.15,
+            'Félix Lemaréchal': 1.12,
+            'Habib Diarra': 1.08
+        }
     
     def calculer_xg_tir(self, 
                         x_coordonnee: float, 
@@ -102,12 +130,7 @@ class MetriquesFootballRCS:
         facteur_situation = self.coefficients_xg.get(f'situation_{situation}', 1.0)
         
         # Bonus/malus selon la partie du corps
-        if partie_corps in ["pied_gauche", "pied_droit"]:
-            facteur_corps = self.coefficients_xg['pied_dominant']
-        elif partie_corps == "tete":
-            facteur_corps = self.coefficients_xg['tete']
-        else:
-            facteur_corps = 0.8  # Autre partie du corps
+        facteur_corps = self._obtenir_facteur_corps(partie_corps)
         
         # Bonus joueur spécifique (finisseurs reconnus)
         bonus_joueur = self._obtenir_bonus_finisseur(joueur_tireur)
@@ -118,6 +141,74 @@ class MetriquesFootballRCS:
         # Contraindre entre 0.005 et 0.95
         return max(0.005, min(0.95, xg_final))
     
+    def calculer_xg_lot(self,
+                        tirs: Union[pd.DataFrame, np.ndarray],
+                        situation: str = "jeu_ouvert",
+                        partie_corps: str = "pied_droit",
+                        joueur_tireur: str = None,
+                        grille=None) -> np.ndarray:
+        """
+        Calcule l'xG d'un lot de tirs en une seule passe vectorisée
+        
+        Même modèle que calculer_xg_tir, appliqué à des tableaux NumPy : les
+        résultats sont identiques tir par tir à ceux de la version scalaire
+        (à l'arrondi machine près des fonctions trigonométriques).
+        
+        Args:
+            tirs: DataFrame avec colonnes x_coordonnee, y_coordonnee et
+                  optionnellement situation, partie_corps, joueur_tireur ;
+                  ou ndarray de forme (n, 2) contenant les coordonnées X, Y
+            situation: Situation par défaut (ou tableau de longueur n)
+            partie_corps: Partie du corps par défaut (ou tableau de longueur n)
+            joueur_tireur: Tireur par défaut (ou tableau de longueur n)
+            grille: XGGrid optionnelle ; la distance et l'angle sont alors lus
+                    par interpolation au lieu d'être recalculés
+            
+        Returns:
+            Tableau des valeurs xG (une par tir)
+        """
+        
+        (x, y), colonnes = self._extraire_colonnes_lot(
+            tirs, ['x_coordonnee', 'y_coordonnee'],
+            ['situation', 'partie_corps', 'joueur_tireur']
+        )
+        n_tirs = len(x)
+        
+        situations = colonnes.get('situation', situation)
+        parties_corps = colonnes.get('partie_corps', partie_corps)
+        tireurs = colonnes.get('joueur_tireur', joueur_tireur)
+        
+        # Géométrie du tir
+        if grille is not None:
+            geometrie = grille.interpolate_many(['distance', 'sin_angle'], x, y)
+            distance_but = geometrie['distance'] * 1.05
+            sin_angle = geometrie['sin_angle']
+        else:
+            distance_but = self._calculer_distance_but_lot(x, y)
+            sin_angle = np.sin(np.radians(self._calculer_angle_tir_lot(x, y)))
+        
+        # xG de base par tranche de distance (6, 11, 16, 25 mètres)
+        xg_base = self._valeurs_par_tranche(
+            distance_but, [6, 11, 16, 25], [0.45, 0.25, 0.12, 0.05, 0.02]
+        )
+        
+        facteur_angle = np.maximum(0.3, sin_angle)
+        
+        facteur_situation = self._facteurs_categoriels(
+            situations, n_tirs,
+            lambda s: self.coefficients_xg.get(f'situation_{s}', 1.0)
+        )
+        facteur_corps = self._facteurs_categoriels(
+            parties_corps, n_tirs, self._obtenir_facteur_corps
+        )
+        bonus_joueur = self._facteurs_categoriels(
+            tireurs, n_tirs, self._obtenir_bonus_finisseur
+        )
+        
+        xg_final = xg_base * facteur_angle * facteur_situation * facteur_corps * bonus_joueur
+        
+        return np.clip(xg_final, 0.005, 0.95)
+    
     def calculer_xa_passe(self,
                          x_passe: float,
                          y_passe: float, 
@@ -162,13 +253,7 @@ class MetriquesFootballRCS:
         facteur_angle = max(0.4, math.sin(math.radians(angle_reception)))
         
         # Bonus selon le type de passe
-        bonus_type_passe = {
-            'passe_cle': 1.8,      # Passe décisive directe
-            'centre': 1.3,         # Centre dans la surface
-            'passe_profondeur': 1.5, # Passe en profondeur
-            'normale': 1.0,
-            'relance': 0.7
-        }.get(type_passe, 1.0)
+        bonus_type_passe = self.bonus_types_passe.get(type_passe, 1.0)
         
         # Difficulté de la passe (distance et précision requise)
         distance_passe = math.sqrt((x_reception - x_passe)**2 + (y_reception - y_passe)**2)
@@ -187,6 +272,64 @@ class MetriquesFootballRCS:
         
         return max(0.001, min(0.8, xa_final))
     
+    def calculer_xa_lot(self,
+                        passes: Union[pd.DataFrame, np.ndarray],
+                        type_passe: str = "normale",
+                        joueur_passeur: str = None) -> np.ndarray:
+        """
+        Calcule l'xA d'un lot de passes en une seule passe vectorisée
+        
+        Même modèle que calculer_xa_passe : les types de passe et les passeurs
+        sont encodés en codes catégoriels, chaque bonus n'est évalué qu'une fois
+        par modalité puis diffusé sur tout le lot.
+        
+        Args:
+            passes: DataFrame avec colonnes x_passe, y_passe, x_reception,
+                    y_reception et optionnellement type_passe, joueur_passeur ;
+                    ou ndarray de forme (n, 4) dans cet ordre de colonnes
+            type_passe: Type de passe par défaut (ou tableau de longueur n)
+            joueur_passeur: Passeur par défaut (ou tableau de longueur n)
+            
+        Returns:
+            Tableau des valeurs xA (une par passe)
+        """
+        
+        (x_passe, y_passe, x_reception, y_reception), colonnes = self._extraire_colonnes_lot(
+            passes, ['x_passe', 'y_passe', 'x_reception', 'y_reception'],
+            ['type_passe', 'joueur_passeur']
+        )
+        n_passes = len(x_passe)
+        
+        types_passe = colonnes.get('type_passe', type_passe)
+        passeurs = colonnes.get('joueur_passeur', joueur_passeur)
+        
+        # Position de réception
+        distance_but_reception = self._calculer_distance_but_lot(x_reception, y_reception)
+        angle_reception = self._calculer_angle_tir_lot(x_reception, y_reception)
+        
+        # xA de base par tranche de distance (6, 11, 16, 22 mètres)
+        xa_base = self._valeurs_par_tranche(
+            distance_but_reception, [6, 11, 16, 22], [0.25, 0.15, 0.08, 0.04, 0.01]
+        )
+        
+        facteur_angle = np.maximum(0.4, np.sin(np.radians(angle_reception)))
+        
+        bonus_type_passe = self._facteurs_categoriels(
+            types_passe, n_passes, lambda t: self.bonus_types_passe.get(t, 1.0)
+        )
+        
+        # Longueur de passe : courte (<= 15), moyenne (<= 30), longue
+        distance_passe = np.sqrt((x_reception - x_passe)**2 + (y_reception - y_passe)**2)
+        facteur_distance = self._valeurs_par_tranche(distance_passe, [15, 30], [1.0, 1.1, 1.2])
+        
+        bonus_joueur = self._facteurs_categoriels(
+            passeurs, n_passes, self._obtenir_bonus_createur
+        )
+        
+        xa_final = xa_base * facteur_angle * bonus_type_passe * facteur_distance * bonus_joueur
+        
+        return np.clip(xa_final, 0.001, 0.8)
+    
     def calculer_ppda_equipe(self, 
                             donnees_evenements: pd.DataFrame,
                             equipe_analysee: str = "RCS") -> float:
@@ -201,32 +344,66 @@ class MetriquesFootballRCS:
             Valeur PPDA (plus c'est bas, plus le pressing est intense)
         """
         
-        # Filtrer les événements de l'adversaire dans leur tiers défensif
-        adversaire = donnees_evenements[donnees_evenements['equipe'] != equipe_analysee]
+        return self._ppda_depuis_resume(MatchEventSummary(donnees_evenements, equipe_analysee))
+    
+    def calculer_ppda_ligue(self,
+                            donnees_evenements: pd.DataFrame,
+                            colonne_match: str = "match") -> Dict[str, pd.DataFrame]:
+        """
+        Calcule le PPDA de chaque équipe dans chaque match d'une saison en un seul groupby
         
-        # Passes adverses dans leur tiers défensif (où RCS peut presser)
-        passes_adversaire_def = adversaire[
-            (adversaire['type_evenement'] == 'passe') &
-            (adversaire['x_coordonnee'] <= 35)  # Tiers défensif adverse
-        ]
+        Même définition que calculer_ppda_equipe (passes adverses dans leur tiers
+        défensif, actions défensives au-delà de x = 65), pour toutes les équipes
+        et tous les matchs d'un DataFrame multi-matchs.
         
-        # Actions défensives du RCS dans le tiers adverse
-        actions_defensives_rcs = donnees_evenements[
-            (donnees_evenements['equipe'] == equipe_analysee) &
-            (donnees_evenements['type_evenement'].isin(['tacle', 'interception', 'faute'])) &
-            (donnees_evenements['x_coordonnee'] >= 65)  # Pressing haut
-        ]
+        Args:
+            donnees_evenements: DataFrame avec les événements de plusieurs matchs
+            colonne_match: Colonne identifiant le match
+            
+        Returns:
+            Dictionnaire avec 'par_match' (PPDA par match et équipe) et
+            'par_equipe' (profil de pressing sur la saison, trié du pressing le
+            plus intense au plus faible)
+        """
         
-        # Calcul PPDA
-        nb_passes_adversaire = len(passes_adversaire_def)
-        nb_actions_defensives = len(actions_defensives_rcs)
+        indicateurs = pd.DataFrame({
+            'match': donnees_evenements[colonne_match],
+            'equipe': donnees_evenements['equipe'],
+            'passes_tiers_defensif': (
+                (donnees_evenements['type_evenement'] == 'passe') &
+                (donnees_evenements['x_coordonnee'] <= 35)
+            ),
+            'actions_defensives': (
+                donnees_evenements['type_evenement'].isin(['tacle', 'interception', 'faute']) &
+                (donnees_evenements['x_coordonnee'] >= 65)
+            )
+        })
+        
+        # Passes adverses = passes du match dans le tiers défensif moins celles de l'équipe
+        comptages = indicateurs.groupby(['match', 'equipe'], dropna=False).sum()
+        passes_match = comptages['passes_tiers_defensif'].groupby(level='match').transform('sum')
+        
+        par_match = pd.DataFrame({
+            'passes_adversaire': passes_match - comptages['passes_tiers_defensif'],
+            'actions_defensives': comptages['actions_defensives']
+        }).reset_index()
+        par_match = par_match[par_match['equipe'].notna()].reset_index(drop=True)
+        par_match['ppda'] = self._ratio_ppda(
+            par_match['passes_adversaire'], par_match['actions_defensives']
+        )
         
-        if nb_actions_defensives > 0:
-            ppda = nb_passes_adversaire / nb_actions_defensives
-        else:
-            ppda = float('inf')  # Pas de pressing
+        par_equipe = par_match.groupby('equipe').agg(
+            matchs=('match', 'nunique'),
+            passes_adversaire=('passes_adversaire', 'sum'),
+            actions_defensives=('actions_defensives', 'sum'),
+            ppda_meilleur_match=('ppda', 'min')
+        ).reset_index()
+        par_equipe['ppda'] = self._ratio_ppda(
+            par_equipe['passes_adversaire'], par_equipe['actions_defensives']
+        )
+        par_equipe = par_equipe.sort_values('ppda').reset_index(drop=True)
         
-        return round(ppda, 2)
+        return {'par_match': par_match, 'par_equipe': par_equipe}
     
     def analyser_zones_recuperation(self, 
                                    donnees_evenements: pd.DataFrame,
@@ -242,56 +419,9 @@ class MetriquesFootballRCS:
             Dictionnaire avec les statistiques par zone
         """
         
-        # Récupérations de l'équipe
-        recuperations = donnees_evenements[
-            (donnees_evenements['equipe'] == equipe_analysee) &
-            (donnees_evenements['type_evenement'].isin(['interception', 'tacle_reussi']))
-        ]
-        
-        # Classification par zones
-        recuperations_zones = {
-            'zone_defensive': 0,    # 0-35
-            'zone_milieu': 0,       # 35-65  
-            'zone_offensive': 0     # 65-100
-        }
-        
-        for _, recup in recuperations.iterrows():
-            x = recup['x_coordonnee']
-            if x <= 35:
-                recuperations_zones['zone_defensive'] += 1
-            elif x <= 65:
-                recuperations_zones['zone_milieu'] += 1
-            else:
-                recuperations_zones['zone_offensive'] += 1
-        
-        total_recuperations = sum(recuperations_zones.values())
-        
-        # Calcul des pourcentages
-        if total_recuperations > 0:
-            pourcentages = {
-                zone: (count / total_recuperations) * 100 
-                for zone, count in recuperations_zones.items()
-            }
-        else:
-            pourcentages = {zone: 0 for zone in recuperations_zones.keys()}
-        
-        # Évaluation du style de pressing
-        if pourcentages['zone_offensive'] > 25:
-            style_pressing = "Pressing très haut - Style agressif"
-        elif pourcentages['zone_offensive'] > 15:
-            style_pressing = "Pressing haut - Style proactif"
-        elif pourcentages['zone_milieu'] > 50:
-            style_pressing = "Pressing médian - Style équilibré"
-        else:
-            style_pressing = "Pressing bas - Style défensif"
-        
-        return {
-            'recuperations_par_zone': recuperations_zones,
-            'pourcentages_par_zone': pourcentages,
-            'total_recuperations': total_recuperations,
-            'style_pressing': style_pressing,
-            'efficacite_pressing': pourcentages['zone_offensive'] + pourcentages['zone_milieu'] / 2
-        }
+        return self._zones_recuperation_depuis_resume(
+            MatchEventSummary(donnees_evenements, equipe_analysee)
+        )
     
     def calculer_metriques_possession(self, 
                                      donnees_evenements: pd.DataFrame,
@@ -307,50 +437,30 @@ class MetriquesFootballRCS:
             Dictionnaire avec les métriques de possession
         """
         
-        # Événements de l'équipe
-        evenements_equipe = donnees_evenements[donnees_evenements['equipe'] == equipe_analysee]
-        
-        # Passes de l'équipe
-        passes = evenements_equipe[evenements_equipe['type_evenement'] == 'passe']
-        passes_reussies = evenements_equipe[evenements_equipe['type_evenement'] == 'passe_reussie']
-        
-        # Métriques de base
-        total_passes = len(passes)
-        total_passes_reussies = len(passes_reussies)
-        precision_passes = (total_passes_reussies / total_passes * 100) if total_passes > 0 else 0
-        
-        # Passes par zone
-        passes_par_zone = {
-            'zone_defensive': len(passes[passes['x_coordonnee'] <= 35]),
-            'zone_milieu': len(passes[(passes['x_coordonnee'] > 35) & (passes['x_coordonnee'] <= 65)]),
-            'zone_offensive': len(passes[passes['x_coordonnee'] > 65])
-        }
-        
-        # Passes courtes vs longues
-        passes['distance_passe'] = np.sqrt(
-            (passes['x_coordonnee'] - passes['x_reception'])**2 + 
-            (passes['y_coordonnee'] - passes['y_reception'])**2
-        )
+        return self._possession_depuis_resume(MatchEventSummary(donnees_evenements, equipe_analysee))
+    
+    def calculer_resume_match(self,
+                              donnees_evenements: pd.DataFrame,
+                              equipe_analysee: str = "RCS") -> Dict:
+        """
+        Calcule PPDA, zones de récupération, possession et métriques défensives
+        en une seule passe sur les événements du match
         
-        passes_courtes = len(passes[passes['distance_passe'] <= 15])
-        passes_longues = len(passes[passes['distance_passe'] > 30])
-        passes_moyennes = total_passes - passes_courtes - passes_longues
+        Args:
+            donnees_evenements: DataFrame avec les événements du match
+            equipe_analysee: Équipe à analyser
+            
+        Returns:
+            Dictionnaire regroupant les quatre analyses
+        """
         
-        # Vitesse de jeu (passes par minute de possession effective)
-        duree_possession = donnees_evenements['minute'].max() - donnees_evenements['minute'].min()
-        vitesse_jeu = total_passes / duree_possession if duree_possession > 0 else 0
+        resume = MatchEventSummary(donnees_evenements, equipe_analysee)
         
         return {
-            'total_passes': total_passes,
-            'precision_passes_pct': round(precision_passes, 1),
-            'passes_par_zone': passes_par_zone,
-            'repartition_distance': {
-                'courtes': passes_courtes,
-                'moyennes': passes_moyennes,
-                'longues': passes_longues
-            },
-            'vitesse_jeu': round(vitesse_jeu, 1),
-            'style_possession': self._evaluer_style_possession(passes_par_zone, precision_passes)
+            'ppda': self._ppda_depuis_resume(resume),
+            'zones_recuperation': self._zones_recuperation_depuis_resume(resume),
+            'possession': self._possession_depuis_resume(resume),
+            'defense': self._defense_depuis_resume(resume)
         }
     
     def generer_heatmap_joueur(self, 
@@ -373,34 +483,131 @@ class MetriquesFootballRCS:
         if positions_joueur.empty:
             return {"erreur": f"Aucune donnée de position trouvée pour {nom_joueur}"}
         
-        # Créer une grille pour la heatmap
-        x_bins = np.linspace(0, 100, 21)  # 20 zones en largeur
-        y_bins = np.linspace(0, 100, 21)  # 20 zones en longueur
-        
-        # Calculer la densité par zone
-        hist, x_edges, y_edges = np.histogram2d(
-            positions_joueur['x_coordonnee'],
-            positions_joueur['y_coordonnee'],
-            bins=[x_bins, y_bins]
+        accumulateur = HeatmapAccumulator(n_bins_x=20, n_bins_y=20).update(
+            positions_joueur['x_coordonnee'].to_numpy(),
+            positions_joueur['y_coordonnee'].to_numpy()
         )
         
+        return self.generer_heatmap_depuis_accumulateur(accumulateur, nom_joueur)
+    
+    def generer_heatmaps_effectif(self,
+                                 donnees_positions: pd.DataFrame,
+                                 joueurs: Optional[List[str]] = None) -> Dict:
+        """
+        Génère les heatmaps de tous les joueurs en une seule passe
+        
+        Chaque position reçoit un index linéaire (joueur, case X, case Y) et
+        l'ensemble est compté avec un unique np.bincount, sans filtrer le
+        DataFrame joueur par joueur.
+        
+        Args:
+            donnees_positions: DataFrame avec colonnes joueur, x_coordonnee, y_coordonnee
+            joueurs: Ordre des joueurs souhaité (par défaut, ordre d'apparition) ;
+                     un joueur sans position reçoit une heatmap vide
+            
+        Returns:
+            Dictionnaire avec le tenseur des heatmaps (joueurs x 20 x 20), les
+            bords de la grille et un DataFrame de profils (position moyenne,
+            zone principale, mobilité)
+        """
+        
+        grille = HeatmapAccumulator(n_bins_x=20, n_bins_y=20)
+        n_x, n_y = grille.shape
+        
+        x = donnees_positions['x_coordonnee'].to_numpy(dtype=np.float64)
+        y = donnees_positions['y_coordonnee'].to_numpy(dtype=np.float64)
+        
+        codes, modalites = pd.factorize(donnees_positions['joueur'])
+        if joueurs is None:
+            joueurs = list(modalites)
+        else:
+            # Réordonner les codes selon la liste demandée (-1 pour les joueurs non demandés)
+            joueurs = list(joueurs)
+            rang_joueur = {joueur: rang for rang, joueur in enumerate(joueurs)}
+            correspondance = np.array([rang_joueur.get(m, -1) for m in modalites] + [-1], dtype=np.int64)
+            codes = correspondance[codes]
+        n_joueurs = len(joueurs)
+        
+        valides = (codes >= 0) & ~np.isnan(x) & ~np.isnan(y)
+        codes, x, y = codes[valides].astype(np.int64), x[valides], y[valides]
+        
+        # Heatmaps : un seul comptage sur (joueur, case X, case Y)
+        ix, iy, dans_terrain = grille.bin_indices(x, y)
+        index_lineaire = (codes[dans_terrain] * n_x + ix[dans_terrain]) * n_y + iy[dans_terrain]
+        heatmaps = np.bincount(
+            index_lineaire, minlength=n_joueurs * n_x * n_y
+        ).reshape(n_joueurs, n_x, n_y).astype(np.float64)
+        
+        # Positions moyennes et mobilité (écarts-types) par joueur
+        nb_positions = np.bincount(codes, minlength=n_joueurs)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            x_moyen = np.bincount(codes, weights=x, minlength=n_joueurs) / nb_positions
+            y_moyen = np.bincount(codes, weights=y, minlength=n_joueurs) / nb_positions
+            variance_x = np.bincount(codes, weights=(x - x_moyen[codes])**2, minlength=n_joueurs) / (nb_positions - 1)
+            variance_y = np.bincount(codes, weights=(y - y_moyen[codes])**2, minlength=n_joueurs) / (nb_positions - 1)
+        variance_x[nb_positions < 2] = np.nan
+        variance_y[nb_positions < 2] = np.nan
+        score_mobilite = np.sqrt(variance_x + variance_y)
+        
+        zones = [
+            self._identifier_zone_activite(xm, ym) if n > 0 else None
+            for xm, ym, n in zip(x_moyen, y_moyen, nb_positions)
+        ]
+        profils = pd.DataFrame({
+            'joueur': joueurs,
+            'nb_positions': nb_positions,
+            'x_moyen': np.round(x_moyen, 1),
+            'y_moyen': np.round(y_moyen, 1),
+            'zone_principale': zones,
+            'score_mobilite': np.round(score_mobilite, 1),
+            'interpretation': [
+                self._interpreter_heatmap(zone, mobilite) if zone is not None else None
+                for zone, mobilite in zip(zones, score_mobilite)
+            ]
+        })
+        
+        return {
+            'joueurs': joueurs,
+            'heatmaps': heatmaps,
+            'x_edges': grille.x_edges,
+            'y_edges': grille.y_edges,
+            'profils': profils
+        }
+    
+    def generer_heatmap_depuis_accumulateur(self,
+                                           accumulateur: HeatmapAccumulator,
+                                           nom_joueur: str) -> Dict:
+        """
+        Génère la heatmap d'un joueur à partir d'un accumulateur de positions
+        
+        Permet de produire des heatmaps de saison en fusionnant les
+        accumulateurs de chaque match, sans relire les positions brutes.
+        
+        Args:
+            accumulateur: HeatmapAccumulator alimenté avec les positions du joueur
+            nom_joueur: Nom du joueur
+            
+        Returns:
+            Dictionnaire avec les données de heatmap
+        """
+        
+        if accumulateur.n_positions == 0:
+            return {"erreur": f"Aucune donnée de position trouvée pour {nom_joueur}"}
+        
         # Position moyenne du joueur
-        x_moyen = positions_joueur['x_coordonnee'].mean()
-        y_moyen = positions_joueur['y_coordonnee'].mean()
+        x_moyen, y_moyen = accumulateur.mean
         
         # Zone d'activité principale
         zone_principale = self._identifier_zone_activite(x_moyen, y_moyen)
         
         # Mobilité du joueur (écart-type des positions)
-        mobilite_x = positions_joueur['x_coordonnee'].std()
-        mobilite_y = positions_joueur['y_coordonnee'].std()
-        score_mobilite = math.sqrt(mobilite_x**2 + mobilite_y**2)
+        score_mobilite = accumulateur.mobility_score
         
         return {
             'joueur': nom_joueur,
-            'heatmap_data': hist,
-            'x_edges': x_edges,
-            'y_edges': y_edges,
+            'heatmap_data': accumulateur.histogram(),
+            'x_edges': accumulateur.x_edges,
+            'y_edges': accumulateur.y_edges,
             'position_moyenne': (round(x_moyen, 1), round(y_moyen, 1)),
             'zone_principale': zone_principale,
             'score_mobilite': round(score_mobilite, 1),
@@ -421,37 +628,135 @@ class MetriquesFootballRCS:
             Dictionnaire avec les métriques défensives
         """
         
-        # Événements défensifs de l'équipe
-        evenements_defensifs = donnees_evenements[
-            (donnees_evenements['equipe'] == equipe_analysee) &
-            (donnees_evenements['type_evenement'].isin([
-                'tacle', 'interception', 'degagement', 'duel_aerien'
-            ]))
-        ]
+        return self._defense_depuis_resume(MatchEventSummary(donnees_evenements, equipe_analysee))
+    
+    # Calculs à partir du résumé de match
+    
+    def _ppda_depuis_resume(self, resume: 'MatchEventSummary') -> float:
+        """Calcule le PPDA à partir des comptages du résumé de match"""
+        
+        # Passes adverses dans leur tiers défensif (où RCS peut presser)
+        nb_passes_adversaire = resume.compter(
+            equipe=False, types=['passe'], zones=[MatchEventSummary.ZONE_DEFENSIVE]
+        )
+        
+        # Actions défensives du RCS dans le tiers adverse (x >= 65)
+        nb_actions_defensives = resume.compter(
+            equipe=True, types=['tacle', 'interception', 'faute'],
+            zones=[MatchEventSummary.ZONE_LIMITE_OFFENSIVE, MatchEventSummary.ZONE_OFFENSIVE]
+        )
+        
+        if nb_actions_defensives > 0:
+            ppda = nb_passes_adversaire / nb_actions_defensives
+        else:
+            ppda = float('inf')  # Pas de pressing
+        
+        return round(ppda, 2)
+    
+    def _zones_recuperation_depuis_resume(self, resume: 'MatchEventSummary') -> Dict:
+        """Analyse les zones de récupération à partir du résumé de match"""
+        
+        recuperations_zones = resume.compter_par_tiers(
+            equipe=True, types=['interception', 'tacle_reussi'],
+            noms=('zone_defensive', 'zone_milieu', 'zone_offensive')
+        )
+        
+        total_recuperations = sum(recuperations_zones.values())
+        
+        # Calcul des pourcentages
+        if total_recuperations > 0:
+            pourcentages = {
+                zone: (count / total_recuperations) * 100 
+                for zone, count in recuperations_zones.items()
+            }
+        else:
+            pourcentages = {zone: 0 for zone in recuperations_zones.keys()}
+        
+        # Évaluation du style de pressing
+        if pourcentages['zone_offensive'] > 25:
+            style_pressing = "Pressing très haut - Style agressif"
+        elif pourcentages['zone_offensive'] > 15:
+            style_pressing = "Pressing haut - Style proactif"
+        elif pourcentages['zone_milieu'] > 50:
+            style_pressing = "Pressing médian - Style équilibré"
+        else:
+            style_pressing = "Pressing bas - Style défensif"
+        
+        return {
+            'recuperations_par_zone': recuperations_zones,
+            'pourcentages_par_zone': pourcentages,
+            'total_recuperations': total_recuperations,
+            'style_pressing': style_pressing,
+            'efficacite_pressing': pourcentages['zone_offensive'] + pourcentages['zone_milieu'] / 2
+        }
+    
+    def _possession_depuis_resume(self, resume: 'MatchEventSummary') -> Dict:
+        """Calcule les métriques de possession à partir du résumé de match"""
+        
+        # Métriques de base
+        total_passes = resume.compter(equipe=True, types=['passe'])
+        total_passes_reussies = resume.compter(equipe=True, types=['passe_reussie'])
+        precision_passes = (total_passes_reussies / total_passes * 100) if total_passes > 0 else 0
+        
+        # Passes par zone
+        passes_par_zone = resume.compter_par_tiers(
+            equipe=True, types=['passe'],
+            noms=('zone_defensive', 'zone_milieu', 'zone_offensive')
+        )
+        
+        # Passes courtes (<= 15) vs longues (> 30)
+        passes_courtes = resume.compter(
+            equipe=True, types=['passe'], distances=[MatchEventSummary.PASSE_COURTE]
+        )
+        passes_longues = resume.compter(
+            equipe=True, types=['passe'], distances=[MatchEventSummary.PASSE_LONGUE]
+        )
+        passes_moyennes = total_passes - passes_courtes - passes_longues
+        
+        # Vitesse de jeu (passes par minute de possession effective)
+        duree_possession = resume.duree_minutes
+        vitesse_jeu = total_passes / duree_possession if duree_possession > 0 else 0
+        
+        return {
+            'total_passes': total_passes,
+            'precision_passes_pct': round(precision_passes, 1),
+            'passes_par_zone': passes_par_zone,
+            'repartition_distance': {
+                'courtes': passes_courtes,
+                'moyennes': passes_moyennes,
+                'longues': passes_longues
+            },
+            'vitesse_jeu': round(vitesse_jeu, 1),
+            'style_possession': self._evaluer_style_possession(passes_par_zone, precision_passes)
+        }
+    
+    def _defense_depuis_resume(self, resume: 'MatchEventSummary') -> Dict:
+        """Calcule les métriques défensives à partir du résumé de match"""
+        
+        types_defensifs = ['tacle', 'interception', 'degagement', 'duel_aerien']
         
         # Calculs par type d'action
-        tacles = evenements_defensifs[evenements_defensifs['type_evenement'] == 'tacle']
-        interceptions = evenements_defensifs[evenements_defensifs['type_evenement'] == 'interception']
-        duels_aeriens = evenements_defensifs[evenements_defensifs['type_evenement'] == 'duel_aerien']
+        nb_tacles = resume.compter(equipe=True, types=['tacle'])
+        nb_tacles_reussis = resume.compter(equipe=True, types=['tacle'], reussi=True)
+        nb_interceptions = resume.compter(equipe=True, types=['interception'])
+        nb_duels_aeriens = resume.compter(equipe=True, types=['duel_aerien'])
+        nb_duels_reussis = resume.compter(equipe=True, types=['duel_aerien'], reussi=True)
         
         # Taux de réussite
-        taux_reussite_tacles = len(tacles[tacles['reussi'] == True]) / len(tacles) * 100 if len(tacles) > 0 else 0
-        taux_reussite_duels = len(duels_aeriens[duels_aeriens['reussi'] == True]) / len(duels_aeriens) * 100 if len(duels_aeriens) > 0 else 0
+        taux_reussite_tacles = nb_tacles_reussis / nb_tacles * 100 if nb_tacles > 0 else 0
+        taux_reussite_duels = nb_duels_reussis / nb_duels_aeriens * 100 if nb_duels_aeriens > 0 else 0
         
         # Intensité défensive par zone
-        intensite_par_zone = {
-            'defensive': len(evenements_defensifs[evenements_defensifs['x_coordonnee'] <= 35]),
-            'milieu': len(evenements_defensifs[(evenements_defensifs['x_coordonnee'] > 35) & 
-                                             (evenements_defensifs['x_coordonnee'] <= 65)]),
-            'offensive': len(evenements_defensifs[evenements_defensifs['x_coordonnee'] > 65])
-        }
+        intensite_par_zone = resume.compter_par_tiers(
+            equipe=True, types=types_defensifs, noms=('defensive', 'milieu', 'offensive')
+        )
         
         return {
-            'total_actions_defensives': len(evenements_defensifs),
-            'tacles_tentes': len(tacles),
+            'total_actions_defensives': resume.compter(equipe=True, types=types_defensifs),
+            'tacles_tentes': nb_tacles,
             'taux_reussite_tacles': round(taux_reussite_tacles, 1),
-            'interceptions': len(interceptions),
-            'duels_aeriens_tentes': len(duels_aeriens),
+            'interceptions': nb_interceptions,
+            'duels_aeriens_tentes': nb_duels_aeriens,
             'taux_reussite_duels_aeriens': round(taux_reussite_duels, 1),
             'intensite_par_zone': intensite_par_zone,
             'evaluation_defensive': self._evaluer_performance_defensive(
@@ -484,25 +789,83 @@ class MetriquesFootballRCS:
         
         return math.degrees(angle_tir)
     
+    def _ratio_ppda(self, passes_adversaire: pd.Series, actions_defensives: pd.Series) -> pd.Series:
+        """PPDA vectorisé arrondi comme calculer_ppda_equipe (infini sans pressing)"""
+        ppda = passes_adversaire / actions_defensives.where(actions_defensives > 0)
+        # round() Python plutôt que Series.round pour des arrondis identiques
+        return ppda.fillna(float('inf')).map(lambda valeur: round(valeur, 2))
+    
+    def _calculer_distance_but_lot(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Version vectorisée de _calculer_distance_but"""
+        return np.sqrt((100 - x)**2 + (50 - y)**2) * 1.05
+    
+    def _calculer_angle_tir_lot(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Version vectorisée de _calculer_angle_tir"""
+        angle_gauche = np.arctan2(np.abs(y - 44), np.abs(x - 100))
+        angle_droit = np.arctan2(np.abs(y - 56), np.abs(x - 100))
+        return np.degrees(np.abs(angle_gauche - angle_droit))
+    
+    def _extraire_colonnes_lot(self,
+                               donnees: Union[pd.DataFrame, np.ndarray],
+                               colonnes_numeriques: List[str],
+                               colonnes_optionnelles: List[str]) -> Tuple[List[np.ndarray], Dict]:
+        """Extrait les colonnes numériques et les colonnes optionnelles présentes d'un lot d'actions"""
+        if isinstance(donnees, pd.DataFrame):
+            numeriques = [donnees[col].to_numpy(dtype=np.float64) for col in colonnes_numeriques]
+            colonnes = {
+                col: donnees[col].to_numpy()
+                for col in colonnes_optionnelles if col in donnees.columns
+            }
+            return numeriques, colonnes
+        
+        tableau = np.asarray(donnees, dtype=np.float64)
+        n_colonnes = len(colonnes_numeriques)
+        if tableau.ndim != 2 or tableau.shape[1] != n_colonnes:
+            raise ValueError(
+                f"Le tableau doit être de forme (n, {n_colonnes}) avec les colonnes "
+                f"{', '.join(colonnes_numeriques)}"
+            )
+        return [tableau[:, i] for i in range(n_colonnes)], {}
+    
+    @staticmethod
+    def _valeurs_par_tranche(valeurs: np.ndarray, seuils: List[float], niveaux: List[float]) -> np.ndarray:
+        """Associe à chaque valeur le niveau de sa tranche (bornes supérieures incluses)"""
+        indices = np.searchsorted(np.asarray(seuils, dtype=np.float64), valeurs, side='left')
+        return np.asarray(niveaux, dtype=np.float64)[indices]
+    
+    @staticmethod
+    def _facteurs_categoriels(valeurs, n: int, fonction_facteur) -> np.ndarray:
+        """
+        Applique une fonction de facteur à des valeurs catégorielles
+        
+        La fonction n'est évaluée qu'une fois par modalité distincte, puis
+        diffusée sur le lot via les codes catégoriels.
+        """
+        if np.ndim(valeurs) == 0:
+            return np.full(n, fonction_facteur(valeurs), dtype=np.float64)
+        
+        codes, modalites = pd.factorize(np.asarray(valeurs, dtype=object), use_na_sentinel=True)
+        # La dernière case sert aux valeurs manquantes (code -1)
+        table = np.array([fonction_facteur(m) for m in modalites] + [fonction_facteur(None)],
+                         dtype=np.float64)
+        return table[codes]
+    
+    def _obtenir_facteur_corps(self, partie_corps: str) -> float:
+        """Retourne le facteur xG associé à la partie du corps utilisée"""
+        if partie_corps in ["pied_gauche", "pied_droit"]:
+            return self.coefficients_xg['pied_dominant']
+        elif partie_corps == "tete":
+            return self.coefficients_xg['tete']
+        else:
+            return 0.8  # Autre partie du corps
+    
     def _obtenir_bonus_finisseur(self, nom_joueur: str) -> float:
         """Retourne un bonus pour les finisseurs reconnus du RCS"""
-        finisseurs_rcs = {
-            'Emanuel Emegha': 1.15,
-            'Dilane Bakwa': 1.10,
-            'Félix Lemaréchal': 1.05,
-            'Sékou Mara': 1.08
-        }
-        return finisseurs_rcs.get(nom_joueur, 1.0)
+        return self.bonus_finisseurs.get(nom_joueur, 1.0)
     
     def _obtenir_bonus_createur(self, nom_joueur: str) -> float:
         """Retourne un bonus pour les créateurs reconnus du RCS"""
-        createurs_rcs = {
-            'Dilane Bakwa': 1.20,
-            'Andrey Santos': 1.15,
-            'Félix Lemaréchal': 1.12,
-            'Habib Diarra': 1.08
-        }
-        return createurs_rcs.get(nom_joueur, 1.0)
+        return self.bonus_createurs.get(nom_joueur, 1.0)
     
     def _evaluer_style_possession(self, passes_par_zone: Dict, precision: float) -> str:
         """Évalue le style de possession de l'équipe"""
@@ -567,6 +930,127 @@ class MetriquesFootballRCS:
         else:
             return "🔴 Problématique - Amélioration nécessaire"
 
+class MatchEventSummary:
+    """
+    Résumé des événements d'un match calculé en une seule passe
+    
+    Chaque événement est encodé une fois (équipe analysée ou adversaire, type
+    d'événement, tiers du terrain, réussite, longueur de passe), puis compté
+    avec un unique np.bincount. PPDA, zones de récupération, possession et
+    métriques défensives se lisent ensuite dans le tableau de comptages sans
+    refiltrer le DataFrame.
+    """
+    
+    # Tiers du terrain selon x (bornes du RCS : 35 et 65)
+    ZONE_DEFENSIVE = 0           # x <= 35
+    ZONE_MILIEU = 1              # 35 < x < 65
+    ZONE_LIMITE_OFFENSIVE = 2    # x == 65 (milieu pour les zones, haut pour le pressing)
+    ZONE_OFFENSIVE = 3           # x > 65
+    ZONE_INCONNUE = 4            # coordonnée manquante
+    NB_ZONES = 5
+    
+    # Longueur de passe
+    PASSE_COURTE = 0             # <= 15
+    PASSE_MOYENNE = 1            # 15 < distance <= 30 ou réception inconnue
+    PASSE_LONGUE = 2             # > 30
+    NB_DISTANCES = 3
+    
+    def __init__(self, donnees_evenements: pd.DataFrame, equipe_analysee: str = "RCS"):
+        """
+        Encode et compte les événements du match
+        
+        Args:
+            donnees_evenements: DataFrame avec les événements du match (colonnes
+                                equipe, type_evenement, x_coordonnee et
+                                optionnellement reussi, minute, y_coordonnee,
+                                x_reception, y_reception)
+            equipe_analysee: Équipe à analyser
+        """
+        self.equipe_analysee = equipe_analysee
+        n_evenements = len(donnees_evenements)
+        
+        code_equipe = (donnees_evenements['equipe'] == equipe_analysee).to_numpy(dtype=np.int64)
+        
+        codes_types, types = pd.factorize(donnees_evenements['type_evenement'])
+        self.types_evenements = list(types)
+        self._index_types = {t: i for i, t in enumerate(self.types_evenements)}
+        # Les types manquants (code -1) vont dans une case supplémentaire
+        nb_types = len(self.types_evenements) + 1
+        codes_types = np.where(codes_types < 0, nb_types - 1, codes_types)
+        
+        x = donnees_evenements['x_coordonnee'].to_numpy(dtype=np.float64)
+        code_zone = (x > 35).astype(np.int64) + (x >= 65) + (x > 65)
+        code_zone[np.isnan(x)] = self.ZONE_INCONNUE
+        
+        if 'reussi' in donnees_evenements.columns:
+            code_reussi = donnees_evenements['reussi'].eq(True).to_numpy(dtype=np.int64)
+        else:
+            code_reussi = np.zeros(n_evenements, dtype=np.int64)
+        
+        code_distance = np.full(n_evenements, self.PASSE_MOYENNE, dtype=np.int64)
+        colonnes_passe = ['y_coordonnee', 'x_reception', 'y_reception']
+        if all(col in donnees_evenements.columns for col in colonnes_passe):
+            distance_passe = np.sqrt(
+                (x - donnees_evenements['x_reception'].to_numpy(dtype=np.float64))**2 +
+                (donnees_evenements['y_coordonnee'].to_numpy(dtype=np.float64) -
+                 donnees_evenements['y_reception'].to_numpy(dtype=np.float64))**2
+            )
+            code_distance[distance_passe <= 15] = self.PASSE_COURTE
+            code_distance[distance_passe > 30] = self.PASSE_LONGUE
+        
+        # Un seul comptage sur l'index linéaire (équipe, type, zone, réussite, distance)
+        forme = (2, nb_types, self.NB_ZONES, 2, self.NB_DISTANCES)
+        index_lineaire = np.ravel_multi_index(
+            (code_equipe, codes_types, code_zone, code_reussi, code_distance), forme
+        )
+        self.comptages = np.bincount(index_lineaire, minlength=int(np.prod(forme))).reshape(forme)
+        
+        if 'minute' in donnees_evenements.columns and n_evenements > 0:
+            minutes = donnees_evenements['minute']
+            self.duree_minutes = minutes.max() - minutes.min()
+        else:
+            self.duree_minutes = 0
+    
+    def compter(self,
+                equipe: bool,
+                types: List[str],
+                zones: Optional[List[int]] = None,
+                reussi: Optional[bool] = None,
+                distances: Optional[List[int]] = None) -> int:
+        """
+        Compte les événements correspondant aux critères
+        
+        Args:
+            equipe: True pour l'équipe analysée, False pour l'adversaire
+            types: Types d'événements à inclure
+            zones: Codes de zone à inclure (toutes si None)
+            reussi: Ne compter que les actions réussies (True) ou ratées (False)
+            distances: Codes de longueur de passe à inclure (toutes si None)
+            
+        Returns:
+            Nombre d'événements
+        """
+        indices_types = [self._index_types[t] for t in types if t in self._index_types]
+        comptages = self.comptages[int(equipe)][indices_types]
+        
+        if zones is not None:
+            comptages = comptages[:, zones]
+        if reussi is not None:
+            comptages = comptages[:, :, [int(reussi)]]
+        if distances is not None:
+            comptages = comptages[..., distances]
+        
+        return int(comptages.sum())
+    
+    def compter_par_tiers(self, equipe: bool, types: List[str], noms: Tuple[str, str, str]) -> Dict[str, int]:
+        """Compte les événements par tiers (défensif <= 35, milieu <= 65, offensif > 65)"""
+        nom_defensif, nom_milieu, nom_offensif = noms
+        return {
+            nom_defensif: self.compter(equipe, types, zones=[self.ZONE_DEFENSIVE]),
+            nom_milieu: self.compter(equipe, types, zones=[self.ZONE_MILIEU, self.ZONE_LIMITE_OFFENSIVE]),
+            nom_offensif: self.compter(equipe, types, zones=[self.ZONE_OFFENSIVE])
+        }
+
 def main():
     """Fonction principale pour tester les métriques"""
     print("🔵⚪ Métriques Football Racing Club de Strasbourg")
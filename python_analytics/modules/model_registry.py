@@ -0,0 +1,238 @@
+"""
+Registre des Modèles Entraînés
+==============================
+
+Conserve les estimateurs ajustés (MarketValuePredictor, PlayerProfiler) pour
+que les processus d'inférence (démarrage Streamlit, rapports) les chargent au
+lieu de les réentraîner :
+
+- chaque artefact est sauvegardé avec joblib (sans compression) et rechargé
+  avec mmap_mode : les tableaux NumPy sont projetés en mémoire, pas copiés ;
+- la clé d'un artefact combine le schéma des features (noms et ordre des
+  colonnes) et l'empreinte des données d'entraînement ;
+- publish() désigne, pour un schéma donné, l'artefact servi à l'inférence.
+
+Organisation sur disque :
+
+    {racine}/{modèle}/{schéma}-{données}/model.joblib
+    {racine}/{modèle}/{schéma}-{données}/manifest.json
+    {racine}/{modèle}/published.json          # schéma → clé publiée
+
+Usage:
+    python model_registry.py train market_value --publish
+    python model_registry.py train profiler --data stats_joueurs.parquet
+    python model_registry.py publish profiler <clé>
+    python model_registry.py list
+
+Author: Football Analytics Platform
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+DEFAULT_ROOT = os.getenv('FOOTBALL_MODEL_REGISTRY', str(Path(__file__).resolve().parents[2] / 'models'))
+
+
+class ModelRegistry:
+    """Artefacts joblib versionnés par schéma de features et données d'entraînement"""
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Args:
+            root: Répertoire du registre (variable FOOTBALL_MODEL_REGISTRY ou models/ par défaut)
+        """
+        self.root = Path(root or DEFAULT_ROOT)
+        self._loaded: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def schema_hash(feature_columns: Sequence[str]) -> str:
+        """Empreinte du schéma de features (noms et ordre)"""
+        return hashlib.sha256(json.dumps(list(feature_columns)).encode()).hexdigest()[:12]
+
+    @staticmethod
+    def data_hash(data: pd.DataFrame) -> str:
+        """Empreinte des données d'entraînement (valeurs, index et colonnes)"""
+        digest = hashlib.sha256(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        digest.update(json.dumps([str(col) for col in data.columns]).encode())
+        return digest.hexdigest()[:12]
+
+    def save(self, name: str, artifact: Dict[str, Any], feature_columns: Sequence[str],
+             training_data: pd.DataFrame, metrics: Optional[Dict] = None) -> str:
+        """
+        Enregistre un artefact entraîné (non publié)
+
+        Args:
+            name: Nom du modèle ('market_value', 'profiler')
+            artifact: Estimateurs ajustés et paramètres à restaurer
+            feature_columns: Colonnes d'entrée, dans l'ordre attendu par les estimateurs
+            training_data: Données d'entraînement (pour l'empreinte)
+            metrics: Métriques d'évaluation conservées dans le manifeste
+
+        Returns:
+            Clé de l'artefact
+        """
+        import joblib
+
+        key = f"{self.schema_hash(feature_columns)}-{self.data_hash(training_data)}"
+        directory = self.root / name / key
+        directory.mkdir(parents=True, exist_ok=True)
+        joblib.dump(artifact, directory / 'model.joblib')
+        manifest = {
+            'name': name,
+            'key': key,
+            'feature_columns': list(feature_columns),
+            'training_rows': len(training_data),
+            'metrics': {metric: float(value) for metric, value in (metrics or {}).items()
+                        if isinstance(value, (int, float))},
+            'created_at': datetime.now().isoformat(timespec='seconds')
+        }
+        (directory / 'manifest.json').write_text(json.dumps(manifest, indent=2))
+        return key
+
+    def publish(self, name: str, key: str):
+        """Désigne un artefact comme modèle servi pour son schéma de features"""
+        manifest = self.manifest(name, key)
+        published = self._published(name)
+        published[self.schema_hash(manifest['feature_columns'])] = key
+        (self.root / name / 'published.json').write_text(json.dumps(published, indent=2))
+
+    def manifest(self, name: str, key: str) -> Dict[str, Any]:
+        """Manifeste d'un artefact"""
+        path = self.root / name / key / 'manifest.json'
+        if not path.exists():
+            raise KeyError(f"Artefact inconnu: {name}/{key}")
+        return json.loads(path.read_text())
+
+    def list(self, name: Optional[str] = None) -> pd.DataFrame:
+        """Artefacts du registre, avec leur statut de publication"""
+        rows = []
+        names = [name] if name else sorted(path.name for path in self.root.glob('*') if path.is_dir())
+        for model in names:
+            published = set(self._published(model).values())
+            for path in sorted((self.root / model).glob('*/manifest.json')):
+                manifest = json.loads(path.read_text())
+                rows.append({'name': model, 'key': manifest['key'], 'published': manifest['key'] in published,
+                             'training_rows': manifest['training_rows'], 'created_at': manifest['created_at']})
+        return pd.DataFrame(rows, columns=['name', 'key', 'published', 'training_rows', 'created_at'])
+
+    def load(self, name: str, key: str, mmap: bool = True) -> Dict[str, Any]:
+        """
+        Charge un artefact (une seule fois par processus)
+
+        Args:
+            name: Nom du modèle
+            key: Clé de l'artefact
+            mmap: Tableaux NumPy projetés en mémoire plutôt que lus
+        """
+        import joblib
+
+        cache_key = f"{name}/{key}"
+        with self._lock:
+            if cache_key not in self._loaded:
+                path = self.root / name / key / 'model.joblib'
+                if not path.exists():
+                    raise KeyError(f"Artefact inconnu: {cache_key}")
+                self._loaded[cache_key] = joblib.load(path, mmap_mode='r' if mmap else None)
+            return self._loaded[cache_key]
+
+    def load_published(self, name: str, feature_columns: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """
+        Artefact publié pour un schéma de features
+
+        Returns:
+            Artefact, ou None si aucun modèle n'est publié pour ce schéma
+        """
+        key = self._published(name).get(self.schema_hash(feature_columns))
+        return self.load(name, key) if key else None
+
+    def _published(self, name: str) -> Dict[str, str]:
+        path = self.root / name / 'published.json'
+        return json.loads(path.read_text()) if path.exists() else {}
+
+
+def train(registry: ModelRegistry, name: str, data: Optional[pd.DataFrame] = None) -> str:
+    """
+    Entraîne un modèle et l'enregistre (sans le publier)
+
+    Args:
+        registry: Registre cible
+        name: 'market_value' ou 'profiler'
+        data: Données d'entraînement (données de démonstration par défaut)
+
+    Returns:
+        Clé de l'artefact
+
+    Raises:
+        ValueError: Modèle inconnu, ou données fournies sans les colonnes requises
+                    (jamais de repli silencieux sur les données de démonstration)
+    """
+    try:
+        from .scouting_engine import MarketValuePredictor, PlayerProfiler
+    except ImportError:
+        from scouting_engine import MarketValuePredictor, PlayerProfiler
+
+    if name == 'market_value':
+        predictor = MarketValuePredictor()
+        if data is None:
+            data = predictor._generate_market_demo_data()
+        missing = [col for col in list(predictor.FEATURE_DEFAULTS) + ['market_value'] if col not in data.columns]
+        if missing:
+            raise ValueError(f"Colonnes manquantes pour market_value: {', '.join(missing)}")
+        metrics = predictor.train_model(data)
+        return registry.save(name, predictor.artifact(), list(predictor.FEATURE_DEFAULTS),
+                             data[list(predictor.FEATURE_DEFAULTS) + ['market_value']], metrics)
+    if name == 'profiler':
+        profiler = PlayerProfiler()
+        if data is None:
+            data = profiler._generate_demo_stats(2_000)
+        if not any(col in data.columns for col in profiler.PROFILE_METRICS):
+            raise ValueError(f"Aucune métrique de profilage dans les données "
+                             f"(attendu parmi: {', '.join(profiler.PROFILE_METRICS)})")
+        profiles = profiler.create_player_profiles(data)
+        return registry.save(name, profiler.artifact(), profiler.feature_columns,
+                             data[profiler.feature_columns], {'n_clusters': profiles['player_cluster'].nunique()})
+    raise ValueError(f"Modèle inconnu: {name}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Registre des modèles de scouting")
+    parser.add_argument('--root', default=None, help="répertoire du registre")
+    commands = parser.add_subparsers(dest='command', required=True)
+    train_parser = commands.add_parser('train', help="entraîne et enregistre un modèle")
+    train_parser.add_argument('name', choices=['market_value', 'profiler'])
+    train_parser.add_argument('--data', help="données d'entraînement (.parquet ou .csv)")
+    train_parser.add_argument('--publish', action='store_true', help="publie le modèle entraîné")
+    publish_parser = commands.add_parser('publish', help="publie un artefact enregistré")
+    publish_parser.add_argument('name')
+    publish_parser.add_argument('key')
+    commands.add_parser('list', help="liste les artefacts")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    if args.command == 'train':
+        data = None
+        if args.data:
+            data = pd.read_parquet(args.data) if args.data.endswith('.parquet') else pd.read_csv(args.data)
+        try:
+            key = train(registry, args.name, data)
+        except ValueError as error:
+            raise SystemExit(f"❌ {error}")
+        print(f"✅ {args.name} entraîné: {key}")
+        if args.publish:
+            registry.publish(args.name, key)
+            print(f"📦 {args.name}/{key} publié")
+    elif args.command == 'publish':
+        registry.publish(args.name, args.key)
+        print(f"📦 {args.name}/{args.key} publié")
+    else:
+        print(registry.list().to_string(index=False))
@@ -0,0 +1,524 @@
+"""
+Stockage Analytique Local en Parquet
+====================================
+
+Alternative à PostgreSQL pour les déploiements sans base : les tables de
+create_schema.sql sont conservées en jeux Parquet partitionnés (Hive) :
+
+    matches/season=2024-2025/league=<league_id>/
+    player_match_stats/season=2024-2025/league=<league_id>/     (trié par joueur)
+    match_events/season=2024-2025/league=<league_id>/match=<match_id>/
+    physical_data/season=2024-2025/                              (trié par joueur)
+    leagues/, teams/, players/, positions/, player_team_contracts/
+
+Les lectures ne décodent que les colonnes demandées et les filtres sont
+poussés jusqu'aux fichiers : élagage des partitions (saison, championnat,
+match) puis des groupes de lignes par leurs statistiques min/max. Les
+événements d'un match sont lus directement dans leur répertoire, localisé par
+l'index des matchs gardé en mémoire.
+
+ParquetStore expose read_sql(query, params) comme DatabaseManager : les
+requêtes de PlayerPerformanceAnalyzer, TacticalAnalyzer et MatchEventCache
+y sont traduites en lectures Parquet (voir register_query pour en ajouter).
+
+Usage:
+    store = ParquetStore('data/store')
+    store.import_directory('data/load_test')        # fragments de synthetic_dataset.py
+    analyzer = TacticalAnalyzer(store)
+    analyzer.analyze_team_formation(team_id, match_id)
+
+Author: Football Analytics Platform
+"""
+
+import decimal
+import logging
+import re
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .performance_analyzer import PlayerPerformanceAnalyzer, TacticalAnalyzer
+    from .match_event_cache import MatchEventCache
+except ImportError:
+    from performance_analyzer import PlayerPerformanceAnalyzer, TacticalAnalyzer
+    from match_event_cache import MatchEventCache
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(query: str) -> str:
+    """Texte de requête sans différences d'espacement"""
+    return re.sub(r'\s+', ' ', query).strip()
+
+
+def season_of(dates: pd.Series) -> pd.Series:
+    """Saison (1er juillet - 30 juin) de chaque date, au format '2024-2025'"""
+    dates = pd.to_datetime(dates)
+    start = dates.dt.year - (dates.dt.month < 7)
+    return start.astype(str) + '-' + (start + 1).astype(str)
+
+
+class ParquetStore:
+    """Tables du schéma en Parquet partitionné, interrogeables comme DatabaseManager"""
+
+    # Colonnes de partition (Hive) par table de faits ; les autres tables tiennent en un fichier
+    PARTITIONS = {
+        'matches': ['season', 'league'],
+        'player_match_stats': ['season', 'league'],
+        'match_events': ['season', 'league', 'match'],
+        'physical_data': ['season']
+    }
+
+    # Tri dans chaque fichier : les statistiques des groupes de lignes deviennent sélectives
+    SORT_KEYS = {
+        'matches': ['match_date'],
+        'player_match_stats': ['player_id', 'match_id'],
+        'match_events': ['minute', 'second_in_minute'],
+        'physical_data': ['player_id', 'date']
+    }
+
+    DIMENSIONS = ['leagues', 'teams', 'positions', 'players', 'player_team_contracts']
+
+    ROW_GROUP_SIZE = 8_192
+
+    def __init__(self, root, compression: str = 'zstd'):
+        """
+        Args:
+            root: Répertoire du stockage
+            compression: Codec Parquet des fichiers écrits
+        """
+        self.root = Path(root)
+        self.compression = compression
+        self._datasets: Dict[str, Any] = {}
+        self._dimensions: Dict[str, pd.DataFrame] = {}
+        self._match_index: Optional[pd.DataFrame] = None
+        self._handlers: Dict[str, Callable[[tuple], pd.DataFrame]] = {}
+        self._register_analyzer_queries()
+
+    # ------------------------------------------------------------------
+    # Interface DatabaseManager
+    # ------------------------------------------------------------------
+
+    def connect(self) -> bool:
+        """Vérifie la présence du stockage et charge l'index des matchs"""
+        if not (self.root / 'matches').is_dir():
+            logger.error(f"❌ Stockage Parquet introuvable: {self.root}")
+            return False
+        self.match_index()
+        logger.info(f"✅ Stockage Parquet ouvert: {self.root}")
+        return True
+
+    def disconnect(self):
+        """Libère les jeux de données et index gardés en mémoire"""
+        self._datasets.clear()
+        self._dimensions.clear()
+        self._match_index = None
+
+    def read_sql(self, query: str, params: tuple = None) -> pd.DataFrame:
+        """
+        Exécute une requête enregistrée sur les fichiers Parquet
+
+        Args:
+            query: Texte SQL d'une requête enregistrée (espacement indifférent)
+            params: Paramètres positionnels de la requête
+
+        Returns:
+            DataFrame aux mêmes colonnes que la requête SQL
+        """
+        handler = self._handlers.get(_normalize(query))
+        if handler is None:
+            raise NotImplementedError(f"Requête non prise en charge par le stockage Parquet: {_normalize(query)[:80]}...")
+        return handler(tuple(params or ()))
+
+    def register_query(self, query: str, handler: Callable[[tuple], pd.DataFrame]):
+        """
+        Associe un texte SQL à sa traduction en lectures Parquet
+
+        Args:
+            query: Requête telle qu'envoyée à read_sql
+            handler: Fonction (params) -> DataFrame
+        """
+        self._handlers[_normalize(query)] = handler
+
+    # ------------------------------------------------------------------
+    # Lectures
+    # ------------------------------------------------------------------
+
+    def scan(self, table: str, columns: Optional[Sequence[str]] = None,
+             filters: Optional[List[tuple]] = None) -> pd.DataFrame:
+        """
+        Lit une table avec projection de colonnes et filtres poussés aux fichiers
+
+        Args:
+            table: Nom de la table
+            columns: Colonnes à décoder (colonnes de la table par défaut)
+            filters: Conditions [(colonne, op, valeur)] combinées par ET, au format
+                     pyarrow ('=', '!=', '<', '<=', '>', '>=', 'in', 'not in') ;
+                     les colonnes de partition (season, league, match) élaguent les répertoires
+
+        Returns:
+            DataFrame des lignes retenues
+        """
+        import pyarrow.parquet as pq
+
+        dataset = self._dataset(table)
+        if dataset is None:
+            return pd.DataFrame(columns=list(columns or []))
+        if columns is None:
+            partitions = set(self.PARTITIONS.get(table, []))
+            columns = [name for name in dataset.schema.names if name not in partitions]
+        expression = pq.filters_to_expression(filters) if filters else None
+        return dataset.to_table(columns=list(columns), filter=expression).to_pandas()
+
+    def match_events(self, match_id: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Événements d'un match, lus dans le seul répertoire de sa partition
+
+        Args:
+            match_id: ID du match
+            columns: Colonnes à décoder
+
+        Returns:
+            Événements triés par (minute, second_in_minute)
+        """
+        import pyarrow.parquet as pq
+
+        index = self.match_index()
+        key = str(match_id)
+        if key not in index.index:
+            return pd.DataFrame(columns=list(columns or []))
+        season, league = index.loc[key, ['season', 'league']]
+        directory = self.root / 'match_events' / f'season={season}' / f'league={league}' / f'match={key}'
+        files = sorted(directory.glob('*.parquet'))
+        if not files:
+            return pd.DataFrame(columns=list(columns or []))
+        tables = [pq.read_table(path, columns=list(columns) if columns else None) for path in files]
+        events = tables[0].to_pandas() if len(tables) == 1 else pd.concat(
+            [table.to_pandas() for table in tables], ignore_index=True)
+        if len(files) > 1 and {'minute', 'second_in_minute'} <= set(events.columns):
+            events = events.sort_values(['minute', 'second_in_minute'], kind='stable', ignore_index=True)
+        return events
+
+    def match_index(self) -> pd.DataFrame:
+        """Matchs indexés par match_id : saison, championnat, date et équipes"""
+        if self._match_index is None:
+            index = self.scan('matches', ['match_id', 'league_id', 'home_team_id', 'away_team_id',
+                                          'match_date', 'season', 'league'])
+            self._match_index = index.set_index('match_id')
+        return self._match_index
+
+    def dimension(self, table: str) -> pd.DataFrame:
+        """Table de référence complète, gardée en mémoire"""
+        if table not in self._dimensions:
+            self._dimensions[table] = self.scan(table)
+        return self._dimensions[table]
+
+    def _dataset(self, table: str):
+        """Jeu de données pyarrow de la table (découverte des fichiers une seule fois)"""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        if table not in self._datasets:
+            directory = self.root / table
+            if not directory.is_dir():
+                return None
+            fields = [pa.field(name, pa.string()) for name in self.PARTITIONS.get(table, [])]
+            partitioning = ds.partitioning(pa.schema(fields), flavor='hive') if fields else None
+            self._datasets[table] = ds.dataset(directory, format='parquet', partitioning=partitioning)
+        return self._datasets[table]
+
+    # ------------------------------------------------------------------
+    # Écritures
+    # ------------------------------------------------------------------
+
+    def write(self, table: str, frame: pd.DataFrame) -> int:
+        """
+        Ajoute des lignes à une table (un fichier par partition touchée)
+
+        Les matchs doivent être écrits avant les statistiques et événements,
+        dont la partition est déduite de l'index des matchs.
+
+        Args:
+            table: Nom de la table
+            frame: Lignes au schéma de la table
+
+        Returns:
+            Nombre de lignes écrites
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        frame = self._arrow_ready(frame)
+        if table in self.DIMENSIONS:
+            return self._write_dimension(table, frame)
+        if table not in self.PARTITIONS:
+            raise ValueError(f"Table inconnue du stockage Parquet: {table}")
+
+        frame = self._with_partitions(table, frame)
+        sort_keys = [col for col in self.PARTITIONS[table] + self.SORT_KEYS[table] if col in frame.columns]
+        frame = frame.sort_values(sort_keys, kind='stable', ignore_index=True)
+        arrow_table = pa.Table.from_pandas(frame, preserve_index=False)
+        fields = [pa.field(name, pa.string()) for name in self.PARTITIONS[table]]
+        ds.write_dataset(
+            arrow_table, self.root / table, format='parquet',
+            partitioning=ds.partitioning(pa.schema(fields), flavor='hive'),
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+            max_partitions=max(1024, len(frame)),
+            max_rows_per_group=self.ROW_GROUP_SIZE, min_rows_per_group=min(self.ROW_GROUP_SIZE, len(frame)),
+            file_options=ds.ParquetFileFormat().make_write_options(compression=self.compression)
+        )
+        self._invalidate(table)
+        return len(frame)
+
+    def drop(self, table: str):
+        """Supprime une table du stockage"""
+        shutil.rmtree(self.root / table, ignore_errors=True)
+        self._invalidate(table)
+
+    def import_directory(self, source_dir, tables: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Importe les fichiers produits par synthetic_dataset.py (Parquet ou CSV)
+
+        Args:
+            source_dir: Répertoire {table}/.../{table}.parquet|csv
+            tables: Tables à importer (toutes par défaut, matchs en premier)
+
+        Returns:
+            Lignes importées par table
+        """
+        order = self.DIMENSIONS + list(self.PARTITIONS)
+        report = []
+        for table in tables or order:
+            files = sorted(Path(source_dir, table).rglob(f'{table}.*'))
+            if table in self.DIMENSIONS and files:
+                self.drop(table)
+            rows = 0
+            for path in files:
+                frame = pd.read_parquet(path) if path.suffix == '.parquet' else pd.read_csv(path)
+                rows += self.write(table, frame)
+            report.append({'table': table, 'files': len(files), 'rows': rows})
+        return pd.DataFrame(report)
+
+    def export_database(self, manager, tables: Optional[Sequence[str]] = None,
+                        chunk_rows: int = 200_000) -> pd.DataFrame:
+        """
+        Copie des tables PostgreSQL dans le stockage, par blocs (stream_sql)
+
+        Args:
+            manager: DatabaseManager connecté
+            tables: Tables à copier (toutes par défaut)
+            chunk_rows: Lignes par bloc lu puis écrit
+
+        Returns:
+            Lignes copiées par table
+        """
+        report = []
+        for table in tables or self.DIMENSIONS + list(self.PARTITIONS):
+            self.drop(table)
+            rows = sum(self.write(table, chunk)
+                       for chunk in manager.stream_sql(f"SELECT * FROM {table}", chunk_rows=chunk_rows))
+            report.append({'table': table, 'rows': rows})
+        return pd.DataFrame(report)
+
+    def _write_dimension(self, table: str, frame: pd.DataFrame) -> int:
+        """Ajoute un fichier à une table de référence"""
+        directory = self.root / table
+        directory.mkdir(parents=True, exist_ok=True)
+        frame.to_parquet(directory / f"part-{uuid.uuid4().hex}.parquet", index=False,
+                         compression=self.compression)
+        self._invalidate(table)
+        return len(frame)
+
+    def _with_partitions(self, table: str, frame: pd.DataFrame) -> pd.DataFrame:
+        """Ajoute les colonnes de partition (saison, championnat, match)"""
+        if table == 'matches':
+            return frame.assign(season=season_of(frame['match_date']).to_numpy(),
+                                league=frame['league_id'].astype(str).to_numpy())
+        if table == 'physical_data':
+            return frame.assign(season=season_of(frame['date']).to_numpy())
+
+        index = self.match_index()
+        located = index.reindex(frame['match_id'].astype(str))
+        if located['season'].isna().any():
+            raise ValueError(f"{table}: matchs absents du stockage (écrire la table matches d'abord)")
+        frame = frame.assign(season=located['season'].to_numpy(), league=located['league'].to_numpy())
+        if table == 'match_events':
+            frame['match'] = frame['match_id'].astype(str).to_numpy()
+        return frame
+
+    def _arrow_ready(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Convertit les UUID et Decimal (psycopg2) en texte et flottants"""
+        converted = {}
+        for col in frame.columns[frame.dtypes == object]:
+            sample = frame[col].dropna()
+            if sample.empty:
+                continue
+            if isinstance(sample.iloc[0], uuid.UUID):
+                converted[col] = frame[col].map(lambda value: str(value) if value is not None else None)
+            elif isinstance(sample.iloc[0], decimal.Decimal):
+                converted[col] = pd.to_numeric(frame[col], errors='coerce')
+        return frame.assign(**converted) if converted else frame
+
+    def _invalidate(self, table: str):
+        """Oublie les fichiers découverts et index d'une table modifiée"""
+        self._datasets.pop(table, None)
+        self._dimensions.pop(table, None)
+        if table == 'matches':
+            self._match_index = None
+
+    # ------------------------------------------------------------------
+    # Requêtes des analyseurs
+    # ------------------------------------------------------------------
+
+    def _register_analyzer_queries(self):
+        """Traductions des requêtes de PlayerPerformanceAnalyzer, TacticalAnalyzer et MatchEventCache"""
+        self.register_query(PlayerPerformanceAnalyzer.PLAYER_FORM_QUERY, self._player_form)
+        self.register_query(PlayerPerformanceAnalyzer.COMPARE_PLAYERS_QUERY, self._compare_players)
+        self.register_query(PlayerPerformanceAnalyzer.COMPARE_PLAYERS_QUERY + " AND pos.code = %s",
+                            self._compare_players)
+        self.register_query(PlayerPerformanceAnalyzer.MATCH_HEATMAP_QUERY, self._match_heatmap)
+        self.register_query(PlayerPerformanceAnalyzer.RECENT_HEATMAP_QUERY, self._recent_heatmap)
+        self.register_query(TacticalAnalyzer.LINEUP_QUERY, self._lineup)
+        self.register_query(TacticalAnalyzer.PLAYER_NAMES_QUERY, self._player_names)
+        self.register_query(MatchEventCache.FETCH_QUERY, self._event_cache_fetch)
+
+    def _player_form(self, params: tuple) -> pd.DataFrame:
+        player_id, last_n = params
+        stats = self.scan('player_match_stats', filters=[('player_id', '=', str(player_id))])
+        stats = stats[stats['minutes_played'] > 0]
+        matches = self.match_index().reindex(stats['match_id'].astype(str))
+        opponent_id = np.where(matches['home_team_id'].to_numpy() == stats['team_id'].astype(str).to_numpy(),
+                               matches['away_team_id'].to_numpy(), matches['home_team_id'].to_numpy())
+        names = self.dimension('teams').set_index('team_id')['name']
+        stats = stats.assign(match_date=matches['match_date'].to_numpy(),
+                             opponent=names.reindex(opponent_id).to_numpy())
+        stats = stats[stats['opponent'].notna()]
+        return stats.sort_values('match_date', ascending=False).head(int(last_n)).reset_index(drop=True)
+
+    def _compare_players(self, params: tuple) -> pd.DataFrame:
+        # Même périmètre que la vue player_season_stats (cumuls de SeasonStatsMaintainer) :
+        # matchs terminés, joueurs entrés en jeu, saison du championnat (leagues.season),
+        # une ligne par (joueur, équipe, saison)
+        season = '2024-2025'
+        player_ids = [str(player_id) for player_id in params[0]]
+        leagues = self.dimension('leagues')
+        league_ids = sorted(leagues.loc[leagues['season'] == season, 'league_id'].astype(str))
+        matches = self.scan('matches', filters=[('league', 'in', league_ids)]) if league_ids else pd.DataFrame()
+        if 'status' in matches.columns:
+            matches = matches[matches['status'] == 'Finished']
+        stats = self.scan('player_match_stats', filters=[('league', 'in', league_ids),
+                                                         ('player_id', 'in', player_ids)]) \
+            if league_ids else pd.DataFrame(columns=['player_id', 'team_id', 'match_id', 'minutes_played'])
+        stats = stats[(stats['minutes_played'] > 0) &
+                      stats['match_id'].astype(str).isin(matches.get('match_id', pd.Series(dtype=str)).astype(str)) &
+                      stats['team_id'].astype(str).isin(self.dimension('teams')['team_id'].astype(str))]
+        totals = stats.groupby(['player_id', 'team_id']).agg(
+            total_goals=('goals', 'sum'), total_assists=('assists', 'sum'),
+            total_xg=('xg', 'sum'), total_xa=('xa', 'sum'), avg_rating=('rating', 'mean'),
+            passes_completed=('passes_completed', 'sum'), passes_total=('passes_total', 'sum'),
+            tackles_won=('tackles_won', 'sum'), tackles_total=('tackles_total', 'sum'),
+            matches_played=('match_id', 'size'), total_minutes=('minutes_played', 'sum')
+        ).reset_index()
+        totals['avg_rating'] = totals['avg_rating'].round(2)
+        totals['pass_accuracy_pct'] = totals['passes_completed'] / totals['passes_total'].replace(0, np.nan) * 100
+        totals['tackle_success_pct'] = totals['tackles_won'] / totals['tackles_total'].replace(0, np.nan) * 100
+
+        players = self.dimension('players')
+        contracts = self.dimension('player_team_contracts')
+        contracts = contracts[contracts['end_date'].isna()][['player_id', 'primary_position_id']]
+        positions = self.dimension('positions')[['position_id', 'name', 'code']].rename(
+            columns={'name': 'position', 'position_id': 'primary_position_id'})
+        comparison = totals.merge(players[['player_id', 'first_name', 'last_name']], on='player_id') \
+            .merge(contracts, on='player_id', how='left') \
+            .merge(positions, on='primary_position_id', how='left')
+        if len(params) > 1:
+            comparison = comparison[comparison['code'] == params[1]]
+        comparison['player_name'] = comparison['first_name'] + ' ' + comparison['last_name']
+        return comparison[['player_name', 'position', 'total_goals', 'total_assists', 'total_xg', 'total_xa',
+                           'avg_rating', 'pass_accuracy_pct', 'tackle_success_pct', 'matches_played',
+                           'total_minutes']].reset_index(drop=True)
+
+    def _match_heatmap(self, params: tuple) -> pd.DataFrame:
+        player_id, match_id = params
+        events = self.match_events(match_id, ['player_id', 'x_coordinate', 'y_coordinate', 'event_type'])
+        events = events[(events['player_id'] == str(player_id)) &
+                        events['x_coordinate'].notna() & events['y_coordinate'].notna()]
+        return events[['x_coordinate', 'y_coordinate', 'event_type']].reset_index(drop=True)
+
+    def _recent_heatmap(self, params: tuple) -> pd.DataFrame:
+        player_id, since = params
+        index = self.match_index()
+        recent = index[index['match_date'] >= pd.Timestamp(since)]
+        if recent.empty:
+            return pd.DataFrame(columns=['x_coordinate', 'y_coordinate', 'event_type'])
+        events = self.scan('match_events', ['x_coordinate', 'y_coordinate', 'event_type'], filters=[
+            ('season', 'in', sorted(recent['season'].unique())),
+            ('match', 'in', list(recent.index)),
+            ('player_id', '=', str(player_id))
+        ])
+        return events.dropna(subset=['x_coordinate', 'y_coordinate']).reset_index(drop=True)
+
+    def _lineup(self, params: tuple) -> pd.DataFrame:
+        team_id, match_id = params
+        index = self.match_index()
+        key = str(match_id)
+        if key not in index.index:
+            return pd.DataFrame(columns=['player_id', 'player_name', 'position', 'minutes_played'])
+        season, league = index.loc[key, ['season', 'league']]
+        stats = self.scan('player_match_stats', ['player_id', 'position_played_id', 'minutes_played'], filters=[
+            ('season', '=', season), ('league', '=', league),
+            ('match_id', '=', key), ('team_id', '=', str(team_id)), ('minutes_played', '>', 0)
+        ])
+        players = self.dimension('players')[['player_id', 'first_name', 'last_name']]
+        positions = self.dimension('positions')[['position_id', 'code']].rename(
+            columns={'position_id': 'position_played_id', 'code': 'position'})
+        lineup = stats.merge(players, on='player_id').merge(positions, on='position_played_id')
+        lineup['player_name'] = lineup['first_name'] + ' ' + lineup['last_name']
+        lineup = lineup.sort_values('minutes_played', ascending=False, kind='stable')
+        return lineup[['player_id', 'player_name', 'position', 'minutes_played']].reset_index(drop=True)
+
+    def _player_names(self, params: tuple) -> pd.DataFrame:
+        players = self.dimension('players')
+        players = players[players['player_id'].isin([str(player_id) for player_id in params[0]])]
+        return pd.DataFrame({'player_id': players['player_id'].to_numpy(),
+                             'player_name': (players['first_name'] + ' ' + players['last_name']).to_numpy()})
+
+    def _event_cache_fetch(self, params: tuple) -> pd.DataFrame:
+        return self.match_events(params[0], list(MatchEventCache.DTYPES))
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description="Stockage analytique Parquet")
+    parser.add_argument('root', help="répertoire du stockage")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--synthetic', help="importe les fragments de synthetic_dataset.py")
+    source.add_argument('--database', action='store_true', help="copie les tables PostgreSQL")
+    args = parser.parse_args()
+
+    store = ParquetStore(args.root)
+    start = time.perf_counter()
+    if args.synthetic:
+        report = store.import_directory(args.synthetic)
+    else:
+        sys.path.append(str(Path(__file__).resolve().parents[2]))
+        from configs.database import DatabaseManager
+
+        manager = DatabaseManager()
+        if not manager.connect():
+            raise SystemExit("❌ Impossible de se connecter à la base de données")
+        try:
+            report = store.export_database(manager)
+        finally:
+            manager.disconnect()
+    print(report.to_string(index=False))
+    print(f"✅ Stockage prêt en {time.perf_counter() - start:.1f}s: {store.root}")
@@ -0,0 +1,166 @@
+"""
+Réseau de Passes
+================
+
+Construit le réseau de passes d'une équipe à partir des événements d'un seul
+match : les événements sont triés sur l'horloge du match (minute,
+second_in_minute) puis parcourus une seule fois. Une passe réussie relie son
+auteur au joueur de l'événement suivant lorsque celui-ci appartient à la même
+équipe ; une passe suivie d'un événement adverse n'a pas de receveur.
+
+Le réseau est stocké dans une matrice d'adjacence creuse (passeur x receveur)
+d'où sont dérivées les métriques de centralité.
+
+Author: Football Analytics Platform
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from typing import Dict, List, Optional
+
+
+class PassNetwork:
+    """Réseau passeur → receveur d'une équipe sur un match"""
+
+    def __init__(self, players: List, adjacency: sparse.csr_matrix):
+        """
+        Args:
+            players: Identifiants des joueurs (ordre des lignes et colonnes)
+            adjacency: Matrice creuse du nombre de passes passeur → receveur
+        """
+        self.players = list(players)
+        self.adjacency = adjacency
+
+    @classmethod
+    def from_events(cls, events_data: pd.DataFrame, team_id) -> 'PassNetwork':
+        """
+        Construit le réseau d'une équipe en un seul parcours des événements
+
+        Args:
+            events_data: Événements d'un match [minute, second_in_minute,
+                         event_type, player_id, team_id, success]
+            team_id: Équipe analysée
+
+        Returns:
+            Réseau de passes de l'équipe
+        """
+        sort_cols = [col for col in ('minute', 'second_in_minute') if col in events_data.columns]
+        events = events_data.sort_values(sort_cols, kind='stable') if sort_cols else events_data
+
+        teams = events['team_id'].to_numpy()
+        players = events['player_id'].to_numpy()
+        completed = (events['event_type'] == 'Pass').to_numpy()
+        if 'success' in events.columns:
+            completed = completed & events['success'].fillna(False).astype(bool).to_numpy()
+
+        # Passe réussie i → événement suivant i + 1 du même club, joué par un autre joueur
+        passer_team, next_team = teams[:-1], teams[1:]
+        is_edge = (
+            completed[:-1] & (passer_team == team_id) & (next_team == team_id) &
+            (players[:-1] != players[1:]) & pd.notna(players[:-1]) & pd.notna(players[1:])
+        )
+        passers, receivers = players[:-1][is_edge], players[1:][is_edge]
+
+        codes, team_players = pd.factorize(np.concatenate([passers, receivers]))
+        n_players = len(team_players)
+        n_edges = len(passers)
+        adjacency = sparse.coo_matrix(
+            (np.ones(n_edges, dtype=np.int64), (codes[:n_edges], codes[n_edges:])),
+            shape=(n_players, n_players)
+        ).tocsr()
+        return cls(team_players, adjacency)
+
+    @property
+    def total_passes(self) -> int:
+        """Nombre de passes réussies ayant un receveur identifié"""
+        return int(self.adjacency.sum())
+
+    def edges(self, min_passes: int = 1) -> pd.DataFrame:
+        """
+        Liste des connexions passeur → receveur
+
+        Args:
+            min_passes: Nombre minimal de passes pour retenir une connexion
+
+        Returns:
+            DataFrame [passer_id, receiver_id, pass_count] trié par volume décroissant
+        """
+        coo = self.adjacency.tocoo()
+        keep = coo.data >= min_passes
+        players = np.asarray(self.players, dtype=object)
+        edges = pd.DataFrame({
+            'passer_id': players[coo.row[keep]],
+            'receiver_id': players[coo.col[keep]],
+            'pass_count': coo.data[keep]
+        })
+        return edges.sort_values('pass_count', ascending=False, kind='stable').reset_index(drop=True)
+
+    def centrality(self, max_iterations: int = 100, tolerance: float = 1e-8) -> pd.DataFrame:
+        """
+        Métriques de centralité par joueur
+
+        Returns:
+            DataFrame [player_id, passes_made, passes_received, degree_centrality,
+            eigenvector_centrality] trié par centralité de vecteur propre
+        """
+        n_players = len(self.players)
+        passes_made = np.asarray(self.adjacency.sum(axis=1)).ravel()
+        passes_received = np.asarray(self.adjacency.sum(axis=0)).ravel()
+
+        # Centralité de degré : partenaires distincts (en passe ou en réception)
+        undirected = (self.adjacency + self.adjacency.T).tocsr()
+        partners = np.diff(undirected.indptr)
+        degree = partners / (n_players - 1) if n_players > 1 else np.zeros(n_players)
+
+        # Centralité de vecteur propre du graphe non orienté pondéré (puissance itérée
+        # sur A + I, même vecteur propre sans oscillation sur les graphes bipartis)
+        eigenvector = np.full(n_players, 1 / np.sqrt(n_players)) if n_players else np.zeros(0)
+        for _ in range(max_iterations if n_players else 0):
+            updated = undirected @ eigenvector + eigenvector
+            norm = np.linalg.norm(updated)
+            if norm == 0:
+                break
+            updated /= norm
+            converged = np.abs(updated - eigenvector).max() < tolerance
+            eigenvector = updated
+            if converged:
+                break
+
+        centrality = pd.DataFrame({
+            'player_id': self.players,
+            'passes_made': passes_made.astype(np.int64),
+            'passes_received': passes_received.astype(np.int64),
+            'degree_centrality': degree,
+            'eigenvector_centrality': eigenvector
+        })
+        return centrality.sort_values('eigenvector_centrality', ascending=False).reset_index(drop=True)
+
+    def summary(self, min_passes: int = 3, top_n: int = 10,
+                player_names: Optional[Dict] = None) -> Dict:
+        """
+        Résumé du réseau au format de TacticalAnalyzer
+
+        Args:
+            min_passes: Seuil de passes pour une connexion
+            top_n: Nombre de connexions les plus fortes retournées
+            player_names: Correspondance optionnelle player_id → nom affiché
+
+        Returns:
+            Dictionnaire avec connexions, centralités et matrice creuse
+        """
+        edges = self.edges(min_passes)
+        centrality = self.centrality()
+        if player_names:
+            edges['passer_name'] = edges['passer_id'].map(player_names)
+            edges['receiver_name'] = edges['receiver_id'].map(player_names)
+            centrality['player_name'] = centrality['player_id'].map(player_names)
+
+        return {
+            "total_passes": self.total_passes,
+            "total_connections": len(edges),
+            "strongest_connections": edges.head(top_n).to_dict('records'),
+            "centrality": centrality.to_dict('records'),
+            "players": self.players,
+            "adjacency": self.adjacency
+        }
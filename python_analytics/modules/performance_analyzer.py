@@ -8,6 +8,7 @@ Calcule les métriques avancées (xG, xA, PPDA) et fournit des analyses tactique
 Author: Football Analytics Platform
 """
 
+import asyncio
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
@@ -17,18 +18,39 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from .heatmap_accumulator import HeatmapAccumulator
+    from .pass_network import PassNetwork
+    from .match_event_cache import MatchEventCache
+except ImportError:
+    from heatmap_accumulator import HeatmapAccumulator
+    from pass_network import PassNetwork
+    from match_event_cache import MatchEventCache
+
+def _read_query(db_connection, query_registry, name: str, query: str, params: tuple,
+                param_types: Optional[List[str]] = None) -> pd.DataFrame:
+    """Lit une requête d'analyseur, préparée via le registre s'il est fourni"""
+    if query_registry is not None:
+        return query_registry.read_sql(name, params, query=query, param_types=param_types)
+    # Gestionnaires exposant read_sql (DatabaseManager, ParquetStore) ou connexion/engine SQLAlchemy
+    if hasattr(db_connection, 'read_sql'):
+        return db_connection.read_sql(query, params)
+    return pd.read_sql(query, db_connection, params=params)
+
+
 class FootballMetrics:
     """Classe pour calculer les métriques football avancées"""
     
     def __init__(self):
         self.xg_model = None  # Sera chargé avec un modèle ML pré-entraîné
         
-    def calculate_xg(self, shots_data: pd.DataFrame) -> pd.DataFrame:
+    def calculate_xg(self, shots_data: pd.DataFrame, xg_grid=None) -> pd.DataFrame:
         """
         Calcule l'Expected Goals (xG) basé sur les caractéristiques des tirs
         
         Args:
             shots_data: DataFrame avec colonnes [x, y, situation, body_part, distance, angle]
+            xg_grid: XGGrid optionnelle pour lire distance et xG de base par interpolation
         
         Returns:
             DataFrame avec colonne xG ajoutée
@@ -45,16 +67,27 @@ class FootballMetrics:
         x_col = 'x_coordinate' if 'x_coordinate' in shots_data.columns else 'x'
         y_col = 'y_coordinate' if 'y_coordinate' in shots_data.columns else 'y'
         
-        shots_data['distance_to_goal'] = np.sqrt(
-            (shots_data[x_col] - goal_x) ** 2 + 
-            (shots_data[y_col] - goal_y) ** 2
-        )
+        if xg_grid is not None:
+            geometry = xg_grid.interpolate_many(
+                ['distance', 'xg_logistic'],
+                shots_data[x_col].to_numpy(dtype=np.float64),
+                shots_data[y_col].to_numpy(dtype=np.float64)
+            )
+            shots_data['distance_to_goal'] = geometry['distance']
+        else:
+            shots_data['distance_to_goal'] = np.sqrt(
+                (shots_data[x_col] - goal_x) ** 2 + 
+                (shots_data[y_col] - goal_y) ** 2
+            )
         
         # Calcul de l'angle de tir
         shots_data['angle'] = np.abs(shots_data[y_col] - goal_y) / shots_data['distance_to_goal']
         
         # Modèle xG simplifié (à remplacer par ML)
-        base_xg = 1 / (1 + np.exp(0.1 * shots_data['distance_to_goal'] - 3))
+        if xg_grid is not None:
+            base_xg = geometry['xg_logistic']
+        else:
+            base_xg = 1 / (1 + np.exp(0.1 * shots_data['distance_to_goal'] - 3))
         
         # Ajustements selon la situation
         if 'event_details' in shots_data.columns:
@@ -91,27 +124,69 @@ class FootballMetrics:
         
         return multipliers.get(situation, 1.0)
     
-    def calculate_xa(self, passes_data: pd.DataFrame, shots_data: pd.DataFrame) -> pd.DataFrame:
+    def calculate_xa(self, passes_data: pd.DataFrame, shots_data: pd.DataFrame,
+                     max_seconds: float = 15) -> pd.DataFrame:
         """
         Calcule l'Expected Assists (xA) pour les passes menant à des tirs
         
+        Chaque tir est rattaché à la dernière passe réussie de la même équipe
+        dans le même match, jouée au plus max_seconds avant le tir (merge_asof
+        sur l'horloge du match). La passe reçoit l'xG du premier tir qu'elle
+        précède ; les autres passes ont un xA nul.
+        
         Args:
-            passes_data: DataFrame des passes
-            shots_data: DataFrame des tirs avec xG
+            passes_data: DataFrame des passes [match_id, team_id, minute,
+                         second_in_minute, success]
+            shots_data: DataFrame des tirs avec xG (calculé s'il est absent)
+            max_seconds: Délai maximal entre la passe et le tir
         
         Returns:
             DataFrame des passes avec xA
         """
-        # Simuler la logique xA - en production, analyser les passes précédant les tirs
         passes_data = passes_data.copy()
-        
-        # xA = xG du tir qui suit la passe (si dans les 15 secondes)
-        # Logique simplifiée pour la démo
-        passes_data['xa'] = np.random.exponential(0.1, len(passes_data))  # Valeurs réalistes
-        passes_data['xa'] = np.clip(passes_data['xa'], 0, 0.8)  # Plafond réaliste
+        passes_data['xa'] = 0.0
+        if passes_data.empty or shots_data.empty:
+            return passes_data
+        
+        if 'xg' not in shots_data.columns:
+            shots_data = self.calculate_xg(shots_data)
+        
+        # Seules les passes réussies peuvent être décisives
+        completed = passes_data['success'].fillna(False).astype(bool) \
+            if 'success' in passes_data.columns else np.ones(len(passes_data), dtype=bool)
+        # Clés présentes dans les deux tables (tirs sans team_id : rattachement par match seul)
+        keys = [col for col in ('match_id', 'team_id')
+                if col in passes_data.columns and col in shots_data.columns]
+        
+        passes = passes_data.loc[completed, keys].assign(
+            clock=self._match_clock(passes_data.loc[completed]),
+            pass_position=np.flatnonzero(completed)
+        )
+        shots = shots_data[keys].assign(clock=self._match_clock(shots_data), shot_xg=shots_data['xg'])
+        passes = passes.dropna(subset=['clock']).sort_values('clock', kind='stable')
+        shots = shots.dropna(subset=['clock']).sort_values('clock', kind='stable')
+        
+        # Dernière passe de l'équipe avant chaque tir, par match
+        linked = pd.merge_asof(
+            shots, passes, on='clock', by=keys or None,
+            direction='backward', tolerance=float(max_seconds)
+        ).dropna(subset=['pass_position'])
+        
+        # Une passe suivie de plusieurs tirs (rebonds) ne compte que le premier
+        linked = linked.drop_duplicates(subset='pass_position', keep='first')
+        xa = np.zeros(len(passes_data))
+        xa[linked['pass_position'].to_numpy(dtype=np.int64)] = linked['shot_xg'].to_numpy(dtype=np.float64)
+        passes_data['xa'] = xa
         
         return passes_data
     
+    def _match_clock(self, events_data: pd.DataFrame) -> pd.Series:
+        """Horloge du match en secondes à partir de minute et second_in_minute"""
+        clock = events_data['minute'].astype(np.float64) * 60
+        if 'second_in_minute' in events_data.columns:
+            clock = clock + events_data['second_in_minute'].fillna(0).astype(np.float64)
+        return clock
+    
     def calculate_ppda(self, events_data: pd.DataFrame, team_id: str) -> float:
         """
         Calcule le PPDA (Passes per Defensive Action)
@@ -140,15 +215,138 @@ class FootballMetrics:
         if len(defensive_actions) == 0:
             return float('inf')
         
-        return len(opponent_passes) / len(defensive_actions)
+        return round(len(opponent_passes) / len(defensive_actions), 2)
+    
+    def calculate_league_ppda(self, events_data: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        Calcule le PPDA de toutes les équipes sur tous les matchs en un seul groupby
+        
+        Même définition que calculate_ppda, appliquée à chaque couple (match, équipe)
+        d'un DataFrame multi-matchs, puis agrégée sur la saison.
+        
+        Args:
+            events_data: DataFrame des événements avec colonnes
+                         [match_id, team_id, event_type, x_coordinate]
+                         et optionnellement season
+        
+        Returns:
+            Dictionnaire avec 'by_match' (PPDA par match et équipe) et
+            'by_team' (cumul saison par équipe)
+        """
+        group_cols = ['season'] if 'season' in events_data.columns else []
+        
+        flags = pd.DataFrame({
+            'match_id': events_data['match_id'],
+            'team_id': events_data['team_id'],
+            'defensive_third_passes': (
+                (events_data['event_type'] == 'Pass') &
+                (events_data['x_coordinate'] <= 33.33)
+            ),
+            'defensive_actions': events_data['event_type'].isin(['Tackle', 'Interception', 'Foul'])
+        })
+        for col in group_cols:
+            flags[col] = events_data[col]
+        
+        # Comptages par (match, équipe) ; les événements sans équipe comptent
+        # comme passes adverses, comme dans calculate_ppda
+        counts = flags.groupby(group_cols + ['match_id', 'team_id'], dropna=False).sum()
+        match_passes = counts['defensive_third_passes'].groupby(
+            level=group_cols + ['match_id']
+        ).transform('sum')
+        
+        by_match = pd.DataFrame({
+            'opponent_passes': match_passes - counts['defensive_third_passes'],
+            'defensive_actions': counts['defensive_actions']
+        }).reset_index()
+        by_match = by_match[by_match['team_id'].notna()].reset_index(drop=True)
+        by_match['ppda'] = self._safe_ppda(by_match['opponent_passes'], by_match['defensive_actions'])
+        
+        by_team = by_match.groupby(group_cols + ['team_id']).agg(
+            matches=('match_id', 'nunique'),
+            opponent_passes=('opponent_passes', 'sum'),
+            defensive_actions=('defensive_actions', 'sum'),
+            best_match_ppda=('ppda', 'min')
+        ).reset_index()
+        by_team['ppda'] = self._safe_ppda(by_team['opponent_passes'], by_team['defensive_actions'])
+        by_team = by_team.sort_values(group_cols + ['ppda']).reset_index(drop=True)
+        
+        return {'by_match': by_match, 'by_team': by_team}
+    
+    def _safe_ppda(self, opponent_passes: pd.Series, defensive_actions: pd.Series) -> pd.Series:
+        """Ratio PPDA vectorisé arrondi comme calculate_ppda (infini sans action défensive)"""
+        ppda = opponent_passes / defensive_actions.where(defensive_actions > 0)
+        # round() Python plutôt que Series.round pour des arrondis identiques
+        return ppda.fillna(float('inf')).map(lambda value: round(value, 2))
 
 
 class PlayerPerformanceAnalyzer:
     """Analyseur de performance individuelle des joueurs"""
     
-    def __init__(self, db_connection):
+    # Derniers matchs joués par un joueur, avec l'adversaire
+    PLAYER_FORM_QUERY = """
+        SELECT pms.*, m.match_date, t.name as opponent
+        FROM player_match_stats pms
+        JOIN matches m ON pms.match_id = m.match_id
+        JOIN teams t ON (CASE 
+            WHEN m.home_team_id = pms.team_id THEN m.away_team_id 
+            ELSE m.home_team_id 
+        END) = t.team_id
+        WHERE pms.player_id = %s 
+        AND pms.minutes_played > 0
+        ORDER BY m.match_date DESC
+        LIMIT %s
+        """
+    
+    # Statistiques de saison d'une liste de joueurs (tableau lié en un seul paramètre)
+    COMPARE_PLAYERS_QUERY = """
+        SELECT 
+            p.first_name || ' ' || p.last_name as player_name,
+            pos.name as position,
+            pss.total_goals,
+            pss.total_assists,
+            pss.total_xg,
+            pss.total_xa,
+            pss.avg_rating,
+            pss.pass_accuracy_pct,
+            pss.tackle_success_pct,
+            pss.matches_played,
+            pss.total_minutes
+        FROM player_season_stats pss
+        JOIN players p ON pss.player_id = p.player_id
+        LEFT JOIN player_team_contracts ptc ON p.player_id = ptc.player_id 
+            AND ptc.end_date IS NULL
+        LEFT JOIN positions pos ON ptc.primary_position_id = pos.position_id
+        WHERE pss.player_id = ANY(%s::uuid[])
+        AND pss.season = '2024-2025'
+        """
+    
+    # Positions des actions d'un joueur sur un match
+    MATCH_HEATMAP_QUERY = """
+        SELECT x_coordinate, y_coordinate, event_type
+        FROM match_events 
+        WHERE player_id = %s AND match_id = %s
+        AND x_coordinate IS NOT NULL AND y_coordinate IS NOT NULL
+        """
+    
+    # Positions des actions d'un joueur depuis une date
+    RECENT_HEATMAP_QUERY = """
+        SELECT me.x_coordinate, me.y_coordinate, me.event_type
+        FROM match_events me
+        JOIN matches m ON me.match_id = m.match_id
+        WHERE me.player_id = %s 
+        AND me.x_coordinate IS NOT NULL AND me.y_coordinate IS NOT NULL
+        AND m.match_date >= %s
+        """
+    
+    def __init__(self, db_connection, query_registry=None):
+        """
+        Args:
+            db_connection: Connexion à la base de données
+            query_registry: QueryRegistry optionnel (requêtes préparées et latences)
+        """
         self.db = db_connection
         self.metrics = FootballMetrics()
+        self.query_registry = query_registry
     
     def get_player_form(self, player_id: str, last_n_matches: int = 10) -> Dict:
         """
@@ -161,22 +359,37 @@ class PlayerPerformanceAnalyzer:
         Returns:
             Dictionnaire avec métriques de forme
         """
-        query = """
-        SELECT pms.*, m.match_date, t.name as opponent
-        FROM player_match_stats pms
-        JOIN matches m ON pms.match_id = m.match_id
-        JOIN teams t ON (CASE 
-            WHEN m.home_team_id = pms.team_id THEN m.away_team_id 
-            ELSE m.home_team_id 
-        END) = t.team_id
-        WHERE pms.player_id = %s 
-        AND pms.minutes_played > 0
-        ORDER BY m.match_date DESC
-        LIMIT %s
+        stats = _read_query(self.db, self.query_registry, 'player_form', self.PLAYER_FORM_QUERY,
+                            (player_id, last_n_matches))
+        return self._summarize_form(stats)
+    
+    async def get_players_form_async(self, player_ids: List[str], async_db,
+                                     last_n_matches: int = 10) -> Dict[str, Dict]:
         """
+        Analyse la forme de plusieurs joueurs avec des requêtes concurrentes
         
-        stats = pd.read_sql(query, self.db, params=[player_id, last_n_matches])
+        Args:
+            player_ids: IDs des joueurs
+            async_db: AsyncDatabaseManager
+            last_n_matches: Nombre de matchs à analyser
         
+        Returns:
+            Dictionnaire player_id → métriques de forme
+        """
+        if self.query_registry is not None:
+            frames = await asyncio.gather(*(
+                async_db.run(_read_query, self.db, self.query_registry, 'player_form',
+                             self.PLAYER_FORM_QUERY, (player_id, last_n_matches))
+                for player_id in player_ids
+            ))
+        else:
+            frames = await async_db.gather_sql(
+                [(self.PLAYER_FORM_QUERY, (player_id, last_n_matches)) for player_id in player_ids]
+            )
+        return {player_id: self._summarize_form(stats) for player_id, stats in zip(player_ids, frames)}
+    
+    def _summarize_form(self, stats: pd.DataFrame) -> Dict:
+        """Métriques de forme à partir des derniers matchs d'un joueur"""
         if len(stats) == 0:
             return {"error": "Aucune donnée trouvée pour ce joueur"}
         
@@ -231,36 +444,15 @@ class PlayerPerformanceAnalyzer:
         Returns:
             DataFrame de comparaison
         """
-        placeholders = ','.join(['%s'] * len(player_ids))
-        
-        query = f"""
-        SELECT 
-            p.first_name || ' ' || p.last_name as player_name,
-            pos.name as position,
-            pss.total_goals,
-            pss.total_assists,
-            pss.total_xg,
-            pss.total_xa,
-            pss.avg_rating,
-            pss.pass_accuracy_pct,
-            pss.tackle_success_pct,
-            pss.matches_played,
-            pss.total_minutes
-        FROM player_season_stats pss
-        JOIN players p ON pss.player_id = p.player_id
-        LEFT JOIN player_team_contracts ptc ON p.player_id = ptc.player_id 
-            AND ptc.end_date IS NULL
-        LEFT JOIN positions pos ON ptc.primary_position_id = pos.position_id
-        WHERE pss.player_id IN ({placeholders})
-        AND pss.season = '2024-2025'
-        """
-        
-        params = player_ids
+        query = self.COMPARE_PLAYERS_QUERY
+        params = (list(player_ids),)
         if position_filter:
             query += " AND pos.code = %s"
-            params.append(position_filter)
+            params += (position_filter,)
         
-        comparison = pd.read_sql(query, self.db, params=params)
+        name = 'compare_players_by_position' if position_filter else 'compare_players'
+        param_types = ['uuid[]', 'varchar'] if position_filter else ['uuid[]']
+        comparison = _read_query(self.db, self.query_registry, name, query, params, param_types)
         
         # Calcul des métriques par 90 minutes
         comparison['goals_per_90'] = (comparison['total_goals'] / comparison['total_minutes']) * 90
@@ -283,27 +475,31 @@ class PlayerPerformanceAnalyzer:
         """
         # Requête des événements avec positions
         if match_id:
-            query = """
-            SELECT x_coordinate, y_coordinate, event_type
-            FROM match_events 
-            WHERE player_id = %s AND match_id = %s
-            AND x_coordinate IS NOT NULL AND y_coordinate IS NOT NULL
-            """
-            params = [player_id, match_id]
+            events = _read_query(self.db, self.query_registry, 'match_heatmap',
+                                 self.MATCH_HEATMAP_QUERY, (player_id, match_id))
         else:
-            query = """
-            SELECT me.x_coordinate, me.y_coordinate, me.event_type
-            FROM match_events me
-            JOIN matches m ON me.match_id = m.match_id
-            WHERE me.player_id = %s 
-            AND me.x_coordinate IS NOT NULL AND me.y_coordinate IS NOT NULL
-            AND m.match_date >= %s
-            """
-            params = [player_id, datetime.now() - timedelta(days=30)]
-        
-        events = pd.read_sql(query, self.db, params=params)
-        
-        if len(events) == 0:
+            events = _read_query(self.db, self.query_registry, 'recent_heatmap',
+                                 self.RECENT_HEATMAP_QUERY, (player_id, datetime.now() - timedelta(days=30)))
+        
+        accumulator = HeatmapAccumulator(n_bins_x=20, n_bins_y=14).update(
+            events['x_coordinate'].to_numpy(dtype=np.float64),
+            events['y_coordinate'].to_numpy(dtype=np.float64)
+        )
+        
+        return self.plot_heatmap(accumulator, f'Joueur {player_id}')
+    
+    def plot_heatmap(self, accumulator: HeatmapAccumulator, player_label: str) -> plt.Figure:
+        """
+        Affiche une heatmap à partir d'un accumulateur de positions
+        
+        Args:
+            accumulator: HeatmapAccumulator (un match ou plusieurs fusionnés)
+            player_label: Libellé du joueur pour le titre
+        
+        Returns:
+            Figure matplotlib avec heatmap
+        """
+        if accumulator.n_positions == 0:
             fig, ax = plt.subplots(figsize=(12, 8))
             ax.text(0.5, 0.5, 'Aucune donnée de position disponible', 
                    ha='center', va='center', transform=ax.transAxes)
@@ -312,16 +508,8 @@ class PlayerPerformanceAnalyzer:
         # Création de la heatmap
         fig, ax = plt.subplots(figsize=(15, 10))
         
-        # Grille pour la heatmap
-        x_bins = np.linspace(0, 100, 21)
-        y_bins = np.linspace(0, 100, 15)
-        
-        # Calcul de la densité
-        heatmap, _, _ = np.histogram2d(events['x_coordinate'], events['y_coordinate'], 
-                                     bins=[x_bins, y_bins])
-        
         # Affichage
-        im = ax.imshow(heatmap.T, extent=[0, 100, 0, 100], origin='lower', 
+        im = ax.imshow(accumulator.histogram().T, extent=[0, 100, 0, 100], origin='lower', 
                       cmap='Reds', alpha=0.7)
         
         # Ajout du terrain de football
@@ -330,7 +518,7 @@ class PlayerPerformanceAnalyzer:
         # Colorbar
         plt.colorbar(im, ax=ax, label='Densité d\'actions')
         
-        ax.set_title(f'Heatmap d\'activité - Joueur {player_id}', fontsize=16)
+        ax.set_title(f'Heatmap d\'activité - {player_label}', fontsize=16)
         ax.set_xlabel('Position X (0=But défensif, 100=But offensif)')
         ax.set_ylabel('Position Y (0=Touche gauche, 100=Touche droite)')
         
@@ -366,9 +554,40 @@ class PlayerPerformanceAnalyzer:
 class TacticalAnalyzer:
     """Analyseur de données tactiques et d'équipe"""
     
-    def __init__(self, db_connection):
+    # Joueurs alignés sur un match
+    LINEUP_QUERY = """
+        SELECT 
+            pms.player_id,
+            p.first_name || ' ' || p.last_name as player_name,
+            pos.code as position,
+            pms.minutes_played
+        FROM player_match_stats pms
+        JOIN players p ON pms.player_id = p.player_id
+        JOIN positions pos ON pms.position_played_id = pos.position_id
+        WHERE pms.team_id = %s AND pms.match_id = %s
+        AND pms.minutes_played > 0
+        ORDER BY pms.minutes_played DESC
+        """
+    
+    # Noms affichés des joueurs d'un réseau de passes
+    PLAYER_NAMES_QUERY = """
+        SELECT player_id, first_name || ' ' || last_name as player_name
+        FROM players
+        WHERE player_id = ANY(%s::uuid[])
+        """
+    
+    def __init__(self, db_connection, event_cache: Optional[MatchEventCache] = None,
+                 query_registry=None):
+        """
+        Args:
+            db_connection: Connexion à la base de données
+            event_cache: Cache d'événements partagé (un cache dédié est créé sinon)
+            query_registry: QueryRegistry optionnel (requêtes préparées et latences)
+        """
         self.db = db_connection
         self.metrics = FootballMetrics()
+        self.event_cache = event_cache if event_cache is not None else MatchEventCache(db_connection)
+        self.query_registry = query_registry
     
     def analyze_team_formation(self, team_id: str, match_id: str) -> Dict:
         """
@@ -381,38 +600,49 @@ class TacticalAnalyzer:
         Returns:
             Dictionnaire avec analyse tactique
         """
-        # Récupération des positions moyennes des joueurs
-        query = """
-        SELECT 
-            p.first_name || ' ' || p.last_name as player_name,
-            pos.code as position,
-            pms.minutes_played,
-            AVG(me.x_coordinate) as avg_x,
-            AVG(me.y_coordinate) as avg_y,
-            COUNT(me.event_id) as total_actions
-        FROM player_match_stats pms
-        JOIN players p ON pms.player_id = p.player_id
-        JOIN positions pos ON pms.position_played_id = pos.position_id
-        LEFT JOIN match_events me ON pms.player_id = me.player_id 
-            AND pms.match_id = me.match_id
-        WHERE pms.team_id = %s AND pms.match_id = %s
-        AND pms.minutes_played > 0
-        GROUP BY p.first_name, p.last_name, pos.code, pms.minutes_played
-        ORDER BY pms.minutes_played DESC
+        # Événements du match lus une seule fois (cache partagé)
+        match_events = self.event_cache.get(match_id)
+        lineup = _read_query(self.db, self.query_registry, 'team_lineup', self.LINEUP_QUERY, (team_id, match_id))
+        
+        return self._formation_report(team_id, match_id, lineup, match_events)
+    
+    async def analyze_team_formation_async(self, team_id: str, match_id: str, async_db) -> Dict:
         """
+        Version asynchrone de analyze_team_formation
+        
+        La composition et les événements du match sont lus en parallèle.
         
-        formation_data = pd.read_sql(query, self.db, params=[team_id, match_id])
+        Args:
+            team_id: ID de l'équipe
+            match_id: ID du match
+            async_db: AsyncDatabaseManager
+        
+        Returns:
+            Dictionnaire avec analyse tactique
+        """
+        if self.query_registry is not None:
+            # Même requête préparée et même histogramme que la version synchrone
+            lineup_read = async_db.run(_read_query, self.db, self.query_registry, 'team_lineup',
+                                       self.LINEUP_QUERY, (team_id, match_id))
+        else:
+            lineup_read = async_db.read_sql(self.LINEUP_QUERY, (team_id, match_id))
+        lineup, match_events = await asyncio.gather(lineup_read, async_db.run(self.event_cache.get, match_id))
+        return await async_db.run(self._formation_report, team_id, match_id, lineup, match_events)
+    
+    def _formation_report(self, team_id: str, match_id: str,
+                          lineup: pd.DataFrame, match_events: pd.DataFrame) -> Dict:
+        """Formation, réseau de passes et pressing à partir des données du match"""
+        # Les positions moyennes viennent des événements en cache
+        formation_data = self._average_positions(lineup, match_events)
         
         # Détection automatique de la formation
         formation = self._detect_formation(formation_data)
         
         # Analyse des passes entre joueurs
-        pass_network = self._analyze_pass_network(team_id, match_id)
+        pass_network = self._analyze_pass_network(team_id, match_id, match_events)
         
         # Intensité du pressing
-        ppda = self.metrics.calculate_ppda(
-            self._get_match_events(match_id), team_id
-        )
+        ppda = self.metrics.calculate_ppda(match_events, team_id)
         
         return {
             "detected_formation": formation,
@@ -424,6 +654,22 @@ class TacticalAnalyzer:
             }
         }
     
+    def _average_positions(self, lineup: pd.DataFrame, match_events: pd.DataFrame) -> pd.DataFrame:
+        """Positions moyennes et volume d'actions des joueurs alignés"""
+        player_events = match_events.assign(
+            player_id=match_events['player_id'].astype(str)
+        ).groupby('player_id').agg(
+            avg_x=('x_coordinate', 'mean'),
+            avg_y=('y_coordinate', 'mean'),
+            total_actions=('player_id', 'size')
+        ).reset_index()
+        
+        formation_data = lineup.assign(player_id=lineup['player_id'].astype(str)).merge(
+            player_events, on='player_id', how='left'
+        )
+        formation_data['total_actions'] = formation_data['total_actions'].fillna(0).astype(int)
+        return formation_data.drop(columns=['player_id'])
+    
     def _detect_formation(self, formation_data: pd.DataFrame) -> str:
         """Détecte automatiquement la formation basée sur les positions"""
         # Comptage par ligne de jeu
@@ -450,46 +696,39 @@ class TacticalAnalyzer:
         }
         return lines.get(position_code, 'Unknown')
     
-    def _analyze_pass_network(self, team_id: str, match_id: str) -> Dict:
-        """Analyse le réseau de passes entre joueurs"""
-        # Simulation d'un réseau de passes
-        # En production, analyser les passes successives
-        query = """
-        SELECT 
-            passer.first_name || ' ' || passer.last_name as passer_name,
-            receiver.first_name || ' ' || receiver.last_name as receiver_name,
-            COUNT(*) as pass_count
-        FROM match_events me1
-        JOIN players passer ON me1.player_id = passer.player_id
-        JOIN match_events me2 ON me1.match_id = me2.match_id 
-            AND me2.minute = me1.minute 
-            AND me2.event_type = 'Pass'
-            AND me2.player_id != me1.player_id
-            AND me2.team_id = me1.team_id
-        JOIN players receiver ON me2.player_id = receiver.player_id
-        WHERE me1.team_id = %s AND me1.match_id = %s
-        AND me1.event_type = 'Pass' AND me1.success = true
-        GROUP BY passer.first_name, passer.last_name, 
-                receiver.first_name, receiver.last_name
-        HAVING COUNT(*) >= 3
-        ORDER BY pass_count DESC
-        """
-        
-        pass_network = pd.read_sql(query, self.db, params=[team_id, match_id])
+    def _analyze_pass_network(self, team_id: str, match_id: str,
+                              match_events: Optional[pd.DataFrame] = None) -> Dict:
+        """
+        Analyse le réseau de passes entre joueurs
         
-        return {
-            "total_connections": len(pass_network),
-            "strongest_connections": pass_network.head(10).to_dict('records')
-        }
+        Les connexions viennent des passes réussies suivies d'un événement du
+        même club (voir PassNetwork), en un seul parcours des événements du match.
+        
+        Args:
+            team_id: ID de l'équipe
+            match_id: ID du match
+            match_events: Événements du match déjà chargés (sinon lus en base)
+        
+        Returns:
+            Dictionnaire avec connexions, centralités et matrice d'adjacence creuse
+        """
+        if match_events is None:
+            match_events = self._get_match_events(match_id)
+        
+        network = PassNetwork.from_events(match_events, team_id)
+        return network.summary(min_passes=3, player_names=self._get_player_names(network.players))
+    
+    def _get_player_names(self, player_ids: List) -> Dict:
+        """Noms affichés des joueurs du réseau"""
+        if not player_ids:
+            return {}
+        names = _read_query(self.db, self.query_registry, 'player_names', self.PLAYER_NAMES_QUERY,
+                            ([str(player_id) for player_id in player_ids],), ['uuid[]'])
+        return dict(zip(names['player_id'].astype(str), names['player_name']))
     
     def _get_match_events(self, match_id: str) -> pd.DataFrame:
-        """Récupère tous les événements d'un match"""
-        query = """
-        SELECT * FROM match_events 
-        WHERE match_id = %s
-        ORDER BY minute, second_in_minute
-        """
-        return pd.read_sql(query, self.db, params=[match_id])
+        """Récupère les événements d'un match (colonnes utiles, via le cache partagé)"""
+        return self.event_cache.get(match_id)
     
     def _categorize_ppda(self, ppda_value: float) -> str:
         """Catégorise l'intensité du pressing selon la valeur PPDA"""
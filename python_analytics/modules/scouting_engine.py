@@ -14,23 +14,60 @@ from sklearn.ensemble import RandomForestRegressor, GradientBoostingClassifier
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, classification_report
-from sklearn.decomposition import PCA
-from sklearn.cluster import KMeans
+from sklearn.decomposition import PCA, IncrementalPCA
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.neighbors import NearestNeighbors
 import warnings
 warnings.filterwarnings('ignore')
 
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterable, List, Tuple, Optional, Sequence
+import copy
 import json
 from datetime import datetime, timedelta
 
 class PlayerProfiler:
     """Classe pour créer des profils de joueurs et clustering"""
     
-    def __init__(self):
+    REGISTRY_NAME = 'profiler'
+    
+    # Métriques clés pour le profilage
+    PROFILE_METRICS = [
+        'goals_per_90', 'assists_per_90', 'xg_per_90', 'xa_per_90',
+        'pass_accuracy', 'passes_per_90', 'key_passes_per_90',
+        'tackles_per_90', 'interceptions_per_90', 'duels_won_pct',
+        'aerial_duels_won_pct', 'distance_per_90', 'sprints_per_90'
+    ]
+    
+    N_CLUSTERS = 8
+    EXPLAINED_VARIANCE = 0.95  # Garder 95% de la variance
+    
+    def __init__(self, registry=None, incremental: bool = False, chunk_size: int = 50_000):
+        """
+        Args:
+            registry: ModelRegistry optionnel ; les estimateurs publiés y sont chargés
+                      au lieu d'être réajustés à chaque chargement de la base
+            incremental: Profilage par blocs (IncrementalPCA + MiniBatchKMeans) : mémoire
+                         bornée et nouveaux joueurs-saisons intégrés sans réajustement complet
+            chunk_size: Lignes par bloc en mode incrémental
+        """
         self.scaler = StandardScaler()
-        self.pca = PCA(n_components=0.95)  # Garder 95% de la variance
-        self.kmeans = KMeans(n_clusters=8, random_state=42)
+        self.incremental = incremental
+        self.chunk_size = chunk_size
+        if incremental:
+            self.pca = IncrementalPCA()
+            self.kmeans = MiniBatchKMeans(n_clusters=self.N_CLUSTERS, random_state=42)
+        else:
+            self.pca = PCA(n_components=self.EXPLAINED_VARIANCE)
+            self.kmeans = KMeans(n_clusters=self.N_CLUSTERS, random_state=42)
+        self.n_components: Optional[int] = None  # Composantes conservées par IncrementalPCA
         self.player_clusters = {}
+        self.feature_columns: List[str] = []
+        self.registry = registry
+        # Sommes et effectifs par cluster (profils mis à jour sans relire la base)
+        self._cluster_sums: Optional[np.ndarray] = None
+        self._cluster_counts: Optional[np.ndarray] = None
+        # Estimateurs restaurés : partagés avec le cache du registre (copiés avant modification)
+        self._shared_estimators = False
         
     def create_player_profiles(self, player_stats: pd.DataFrame) -> pd.DataFrame:
         """
@@ -42,13 +79,7 @@ class PlayerProfiler:
         Returns:
             DataFrame avec profils et clusters
         """
-        # Sélection des métriques clés pour le profilage
-        profile_metrics = [
-            'goals_per_90', 'assists_per_90', 'xg_per_90', 'xa_per_90',
-            'pass_accuracy', 'passes_per_90', 'key_passes_per_90',
-            'tackles_per_90', 'interceptions_per_90', 'duels_won_pct',
-            'aerial_duels_won_pct', 'distance_per_90', 'sprints_per_90'
-        ]
+        profile_metrics = self.PROFILE_METRICS
         
         # Vérifier que toutes les colonnes existent
         available_metrics = [col for col in profile_metrics if col in player_stats.columns]
@@ -59,16 +90,26 @@ class PlayerProfiler:
             available_metrics = profile_metrics
         
         # Préparation des données
+        self.feature_columns = available_metrics
         X = player_stats[available_metrics].fillna(0)
         
-        # Normalisation
-        X_scaled = self.scaler.fit_transform(X)
-        
-        # Réduction de dimensionnalité
-        X_pca = self.pca.fit_transform(X_scaled)
-        
-        # Clustering des joueurs
-        clusters = self.kmeans.fit_predict(X_pca)
+        if self.registry is not None:
+            # Estimateurs publiés : inférence seule
+            self.restore(self._published_artifact(available_metrics))
+            clusters = self.kmeans.predict(self._project(X))
+        elif self.incremental:
+            # Ajustement par blocs, puis affectation de toute la table
+            self.fit_stream(lambda: self._chunks(X), available_metrics)
+            clusters = self.kmeans.predict(self._project(X))
+        else:
+            # Normalisation
+            X_scaled = self.scaler.fit_transform(X)
+            
+            # Réduction de dimensionnalité
+            X_pca = self.pca.fit_transform(X_scaled)
+            
+            # Clustering des joueurs
+            clusters = self.kmeans.fit_predict(X_pca)
         
         # Ajout des clusters au DataFrame
         player_stats = player_stats.copy()
@@ -80,6 +121,195 @@ class PlayerProfiler:
         
         return player_stats
     
+    def fit_stream(self, chunks: Callable[[], Iterable[pd.DataFrame]],
+                   feature_columns: Optional[List[str]] = None, epochs: int = 2) -> Dict:
+        """
+        Ajuste le profilage incrémental sur une table lue par blocs
+        
+        La source est parcourue plusieurs fois (normalisation, ACP, clustering,
+        profils) et un seul bloc est en mémoire à la fois. Si le profileur était
+        déjà ajusté, les nouveaux centres sont appariés aux anciens : un même
+        profil garde son numéro de cluster, donc son label.
+        
+        Args:
+            chunks: Fonction renvoyant un nouvel itérateur de DataFrames à chaque passe
+            feature_columns: Métriques de profilage (colonnes de PROFILE_METRICS du premier bloc par défaut)
+            epochs: Passes de MiniBatchKMeans sur la source
+            
+        Returns:
+            Analyse des clusters (voir player_clusters)
+        """
+        from scipy.optimize import linear_sum_assignment
+        
+        previous_centers = self._raw_centers()
+        if feature_columns is None:
+            first = next(iter(chunks()))
+            feature_columns = [col for col in self.PROFILE_METRICS if col in first.columns]
+        self.feature_columns = list(feature_columns)
+        self.incremental = True
+        n_features = len(self.feature_columns)
+        
+        # Passe 1 : moyennes et écarts-types
+        self.scaler = StandardScaler()
+        for chunk in chunks():
+            self.scaler.partial_fit(chunk[self.feature_columns].fillna(0))
+        
+        # Passe 2 : ACP (les blocs plus petits que le nombre de composantes sont ignorés)
+        self.pca = IncrementalPCA(n_components=n_features)
+        for chunk in chunks():
+            if len(chunk) >= n_features:
+                self.pca.partial_fit(self.scaler.transform(chunk[self.feature_columns].fillna(0)))
+        explained = np.cumsum(self.pca.explained_variance_ratio_)
+        self.n_components = int(min(np.searchsorted(explained, self.EXPLAINED_VARIANCE) + 1, n_features))
+        
+        # Passes suivantes : clustering par mini-lots, centres initiaux tirés d'un KMeans
+        # complet sur le premier bloc (un seul k-means++ sur un mini-lot fusionne des profils)
+        self.kmeans = None
+        self._shared_estimators = False
+        for _ in range(epochs):
+            for chunk in chunks():
+                projected = self._project(chunk[self.feature_columns].fillna(0))
+                if self.kmeans is None:
+                    init = KMeans(n_clusters=self.N_CLUSTERS, n_init=3, random_state=42).fit(projected)
+                    self.kmeans = MiniBatchKMeans(n_clusters=self.N_CLUSTERS, init=init.cluster_centers_,
+                                                  n_init=1, random_state=42)
+                for start in range(0, len(projected), self.kmeans.batch_size):
+                    self.kmeans.partial_fit(projected[start:start + self.kmeans.batch_size])
+        
+        if previous_centers is not None and len(previous_centers) == self.N_CLUSTERS:
+            # Appariement des centres sur les métriques normalisées : numéros stables
+            scale = self.scaler.scale_
+            cost = np.linalg.norm((previous_centers[:, None, :] - self._raw_centers()[None, :, :]) / scale,
+                                  axis=2)
+            _, order = linear_sum_assignment(cost)
+            self.kmeans.cluster_centers_ = self.kmeans.cluster_centers_[order]
+            if hasattr(self.kmeans, '_counts'):
+                self.kmeans._counts = self.kmeans._counts[order]
+        
+        # Dernière passe : profils des clusters
+        self._cluster_sums = np.zeros((self.N_CLUSTERS, n_features))
+        self._cluster_counts = np.zeros(self.N_CLUSTERS, dtype=np.int64)
+        for chunk in chunks():
+            values = chunk[self.feature_columns].fillna(0)
+            self._accumulate(values.to_numpy(dtype=float), self.kmeans.predict(self._project(values)))
+        self.player_clusters = self._summarize_clusters()
+        return self.player_clusters
+    
+    def partial_update(self, new_stats: pd.DataFrame) -> pd.DataFrame:
+        """
+        Intègre de nouveaux joueurs-saisons au profilage incrémental
+        
+        Les centres sont déplacés d'un pas de MiniBatchKMeans sans réajustement :
+        la normalisation et l'ACP restent celles de fit_stream, les numéros de
+        cluster (et labels) existants sont conservés.
+        
+        Args:
+            new_stats: Statistiques des nouveaux joueurs-saisons
+            
+        Returns:
+            new_stats avec player_cluster et cluster_label
+        """
+        if not hasattr(self.kmeans, 'partial_fit') or self._raw_centers() is None:
+            raise RuntimeError("Profileur incrémental non ajusté (fit_stream d'abord)")
+        values = new_stats[self.feature_columns].fillna(0)
+        if self._shared_estimators:
+            # Copie privée : le KMeans restauré est celui du cache du registre, partagé
+            # par tout le processus, et ses tableaux sont projetés en lecture seule
+            self.kmeans = copy.deepcopy(self.kmeans)
+            self.kmeans.cluster_centers_ = np.array(self.kmeans.cluster_centers_)
+            if hasattr(self.kmeans, '_counts'):
+                self.kmeans._counts = np.array(self.kmeans._counts)
+            self._shared_estimators = False
+        self.kmeans.partial_fit(self._project(values))
+        
+        profiles = self.assign(new_stats)
+        if self._cluster_sums is None:
+            self._cluster_sums = np.zeros((self.N_CLUSTERS, len(self.feature_columns)))
+            self._cluster_counts = np.zeros(self.N_CLUSTERS, dtype=np.int64)
+        self._accumulate(values.to_numpy(dtype=float), profiles['player_cluster'].to_numpy())
+        self.player_clusters = self._summarize_clusters()
+        return profiles
+    
+    def assign(self, player_stats: pd.DataFrame) -> pd.DataFrame:
+        """
+        Affecte des joueurs aux clusters existants (inférence seule)
+        
+        Args:
+            player_stats: Statistiques contenant feature_columns
+            
+        Returns:
+            Copie avec player_cluster et cluster_label
+        """
+        clusters = self.kmeans.predict(self._project(player_stats[self.feature_columns].fillna(0)))
+        player_stats = player_stats.copy()
+        player_stats['player_cluster'] = clusters
+        player_stats['cluster_label'] = [self._get_cluster_label(c) for c in clusters]
+        return player_stats
+    
+    def artifact(self) -> Dict:
+        """Estimateurs ajustés à enregistrer dans le registre"""
+        return {'scaler': self.scaler, 'pca': self.pca, 'kmeans': self.kmeans,
+                'feature_columns': list(self.feature_columns), 'n_components': self.n_components,
+                'cluster_sums': self._cluster_sums, 'cluster_counts': self._cluster_counts}
+    
+    def restore(self, artifact: Dict):
+        """Reprend des estimateurs ajustés (voir artifact)"""
+        self.scaler, self.pca, self.kmeans = artifact['scaler'], artifact['pca'], artifact['kmeans']
+        self.feature_columns = list(artifact['feature_columns'])
+        self.n_components = artifact.get('n_components')
+        self._shared_estimators = True
+        # Cumuls par cluster copiés (projetés en lecture seule) : partial_update les complète
+        sums, counts = artifact.get('cluster_sums'), artifact.get('cluster_counts')
+        self._cluster_sums = None if sums is None else np.array(sums, dtype=float)
+        self._cluster_counts = None if counts is None else np.array(counts, dtype=np.int64)
+        if self._cluster_counts is not None:
+            self.player_clusters = self._summarize_clusters()
+    
+    def _project(self, X) -> np.ndarray:
+        """Normalisation puis projection sur les composantes conservées"""
+        projected = self.pca.transform(self.scaler.transform(X))
+        return projected[:, :self.n_components] if self.n_components else projected
+    
+    def _raw_centers(self) -> Optional[np.ndarray]:
+        """Centres des clusters dans l'espace des métriques (None si non ajusté)"""
+        centers = getattr(self.kmeans, 'cluster_centers_', None)
+        if centers is None:
+            return None
+        components = self.pca.components_[:centers.shape[1]]
+        return self.scaler.inverse_transform(centers @ components + self.pca.mean_)
+    
+    def _chunks(self, data: pd.DataFrame) -> Iterable[pd.DataFrame]:
+        """Découpe une table en blocs de chunk_size lignes"""
+        for start in range(0, len(data), self.chunk_size):
+            yield data.iloc[start:start + self.chunk_size]
+    
+    def _accumulate(self, values: np.ndarray, clusters: np.ndarray):
+        """Ajoute des joueurs aux sommes et effectifs par cluster"""
+        np.add.at(self._cluster_sums, clusters, values)
+        self._cluster_counts += np.bincount(clusters, minlength=self.N_CLUSTERS)
+    
+    def _summarize_clusters(self) -> Dict:
+        """Analyse des clusters à partir des sommes cumulées (même format que _analyze_clusters)"""
+        cluster_analysis = {}
+        for cluster_id in np.flatnonzero(self._cluster_counts):
+            means = self._cluster_sums[cluster_id] / self._cluster_counts[cluster_id]
+            cluster_stats = dict(zip(self.feature_columns, means.tolist()))
+            cluster_analysis[int(cluster_id)] = {
+                'label': self._get_cluster_label(cluster_id),
+                'size': int(self._cluster_counts[cluster_id]),
+                'avg_stats': cluster_stats,
+                'top_characteristics': sorted(cluster_stats.items(), key=lambda x: x[1], reverse=True)[:5]
+            }
+        return cluster_analysis
+    
+    def _published_artifact(self, feature_columns: List[str]) -> Dict:
+        """Artefact publié pour ces features ; l'inférence n'entraîne jamais"""
+        artifact = self.registry.load_published(self.REGISTRY_NAME, feature_columns)
+        if artifact is None:
+            raise RuntimeError(f"Aucun profileur publié pour les features {feature_columns} "
+                               f"(python model_registry.py train profiler --publish)")
+        return artifact
+    
     def _generate_demo_stats(self, n_players: int) -> pd.DataFrame:
         """Génère des statistiques de démonstration pour les joueurs"""
         np.random.seed(42)
@@ -150,10 +380,37 @@ class PlayerProfiler:
 class MarketValuePredictor:
     """Prédicteur de valeur marchande des joueurs"""
     
-    def __init__(self):
-        self.model = RandomForestRegressor(n_estimators=100, random_state=42)
+    # Features du modèle et valeurs utilisées quand une caractéristique manque
+    FEATURE_DEFAULTS = {
+        'age': 25,
+        'goals_per_90': 0.3,
+        'assists_per_90': 0.2,
+        'xg_per_90': 0.25,
+        'xa_per_90': 0.15,
+        'pass_accuracy': 80,
+        'international_caps': 5,
+        'contract_years_remaining': 2,
+        'minutes_played_season': 2000,
+        'league_level': 1  # 1=top, 2=second...
+    }
+    
+    # Intervalle : quantiles des prédictions des arbres de la forêt
+    INTERVAL_QUANTILES = (10, 90)
+    
+    REGISTRY_NAME = 'market_value'
+    
+    def __init__(self, n_jobs: int = -1, registry=None):
+        """
+        Args:
+            n_jobs: Cœurs utilisés pour l'entraînement et la prédiction (-1 = tous)
+            registry: ModelRegistry optionnel ; le modèle publié y est chargé à la
+                      première prédiction au lieu d'un entraînement sur données de démo
+        """
+        self.n_jobs = n_jobs
+        self.model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs)
         self.scaler = StandardScaler()
         self.is_fitted = False
+        self.registry = registry
         
     def train_model(self, training_data: pd.DataFrame) -> Dict:
         """
@@ -166,11 +423,7 @@ class MarketValuePredictor:
             Métriques de performance du modèle
         """
         # Features pour la prédiction
-        feature_columns = [
-            'age', 'goals_per_90', 'assists_per_90', 'xg_per_90', 'xa_per_90',
-            'pass_accuracy', 'international_caps', 'contract_years_remaining',
-            'minutes_played_season', 'league_level'  # 1=top, 2=second...
-        ]
+        feature_columns = list(self.FEATURE_DEFAULTS)
         
         # Générer des données de démonstration si nécessaire
         if not all(col in training_data.columns for col in feature_columns + ['market_value']):
@@ -220,38 +473,81 @@ class MarketValuePredictor:
         Returns:
             Prédiction avec intervalle de confiance
         """
-        if not self.is_fitted:
-            # Entraîner avec des données de démo
-            demo_data = self._generate_market_demo_data()
-            self.train_model(demo_data)
-        
-        # Préparation des features
-        features = [
-            player_data.get('age', 25),
-            player_data.get('goals_per_90', 0.3),
-            player_data.get('assists_per_90', 0.2),
-            player_data.get('xg_per_90', 0.25),
-            player_data.get('xa_per_90', 0.15),
-            player_data.get('pass_accuracy', 80),
-            player_data.get('international_caps', 5),
-            player_data.get('contract_years_remaining', 2),
-            player_data.get('minutes_played_season', 2000),
-            player_data.get('league_level', 1)
-        ]
+        prediction = self.predict_values(pd.DataFrame([player_data])).iloc[0]
+        return {
+            'predicted_value': round(float(prediction['predicted_value']), 2),
+            'min_value': round(float(prediction['min_value']), 2),
+            'max_value': round(float(prediction['max_value']), 2),
+            'confidence': int(prediction['confidence'])
+        }
+    
+    def predict_values(self, players: pd.DataFrame) -> pd.DataFrame:
+        """
+        Prédit la valeur marchande d'un lot de joueurs
         
-        # Normalisation et prédiction
-        features_scaled = self.scaler.transform([features])
-        predicted_value = self.model.predict(features_scaled)[0]
+        La matrice de features est construite et normalisée une seule fois ;
+        chaque arbre prédit tout le lot (en parallèle sur n_jobs cœurs) et la
+        dispersion des arbres donne l'intervalle de chaque joueur.
         
-        # Calcul de l'intervalle de confiance (estimation basée sur les erreurs du modèle)
-        confidence_interval = predicted_value * 0.15  # ±15%
+        Args:
+            players: Une ligne par joueur (features manquantes remplacées par FEATURE_DEFAULTS)
+            
+        Returns:
+            DataFrame (même index) : predicted_value, min_value, max_value, confidence
+        """
+        self._ensure_fitted()
+        
+        features = pd.DataFrame({
+            col: pd.to_numeric(players[col], errors='coerce').fillna(default) if col in players.columns
+            else default
+            for col, default in self.FEATURE_DEFAULTS.items()
+        }, index=players.index)
+        # Conversion faite une fois pour toute la forêt (comme RandomForestRegressor.predict)
+        features_scaled = np.ascontiguousarray(self.scaler.transform(features), dtype=np.float32)
+        
+        from joblib import Parallel, delayed
+        # En dessous de quelques centaines de lignes, la répartition sur les cœurs coûte plus qu'elle ne rapporte
+        n_jobs = self.n_jobs if len(features) >= 500 else 1
+        tree_predictions = np.stack(Parallel(n_jobs=n_jobs, prefer='threads')(
+            delayed(tree.predict)(features_scaled, check_input=False) for tree in self.model.estimators_
+        )) if len(features) else np.empty((len(self.model.estimators_), 0))
+        low, high = self.INTERVAL_QUANTILES
+        
+        return pd.DataFrame({
+            'predicted_value': tree_predictions.mean(axis=0),
+            'min_value': np.percentile(tree_predictions, low, axis=0),
+            'max_value': np.percentile(tree_predictions, high, axis=0),
+            'confidence': high - low
+        }, index=players.index)
+    
+    def artifact(self) -> Dict:
+        """Modèle ajusté à enregistrer dans le registre"""
+        return {'model': self.model, 'scaler': self.scaler}
+    
+    def restore(self, artifact: Dict):
+        """
+        Reprend un modèle ajusté (voir artifact)
         
-        return {
-            'predicted_value': round(predicted_value, 2),
-            'min_value': round(predicted_value - confidence_interval, 2),
-            'max_value': round(predicted_value + confidence_interval, 2),
-            'confidence': 85  # Pourcentage de confiance
-        }
+        Le modèle est partagé avec le cache du registre : il n'est pas modifié,
+        n_jobs ne s'applique qu'au Parallel de predict_values.
+        """
+        self.model, self.scaler = artifact['model'], artifact['scaler']
+        self.is_fitted = True
+    
+    def _ensure_fitted(self):
+        """Charge le modèle publié (chargement paresseux) ou, sans registre, entraîne sur données de démo"""
+        if self.is_fitted:
+            return
+        if self.registry is not None:
+            artifact = self.registry.load_published(self.REGISTRY_NAME, list(self.FEATURE_DEFAULTS))
+            if artifact is None:
+                raise RuntimeError("Aucun modèle de valeur marchande publié "
+                                   "(python model_registry.py train market_value --publish)")
+            self.restore(artifact)
+        else:
+            # Entraîner avec des données de démo
+            demo_data = self._generate_market_demo_data()
+            self.train_model(demo_data)
     
     def _generate_market_demo_data(self) -> pd.DataFrame:
         """Génère des données de démonstration pour l'entraînement"""
@@ -297,28 +593,335 @@ class MarketValuePredictor:
         return pd.DataFrame(data)
 
 
+def similarity_scores(distances: np.ndarray, n_features: int) -> np.ndarray:
+    """Score 0-100 d'une distance entre profils standardisés (100 = identiques, ~37 = deux joueurs au hasard)"""
+    return 100 * np.exp(-np.asarray(distances, dtype=np.float64) ** 2 / (2 * n_features))
+
+
+class PlayerSimilarityIndex:
+    """Index de similarité exact : statistiques standardisées (float32) et k plus proches voisins"""
+    
+    def __init__(self, features: np.ndarray, clusters: Optional[np.ndarray] = None,
+                 algorithm: str = 'brute'):
+        """
+        Args:
+            features: Matrice (joueurs, statistiques) brute, standardisée à la construction
+            clusters: Cluster de chaque joueur (un index par cluster pour les recherches restreintes)
+            algorithm: Algorithme de NearestNeighbors ('brute' = produit matriciel BLAS, 'ball_tree'...)
+        """
+        self.scaler = StandardScaler()
+        self.features = self.scaler.fit_transform(np.asarray(features, dtype=np.float64)).astype(np.float32)
+        self.clusters = np.asarray(clusters) if clusters is not None else None
+        self.n_features = self.features.shape[1]
+        self.algorithm = algorithm
+        
+        self.neighbors = NearestNeighbors(algorithm=algorithm).fit(self.features)
+        self.cluster_members: Dict = {}
+        self.cluster_neighbors: Dict = {}
+        if self.clusters is not None:
+            for cluster_id in np.unique(self.clusters):
+                members = np.flatnonzero(self.clusters == cluster_id)
+                self.cluster_members[cluster_id] = members
+                self.cluster_neighbors[cluster_id] = NearestNeighbors(algorithm=algorithm).fit(self.features[members])
+    
+    def __len__(self) -> int:
+        return len(self.features)
+    
+    def query(self, row: int, k: int = 10, cluster=None,
+              mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Les k joueurs les plus proches d'un joueur de l'index (lui-même exclu)
+        
+        Args:
+            row: Position du joueur de référence dans l'index
+            k: Nombre de voisins
+            cluster: Restreint la recherche aux membres de ce cluster
+            mask: Joueurs candidats (booléens) ; la recherche se fait alors sur ce sous-ensemble
+        
+        Returns:
+            (positions des voisins, distances euclidiennes), par distance croissante
+        """
+        vector = self.features[row:row + 1]
+        if mask is not None:
+            candidates = np.asarray(mask, dtype=bool).copy()
+            if cluster is not None:
+                candidates &= self.clusters == cluster
+            candidates[row] = False
+            return self._brute_force(vector, np.flatnonzero(candidates), k)
+        
+        if cluster is not None:
+            members = self.cluster_members.get(cluster, np.array([], dtype=np.intp))
+            neighbors = self.cluster_neighbors.get(cluster)
+        else:
+            members, neighbors = None, self.neighbors
+        n_candidates = len(self) if members is None else len(members)
+        if neighbors is None or n_candidates <= 1:
+            return np.array([], dtype=np.intp), np.array([], dtype=np.float32)
+        
+        distances, positions = neighbors.kneighbors(vector, n_neighbors=min(k + 1, n_candidates))
+        positions = positions[0] if members is None else members[positions[0]]
+        keep = positions != row
+        return positions[keep][:k], distances[0][keep][:k]
+    
+    def _brute_force(self, vector: np.ndarray, candidates: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Distances au sous-ensemble candidat en un produit matrice-vecteur"""
+        if len(candidates) == 0:
+            return candidates, np.array([], dtype=np.float32)
+        subset = self.features[candidates]
+        squared = (np.einsum('ij,ij->i', subset, subset) - 2 * subset @ vector[0]
+                   + float(vector[0] @ vector[0]))
+        k = min(k, len(candidates))
+        top = np.argpartition(squared, k - 1)[:k]
+        top = top[np.argsort(squared[top], kind='stable')]
+        return candidates[top], np.sqrt(np.maximum(squared[top], 0))
+    
+    def similarity_scores(self, distances: np.ndarray) -> np.ndarray:
+        """Score de similarité 0-100 (100 = profils identiques) à partir des distances standardisées"""
+        return similarity_scores(distances, self.n_features)
+
+
+class PlayerANNIndex:
+    """
+    Index approché (IVF) pour les recherches de profils sur un grand vivier
+    
+    Les vecteurs standardisés sont répartis en listes par un quantificateur
+    grossier KMeans ; une requête ne parcourt que les n_probe listes dont le
+    centroïde est le plus proche. Les vecteurs sont stockés triés par liste,
+    en tableaux contigus float32 sauvegardables et rechargeables en memmap.
+    """
+    
+    ARRAYS = ['centroids', 'vectors', 'ids', 'offsets', 'mean', 'scale']
+    
+    def __init__(self, n_lists: Optional[int] = None, n_probe: int = 16, seed: int = 42,
+                 feature_columns: Optional[List[str]] = None):
+        """
+        Args:
+            n_lists: Nombre de listes (racine du nombre de vecteurs par défaut)
+            n_probe: Listes parcourues par requête (compromis rappel / latence)
+            seed: Graine du KMeans et de l'échantillon d'entraînement
+            feature_columns: Noms des statistiques indexées (conservés à la sauvegarde)
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.seed = seed
+        self.feature_columns = feature_columns
+        self.centroids = self.vectors = self.ids = self.offsets = self.mean = self.scale = None
+    
+    def __len__(self) -> int:
+        return 0 if self.vectors is None else len(self.vectors)
+    
+    def fit(self, features: np.ndarray, ids: np.ndarray, max_training_points: int = 50_000) -> 'PlayerANNIndex':
+        """
+        Entraîne le quantificateur et indexe les vecteurs
+        
+        Args:
+            features: Matrice (joueurs-saisons, statistiques) brute
+            ids: Identifiant de chaque ligne
+            max_training_points: Taille de l'échantillon d'entraînement du KMeans
+        
+        Returns:
+            L'index (pour chaînage)
+        """
+        features = np.asarray(features, dtype=np.float64)
+        self.mean = features.mean(axis=0).astype(np.float32)
+        self.scale = features.std(axis=0).astype(np.float32)
+        self.scale[self.scale == 0] = 1
+        vectors = self.transform(features)
+        
+        n_lists = self.n_lists or int(np.clip(np.sqrt(len(vectors)), 1, 4_096))
+        n_lists = min(n_lists, len(vectors))
+        rng = np.random.default_rng(self.seed)
+        sample = vectors[rng.choice(len(vectors), min(len(vectors), max_training_points), replace=False)]
+        quantizer = KMeans(n_clusters=n_lists, n_init=1, max_iter=25, random_state=self.seed).fit(sample)
+        self.centroids = quantizer.cluster_centers_.astype(np.float32)
+        self.vectors = np.empty((0, vectors.shape[1]), dtype=np.float32)
+        self.ids = np.empty(0, dtype=np.asarray(ids).astype(str).dtype)
+        self.offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        return self._insert(vectors, ids)
+    
+    def add(self, features: np.ndarray, ids: np.ndarray) -> 'PlayerANNIndex':
+        """
+        Insère de nouveaux joueurs-saisons sans réentraîner le quantificateur
+        
+        Args:
+            features: Statistiques brutes (mêmes colonnes qu'à l'entraînement)
+            ids: Identifiants des nouvelles lignes
+        """
+        if self.centroids is None:
+            return self.fit(features, ids)
+        return self._insert(self.transform(features), ids)
+    
+    def transform(self, features: np.ndarray) -> np.ndarray:
+        """Standardise des statistiques brutes avec les moyennes et écarts-types de l'index"""
+        return ((np.asarray(features, dtype=np.float32) - self.mean) / self.scale).astype(np.float32)
+    
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Liste (centroïde le plus proche) de chaque vecteur, par blocs"""
+        centroid_norms = np.einsum('ij,ij->i', self.centroids, self.centroids)
+        lists = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), 65_536):
+            block = vectors[start:start + 65_536]
+            lists[start:start + len(block)] = np.argmin(centroid_norms - 2 * block @ self.centroids.T, axis=1)
+        return lists
+    
+    def _insert(self, vectors: np.ndarray, ids: np.ndarray) -> 'PlayerANNIndex':
+        """Fusionne les vecteurs dans le stockage trié par liste"""
+        ids = np.asarray(ids).astype(str)
+        existing_lists = np.repeat(np.arange(len(self.offsets) - 1), np.diff(self.offsets))
+        lists = np.concatenate([existing_lists, self._assign(vectors)])
+        order = np.argsort(lists, kind='stable')
+        self.vectors = np.concatenate([np.asarray(self.vectors), vectors])[order]
+        self.ids = np.concatenate([np.asarray(self.ids), ids])[order]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(lists, minlength=len(self.centroids)))])
+        return self
+    
+    def search(self, vector: np.ndarray, k: int = 10, n_probe: Optional[int] = None,
+               standardized: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Les k plus proches voisins approchés d'un vecteur
+        
+        Args:
+            vector: Statistiques brutes d'un joueur (ou standardisées si standardized=True)
+            k: Nombre de voisins
+            n_probe: Listes parcourues (valeur de l'index par défaut)
+            standardized: Le vecteur est déjà dans l'espace de l'index
+        
+        Returns:
+            (identifiants, distances), par distance croissante
+        """
+        query = np.asarray(vector, dtype=np.float32).ravel()
+        if not standardized:
+            query = self.transform(query[None, :])[0]
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        
+        centroid_distances = np.einsum('ij,ij->i', self.centroids, self.centroids) - 2 * self.centroids @ query
+        probed = np.argpartition(centroid_distances, n_probe - 1)[:n_probe]
+        starts, ends = self.offsets[probed], self.offsets[probed + 1]
+        candidates = np.concatenate([np.arange(start, end) for start, end in zip(starts, ends)])
+        if len(candidates) == 0:
+            return np.array([], dtype=self.ids.dtype), np.array([], dtype=np.float32)
+        
+        subset = np.asarray(self.vectors[candidates])
+        distances = np.einsum('ij,ij->i', subset, subset) - 2 * subset @ query + float(query @ query)
+        k = min(k, len(candidates))
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top], kind='stable')]
+        return np.asarray(self.ids[candidates[top]]), np.sqrt(np.maximum(distances[top], 0))
+    
+    def exact_search(self, vector: np.ndarray, k: int = 10, standardized: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """Recherche exhaustive de référence (tous les vecteurs)"""
+        n_lists = len(self.centroids)
+        return self.search(vector, k, n_probe=n_lists, standardized=standardized)
+    
+    def recall_report(self, n_queries: int = 200, k: int = 10,
+                      n_probes: Sequence[int] = (1, 4, 8, 16, 32)) -> pd.DataFrame:
+        """
+        Rappel mesuré par rapport à la recherche exacte, et latence par requête
+        
+        Args:
+            n_queries: Requêtes tirées parmi les vecteurs indexés
+            k: Nombre de voisins comparés
+            n_probes: Valeurs de n_probe évaluées
+        
+        Returns:
+            DataFrame [n_probe, recall_at_k, p50_ms, p95_ms]
+        """
+        import time
+        
+        rng = np.random.default_rng(self.seed)
+        queries = np.asarray(self.vectors[rng.choice(len(self), min(n_queries, len(self)), replace=False)])
+        truth = [set(self.exact_search(query, k, standardized=True)[0]) for query in queries]
+        
+        rows = []
+        for n_probe in n_probes:
+            hits, latencies = 0, []
+            for query, expected in zip(queries, truth):
+                start = time.perf_counter()
+                found, _ = self.search(query, k, n_probe=n_probe, standardized=True)
+                latencies.append((time.perf_counter() - start) * 1000)
+                hits += len(expected.intersection(found))
+            rows.append({
+                'n_probe': n_probe,
+                'recall_at_k': hits / sum(len(expected) for expected in truth),
+                'p50_ms': float(np.percentile(latencies, 50)),
+                'p95_ms': float(np.percentile(latencies, 95))
+            })
+        return pd.DataFrame(rows)
+    
+    def save(self, directory: str):
+        """Sauvegarde les tableaux (.npy) et les paramètres de l'index"""
+        from pathlib import Path
+        
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(directory / f"{name}.npy", np.asarray(getattr(self, name)))
+        (directory / 'index.json').write_text(json.dumps({'n_probe': self.n_probe, 'seed': self.seed,
+                                                          'n_lists': len(self.centroids),
+                                                          'feature_columns': self.feature_columns}))
+    
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'PlayerANNIndex':
+        """
+        Recharge un index sauvegardé
+        
+        Args:
+            directory: Répertoire de save()
+            mmap: Vecteurs et identifiants projetés en mémoire (pages lues à la demande)
+        """
+        from pathlib import Path
+        
+        directory = Path(directory)
+        params = json.loads((directory / 'index.json').read_text())
+        index = cls(n_lists=params['n_lists'], n_probe=params['n_probe'], seed=params['seed'],
+                    feature_columns=params.get('feature_columns'))
+        for name in cls.ARRAYS:
+            mode = 'r' if mmap and name in ('vectors', 'ids') else None
+            setattr(index, name, np.load(directory / f"{name}.npy", mmap_mode=mode))
+        return index
+
+
 class ScoutingEngine:
     """Moteur principal de scouting et recommandations"""
     
-    def __init__(self):
-        self.profiler = PlayerProfiler()
-        self.value_predictor = MarketValuePredictor()
+    def __init__(self, registry=None):
+        """
+        Args:
+            registry: ModelRegistry optionnel (profileur et modèle de valeur publiés)
+        """
+        self.profiler = PlayerProfiler(registry=registry)
+        self.value_predictor = MarketValuePredictor(registry=registry)
         self.player_database = pd.DataFrame()
+        self.similarity_index: Optional[PlayerSimilarityIndex] = None
+        self.lookalike_index: Optional[PlayerANNIndex] = None
         
     def load_player_database(self, player_data: pd.DataFrame):
-        """Charge la base de données des joueurs"""
+        """Charge la base de données des joueurs et construit l'index de similarité"""
         self.player_database = player_data.copy()
         
         # Créer les profils des joueurs
         self.player_database = self.profiler.create_player_profiles(self.player_database)
-        
-    def find_similar_players(self, reference_player_id: str, n_recommendations: int = 10) -> List[Dict]:
+        self._build_similarity_index()
+    
+    def _build_similarity_index(self):
+        """Index de similarité sur les statistiques de profilage (ni âge, ni identifiants)"""
+        self.player_database = self.player_database.reset_index(drop=True)
+        features = self.player_database[self.profiler.feature_columns].fillna(0).to_numpy()
+        self.similarity_index = PlayerSimilarityIndex(features, self.player_database['player_cluster'].to_numpy())
+        rows = pd.Series(np.arange(len(self.player_database)), index=self.player_database['player_id'])
+        self._player_rows = rows[~rows.index.duplicated()]
+    
+    def find_similar_players(self, reference_player_id: str, n_recommendations: int = 10,
+                             same_cluster: bool = True, filters: Optional[Dict] = None) -> List[Dict]:
         """
         Trouve des joueurs similaires au joueur de référence
         
         Args:
             reference_player_id: ID du joueur de référence
             n_recommendations: Nombre de recommandations
+            same_cluster: Restreint la recherche au cluster du joueur de référence
+            filters: Filtres optionnels sur les candidats
+                     {position, team, league (valeur ou liste), age_min, age_max}
             
         Returns:
             Liste des joueurs similaires avec scores de similarité
@@ -328,39 +931,84 @@ class ScoutingEngine:
             self._load_demo_database()
         
         # Trouver le joueur de référence
-        ref_player = self.player_database[
-            self.player_database['player_id'] == reference_player_id
-        ]
-        
-        if ref_player.empty:
+        row = self._player_rows.get(reference_player_id)
+        if row is None:
             return []
         
-        ref_cluster = ref_player['player_cluster'].iloc[0]
+        cluster = self.player_database['player_cluster'].iat[row] if same_cluster else None
+        mask = self._filter_mask(filters) if filters else None
+        positions, distances = self.similarity_index.query(row, n_recommendations, cluster=cluster, mask=mask)
         
-        # Joueurs du même cluster
-        similar_players = self.player_database[
-            (self.player_database['player_cluster'] == ref_cluster) &
-            (self.player_database['player_id'] != reference_player_id)
-        ].copy()
+        recommendations = self.player_database.iloc[positions].copy()
+        recommendations['similarity_score'] = self.similarity_index.similarity_scores(distances)
         
-        # Calcul de similarité basé sur les statistiques
-        ref_stats = ref_player.select_dtypes(include=[np.number]).iloc[0]
+        columns = [col for col in ['player_id', 'name', 'age', 'position', 'team', 'cluster_label', 'similarity_score']
+                   if col in recommendations.columns]
+        return recommendations[columns].to_dict('records')
+    
+    def _filter_mask(self, filters: Dict) -> np.ndarray:
+        """Masque des joueurs respectant les filtres de recherche"""
+        players = self.player_database
+        mask = np.ones(len(players), dtype=bool)
+        for column in ('position', 'team', 'league'):
+            value = filters.get(column)
+            if value is None or column not in players.columns:
+                continue
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            mask &= players[column].isin(values).to_numpy()
+        if 'age_min' in filters:
+            mask &= (players['age'] >= filters['age_min']).to_numpy()
+        if 'age_max' in filters:
+            mask &= (players['age'] <= filters['age_max']).to_numpy()
+        return mask
+    
+    def build_lookalike_index(self, player_pool: pd.DataFrame, id_column: str = 'player_id',
+                              n_lists: Optional[int] = None) -> PlayerANNIndex:
+        """
+        Construit l'index approché d'un vivier multi-championnats et multi-saisons
         
-        similarities = []
-        for idx, player in similar_players.iterrows():
-            player_stats = player.select_dtypes(include=[np.number])
-            
-            # Distance euclidienne normalisée
-            similarity = self._calculate_similarity(ref_stats, player_stats)
-            similarities.append(similarity)
+        Args:
+            player_pool: Une ligne par joueur-saison, avec les statistiques de profilage
+            id_column: Colonne identifiant chaque ligne (ex. 'player_id:season')
+            n_lists: Nombre de listes de l'index IVF
         
-        similar_players['similarity_score'] = similarities
+        Returns:
+            L'index construit (aussi conservé dans lookalike_index)
+        """
+        columns = [col for col in self.profiler.feature_columns if col in player_pool.columns] or \
+            list(player_pool.drop(columns=[id_column]).select_dtypes(include=[np.number]).columns)
+        self.lookalike_index = PlayerANNIndex(n_lists=n_lists, feature_columns=columns).fit(
+            player_pool[columns].fillna(0).to_numpy(), player_pool[id_column].to_numpy()
+        )
+        return self.lookalike_index
+    
+    def find_lookalikes(self, reference_player_id: str, n_recommendations: int = 10,
+                        n_probe: Optional[int] = None) -> List[Dict]:
+        """
+        Profils proches d'un joueur de la base dans tout le vivier indexé (recherche approchée)
         
-        # Tri par similarité
-        recommendations = similar_players.nlargest(n_recommendations, 'similarity_score')
+        Args:
+            reference_player_id: ID du joueur de référence (base chargée)
+            n_recommendations: Nombre de profils retournés
+            n_probe: Listes parcourues (compromis rappel / latence)
+        
+        Returns:
+            Liste {player_id, distance, similarity_score}
+        """
+        if self.lookalike_index is None:
+            raise ValueError("Index approché absent : appeler build_lookalike_index")
+        reference = self.player_database[self.player_database['player_id'] == reference_player_id]
+        if reference.empty:
+            return []
         
-        return recommendations[['player_id', 'name', 'age', 'position', 'team', 
-                              'cluster_label', 'similarity_score']].to_dict('records')
+        columns = self.lookalike_index.feature_columns
+        ids, distances = self.lookalike_index.search(reference[columns].fillna(0).to_numpy()[0],
+                                                     n_recommendations + 1, n_probe=n_probe)
+        keep = ids != str(reference_player_id)
+        ids, distances = ids[keep][:n_recommendations], distances[keep][:n_recommendations]
+        scores = similarity_scores(distances, len(columns))
+        return [{'player_id': player_id, 'distance': float(distance), 'similarity_score': float(score)}
+                for player_id, distance, score in zip(ids, distances, scores)]
     
     def scout_by_criteria(self, criteria: Dict) -> List[Dict]:
         """
@@ -397,10 +1045,9 @@ class ScoutingEngine:
         if 'max_value' in criteria:
             # Prédire les valeurs marchandes si pas disponibles
             if 'market_value' not in filtered_players.columns:
-                filtered_players['market_value'] = filtered_players.apply(
-                    lambda row: self.value_predictor.predict_value(row.to_dict())['predicted_value'],
-                    axis=1
-                )
+                filtered_players['market_value'] = self.value_predictor.predict_values(
+                    filtered_players
+                )['predicted_value']
             
             filtered_players = filtered_players[
                 filtered_players['market_value'] <= criteria['max_value']
@@ -504,26 +1151,7 @@ class ScoutingEngine:
         # Normaliser les âges
         demo_data['age'] = np.clip(demo_data['age'], 16, 40)
         
-        self.player_database = pd.DataFrame(demo_data)
-        self.player_database = self.profiler.create_player_profiles(self.player_database)
-    
-    def _calculate_similarity(self, ref_stats: pd.Series, player_stats: pd.Series) -> float:
-        """Calcule la similarité entre deux joueurs"""
-        # Sélectionner les statistiques communes
-        common_stats = ref_stats.index.intersection(player_stats.index)
-        
-        if len(common_stats) == 0:
-            return 0.0
-        
-        # Distance euclidienne normalisée
-        diff = ref_stats[common_stats] - player_stats[common_stats]
-        distance = np.sqrt(np.sum(diff ** 2))
-        
-        # Conversion en score de similarité (0-100)
-        max_distance = np.sqrt(len(common_stats)) * 100  # Estimation
-        similarity = max(0, 100 - (distance / max_distance * 100))
-        
-        return similarity
+        self.load_player_database(pd.DataFrame(demo_data))
     
     def _calculate_overall_rating(self, players: pd.DataFrame) -> pd.Series:
         """Calcule une note globale pour les joueurs"""
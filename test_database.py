@@ -0,0 +1,781 @@
+#!/usr/bin/env python3
+"""
+Tests du Gestionnaire de Base de Données
+========================================
+
+Vérifie le mode poolé de DatabaseManager sur une base SQLite temporaire
+(même pool SQLAlchemy qu'en PostgreSQL).
+"""
+
+import asyncio
+import sqlite3
+import sys
+from datetime import date
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ajouter le répertoire racine au path
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent / 'database' / 'migrations'))
+
+from sqlalchemy import event
+
+from configs.database import DatabaseConfig, DatabaseManager
+from configs.async_database import AsyncDatabaseManager
+from configs.query_registry import LatencyHistogram, QueryRegistry
+from configs.season_stats import SeasonStatsMaintainer
+from configs.partition_manager import SeasonPartitionManager
+from python_analytics.modules.performance_analyzer import PlayerPerformanceAnalyzer
+from python_analytics.modules.heatmap_accumulator import HeatmapAccumulator
+from python_analytics.modules.parquet_store import ParquetStore
+from synthetic_dataset import SyntheticDatasetGenerator, double_round_robin, generate_shard, read_shard
+
+
+class SQLiteConfig(DatabaseConfig):
+    """Configuration pointant vers un fichier SQLite"""
+
+    def __init__(self, path: str, **pool_settings):
+        super().__init__()
+        self.path = path
+        for name, value in pool_settings.items():
+            setattr(self, name, value)
+
+    def get_connection_string(self) -> str:
+        return f"sqlite:///{self.path}"
+
+
+def create_pooled_manager(directory: str, **pool_settings) -> DatabaseManager:
+    """Gestionnaire poolé connecté à une base SQLite contenant une table teams"""
+    manager = DatabaseManager(SQLiteConfig(str(Path(directory) / 'football.db'), **pool_settings), pooled=True)
+    assert manager.connect()
+    with manager.checkout() as connection:
+        connection.execute("CREATE TABLE teams (team_id TEXT, name TEXT)")
+        connection.execute("INSERT INTO teams VALUES ('rcsa', 'RC Strasbourg'), ('psg', 'Paris SG')")
+    return manager
+
+
+def test_pooled_manager_configuration():
+    """Le pool respecte les tailles, le pre-ping et le recyclage configurés"""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_pooled_manager(directory, pool_min_size=2, pool_max_size=5, pool_recycle=60)
+
+        pool = manager.engine.pool
+        assert pool.size() == 2
+        assert pool._max_overflow == 3
+        assert pool._recycle == 60
+        assert pool._pre_ping
+        # Connexions minimales ouvertes à la connexion
+        assert pool.checkedin() == 2
+        manager.disconnect()
+
+
+def test_checkout_returns_connection_and_reads():
+    """checkout rend la connexion au pool et read_sql passe par le pool"""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_pooled_manager(directory)
+
+        teams = manager.read_sql("SELECT * FROM teams ORDER BY team_id")
+        assert teams['team_id'].tolist() == ['psg', 'rcsa']
+        assert manager.pool_stats()['checked_out'] == 0
+
+        # Une erreur dans le bloc annule la transaction
+        try:
+            with manager.checkout() as connection:
+                connection.execute("INSERT INTO teams VALUES ('ol', 'Lyon')")
+                raise RuntimeError("échec du traitement")
+        except RuntimeError:
+            pass
+        assert len(manager.read_sql("SELECT * FROM teams")) == 2
+        manager.disconnect()
+
+        # Un gestionnaire poolé jamais connecté se connecte à la première lecture
+        lazy = DatabaseManager(SQLiteConfig(str(Path(directory) / 'football.db')), pooled=True)
+        assert len(lazy.read_sql("SELECT * FROM teams")) == 2
+        assert lazy.engine is not None
+        lazy.disconnect()
+
+
+def test_pool_wait_metrics_under_contention():
+    """Les attentes des threads sur un pool saturé sont mesurées"""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_pooled_manager(directory, pool_min_size=1, pool_max_size=2)
+
+        def hold_connection():
+            with manager.checkout():
+                time.sleep(0.05)
+
+        threads = [threading.Thread(target=hold_connection) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = manager.pool_stats()
+        # 6 emprunts de 50 ms sur 2 connexions : au moins un thread attend ~100 ms
+        assert stats['checkouts'] >= 6
+        assert stats['wait_max_ms'] > 80
+        assert stats['checked_out'] == 0 and stats['timeouts'] == 0
+        manager.disconnect()
+
+
+def test_pool_timeout_is_counted():
+    """Un emprunt sur un pool saturé au-delà du délai est compté"""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_pooled_manager(directory, pool_min_size=1, pool_max_size=1, pool_timeout=0.05)
+
+        with manager.checkout():
+            result = manager.read_sql("SELECT * FROM teams")
+
+        assert isinstance(result, pd.DataFrame) and result.empty
+        assert manager.pool_stats()['timeouts'] == 1
+        manager.disconnect()
+
+
+def create_events_table(manager: DatabaseManager, n_events: int = 2_500) -> pd.DataFrame:
+    """Écrit une table match_events synthétique et la retourne"""
+    rng = np.random.default_rng(11)
+    events = pd.DataFrame({
+        'match_id': rng.choice(['m1', 'm2', 'm3'], n_events),
+        'minute': rng.integers(0, 95, n_events),
+        'event_type': rng.choice(['Pass', 'Shot', 'Tackle'], n_events),
+        'x_coordinate': rng.uniform(0, 100, n_events).round(2),
+        'y_coordinate': rng.uniform(0, 100, n_events).round(2)
+    })
+    assert manager.to_sql(events, 'match_events')
+    return events
+
+
+def test_stream_sql_yields_bounded_typed_chunks():
+    """stream_sql découpe le résultat en blocs typés qui recomposent la requête"""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_pooled_manager(directory)
+        events = create_events_table(manager)
+
+        chunks = list(manager.stream_sql(
+            "SELECT * FROM match_events WHERE minute >= ?", (10,), chunk_rows=400,
+            dtypes={'minute': 'int16', 'event_type': 'category'}
+        ))
+
+        assert all(len(chunk) <= 400 for chunk in chunks)
+        assert chunks[0]['minute'].dtype == 'int16'
+        assert chunks[0]['event_type'].dtype == 'category'
+        streamed = pd.concat(chunks, ignore_index=True)
+        assert len(streamed) == (events['minute'] >= 10).sum()
+        assert manager.pool_stats()['checked_out'] == 0
+
+        # Agrégation en mémoire bornée : heatmap de saison bloc par bloc
+        accumulator = HeatmapAccumulator.from_chunks(
+            manager.stream_sql("SELECT x_coordinate, y_coordinate FROM match_events", chunk_rows=300),
+            x_col='x_coordinate', y_col='y_coordinate'
+        )
+        assert accumulator.counts.sum() == len(events)
+        manager.disconnect()
+
+
+class RecordingConnection:
+    """Connexion DB-API unique dont les fins de transaction sont enregistrées"""
+
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path)
+        self.ends = []
+
+    def cursor(self):
+        return self.connection.cursor()
+
+    def commit(self):
+        self.ends.append('commit')
+        self.connection.commit()
+
+    def rollback(self):
+        self.ends.append('rollback')
+        self.connection.rollback()
+
+
+def test_single_connection_connects_lazily_and_ends_stream_transaction():
+    """Sans pool, checkout se connecte à la demande et stream_sql termine sa transaction"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / 'football.db')
+        with sqlite3.connect(path) as connection:
+            connection.execute("CREATE TABLE teams (team_id TEXT)")
+            connection.executemany("INSERT INTO teams VALUES (?)", [('rcsa',), ('psg',)])
+
+        manager = DatabaseManager(SQLiteConfig(path), pooled=False)
+        manager.connect = lambda: False
+        try:
+            list(manager.stream_sql("SELECT * FROM teams"))
+        except ConnectionError:
+            pass
+        else:
+            raise AssertionError("lecture sans connexion")
+        assert manager.bulk_copy(pd.DataFrame({'team_id': ['ol']}), 'teams') is None
+
+        def connect():
+            manager.connection = RecordingConnection(path)
+            return True
+
+        manager.connect = connect
+        chunks = list(manager.stream_sql("SELECT * FROM teams", chunk_rows=1))
+        assert sum(len(chunk) for chunk in chunks) == 2
+        assert manager.connection.ends == ['commit']
+
+        try:
+            list(manager.stream_sql("SELECT * FROM inconnue"))
+        except Exception:
+            pass
+        assert manager.connection.ends == ['commit', 'rollback']
+
+        # Le registre de requêtes termine aussi chaque exécution
+        registry = QueryRegistry(manager)
+        assert len(registry.read_sql('teams', query="SELECT * FROM teams")) == 2
+        try:
+            registry.read_sql('unknown', query="SELECT * FROM inconnue")
+        except Exception:
+            pass
+        assert manager.connection.ends == ['commit', 'rollback', 'commit', 'rollback']
+        manager.connection.connection.close()
+
+
+def test_read_sql_arrow_matches_read_sql():
+    """read_sql_arrow retourne la même table que read_sql au format Arrow"""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_pooled_manager(directory)
+        create_events_table(manager)
+
+        query = "SELECT * FROM match_events ORDER BY rowid"
+        table = manager.read_sql_arrow(query, chunk_rows=700)
+
+        assert table.num_rows == 2_500
+        assert table.column_names == ['match_id', 'minute', 'event_type', 'x_coordinate', 'y_coordinate']
+        pd.testing.assert_frame_equal(table.to_pandas(), manager.read_sql(query), check_dtype=False)
+        manager.disconnect()
+
+
+def test_bulk_copy_csv_buffers():
+    """Les tampons COPY encodent NULL, booléens, dates et JSON et respectent la taille de bloc"""
+    manager = DatabaseManager()
+    events = pd.DataFrame({
+        'event_id': ['e1', 'e2', 'e3'],
+        'minute': [1, 2, None],
+        'x_coordinate': [10.5, None, 99.0],
+        'event_details': [{'situation': 'corner'}, None, {'body_part': 'head'}],
+        'success': pd.array([True, None, False], dtype='boolean'),
+        'match_date': pd.to_datetime(['2024-08-15', '2024-08-15', '2024-08-22']),
+        'comment': ['', 'tir "cadré"', 'passe, décisive']
+    })
+
+    buffers = list(manager._csv_buffers(events, chunk_rows=2))
+    lines = ''.join(buffer.getvalue() for buffer in buffers).splitlines()
+
+    assert len(buffers) == 2
+    assert lines[0] == 'e1,1,10.5,"{""situation"": ""corner""}",True,2024-08-15,'
+    assert lines[1] == 'e2,2,\\N,\\N,\\N,2024-08-15,"tir ""cadré"""'
+    assert lines[2].startswith('e3,\\N,99.0,"{""body_part"": ""head""}",False,2024-08-22,')
+
+
+def test_bulk_copy_upsert_sql():
+    """L'upsert met à jour les colonnes hors clé, ou ignore les doublons sans colonne à mettre à jour"""
+    manager = DatabaseManager()
+
+    upsert = manager._upsert_sql('teams', '_staging_teams', ['team_id', 'name'], ['team_id'])
+    assert upsert == ('INSERT INTO "teams" ("team_id", "name") SELECT "team_id", "name" FROM "_staging_teams" '
+                      'ON CONFLICT ("team_id") DO UPDATE SET "name" = EXCLUDED."name"')
+    assert manager._upsert_sql('positions', '_s', ['code'], ['code']).endswith('DO NOTHING')
+
+
+def add_sleep_function(manager: DatabaseManager):
+    """Fonction SQL sleep_ms(n) sur chaque connexion empruntée (requête lente simulée)"""
+    def register(dbapi_connection, connection_record, connection_proxy):
+        dbapi_connection.create_function('sleep_ms', 1, lambda ms: time.sleep(ms / 1000) or ms)
+    event.listen(manager.engine, 'checkout', register)
+
+
+def test_async_gather_sql_runs_queries_concurrently():
+    """Trois requêtes de 150 ms lancées ensemble prennent moins que leur somme"""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_pooled_manager(directory, pool_min_size=3, pool_max_size=3)
+        add_sleep_function(manager)
+
+        async def load_page():
+            async with AsyncDatabaseManager(manager) as db:
+                start = time.perf_counter()
+                frames = await db.gather_sql(
+                    [("SELECT sleep_ms(150) AS waited, ? AS page", (page,)) for page in range(3)],
+                    dtypes={'waited': 'int16'}
+                )
+                return frames, time.perf_counter() - start
+
+        frames, elapsed = asyncio.run(load_page())
+
+        assert [frame['page'].iloc[0] for frame in frames] == [0, 1, 2]
+        assert frames[0]['waited'].dtype == 'int16'
+        assert elapsed < 0.4
+
+
+def create_player_form_tables(manager: DatabaseManager):
+    """Tables matches et player_match_stats de deux joueurs sur huit matchs"""
+    rng = np.random.default_rng(2)
+    matches = pd.DataFrame({
+        'match_id': [f'm{i}' for i in range(8)],
+        'match_date': pd.date_range('2024-08-15', periods=8, freq='7D'),
+        'home_team_id': ['rcsa', 'psg'] * 4,
+        'away_team_id': ['psg', 'rcsa'] * 4
+    })
+    stats = pd.DataFrame({
+        'player_id': np.repeat(['p1', 'p2'], 8),
+        'match_id': np.tile(matches['match_id'], 2),
+        'team_id': np.repeat(['rcsa', 'psg'], 8),
+        'minutes_played': rng.integers(45, 91, 16),
+        'rating': rng.uniform(5, 9, 16).round(1),
+        'goals': rng.integers(0, 3, 16),
+        'assists': rng.integers(0, 2, 16),
+        'xg': rng.uniform(0, 1, 16),
+        'xa': rng.uniform(0, 1, 16),
+        'passes_completed': rng.integers(20, 40, 16),
+        'passes_total': rng.integers(40, 50, 16)
+    })
+    manager.to_sql(matches, 'matches')
+    manager.to_sql(stats, 'player_match_stats')
+
+
+def test_players_form_async_matches_sync():
+    """get_players_form_async retourne la même forme que get_player_form"""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_pooled_manager(directory)
+        create_player_form_tables(manager)
+
+        analyzer = PlayerPerformanceAnalyzer(manager.engine)
+        # SQLite attend des paramètres '?'
+        analyzer.PLAYER_FORM_QUERY = PlayerPerformanceAnalyzer.PLAYER_FORM_QUERY.replace('%s', '?')
+
+        async def load_forms():
+            async with AsyncDatabaseManager(manager) as db:
+                return await analyzer.get_players_form_async(['p1', 'p2', 'unknown'], db, last_n_matches=5)
+
+        forms = asyncio.run(load_forms())
+
+        assert forms['unknown'] == {"error": "Aucune donnée trouvée pour ce joueur"}
+        for player_id in ('p1', 'p2'):
+            expected = analyzer.get_player_form(player_id, last_n_matches=5)
+            assert forms[player_id]['matches_analyzed'] == 5
+            assert np.isclose(forms[player_id]['goals_per_90'], expected['goals_per_90'])
+            assert forms[player_id]['rating_trend'] == expected['rating_trend']
+
+
+def test_query_registry_prepare_and_execute_sql():
+    """Les requêtes sont numérotées pour PREPARE et les tableaux typés dans EXECUTE"""
+    registry = QueryRegistry(DatabaseManager())
+    registry.register('compare_players', "SELECT * FROM players WHERE player_id = ANY(%s::uuid[]) "
+                      "AND code = %s AND name LIKE 'A%%'", ['uuid[]', 'varchar'])
+
+    assert registry._prepare_sql('compare_players') == (
+        "PREPARE compare_players (uuid[], varchar) AS SELECT * FROM players "
+        "WHERE player_id = ANY($1::uuid[]) AND code = $2 AND name LIKE 'A%'"
+    )
+    assert registry._execute_sql('compare_players') == "EXECUTE compare_players (%s::uuid[], %s::varchar)"
+
+    # Même nom, autre texte : refusé ; même texte : ignoré
+    registry.register('compare_players', "SELECT * FROM players WHERE player_id = ANY(%s::uuid[]) "
+                      "AND code = %s AND name LIKE 'A%%'", ['uuid[]', 'varchar'])
+    for bad_call in (lambda: registry.register('compare_players', "SELECT 1"),
+                     lambda: registry.register('bad-name', "SELECT 1"),
+                     lambda: registry.register('one_type', "SELECT %s, %s", ['int'])):
+        try:
+            bad_call()
+            assert False, "ValueError attendue"
+        except ValueError:
+            pass
+
+
+def test_latency_histogram_percentiles():
+    """Les percentiles retournent la borne de la case du quantile"""
+    histogram = LatencyHistogram()
+    for milliseconds in [0.5] * 50 + [15] * 45 + [300] * 4 + [8000]:
+        histogram.record(milliseconds / 1000)
+
+    summary = histogram.summary()
+    assert summary['calls'] == 100
+    assert summary['p50_ms'] == 1 and summary['p95_ms'] == 20
+    assert summary['<=500ms'] == 4 and summary['>5000ms'] == 1
+    assert summary['max_ms'] == 8000
+
+
+def test_analyzer_queries_through_registry():
+    """Les analyseurs passent par le registre et chaque requête a son histogramme"""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_pooled_manager(directory)
+        create_player_form_tables(manager)
+        registry = QueryRegistry(manager)
+
+        direct = PlayerPerformanceAnalyzer(manager.engine)
+        direct.PLAYER_FORM_QUERY = PlayerPerformanceAnalyzer.PLAYER_FORM_QUERY.replace('%s', '?')
+        analyzer = PlayerPerformanceAnalyzer(manager.engine, query_registry=registry)
+
+        for _ in range(3):
+            form = analyzer.get_player_form('p1', last_n_matches=4)
+        teams = registry.read_sql('team_by_id', ('rcsa',), query="SELECT name FROM teams WHERE team_id = %s")
+
+        assert form['matches_analyzed'] == 4
+        assert np.isclose(form['xg_per_90'], direct.get_player_form('p1', last_n_matches=4)['xg_per_90'])
+        assert teams['name'].tolist() == ['RC Strasbourg']
+        report = registry.latency_report().set_index('query')
+        assert report.loc['player_form', 'calls'] == 3
+        assert report.loc['team_by_id', 'calls'] == 1
+        manager.disconnect()
+
+
+def create_season_tables(manager: DatabaseManager, n_matches: int = 12) -> pd.DataFrame:
+    """Ligue, joueurs, matchs (tous programmés) et statistiques de deux équipes"""
+    rng = np.random.default_rng(5)
+    matches = pd.DataFrame({
+        'match_id': [f'm{i:02d}' for i in range(n_matches)],
+        'league_id': 'ligue1',
+        'match_date': pd.date_range('2024-08-15', periods=n_matches, freq='7D'),
+        'home_team_id': ['rcsa', 'psg'] * (n_matches // 2),
+        'away_team_id': ['psg', 'rcsa'] * (n_matches // 2),
+        'home_score': rng.integers(0, 4, n_matches),
+        'away_score': rng.integers(0, 4, n_matches),
+        'status': 'Scheduled'
+    })
+    players = pd.DataFrame({'player_id': ['p1', 'p2', 'p3'], 'first_name': ['A', 'B', 'C'],
+                            'last_name': ['X', 'Y', 'Z']})
+    n_rows = 3 * n_matches
+    stats = pd.DataFrame({
+        'stat_id': np.arange(n_rows),
+        'player_id': np.repeat(['p1', 'p2', 'p3'], n_matches),
+        'match_id': np.tile(matches['match_id'], 3),
+        'team_id': np.repeat(['rcsa', 'rcsa', 'psg'], n_matches),
+        'minutes_played': rng.choice([0, 30, 90], n_rows),
+        'goals': rng.integers(0, 3, n_rows),
+        'assists': rng.integers(0, 2, n_rows),
+        'xg': rng.uniform(0, 1, n_rows).round(3),
+        'xa': rng.uniform(0, 1, n_rows).round(3),
+        'rating': np.where(rng.random(n_rows) < 0.2, np.nan, rng.uniform(5, 9, n_rows).round(1)),
+        'passes_completed': rng.integers(10, 40, n_rows),
+        'passes_total': rng.integers(40, 50, n_rows),
+        'tackles_won': rng.integers(0, 3, n_rows),
+        'tackles_total': rng.integers(3, 6, n_rows)
+    })
+    manager.to_sql(pd.DataFrame({'league_id': ['ligue1'], 'season': ['2024-2025']}), 'leagues')
+    manager.to_sql(players, 'players')
+    manager.to_sql(matches, 'matches')
+    manager.to_sql(stats, 'player_match_stats')
+    return stats
+
+
+def test_season_stats_apply_only_new_matches():
+    """Chaque lot n'agrège que les nouveaux matchs et les cumuls égalent un calcul complet"""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_pooled_manager(directory)
+        stats = create_season_tables(manager)
+        maintainer = SeasonStatsMaintainer(manager)
+        maintainer.create_tables()
+
+        assert maintainer.apply_new_matches()['matches'] == 0
+        with manager.checkout() as connection:
+            connection.execute("UPDATE matches SET status = 'Finished' WHERE match_id < 'm06'")
+        first = maintainer.apply_new_matches(max_matches=4)
+        second = maintainer.apply_new_matches()
+        with manager.checkout() as connection:
+            connection.execute("UPDATE matches SET status = 'Finished' WHERE match_id < 'm10'")
+        third = maintainer.apply_new_matches()
+
+        assert (first['batch_id'], first['matches']) == (1, 4)
+        assert (second['batch_id'], second['matches']) == (2, 2)
+        assert (third['batch_id'], third['matches']) == (3, 4)
+        assert maintainer.apply_new_matches()['matches'] == 0
+
+        # Référence : agrégation pandas des dix matchs terminés
+        played = stats[(stats['match_id'] < 'm10') & (stats['minutes_played'] > 0)]
+        expected = played.groupby('player_id').agg(
+            matches_played=('stat_id', 'count'), total_goals=('goals', 'sum'),
+            avg_rating=('rating', 'mean'), passes_completed=('passes_completed', 'sum'),
+            passes_total=('passes_total', 'sum')
+        )
+        season = manager.read_sql("SELECT * FROM player_season_stats").set_index('player_id').loc[expected.index]
+        assert (season['matches_played'].to_numpy() == expected['matches_played'].to_numpy()).all()
+        assert (season['total_goals'].to_numpy() == expected['total_goals'].to_numpy()).all()
+        assert np.allclose(season['avg_rating'], expected['avg_rating'].round(2))
+        assert np.allclose(season['pass_accuracy_pct'],
+                           expected['passes_completed'] / expected['passes_total'] * 100)
+
+        teams = manager.read_sql("SELECT * FROM team_performance_stats").set_index('team_id')
+        assert (teams['matches_played'] == 10).all()
+        assert (teams['wins'] + teams['draws'] + teams['losses'] == 10).all()
+        assert teams.loc['rcsa', 'goals_for'] == teams.loc['psg', 'goals_against']
+
+        check = maintainer.check_consistency()
+        assert check['consistent'] and check['pending_matches'] == 0
+        manager.disconnect()
+
+
+def test_parquet_compare_players_matches_season_view():
+    """Le stockage Parquet reproduit player_season_stats : 0 minute exclue, une ligne par équipe"""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_pooled_manager(directory)
+        stats = create_season_tables(manager)
+        assert (stats['minutes_played'] == 0).any()
+        with manager.checkout() as connection:
+            connection.execute("UPDATE matches SET status = 'Finished' WHERE match_id != 'm11'")
+            # Transfert en cours de saison : p1 termine la saison à psg
+            connection.execute("UPDATE player_match_stats SET team_id = 'psg' "
+                               "WHERE player_id = 'p1' AND match_id >= 'm08'")
+        maintainer = SeasonStatsMaintainer(manager)
+        maintainer.create_tables()
+        maintainer.apply_new_matches()
+
+        store = ParquetStore(Path(directory) / 'store')
+        for table in ('leagues', 'teams', 'players', 'matches', 'player_match_stats'):
+            store.write(table, manager.read_sql(f"SELECT * FROM {table}"))
+        store.write('positions', pd.DataFrame({'position_id': ['pos_st'], 'name': ['Attaquant'], 'code': ['ST']}))
+        store.write('player_team_contracts', pd.DataFrame({
+            'player_id': ['p1', 'p2', 'p3'], 'primary_position_id': ['pos_st'] * 3, 'end_date': [None] * 3}))
+
+        columns = ['player_name', 'total_goals', 'total_assists', 'total_xg', 'total_xa', 'avg_rating',
+                   'pass_accuracy_pct', 'tackle_success_pct', 'matches_played', 'total_minutes']
+        expected = manager.read_sql(
+            "SELECT first_name || ' ' || last_name AS player_name, * FROM player_season_stats "
+            "WHERE season = '2024-2025'"
+        )[columns].sort_values(['player_name', 'matches_played'], ignore_index=True)
+        parquet = store.read_sql(PlayerPerformanceAnalyzer.COMPARE_PLAYERS_QUERY, (['p1', 'p2', 'p3'],))
+        parquet = parquet[columns].sort_values(['player_name', 'matches_played'], ignore_index=True)
+
+        assert len(expected) == 4 and (expected['player_name'] == 'A X').sum() == 2
+        pd.testing.assert_frame_equal(parquet, expected, check_dtype=False)
+        manager.disconnect()
+
+
+def test_season_stats_wait_for_player_stats():
+    """Un match terminé sans statistiques joueurs reste en attente jusqu'à leur chargement"""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_pooled_manager(directory)
+        stats = create_season_tables(manager)
+        maintainer = SeasonStatsMaintainer(manager)
+        maintainer.create_tables()
+        with manager.checkout() as connection:
+            connection.execute("DELETE FROM player_match_stats WHERE match_id = 'm05'")
+            connection.execute("UPDATE matches SET status = 'Finished' WHERE match_id < 'm06'")
+
+        assert maintainer.apply_new_matches()['matches'] == 5
+        ledger = manager.read_sql("SELECT match_id FROM season_stats_ledger")
+        assert 'm05' not in set(ledger['match_id'])
+        assert maintainer.check_consistency()['consistent']
+
+        # Les statistiques arrivent après la fin du match : le lot suivant les compte
+        manager.to_sql(stats[stats['match_id'] == 'm05'], 'player_match_stats')
+        assert maintainer.check_consistency()['pending_matches'] == 1
+        assert maintainer.apply_new_matches()['matches'] == 1
+
+        played = stats[(stats['match_id'] < 'm06') & (stats['minutes_played'] > 0)]
+        season = manager.read_sql("SELECT * FROM player_season_stats").set_index('player_id')
+        expected = played.groupby('player_id')['goals'].sum()
+        assert (season.loc[expected.index, 'total_goals'].to_numpy() == expected.to_numpy()).all()
+        assert maintainer.check_consistency()['consistent']
+        manager.disconnect()
+
+
+def test_season_stats_consistency_detects_late_corrections():
+    """Une statistique corrigée après application est signalée, rebuild la rattrape"""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_pooled_manager(directory)
+        create_season_tables(manager)
+        maintainer = SeasonStatsMaintainer(manager)
+        maintainer.create_tables()
+        with manager.checkout() as connection:
+            connection.execute("UPDATE matches SET status = 'Finished'")
+        maintainer.apply_new_matches()
+
+        with manager.checkout() as connection:
+            connection.execute("UPDATE player_match_stats SET goals = goals + 1 "
+                               "WHERE match_id = 'm03' AND player_id = 'p3' AND minutes_played > 0")
+            connection.execute("UPDATE player_match_stats SET minutes_played = 90 "
+                               "WHERE match_id = 'm03' AND player_id = 'p3'")
+            connection.execute("UPDATE matches SET home_score = home_score + 5 WHERE match_id = 'm04'")
+
+        check = maintainer.check_consistency()
+        assert not check['consistent']
+        assert set(check['player_mismatches']['player_id']) == {'p3'}
+        assert 'goals_for' in set(check['team_mismatches']['column'])
+
+        # Recalcul en échec : la suppression est annulée avec lui
+        totals = manager.read_sql("SELECT * FROM player_season_totals ORDER BY player_id, team_id")
+        maintainer.TEAM_DELTA_QUERY = "SELECT * FROM table_inconnue {batch_filter}"
+        try:
+            maintainer.rebuild()
+        except Exception:
+            pass
+        else:
+            raise AssertionError("recalcul invalide validé")
+        pd.testing.assert_frame_equal(
+            manager.read_sql("SELECT * FROM player_season_totals ORDER BY player_id, team_id"), totals)
+        assert len(manager.read_sql("SELECT * FROM season_stats_ledger")) == 12
+        del maintainer.TEAM_DELTA_QUERY
+
+        report = maintainer.rebuild()
+        assert report['matches'] == 12
+        assert maintainer.check_consistency()['consistent']
+        manager.disconnect()
+
+
+def test_season_partitions_cover_every_day():
+    """Les bornes de saison se suivent sans trou et le 30 juin appartient à sa saison"""
+    partitions = SeasonPartitionManager(DatabaseManager())
+
+    start, end = partitions.season_bounds('2024-2025')
+    assert (start, end) == (date(2024, 7, 1), date(2025, 7, 1))
+    assert partitions.season_bounds('2025-2026')[0] == end
+    assert partitions.season_for_date(date(2025, 6, 30)) == '2024-2025'
+    assert partitions.season_for_date(date(2025, 7, 1)) == '2025-2026'
+    assert partitions.create_partition_sql('matches', '2026-2027') == (
+        "CREATE TABLE IF NOT EXISTS matches_2026_2027 PARTITION OF matches "
+        "FOR VALUES FROM ('2026-07-01') TO ('2027-07-01')"
+    )
+    assert partitions.parse_bound(
+        "FOR VALUES FROM ('2024-07-01 00:00:00') TO ('2025-06-30 00:00:00')"
+    ) == (date(2024, 7, 1), date(2025, 6, 30))
+    assert partitions.parse_bound("DEFAULT") is None
+    for bad_season in ('2024', '2024-2026'):
+        try:
+            partitions.season_bounds(bad_season)
+            assert False, "ValueError attendue"
+        except ValueError:
+            pass
+
+
+def test_plan_future_seasons_skips_existing():
+    """Saison en cours et saisons suivantes, sans recréer les partitions existantes"""
+    partitions = SeasonPartitionManager(DatabaseManager())
+
+    planned = partitions.plan_future_seasons(['2024-2025', '2025-2026'], today=date(2026, 3, 1), seasons_ahead=2)
+    assert planned == ['2026-2027', '2027-2028']
+    assert partitions.plan_future_seasons([], today=date(2026, 8, 1), seasons_ahead=0) == ['2026-2027']
+
+
+def test_export_parquet_round_trip():
+    """L'archive Parquet contient toutes les lignes, lues par blocs"""
+    import pyarrow.parquet as pq
+
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_pooled_manager(directory)
+        events = create_events_table(manager, n_events=2_500)
+        partitions = SeasonPartitionManager(manager)
+
+        report = partitions.export_parquet('match_events', Path(directory) / 'archives' / 'events.parquet',
+                                           chunk_rows=1_000)
+        archived = pq.read_table(report['path']).to_pandas()
+
+        assert report['rows'] == len(events) == len(archived)
+        assert pq.ParquetFile(report['path']).metadata.row_group(0).column(0).compression == 'ZSTD'
+        # SQLite relit les lignes dans l'ordre d'insertion
+        pd.testing.assert_frame_equal(archived[events.columns], events, check_dtype=False)
+        manager.disconnect()
+
+
+def test_archive_season_keeps_partition_until_export_succeeds():
+    """matches encore référencée, export en échec ou détachement refusé : la saison reste en place"""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = create_pooled_manager(directory)
+        with manager.checkout() as connection:
+            connection.execute("CREATE TABLE matches_2015_2016 (match_id TEXT, match_date TEXT)")
+            connection.execute("INSERT INTO matches_2015_2016 VALUES ('m1', '2015-08-01'), ('m2', '2016-05-01')")
+            connection.execute("CREATE TABLE player_match_stats (match_id TEXT, player_id TEXT)")
+            connection.execute("CREATE TABLE match_events (match_id TEXT, minute INTEGER)")
+            connection.execute("INSERT INTO match_events VALUES ('m2', 10)")
+        partitions = SeasonPartitionManager(manager)
+        archives = Path(directory) / 'archives'
+
+        try:
+            partitions.archive_season('matches', '2015-2016', archives)
+        except RuntimeError as error:
+            assert 'match_events' in str(error)
+        else:
+            raise AssertionError("archivage de matchs encore référencés")
+        assert not archives.exists()
+
+        with manager.checkout() as connection:
+            connection.execute("DELETE FROM match_events")
+        blocked = Path(directory) / 'fichier'
+        blocked.write_text('')
+        try:
+            partitions.archive_season('matches', '2015-2016', blocked)
+        except OSError:
+            pass
+        else:
+            raise AssertionError("export impossible ignoré")
+
+        # SQLite refuse DETACH PARTITION : la transaction est annulée, la table est intacte
+        try:
+            partitions.archive_season('matches', '2015-2016', archives)
+        except Exception:
+            pass
+        assert (archives / 'matches_2015_2016.parquet').exists()
+        assert len(manager.read_sql("SELECT * FROM matches_2015_2016")) == 2
+        manager.disconnect()
+
+
+def test_double_round_robin_schedule():
+    """Chaque équipe rencontre chaque adversaire une fois à domicile, une fois à l'extérieur"""
+    schedule = double_round_robin(6)
+    fixtures = schedule.reshape(-1, 2)
+
+    assert schedule.shape == (10, 3, 2)
+    assert len({tuple(pair) for pair in fixtures}) == 30
+    for round_fixtures in schedule:
+        assert sorted(round_fixtures.ravel()) == list(range(6))
+
+
+def test_synthetic_shard_is_deterministic_and_consistent():
+    """Même graine, mêmes données ; scores et statistiques agrégés depuis les événements"""
+    generator = SyntheticDatasetGenerator(n_leagues=2, n_seasons=2, teams_per_league=4,
+                                          players_per_team=18, events_per_match=400, seed=7)
+    specs = generator.shard_specs()
+    shard = generate_shard(specs[3])
+    again = generate_shard(SyntheticDatasetGenerator(n_leagues=2, n_seasons=2, teams_per_league=4,
+                                                     players_per_team=18, events_per_match=400,
+                                                     seed=7).shard_specs()[3])
+    assert len(specs) == 4
+    for table, frame in shard.items():
+        pd.testing.assert_frame_equal(frame, again[table])
+    assert not shard['match_events'].equals(generate_shard(specs[2])['match_events'])
+
+    matches, stats, events = shard['matches'], shard['player_match_stats'], shard['match_events']
+    assert len(matches) == 12 and len(events) == 12 * 400
+    goals = stats.groupby(['match_id', 'team_id'])['goals'].sum()
+    home = goals.loc[list(zip(matches['match_id'], matches['home_team_id']))].to_numpy()
+    assert np.array_equal(home, matches['home_score'].to_numpy())
+    assert stats['passes_total'].sum() == (events['event_type'] == 'Pass').sum()
+    # Les statistiques tombent dans la partition de la saison du match
+    assert (stats['created_at'] >= pd.Timestamp('2016-07-01')).all()
+    assert set(events['player_id']) <= set(stats['player_id'])
+    assert stats.groupby('match_id')['is_starter'].sum().eq(22).all()
+
+
+def test_synthetic_dataset_writes_partitioned_files():
+    """Fragments écrits sous {table}/season=/league= avec les seules colonnes du schéma"""
+    generator = SyntheticDatasetGenerator(n_leagues=1, n_seasons=2, teams_per_league=4,
+                                          players_per_team=16, events_per_match=100)
+    with tempfile.TemporaryDirectory() as directory:
+        manifest = generator.generate(directory, processes=1)
+        events = manifest[manifest['table'] == 'match_events']
+
+        assert list(events['season']) == ['2015-2016', '2016-2017']
+        assert Path(events['path'].iloc[1]).parent == Path(directory, 'match_events', 'season=2016-2017', 'league=L1')
+        assert events['rows'].sum() == 2 * 12 * 100
+        players = read_shard(next(Path(directory, 'players').glob('players.parquet')))
+        assert 'team_id' not in players.columns and len(players) == 64
+
+
+if __name__ == "__main__":
+    print("🗄️  Tests du gestionnaire de base de données")
+    print("=" * 50)
+
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+
+    print("\n🎉 Tous les tests sont réussis !")
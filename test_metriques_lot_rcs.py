@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Tests des Calculs Vectorisés RCS
+================================
+
+Vérifie que les chemins vectorisés de MetriquesFootballRCS donnent les mêmes
+résultats que les calculs scalaires d'origine.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ajouter le répertoire racine au path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from python_analytics.modules.metriques_rcs import MetriquesFootballRCS, MatchEventSummary
+from python_analytics.modules.xg_grid import XGGrid
+from python_analytics.modules.heatmap_accumulator import HeatmapAccumulator
+
+
+def generer_tirs(n_tirs: int, graine: int = 42) -> pd.DataFrame:
+    """Génère un lot de tirs aléatoires couvrant toutes les modalités"""
+    rng = np.random.default_rng(graine)
+    return pd.DataFrame({
+        'x_coordonnee': rng.uniform(0, 100, n_tirs),
+        'y_coordonnee': rng.uniform(0, 100, n_tirs),
+        'situation': rng.choice(['jeu_ouvert', 'contre', 'normale', 'arret_jeu', 'contre_attaque'], n_tirs),
+        'partie_corps': rng.choice(['pied_droit', 'pied_gauche', 'tete', 'autre'], n_tirs),
+        'joueur_tireur': rng.choice(['Emanuel Emegha', 'Dilane Bakwa', 'Sékou Mara', 'Inconnu', None], n_tirs)
+    })
+
+
+def test_xg_lot_parite_scalaire():
+    """calculer_xg_lot reproduit calculer_xg_tir tir par tir"""
+    metriques = MetriquesFootballRCS()
+    tirs = generer_tirs(5000)
+
+    xg_lot = metriques.calculer_xg_lot(tirs)
+    xg_scalaire = np.array([
+        metriques.calculer_xg_tir(t.x_coordonnee, t.y_coordonnee, t.situation,
+                                  t.partie_corps, t.joueur_tireur)
+        for t in tirs.itertuples(index=False)
+    ])
+
+    assert xg_lot.shape == (len(tirs),)
+    np.testing.assert_allclose(xg_lot, xg_scalaire, rtol=1e-12, atol=0)
+
+
+def test_xg_lot_tableau_numpy():
+    """Un ndarray (n, 2) utilise les paramètres par défaut pour chaque tir"""
+    metriques = MetriquesFootballRCS()
+    coordonnees = np.array([[85, 50], [99, 50], [60, 10], [100, 44]], dtype=float)
+
+    xg_lot = metriques.calculer_xg_lot(coordonnees, situation="contre", joueur_tireur="Emanuel Emegha")
+    xg_scalaire = [
+        metriques.calculer_xg_tir(x, y, "contre", "pied_droit", "Emanuel Emegha")
+        for x, y in coordonnees
+    ]
+
+    np.testing.assert_allclose(xg_lot, xg_scalaire, rtol=1e-12, atol=0)
+
+
+def test_xg_lot_bornes_tranches():
+    """Les distances exactement sur un seuil restent dans la tranche inférieure"""
+    metriques = MetriquesFootballRCS()
+    # Distances de 6 et 11 mètres pile dans l'axe du but
+    coordonnees = np.array([[100 - 6 / 1.05, 50], [100 - 11 / 1.05, 50]])
+
+    xg_lot = metriques.calculer_xg_lot(coordonnees)
+    xg_scalaire = [metriques.calculer_xg_tir(x, y) for x, y in coordonnees]
+
+    np.testing.assert_allclose(xg_lot, xg_scalaire, rtol=1e-12, atol=0)
+
+
+def generer_passes(n_passes: int, graine: int = 7) -> pd.DataFrame:
+    """Génère un lot de passes aléatoires couvrant toutes les modalités"""
+    rng = np.random.default_rng(graine)
+    return pd.DataFrame({
+        'x_passe': rng.uniform(0, 100, n_passes),
+        'y_passe': rng.uniform(0, 100, n_passes),
+        'x_reception': rng.uniform(0, 100, n_passes),
+        'y_reception': rng.uniform(0, 100, n_passes),
+        'type_passe': rng.choice(['normale', 'centre', 'passe_cle', 'passe_profondeur', 'relance', 'autre'], n_passes),
+        'joueur_passeur': rng.choice(['Dilane Bakwa', 'Andrey Santos', 'Habib Diarra', 'Inconnu', None], n_passes)
+    })
+
+
+def test_xa_lot_parite_scalaire():
+    """calculer_xa_lot reproduit calculer_xa_passe passe par passe"""
+    metriques = MetriquesFootballRCS()
+    passes = generer_passes(5000)
+
+    xa_lot = metriques.calculer_xa_lot(passes)
+    xa_scalaire = np.array([
+        metriques.calculer_xa_passe(p.x_passe, p.y_passe, p.x_reception, p.y_reception,
+                                    p.type_passe, p.joueur_passeur)
+        for p in passes.itertuples(index=False)
+    ])
+
+    np.testing.assert_allclose(xa_lot, xa_scalaire, rtol=1e-12, atol=0)
+
+
+def test_xa_lot_tableau_numpy():
+    """Un ndarray (n, 4) accepte un type de passe et un passeur communs"""
+    metriques = MetriquesFootballRCS()
+    passes = np.array([[70, 25, 88, 45], [40, 50, 80, 50], [10, 10, 12, 12]], dtype=float)
+
+    xa_lot = metriques.calculer_xa_lot(passes, type_passe="passe_cle", joueur_passeur="Dilane Bakwa")
+    xa_scalaire = [
+        metriques.calculer_xa_passe(*p, "passe_cle", "Dilane Bakwa") for p in passes
+    ]
+
+    np.testing.assert_allclose(xa_lot, xa_scalaire, rtol=1e-12, atol=0)
+
+
+def generer_evenements_match(n_evenements: int = 3000, graine: int = 3) -> pd.DataFrame:
+    """Génère les événements d'un match avec des coordonnées entières (bornes 35/65 incluses)"""
+    rng = np.random.default_rng(graine)
+    return pd.DataFrame({
+        'equipe': rng.choice(['RCS', 'Adversaire'], n_evenements),
+        'type_evenement': rng.choice(['passe', 'passe_reussie', 'tacle', 'tacle_reussi', 'interception',
+                                      'faute', 'degagement', 'duel_aerien'], n_evenements),
+        'x_coordonnee': rng.integers(0, 101, n_evenements).astype(float),
+        'y_coordonnee': rng.uniform(0, 100, n_evenements),
+        'x_reception': rng.integers(0, 101, n_evenements).astype(float),
+        'y_reception': rng.uniform(0, 100, n_evenements),
+        'minute': rng.integers(1, 95, n_evenements),
+        'reussi': rng.choice([True, False], n_evenements)
+    })
+
+
+def test_resume_match_comptages():
+    """Les comptages du résumé correspondent aux filtres pandas équivalents"""
+    evenements = generer_evenements_match()
+    resume = MatchEventSummary(evenements, "RCS")
+
+    rcs = evenements[evenements['equipe'] == "RCS"]
+    adversaire = evenements[evenements['equipe'] != "RCS"]
+
+    assert resume.compter(False, ['passe'], zones=[MatchEventSummary.ZONE_DEFENSIVE]) == len(
+        adversaire[(adversaire['type_evenement'] == 'passe') & (adversaire['x_coordonnee'] <= 35)]
+    )
+    assert resume.compter(True, ['tacle', 'faute'], zones=[MatchEventSummary.ZONE_LIMITE_OFFENSIVE,
+                                                           MatchEventSummary.ZONE_OFFENSIVE]) == len(
+        rcs[rcs['type_evenement'].isin(['tacle', 'faute']) & (rcs['x_coordonnee'] >= 65)]
+    )
+    assert resume.compter(True, ['tacle'], reussi=True) == len(
+        rcs[(rcs['type_evenement'] == 'tacle') & rcs['reussi']]
+    )
+    assert resume.compter(True, ['type_inexistant']) == 0
+
+
+def test_resume_match_coherent_avec_methodes():
+    """calculer_resume_match regroupe exactement les quatre analyses individuelles"""
+    metriques = MetriquesFootballRCS()
+    evenements = generer_evenements_match()
+
+    resume = metriques.calculer_resume_match(evenements)
+
+    assert resume['ppda'] == metriques.calculer_ppda_equipe(evenements)
+    assert resume['zones_recuperation'] == metriques.analyser_zones_recuperation(evenements)
+    assert resume['possession'] == metriques.calculer_metriques_possession(evenements)
+    assert resume['defense'] == metriques.calculer_metriques_defensives(evenements)
+
+
+def test_resume_match_sans_colonnes_optionnelles():
+    """Sans réception ni réussite, les passes sont comptées comme moyennes"""
+    metriques = MetriquesFootballRCS()
+    evenements = pd.DataFrame({
+        'equipe': ['RCS', 'RCS', 'RCS', 'Adversaire'],
+        'type_evenement': ['passe', 'passe', 'tacle', 'passe'],
+        'x_coordonnee': [20.0, 70.0, 80.0, 10.0],
+        'minute': [1, 10, 20, 30]
+    })
+
+    possession = metriques.calculer_metriques_possession(evenements)
+
+    assert possession['total_passes'] == 2
+    assert possession['repartition_distance'] == {'courtes': 0, 'moyennes': 2, 'longues': 0}
+    assert possession['passes_par_zone'] == {'zone_defensive': 1, 'zone_milieu': 0, 'zone_offensive': 1}
+    assert metriques.calculer_ppda_equipe(evenements) == 1.0
+
+
+def test_ppda_ligue_parite_par_match():
+    """calculer_ppda_ligue reproduit calculer_ppda_equipe pour chaque (match, équipe)"""
+    metriques = MetriquesFootballRCS()
+    matchs = []
+    for numero, (domicile, exterieur) in enumerate([('RCS', 'OL'), ('OM', 'RCS'), ('OL', 'OM')]):
+        evenements = generer_evenements_match(600, graine=numero)
+        evenements['equipe'] = np.where(evenements['equipe'] == 'RCS', domicile, exterieur)
+        evenements['match'] = numero
+        matchs.append(evenements)
+    saison = pd.concat(matchs, ignore_index=True)
+
+    ppda = metriques.calculer_ppda_ligue(saison)
+
+    assert len(ppda['par_match']) == 6
+    for ligne in ppda['par_match'].itertuples():
+        match = saison[saison['match'] == ligne.match]
+        assert ligne.ppda == metriques.calculer_ppda_equipe(match, ligne.equipe)
+
+    par_equipe = ppda['par_equipe'].set_index('equipe')
+    assert par_equipe.loc['RCS', 'matchs'] == 2
+    assert list(ppda['par_equipe']['ppda']) == sorted(ppda['par_equipe']['ppda'])
+
+
+def test_grille_xg_precision():
+    """Les lectures interpolées respectent la borne d'erreur documentée"""
+    metriques = MetriquesFootballRCS()
+    grille = XGGrid.build(0.25)
+    rng = np.random.default_rng(11)
+    x = rng.uniform(0, 100, 200_000)
+    y = rng.uniform(0, 100, 200_000)
+
+    geometrie = grille.interpolate_many(['distance', 'sin_angle'], x, y)
+    distance = np.sqrt((100 - x)**2 + (50 - y)**2)
+    sin_angle = np.sin(np.radians(metriques._calculer_angle_tir_lot(x, y)))
+    poteau = np.minimum(np.hypot(100 - x, 44 - y), np.hypot(100 - x, 56 - y))
+    loin = (distance > 2) & (poteau > 2)
+
+    assert np.abs(geometrie['distance'] - distance)[loin].max() < 4e-3
+    assert np.abs(geometrie['sin_angle'] - sin_angle)[loin].max() < 2e-3
+
+    ecarts = np.abs(metriques.calculer_xg_lot(np.c_[x, y], grille=grille) -
+                    metriques.calculer_xg_lot(np.c_[x, y]))
+    assert (ecarts > 1e-3).mean() < 1e-3
+
+
+def test_grille_xg_sauvegarde_memmap():
+    """La grille rechargée est mappée en mémoire et donne les mêmes lectures"""
+    grille = XGGrid.build(0.5)
+    x, y = np.array([85.3, 60.0, np.nan]), np.array([48.2, 10.0, 50.0])
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = str(Path(dossier) / 'grille_xg.npy')
+        rechargee = XGGrid.load_or_build(chemin, step=0.5)
+        assert isinstance(rechargee.values, np.memmap)
+        assert rechargee.step == 0.5
+
+        attendu = grille.interpolate('xg_logistic', x, y)
+        lu = rechargee.interpolate('xg_logistic', x, y)
+        np.testing.assert_array_equal(lu[:2], attendu[:2])
+        assert np.isnan(lu[2])
+        del rechargee, lu
+
+
+def test_heatmap_accumulateur_par_blocs():
+    """Les blocs successifs donnent la même heatmap et les mêmes moments que le calcul global"""
+    rng = np.random.default_rng(21)
+    x = np.concatenate([rng.uniform(0, 100, 50_000), [0.0, 100.0, 5.0, 105.0, np.nan]])
+    y = np.concatenate([rng.uniform(0, 100, 50_000), [0.0, 100.0, 5.0, 50.0, 50.0]])
+
+    accumulateur = HeatmapAccumulator()
+    for bloc in np.array_split(np.arange(len(x)), 7):
+        accumulateur.update(x[bloc], y[bloc])
+
+    valides = ~np.isnan(x)
+    attendu, _, _ = np.histogram2d(x[valides], y[valides],
+                                   bins=[np.linspace(0, 100, 21), np.linspace(0, 100, 21)])
+    np.testing.assert_array_equal(accumulateur.histogram(), attendu)
+    assert accumulateur.n_positions == valides.sum()
+    np.testing.assert_allclose(accumulateur.mean, [x[valides].mean(), y[valides].mean()])
+    np.testing.assert_allclose(accumulateur.std, [x[valides].std(ddof=1), y[valides].std(ddof=1)])
+
+
+def test_heatmap_fusion_et_sauvegarde():
+    """Fusion de deux matchs puis rechargement depuis le disque"""
+    rng = np.random.default_rng(4)
+    match_1 = rng.normal(60, 10, (2000, 2))
+    match_2 = rng.normal(40, 15, (3000, 2))
+
+    saison = HeatmapAccumulator().update(*match_1.T).merge(HeatmapAccumulator().update(*match_2.T))
+    global_ = HeatmapAccumulator().update(*np.vstack([match_1, match_2]).T)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = str(Path(dossier) / 'heatmap_saison.npz')
+        saison.save(chemin)
+        rechargee = HeatmapAccumulator.load(chemin)
+
+    np.testing.assert_array_equal(rechargee.counts, global_.counts)
+    np.testing.assert_allclose(rechargee.mean, global_.mean)
+    np.testing.assert_allclose(rechargee.mobility_score, global_.mobility_score)
+
+
+def test_heatmap_joueur_depuis_accumulateur():
+    """generer_heatmap_joueur garde ses résultats historiques"""
+    metriques = MetriquesFootballRCS()
+    rng = np.random.default_rng(8)
+    positions = pd.DataFrame({
+        'joueur': rng.choice(['Emanuel Emegha', 'Dilane Bakwa'], 4000),
+        'x_coordonnee': rng.uniform(0, 100, 4000),
+        'y_coordonnee': rng.uniform(0, 100, 4000)
+    })
+
+    heatmap = metriques.generer_heatmap_joueur(positions, 'Emanuel Emegha')
+
+    joueur = positions[positions['joueur'] == 'Emanuel Emegha']
+    attendu, _, _ = np.histogram2d(joueur['x_coordonnee'], joueur['y_coordonnee'],
+                                   bins=[np.linspace(0, 100, 21), np.linspace(0, 100, 21)])
+    np.testing.assert_array_equal(heatmap['heatmap_data'], attendu)
+    assert heatmap['position_moyenne'] == (round(joueur['x_coordonnee'].mean(), 1),
+                                           round(joueur['y_coordonnee'].mean(), 1))
+    assert 'erreur' in metriques.generer_heatmap_joueur(positions, 'Inconnu')
+
+
+def test_heatmaps_effectif_parite_par_joueur():
+    """Le tenseur de l'effectif reproduit generer_heatmap_joueur pour chaque joueur"""
+    metriques = MetriquesFootballRCS()
+    rng = np.random.default_rng(12)
+    joueurs = [f'Joueur {i}' for i in range(25)]
+    positions = pd.DataFrame({
+        'joueur': rng.choice(joueurs, 20_000),
+        'x_coordonnee': rng.uniform(0, 100, 20_000),
+        'y_coordonnee': rng.uniform(0, 100, 20_000)
+    })
+
+    effectif = metriques.generer_heatmaps_effectif(positions, joueurs=joueurs + ['Absent'])
+
+    assert effectif['heatmaps'].shape == (26, 20, 20)
+    profils = effectif['profils'].set_index('joueur')
+    for indice, joueur in enumerate(joueurs):
+        individuelle = metriques.generer_heatmap_joueur(positions, joueur)
+        np.testing.assert_array_equal(effectif['heatmaps'][indice], individuelle['heatmap_data'])
+        assert (profils.loc[joueur, 'x_moyen'], profils.loc[joueur, 'y_moyen']) == individuelle['position_moyenne']
+        assert profils.loc[joueur, 'score_mobilite'] == individuelle['score_mobilite']
+        assert profils.loc[joueur, 'zone_principale'] == individuelle['zone_principale']
+
+    assert effectif['heatmaps'][-1].sum() == 0
+    assert profils.loc['Absent', 'nb_positions'] == 0
+
+
+if __name__ == "__main__":
+    print("🔵⚪ Tests des calculs vectorisés RCS")
+    print("=" * 50)
+
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+
+    print("\n🎉 Tous les tests sont réussis !")
@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+"""
+Tests du Module Performance Analyzer
+====================================
+
+Vérifie les calculs vectorisés de FootballMetrics par rapport aux calculs
+match par match.
+"""
+
+import asyncio
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ajouter le répertoire racine au path
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent / 'database' / 'migrations'))
+
+from python_analytics.modules.performance_analyzer import FootballMetrics, PlayerPerformanceAnalyzer, TacticalAnalyzer
+from python_analytics.modules.xg_grid import XGGrid
+from python_analytics.modules.pass_network import PassNetwork
+from python_analytics.modules.match_event_cache import MatchEventCache
+from python_analytics.modules.index_advisor import IndexAdvisor
+from python_analytics.modules.parquet_store import ParquetStore
+from configs.async_database import AsyncDatabaseManager
+from configs.database import DatabaseManager
+from synthetic_dataset import SyntheticDatasetGenerator
+
+
+def generate_season_events(n_matches: int = 6, events_per_match: int = 500, seed: int = 42) -> pd.DataFrame:
+    """Génère des événements multi-matchs (deux équipes par match)"""
+    rng = np.random.default_rng(seed)
+    teams = np.array(['RCSA', 'PSG', 'OM', 'OL'])
+    frames = []
+    for match in range(n_matches):
+        home, away = teams[match % 4], teams[(match + 1) % 4]
+        frames.append(pd.DataFrame({
+            'match_id': f'match_{match}',
+            'team_id': rng.choice([home, away], events_per_match),
+            'event_type': rng.choice(['Pass', 'Tackle', 'Interception', 'Foul', 'Shot'], events_per_match),
+            'x_coordinate': rng.uniform(0, 100, events_per_match)
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_league_ppda_matches_single_match_ppda():
+    """calculate_league_ppda reproduit calculate_ppda pour chaque (match, équipe)"""
+    metrics = FootballMetrics()
+    events = generate_season_events()
+
+    league = metrics.calculate_league_ppda(events)
+
+    assert len(league['by_match']) == 12
+    for row in league['by_match'].itertuples():
+        match_events = events[events['match_id'] == row.match_id]
+        assert row.ppda == metrics.calculate_ppda(match_events, row.team_id)
+
+
+def test_league_ppda_season_rollup():
+    """Le cumul saison divise les totaux et sépare les saisons"""
+    metrics = FootballMetrics()
+    events = generate_season_events()
+    events['season'] = np.where(events['match_id'].isin(['match_0', 'match_1', 'match_2']),
+                                '2024-2025', '2025-2026')
+
+    by_team = metrics.calculate_league_ppda(events)['by_team']
+
+    assert set(by_team['season']) == {'2024-2025', '2025-2026'}
+    expected = (by_team['opponent_passes'] / by_team['defensive_actions']).round(2)
+    assert np.allclose(by_team['ppda'], expected)
+
+
+def test_calculate_xg_with_grid():
+    """calculate_xg avec XGGrid reste proche du calcul analytique"""
+    metrics = FootballMetrics()
+    rng = np.random.default_rng(5)
+    shots = pd.DataFrame({
+        'x': rng.uniform(60, 100, 1000),
+        'y': rng.uniform(0, 100, 1000),
+        'situation': rng.choice(['open_play', 'counter_attack'], 1000)
+    })
+
+    analytic = metrics.calculate_xg(shots)
+    interpolated = metrics.calculate_xg(shots, xg_grid=XGGrid.build(0.25))
+
+    assert np.abs(interpolated['xg'] - analytic['xg']).max() < 1e-3
+
+
+def generate_match_sequences(n_matches: int = 4, events_per_match: int = 800, seed: int = 7) -> pd.DataFrame:
+    """Génère des séquences de passes et de tirs horodatées"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for match in range(n_matches):
+        frames.append(pd.DataFrame({
+            'match_id': f'match_{match}',
+            'team_id': rng.choice(['RCSA', 'PSG'], events_per_match),
+            'event_type': rng.choice(['Pass', 'Pass', 'Pass', 'Shot'], events_per_match),
+            'minute': rng.integers(0, 95, events_per_match),
+            'second_in_minute': rng.integers(0, 60, events_per_match),
+            'x_coordinate': rng.uniform(50, 100, events_per_match),
+            'y_coordinate': rng.uniform(0, 100, events_per_match),
+            'success': rng.choice([True, False], events_per_match)
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def reference_xa(passes: pd.DataFrame, shots: pd.DataFrame, max_seconds: float = 15) -> np.ndarray:
+    """xA tir par tir : dernière passe réussie de l'équipe avant chaque tir"""
+    pass_clock = (passes['minute'] * 60 + passes['second_in_minute']).to_numpy()
+    xa = np.zeros(len(passes))
+    credited = set()
+    shots = shots.assign(clock=shots['minute'] * 60 + shots['second_in_minute'])
+    for shot in shots.sort_values('clock', kind='stable').itertuples():
+        candidates = np.flatnonzero(
+            passes['success'].to_numpy() &
+            (passes['match_id'] == shot.match_id).to_numpy() &
+            (passes['team_id'] == shot.team_id).to_numpy() &
+            (pass_clock <= shot.clock) & (pass_clock >= shot.clock - max_seconds)
+        )
+        if len(candidates) == 0:
+            continue
+        # Dernière passe dans le temps, la dernière ligne en cas d'égalité
+        best = candidates[pass_clock[candidates] == pass_clock[candidates].max()][-1]
+        if best not in credited:
+            credited.add(best)
+            xa[best] = shot.xg
+    return xa
+
+
+def test_calculate_xa_links_previous_completed_pass():
+    """La passe réussie précédant un tir reçoit son xG, les autres passes zéro"""
+    metrics = FootballMetrics()
+    passes = pd.DataFrame({
+        'match_id': ['m1'] * 4,
+        'team_id': ['RCSA', 'RCSA', 'PSG', 'RCSA'],
+        'minute': [10, 10, 10, 30],
+        'second_in_minute': [0, 5, 8, 0],
+        'success': [True, False, True, True]
+    })
+    shots = pd.DataFrame({
+        'match_id': ['m1', 'm1'],
+        'team_id': ['RCSA', 'RCSA'],
+        'minute': [10, 31],
+        'second_in_minute': [10, 0],
+        'xg': [0.3, 0.5]
+    })
+
+    xa = metrics.calculate_xa(passes, shots)['xa']
+
+    # Passe ratée et passe adverse ignorées, tir de la 31e trop tardif
+    assert xa.tolist() == [0.3, 0.0, 0.0, 0.0]
+
+
+def test_calculate_xa_uses_keys_shared_with_shots():
+    """Des tirs sans team_id sont rattachés sur les seules clés communes aux deux tables"""
+    metrics = FootballMetrics()
+    passes = pd.DataFrame({
+        'match_id': ['m1', 'm1', 'm2'],
+        'team_id': ['RCSA', 'PSG', 'RCSA'],
+        'minute': [10, 20, 20],
+        'second_in_minute': [0, 0, 0],
+        'success': [True, True, True]
+    })
+    shots = pd.DataFrame({'match_id': ['m1', 'm1'], 'minute': [10, 20], 'second_in_minute': [5, 30],
+                          'xg': [0.2, 0.4]})
+
+    xa = metrics.calculate_xa(passes, shots)['xa']
+
+    # Tir du match m2 absent : la passe de m2 n'est pas créditée
+    assert xa.tolist() == [0.2, 0.0, 0.0]
+    assert metrics.calculate_xa(passes, shots, max_seconds=30)['xa'].tolist() == [0.2, 0.4, 0.0]
+
+
+def test_calculate_xa_matches_nested_loop():
+    """calculate_xa reproduit le rattachement passe-tir par double boucle"""
+    metrics = FootballMetrics()
+    events = generate_match_sequences()
+    passes = events[events['event_type'] == 'Pass'].reset_index(drop=True)
+    shots = metrics.calculate_xg(events[events['event_type'] == 'Shot'])
+
+    xa = metrics.calculate_xa(passes, shots)['xa'].to_numpy()
+
+    assert (xa > 0).sum() > 50
+    assert np.allclose(xa, reference_xa(passes, shots))
+
+
+def test_pass_network_links_consecutive_same_team_events():
+    """Une passe réussie relie son auteur au joueur de l'événement suivant du même club"""
+    events = pd.DataFrame({
+        'minute': [1, 1, 1, 2, 2, 2, 3, 3],
+        'second_in_minute': [10, 0, 20, 0, 5, 9, 0, 1],
+        'event_type': ['Pass', 'Pass', 'Pass', 'Pass', 'Tackle', 'Pass', 'Pass', 'Shot'],
+        'player_id': ['B', 'A', 'C', 'C', 'X', 'A', 'A', 'B'],
+        'team_id': ['RCSA', 'RCSA', 'RCSA', 'RCSA', 'PSG', 'RCSA', 'RCSA', 'RCSA'],
+        'success': [True, True, False, True, True, True, True, True]
+    })
+
+    network = PassNetwork.from_events(events, 'RCSA')
+    edges = network.edges()
+
+    # A→B, B→C ; la passe ratée de C, celle interceptée par PSG et A→A ne comptent pas, A→B à la 3e
+    assert network.total_passes == 3
+    assert set(zip(edges['passer_id'], edges['receiver_id'], edges['pass_count'])) == {
+        ('A', 'B', 2), ('B', 'C', 1)
+    }
+    centrality = network.centrality().set_index('player_id')
+    assert centrality.loc['B', 'degree_centrality'] == 1.0
+    assert centrality['eigenvector_centrality'].idxmax() == 'B'
+
+
+def test_pass_network_matches_sequential_loop():
+    """La matrice creuse reproduit un parcours événement par événement"""
+    rng = np.random.default_rng(3)
+    n_events = 3000
+    events = pd.DataFrame({
+        'minute': rng.integers(0, 95, n_events),
+        'second_in_minute': rng.integers(0, 60, n_events),
+        'event_type': rng.choice(['Pass', 'Pass', 'Tackle', 'Shot'], n_events),
+        'player_id': rng.choice([f'P{i}' for i in range(22)], n_events),
+        'team_id': rng.choice(['RCSA', 'PSG'], n_events),
+        'success': rng.choice([True, False], n_events, p=[0.8, 0.2])
+    })
+
+    network = PassNetwork.from_events(events, 'RCSA')
+
+    expected = {}
+    ordered = events.sort_values(['minute', 'second_in_minute'], kind='stable')
+    rows = list(ordered.itertuples())
+    for current, following in zip(rows, rows[1:]):
+        if (current.event_type == 'Pass' and current.success and current.team_id == 'RCSA'
+                and following.team_id == 'RCSA' and following.player_id != current.player_id):
+            key = (current.player_id, following.player_id)
+            expected[key] = expected.get(key, 0) + 1
+
+    edges = network.edges()
+    assert dict(zip(zip(edges['passer_id'], edges['receiver_id']), edges['pass_count'])) == expected
+    assert network.adjacency.nnz == len(expected)
+
+
+class SQLiteEventCache(MatchEventCache):
+    """Cache lisant une base SQLite (paramètres '?' au lieu de '%s')"""
+
+    def _fetch(self, match_id):
+        query = (f"SELECT {', '.join(self.DTYPES)} FROM match_events "
+                 "WHERE match_id = ? ORDER BY minute, second_in_minute")
+        return pd.read_sql(query, self.db, params=[match_id])
+
+
+def create_events_database(n_matches: int = 5) -> sqlite3.Connection:
+    """Base SQLite en mémoire avec une table match_events multi-matchs"""
+    events = generate_match_sequences(n_matches=n_matches)
+    events['player_id'] = np.random.default_rng(0).choice([f'P{i}' for i in range(22)], len(events))
+    connection = sqlite3.connect(':memory:')
+    events.to_sql('match_events', connection, index=False)
+    return connection
+
+
+def test_match_event_cache_types_and_hits():
+    """Un match n'est lu qu'une fois, avec des types compacts"""
+    connection = create_events_database()
+    cache = SQLiteEventCache(connection)
+
+    events = cache.get('match_1')
+    assert cache.get('match_1') is events
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+    assert events['minute'].dtype == 'int16'
+    assert events['team_id'].dtype == 'category'
+    assert events['success'].dtype == 'boolean'
+
+    # Mêmes métriques que sur les événements bruts
+    raw = pd.read_sql("SELECT * FROM match_events WHERE match_id = 'match_1'", connection)
+    metrics = FootballMetrics()
+    assert metrics.calculate_ppda(events, 'RCSA') == metrics.calculate_ppda(raw, 'RCSA')
+    assert (PassNetwork.from_events(events, 'RCSA').edges().values.tolist() ==
+            PassNetwork.from_events(raw, 'RCSA').edges().values.tolist())
+
+
+def test_match_event_cache_lru_eviction():
+    """Au-delà du plafond mémoire, les matchs les moins récents sont évincés"""
+    connection = create_events_database()
+    one_match = SQLiteEventCache(connection)
+    one_match.get('match_0')
+    cache = SQLiteEventCache(connection, max_bytes=int(one_match.memory_bytes * 2.5))
+
+    cache.get('match_0')
+    cache.get('match_1')
+    cache.get('match_0')
+    cache.get('match_2')
+
+    stats = cache.stats()
+    assert stats['matches'] == 2 and stats['evictions'] == 1
+    assert stats['memory_bytes'] <= stats['max_bytes']
+    # match_1 était le moins récemment consulté
+    cache.get('match_0')
+    assert cache.stats()['misses'] == 3
+    cache.get('match_1')
+    assert cache.stats()['misses'] == 4
+
+
+class FailingReader:
+    """Gestionnaire dont read_sql échoue comme DatabaseManager (DataFrame vide sans colonnes)"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def read_sql(self, query, params=None):
+        self.calls += 1
+        return pd.DataFrame()
+
+
+def test_match_event_cache_does_not_store_failed_or_empty_reads():
+    """Une lecture en échec lève une erreur et une lecture vide est refaite au prochain appel"""
+    reader = FailingReader()
+    cache = MatchEventCache(reader)
+    for _ in range(2):
+        try:
+            cache.get('match_0')
+        except RuntimeError as error:
+            assert 'match_0' in str(error)
+        else:
+            raise AssertionError("lecture en échec mise en cache")
+    assert reader.calls == 2 and cache.stats()['matches'] == 0
+
+    connection = create_events_database(n_matches=1)
+    cache = SQLiteEventCache(connection)
+    assert cache.get('match_inconnu').empty and list(cache.get('match_inconnu').columns) == list(cache.DTYPES)
+    assert cache.stats()['matches'] == 0 and cache.stats()['misses'] == 2
+
+
+def test_match_event_cache_single_fetch_for_concurrent_misses():
+    """Plusieurs threads demandant le même match absent ne déclenchent qu'une lecture"""
+    events = SQLiteEventCache(create_events_database(n_matches=1))._fetch('match_0')
+    fetches = []
+
+    class SlowCache(MatchEventCache):
+        def _fetch(self, match_id):
+            fetches.append(match_id)
+            time.sleep(0.1)
+            return events
+
+    cache = SlowCache(None)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('match_0'))) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetches == ['match_0']
+    assert len(results) == 6 and all(result is results[0] for result in results)
+    assert cache.stats()['misses'] == 1 and cache.stats()['hits'] == 5
+
+
+# Plan EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) de la heatmap récente sans index dédié
+RECENT_HEATMAP_PLAN = [{
+    'Plan': {
+        'Node Type': 'Hash Join', 'Shared Hit Blocks': 120, 'Shared Read Blocks': 880,
+        'Plans': [
+            {'Node Type': 'Seq Scan', 'Relation Name': 'match_events'},
+            {'Node Type': 'Hash', 'Plans': [
+                {'Node Type': 'Append', 'Plans': [
+                    {'Node Type': 'Seq Scan', 'Relation Name': 'matches_2024_2025'},
+                    {'Node Type': 'Index Scan', 'Relation Name': 'matches_2025_2026',
+                     'Index Name': 'matches_2025_2026_match_date_idx'}
+                ]}
+            ]}
+        ]
+    },
+    'Planning Time': 0.4,
+    'Execution Time': 35.2
+}]
+
+
+def test_index_advisor_plan_summary():
+    """Le résumé d'un plan relève parcours séquentiels, index utilisés et blocs lus"""
+    summary = IndexAdvisor.summarize_plan(RECENT_HEATMAP_PLAN)
+
+    assert summary['execution_ms'] == 35.2
+    assert summary['shared_blocks'] == 1000
+    assert summary['seq_scans'] == ['match_events', 'matches_2024_2025']
+    assert summary['indexes'] == ['matches_2025_2026_match_date_idx']
+    assert summary['sorts'] == 0
+    assert summary['sort_keys'] == []
+
+
+# Plans des événements d'un match et de la composition d'une équipe (tri explicite)
+MATCH_EVENTS_PLAN = [{'Plan': {
+    'Node Type': 'Sort', 'Sort Key': ['match_events.minute', 'match_events.second_in_minute'],
+    'Plans': [{'Node Type': 'Seq Scan', 'Relation Name': 'match_events', 'Alias': 'match_events',
+               'Filter': "(match_id = 'a1'::uuid)"}]
+}}]
+LINEUP_PLAN = [{'Plan': {
+    'Node Type': 'Sort', 'Sort Key': ['pms.minutes_played DESC'],
+    'Plans': [{'Node Type': 'Hash Join', 'Hash Cond': '(pms.position_played_id = pos.position_id)', 'Plans': [
+        {'Node Type': 'Index Scan', 'Relation Name': 'player_match_stats', 'Alias': 'pms',
+         'Index Name': 'player_match_stats_match_id_idx',
+         'Index Cond': "(match_id = 'a1'::uuid)", 'Filter': "((minutes_played > 0) AND (team_id = 't1'::uuid))"},
+        {'Node Type': 'Hash', 'Plans': [{'Node Type': 'Seq Scan', 'Relation Name': 'positions', 'Alias': 'pos'}]}
+    ]}]
+}}]
+
+
+def test_index_advisor_describes_sort_keys():
+    """Chaque tri est rattaché à sa table avec les colonnes fixées par égalité"""
+    events = IndexAdvisor.summarize_plan(MATCH_EVENTS_PLAN)
+    lineup = IndexAdvisor.summarize_plan(LINEUP_PLAN)
+
+    assert events['sort_keys'] == ['match_events(=match_id, minute, second_in_minute)']
+    assert lineup['sort_keys'] == ['player_match_stats(=match_id, =team_id, minutes_played DESC)']
+    proposals = {proposal.name: proposal for proposal in IndexAdvisor.PROPOSALS}
+    assert proposals['idx_events_match_clock'].serves_sort(events['sort_keys'][0])
+    # La composition trie sur minutes_played, absent des colonnes clés de l'index couvrant
+    assert not proposals['idx_player_stats_lineup'].serves_sort(lineup['sort_keys'][0])
+    assert not proposals['idx_events_player_match_xy'].serves_sort(events['sort_keys'][0])
+    assert proposals['idx_matches_date_brin'].key_columns == []
+
+
+def test_index_advisor_selects_proposals_from_plans():
+    """Seuls les index absents dont une requête parcourt la table (ou une partition) ou sert le tri sont retenus"""
+    baseline = pd.DataFrame({
+        'query': ['recent_heatmap', 'match_heatmap', 'team_lineup', 'match_events', 'player_form'],
+        'seq_scans': ['match_events, matches_2024_2025', '', '', '', ''],
+        'sorts': [0, 0, 4, 4, 4],
+        'sort_keys': ['', '', 'player_match_stats(=match_id, =team_id, minutes_played DESC)',
+                      'match_events(=match_id, minute, second_in_minute)', 'matches(match_date DESC)']
+    })
+    selected = IndexAdvisor.select_proposals(IndexAdvisor.PROPOSALS, {'idx_events_created_brin'}, baseline)
+    names = [proposal.name for proposal in selected]
+
+    assert names == ['idx_events_player_match_xy', 'idx_events_match_clock',
+                     'idx_matches_date_brin', 'idx_player_stats_created_brin']
+    covering = selected[0].ddl
+    assert covering.startswith('CREATE INDEX IF NOT EXISTS idx_events_player_match_xy ON match_events')
+    assert 'INCLUDE (x_coordinate, y_coordinate, event_type)' in covering
+    assert 'USING brin (match_date)' in selected[2].ddl
+    # Toutes les requêtes ciblées par les propositions sont mesurées
+    targeted = {query for proposal in IndexAdvisor.PROPOSALS for query in proposal.queries}
+    assert targeted <= set(IndexAdvisor.analyzer_queries())
+
+
+def test_index_advisor_compare_reports_speedup():
+    """Le rapport avant/après aligne les requêtes et calcule l'accélération"""
+    before = pd.DataFrame({'query': ['a', 'b'], 'p50_ms': [40.0, 2.0], 'p95_ms': [60.0, 3.0],
+                           'indexes': ['', 'idx_b']})
+    after = pd.DataFrame({'query': ['b', 'a'], 'p50_ms': [2.0, 0.5], 'p95_ms': [3.0, 0.8],
+                          'indexes': ['idx_b', 'idx_events_player_match_xy']})
+
+    comparison = IndexAdvisor.compare(before, after)
+    assert comparison['query'].tolist() == ['a', 'b']
+    assert comparison['speedup'].tolist() == [80.0, 1.0]
+    assert comparison.loc[0, 'indexes_after'] == 'idx_events_player_match_xy'
+
+
+def build_parquet_store(directory: str) -> ParquetStore:
+    """Stockage Parquet alimenté par un petit jeu synthétique (2 championnats, 1 saison)"""
+    generator = SyntheticDatasetGenerator(n_leagues=2, n_seasons=1, first_season=2024, teams_per_league=4,
+                                          players_per_team=16, events_per_match=300)
+    generator.generate(Path(directory) / 'source', processes=1)
+    store = ParquetStore(Path(directory) / 'store')
+    store.import_directory(Path(directory) / 'source')
+    return store
+
+
+def test_parquet_store_partitions_and_pushdown():
+    """Partitions saison/championnat/match ; filtres et projection poussés aux fichiers"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = build_parquet_store(directory)
+        assert store.connect()
+        index = store.match_index()
+        match_id = index.index[0]
+        season, league = index.loc[match_id, ['season', 'league']]
+        assert season == '2024-2025'
+        assert (store.root / 'match_events' / f'season={season}' / f'league={league}' / f'match={match_id}').is_dir()
+
+        events = store.match_events(match_id, ['minute', 'second_in_minute', 'event_type'])
+        assert list(events.columns) == ['minute', 'second_in_minute', 'event_type'] and len(events) == 300
+        clock = events['minute'] * 60 + events['second_in_minute']
+        assert clock.is_monotonic_increasing
+
+        scanned = store.scan('match_events', ['player_id'], filters=[('match', '=', match_id)])
+        assert len(scanned) == 300
+        player_id = store.match_events(match_id, ['player_id'])['player_id'].iloc[0]
+        stats = store.scan('player_match_stats', ['player_id', 'goals'], filters=[('player_id', '=', player_id)])
+        assert set(stats['player_id']) == {player_id} and len(stats) >= 1
+
+
+class RecordingRegistry:
+    """Registre de requêtes minimal : lit via le stockage et note les noms appelés"""
+
+    def __init__(self, store):
+        self.store = store
+        self.calls = []
+
+    def read_sql(self, name, params, query=None, param_types=None):
+        self.calls.append(name)
+        return self.store.read_sql(query, params)
+
+
+def test_async_formation_reads_lineup_through_registry():
+    """La version asynchrone lit la composition via le registre, comme la version synchrone"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = build_parquet_store(directory)
+        index = store.match_index()
+        match_id, team_id = index.index[0], index['home_team_id'].iloc[0]
+        registry = RecordingRegistry(store)
+        analyzer = TacticalAnalyzer(store, query_registry=registry)
+
+        expected = analyzer.analyze_team_formation(team_id, match_id)
+        sync_calls = list(registry.calls)
+        registry.calls.clear()
+        async_db = AsyncDatabaseManager(DatabaseManager(pooled=True))
+        try:
+            report = asyncio.run(analyzer.analyze_team_formation_async(team_id, match_id, async_db))
+        finally:
+            asyncio.run(async_db.close())
+
+        assert 'team_lineup' in sync_calls and sorted(registry.calls) == sorted(sync_calls)
+        assert report['detected_formation'] == expected['detected_formation']
+        assert len(report['average_positions']) == len(expected['average_positions'])
+
+
+def test_parquet_store_serves_analyzer_queries():
+    """Les analyseurs interrogent le stockage Parquet comme une base"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = build_parquet_store(directory)
+        index = store.match_index()
+        match_id, team_id = index.index[0], index['home_team_id'].iloc[0]
+
+        report = TacticalAnalyzer(store).analyze_team_formation(team_id, match_id)
+        assert len(report['average_positions']) >= 11
+        assert all(node['player_name'] for node in report['pass_network']['centrality'])
+
+        analyzer = PlayerPerformanceAnalyzer(store)
+        player_id = store.read_sql(TacticalAnalyzer.LINEUP_QUERY, (team_id, match_id))['player_id'].iloc[0]
+        form = analyzer.get_player_form(player_id, last_n_matches=3)
+        assert form['matches_analyzed'] == 3
+        dates = [performance['match_date'] for performance in form['recent_performances']]
+        assert dates == sorted(dates, reverse=True)
+
+        comparison = analyzer.compare_players([player_id])
+        assert comparison.loc[0, 'matches_played'] >= 3 and comparison.loc[0, 'total_minutes'] > 0
+        heatmap = store.read_sql(PlayerPerformanceAnalyzer.MATCH_HEATMAP_QUERY, (player_id, match_id))
+        assert list(heatmap.columns) == ['x_coordinate', 'y_coordinate', 'event_type'] and len(heatmap) > 0
+
+        try:
+            store.read_sql("SELECT * FROM matches")
+        except NotImplementedError:
+            pass
+        else:
+            raise AssertionError("requête non enregistrée acceptée")
+
+
+if __name__ == "__main__":
+    print("⚽ Tests du module Performance Analyzer")
+    print("=" * 50)
+
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+
+    print("\n🎉 Tous les tests sont réussis !")
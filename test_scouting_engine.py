@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Tests du Moteur de Scouting
+===========================
+
+Vérifie la recherche de joueurs similaires (index k plus proches voisins
+exact et index approché IVF) par rapport à un calcul exhaustif des distances,
+et le profilage incrémental par blocs.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import adjusted_rand_score
+
+# Ajouter le répertoire racine au path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from python_analytics.modules.scouting_engine import (
+    MarketValuePredictor, PlayerANNIndex, PlayerProfiler, PlayerSimilarityIndex, ScoutingEngine
+)
+from python_analytics.modules.model_registry import ModelRegistry, train
+
+
+def generate_player_database(n_players: int = 600, seed: int = 7) -> pd.DataFrame:
+    """Base de joueurs avec statistiques de profilage, âge et équipe"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'player_id': [f'player_{i}' for i in range(n_players)],
+        'name': [f'Joueur {i}' for i in range(n_players)],
+        'age': rng.integers(17, 37, n_players),
+        'position': rng.choice(['CB', 'CM', 'ST'], n_players),
+        'team': rng.choice(['RCSA', 'PSG', 'OM', 'OL'], n_players),
+        'goals_per_90': rng.exponential(0.3, n_players),
+        'assists_per_90': rng.exponential(0.2, n_players),
+        'xg_per_90': rng.exponential(0.25, n_players),
+        'xa_per_90': rng.exponential(0.15, n_players),
+        'pass_accuracy': rng.normal(80, 10, n_players),
+        'passes_per_90': rng.normal(45, 20, n_players),
+        'tackles_per_90': rng.exponential(2.5, n_players)
+    })
+
+
+def exhaustive_neighbors(features: np.ndarray, row: int, candidates: np.ndarray, k: int) -> np.ndarray:
+    """Voisins de référence : toutes les distances calculées"""
+    candidates = candidates[candidates != row]
+    distances = np.linalg.norm(features[candidates] - features[row], axis=1)
+    return candidates[np.argsort(distances, kind='stable')[:k]]
+
+
+def test_similarity_index_matches_exhaustive_search():
+    """Index global et par cluster : mêmes voisins qu'un calcul exhaustif"""
+    rng = np.random.default_rng(0)
+    raw = rng.normal(size=(500, 6)) * [1, 10, 100, 0.1, 5, 50]
+    clusters = rng.integers(0, 4, 500)
+    index = PlayerSimilarityIndex(raw, clusters)
+    standardized = index.features.astype(np.float64)
+
+    assert index.features.dtype == np.float32
+    assert np.allclose(standardized.std(axis=0), 1, atol=1e-3)
+    positions, distances = index.query(3, k=8)
+    assert list(positions) == list(exhaustive_neighbors(standardized, 3, np.arange(500), 8))
+    assert np.all(np.diff(distances) >= 0)
+
+    positions, _ = index.query(3, k=8, cluster=clusters[3])
+    members = np.flatnonzero(clusters == clusters[3])
+    assert list(positions) == list(exhaustive_neighbors(standardized, 3, members, 8))
+
+
+def test_similarity_index_filter_mask():
+    """Le masque restreint les candidats, avec ou sans cluster"""
+    rng = np.random.default_rng(1)
+    index = PlayerSimilarityIndex(rng.normal(size=(300, 4)), rng.integers(0, 3, 300))
+    mask = np.zeros(300, dtype=bool)
+    mask[::3] = True
+
+    positions, distances = index.query(0, k=5, mask=mask)
+    assert 0 not in positions and mask[positions].all()
+    assert list(positions) == list(exhaustive_neighbors(index.features.astype(np.float64), 0, np.flatnonzero(mask), 5))
+    assert np.allclose(distances, np.linalg.norm(index.features[positions] - index.features[0], axis=1), atol=1e-4)
+
+    positions, _ = index.query(0, k=50, cluster=index.clusters[0], mask=mask)
+    assert (index.clusters[positions] == index.clusters[0]).all() and mask[positions].all()
+    assert index.similarity_scores(np.array([0.0]))[0] == 100
+
+
+def test_find_similar_players_uses_profile_features():
+    """Recherche par identifiant : même cluster, filtres appliqués, âge et identifiants ignorés"""
+    engine = ScoutingEngine()
+    database = generate_player_database()
+    engine.load_player_database(database)
+
+    assert 'age' not in engine.profiler.feature_columns
+    similar = engine.find_similar_players('player_10', n_recommendations=5)
+    assert len(similar) == 5 and all(player['player_id'] != 'player_10' for player in similar)
+    clusters = engine.player_database.set_index('player_id')['player_cluster']
+    assert {clusters[player['player_id']] for player in similar} == {clusters['player_10']}
+    scores = [player['similarity_score'] for player in similar]
+    assert scores == sorted(scores, reverse=True) and 0 < scores[-1] <= 100
+
+    filtered = engine.find_similar_players('player_10', n_recommendations=5, same_cluster=False,
+                                           filters={'position': 'ST', 'age_max': 25})
+    assert filtered and all(player['position'] == 'ST' and player['age'] <= 25 for player in filtered)
+
+    # Une autre ligne avec les mêmes statistiques mais un autre âge reste le voisin le plus proche
+    twin = database.iloc[[10]].assign(player_id='twin', age=database['age'].iloc[10] + 10)
+    engine.load_player_database(pd.concat([database, twin], ignore_index=True))
+    assert engine.find_similar_players('player_10', n_recommendations=1)[0]['player_id'] == 'twin'
+    assert engine.find_similar_players('inconnu') == []
+
+
+def clustered_features(n_rows: int, n_features: int = 8, seed: int = 3) -> np.ndarray:
+    """Statistiques groupées en profils (comme des postes)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(12, n_features)) * 3
+    return centers[rng.integers(0, 12, n_rows)] + rng.normal(size=(n_rows, n_features))
+
+
+def test_ann_index_recall_and_exact_fallback():
+    """Rappel élevé avec quelques listes, exact quand toutes les listes sont parcourues"""
+    features = clustered_features(4_000)
+    ids = np.array([f'player_{i}:2023-2024' for i in range(4_000)])
+    index = PlayerANNIndex(n_lists=32, n_probe=8).fit(features, ids)
+
+    assert len(index) == 4_000 and index.offsets[-1] == 4_000
+    assert index.vectors.dtype == np.float32
+    found, distances = index.search(features[17], k=5)
+    assert found[0] == ids[17] and distances[0] < 1e-3
+
+    truth = np.argsort(np.linalg.norm(index.transform(features) - index.transform(features[17:18]), axis=1))[:10]
+    assert set(index.exact_search(features[17], k=10)[0]) == set(ids[truth])
+
+    report = index.recall_report(n_queries=50, k=10, n_probes=(1, 8, 32))
+    assert list(report['n_probe']) == [1, 8, 32]
+    assert report['recall_at_k'].is_monotonic_increasing
+    assert report['recall_at_k'].iloc[-1] == 1.0 and report['recall_at_k'].iloc[1] > 0.9
+
+
+def test_ann_index_incremental_insert_and_memmap_reload():
+    """Insertion sans réentraînement puis rechargement en memmap, mêmes résultats"""
+    features = clustered_features(3_000)
+    ids = np.array([f'player_{i}' for i in range(3_000)])
+    index = PlayerANNIndex(n_lists=16, feature_columns=[f'stat_{i}' for i in range(8)])
+    index.fit(features[:2_500], ids[:2_500])
+    centroids = index.centroids.copy()
+    index.add(features[2_500:], ids[2_500:])
+
+    assert len(index) == 3_000 and np.array_equal(index.centroids, centroids)
+    assert index.search(features[2_900], k=1)[0][0] == 'player_2900'
+
+    with tempfile.TemporaryDirectory() as directory:
+        index.save(directory)
+        reloaded = PlayerANNIndex.load(directory)
+        assert isinstance(reloaded.vectors, np.memmap)
+        assert reloaded.feature_columns == index.feature_columns
+        expected, reloaded_result = index.search(features[42], k=10), reloaded.search(features[42], k=10)
+        assert list(reloaded_result[0]) == list(expected[0])
+        del reloaded
+
+
+def test_find_lookalikes_across_pool():
+    """Profils proches d'un joueur de la base dans un vivier multi-saisons"""
+    engine = ScoutingEngine()
+    database = generate_player_database()
+    engine.load_player_database(database)
+    pool = pd.concat([database.assign(player_id=database['player_id'] + f':{season}') for season in ('2022', '2023')],
+                     ignore_index=True)
+    pool.loc[pool['player_id'] == 'player_10:2023', 'goals_per_90'] += 0.01
+    engine.build_lookalike_index(pool, n_lists=16)
+
+    lookalikes = engine.find_lookalikes('player_10', n_recommendations=3, n_probe=16)
+    assert [player['player_id'] for player in lookalikes[:2]] == ['player_10:2022', 'player_10:2023']
+    assert lookalikes[0]['similarity_score'] > lookalikes[2]['similarity_score']
+
+
+def test_predict_values_matches_forest_with_tree_intervals():
+    """Prédiction en lot : moyenne de la forêt, intervalle issu de la dispersion des arbres"""
+    predictor = MarketValuePredictor()
+    predictor.train_model(predictor._generate_market_demo_data())
+    players = generate_player_database(200)
+
+    predictions = predictor.predict_values(players)
+    features = pd.DataFrame({col: players[col] if col in players.columns else default
+                             for col, default in MarketValuePredictor.FEATURE_DEFAULTS.items()})
+    expected = predictor.model.predict(predictor.scaler.transform(features))
+
+    assert predictions.index.equals(players.index)
+    assert np.allclose(predictions['predicted_value'], expected)
+    assert (predictions['min_value'] <= predictions['predicted_value']).all()
+    assert (predictions['predicted_value'] <= predictions['max_value']).all()
+    assert (predictions['max_value'] > predictions['min_value']).any()
+
+    single = predictor.predict_value(players.iloc[3].to_dict())
+    assert single['predicted_value'] == round(predictions['predicted_value'].iloc[3], 2)
+    assert single['confidence'] == 80
+
+
+def test_scout_by_criteria_predicts_missing_values_in_batch():
+    """max_value sans market_value : une seule prédiction en lot pour tous les candidats"""
+    engine = ScoutingEngine()
+    engine.load_player_database(generate_player_database())
+    calls = []
+    predict_values = engine.value_predictor.predict_values
+    engine.value_predictor.predict_values = lambda players: calls.append(len(players)) or predict_values(players)
+
+    recommendations = engine.scout_by_criteria({'age_max': 28, 'max_value': 150})
+    assert len(calls) == 1 and calls[0] == (engine.player_database['age'] <= 28).sum()
+    assert recommendations and all(player['age'] <= 28 for player in recommendations)
+
+
+def profile_stats(n_rows: int, seed: int = 11) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Statistiques de profilage groupées en 8 profils, avec le profil d'origine"""
+    rng = np.random.default_rng(seed)
+    profiles = rng.integers(0, 8, n_rows)
+    centers = np.random.default_rng(5).normal(size=(8, len(PlayerProfiler.PROFILE_METRICS))) * 3
+    values = centers[profiles] + rng.normal(size=(n_rows, len(PlayerProfiler.PROFILE_METRICS)))
+    return pd.DataFrame(values, columns=PlayerProfiler.PROFILE_METRICS), profiles
+
+
+def test_incremental_profiler_streams_chunks():
+    """fit_stream relit la source par blocs et retrouve les profils d'un clustering complet"""
+    stats, truth = profile_stats(20_000)
+    reads = []
+
+    def chunks():
+        reads.append(0)
+        return (stats.iloc[start:start + 2_500] for start in range(0, len(stats), 2_500))
+
+    profiler = PlayerProfiler(incremental=True)
+    clusters = profiler.fit_stream(chunks)
+    assert len(reads) >= 4 and profiler.feature_columns == PlayerProfiler.PROFILE_METRICS
+    assert adjusted_rand_score(truth, profiler.assign(stats)['player_cluster']) > 0.99
+    assert sum(cluster['size'] for cluster in clusters.values()) == len(stats)
+
+    full = PlayerProfiler().create_player_profiles(stats)
+    incremental = PlayerProfiler(incremental=True, chunk_size=4_000).create_player_profiles(stats)
+    assert adjusted_rand_score(full['player_cluster'], incremental['player_cluster']) > 0.99
+    assert (incremental['cluster_label'] == [profiler._get_cluster_label(c) for c in incremental['player_cluster']]).all()
+
+
+def test_incremental_refit_keeps_cluster_labels():
+    """Un réajustement sur des blocs dans un autre ordre garde les numéros (et labels) de cluster"""
+    stats, _ = profile_stats(12_000)
+    profiler = PlayerProfiler(incremental=True, chunk_size=3_000)
+    before = profiler.create_player_profiles(stats)['player_cluster']
+
+    shuffled = stats.sample(frac=1, random_state=3)
+    profiler.fit_stream(lambda: (shuffled.iloc[start:start + 1_000] for start in range(0, len(shuffled), 1_000)))
+    assert (profiler.assign(stats)['player_cluster'] == before).mean() > 0.99
+
+    # Le profileur complet (KMeans) sert aussi de référence pour l'appariement
+    batch = PlayerProfiler()
+    reference = batch.create_player_profiles(stats)['player_cluster']
+    batch.fit_stream(lambda: iter([shuffled]))
+    assert (batch.assign(stats)['player_cluster'] == reference).mean() > 0.99
+
+
+def test_partial_update_folds_in_new_players():
+    """Les nouveaux joueurs-saisons sont affectés et intégrés sans réajustement, y compris depuis le registre"""
+    stats, _ = profile_stats(10_000)
+    new_players, _ = profile_stats(500, seed=12)
+    with tempfile.TemporaryDirectory() as directory:
+        registry = ModelRegistry(directory)
+        fitted = PlayerProfiler(incremental=True, chunk_size=2_000)
+        before = fitted.create_player_profiles(stats)['player_cluster']
+        registry.publish('profiler', registry.save('profiler', fitted.artifact(), fitted.feature_columns, stats))
+
+        published = registry.load_published('profiler', PlayerProfiler.PROFILE_METRICS)
+        centers = np.array(published['kmeans'].cluster_centers_)
+        steps = published['kmeans'].n_steps_
+        profiler = PlayerProfiler(incremental=True)
+        profiler.restore(published)
+        profiler.fit_stream = None  # aucun réajustement complet
+        updated = profiler.partial_update(new_players)
+        profiler.partial_update(new_players.head(50))
+
+        # L'artefact du cache du registre, partagé par le processus, est inchangé
+        served = registry.load_published('profiler', PlayerProfiler.PROFILE_METRICS)['kmeans']
+        assert served is published['kmeans'] and served is not profiler.kmeans
+        assert np.array_equal(served.cluster_centers_, centers) and served.n_steps_ == steps
+        assert not np.array_equal(profiler.kmeans.cluster_centers_, centers)
+        assert published['cluster_counts'].sum() == len(stats)
+
+    assert set(updated.columns) >= {'player_cluster', 'cluster_label'} and len(updated) == len(new_players)
+    # Profils de la base publiée complétés par les nouveaux joueurs, sans relire la base
+    assert sum(cluster['size'] for cluster in profiler.player_clusters.values()) == len(stats) + len(new_players) + 50
+    assert (profiler.assign(stats)['player_cluster'] == before).mean() > 0.99
+    try:
+        PlayerProfiler().partial_update(new_players)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("mise à jour d'un profileur non ajusté")
+
+
+def test_model_registry_keys_and_publication():
+    """Clé = schéma + données ; seul l'artefact publié est servi pour son schéma"""
+    data = generate_player_database(100)
+    columns = ['goals_per_90', 'xg_per_90']
+    assert ModelRegistry.schema_hash(columns) != ModelRegistry.schema_hash(columns[::-1])
+    assert ModelRegistry.data_hash(data) == ModelRegistry.data_hash(data.copy())
+    assert ModelRegistry.data_hash(data) != ModelRegistry.data_hash(data.assign(goals_per_90=0.0))
+
+    with tempfile.TemporaryDirectory() as directory:
+        registry = ModelRegistry(directory)
+        first = registry.save('demo', {'weights': np.arange(1_000.0)}, columns, data[columns])
+        second = registry.save('demo', {'weights': np.zeros(3)}, columns, data[columns].head(50))
+        assert first.split('-')[0] == second.split('-')[0] and first != second
+        assert registry.load_published('demo', columns) is None
+
+        registry.publish('demo', first)
+        loaded = registry.load_published('demo', columns)
+        assert isinstance(loaded['weights'], np.memmap) and loaded['weights'][999] == 999
+        assert registry.load_published('demo', ['goals_per_90']) is None
+        assert registry.list('demo').set_index('key')['published'].to_dict() == {first: True, second: False}
+
+        # Données fournies incomplètes : erreur explicite, rien n'est entraîné sur la démo
+        for model in ('market_value', 'profiler'):
+            try:
+                train(registry, model, data[['player_id', 'age']])
+            except ValueError as error:
+                assert 'market_value' in str(error) or 'profilage' in str(error)
+            else:
+                raise AssertionError(f"{model} entraîné sans ses colonnes")
+        assert list(registry.list()['name'].unique()) == ['demo']
+
+
+def test_published_models_are_loaded_not_trained():
+    """Avec un registre, prédicteur et profileur chargent les modèles publiés sans réentraîner"""
+    with tempfile.TemporaryDirectory() as directory:
+        registry = ModelRegistry(directory)
+        engine = ScoutingEngine(registry=ModelRegistry(directory))
+        try:
+            engine.value_predictor.predict_values(generate_player_database(5))
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("prédiction sans modèle publié")
+
+        registry.publish('market_value', train(registry, 'market_value'))
+        stats = PlayerProfiler()._generate_demo_stats(500)
+        registry.publish('profiler', train(registry, 'profiler', stats))
+
+        def no_training(*args, **kwargs):
+            raise AssertionError("entraînement pendant l'inférence")
+
+        predictor = MarketValuePredictor(registry=ModelRegistry(directory))
+        predictor.train_model = no_training
+        reference = MarketValuePredictor()
+        reference.train_model(reference._generate_market_demo_data())
+        players = generate_player_database(50)
+        assert np.allclose(predictor.predict_values(players)['predicted_value'],
+                           reference.predict_values(players)['predicted_value'])
+
+        # Le modèle du cache du registre est partagé : n_jobs propre à chaque prédicteur
+        shared = ModelRegistry(directory)
+        single = MarketValuePredictor(n_jobs=1, registry=shared)
+        parallel = MarketValuePredictor(n_jobs=4, registry=shared)
+        single.predict_values(players)
+        saved_n_jobs = single.model.n_jobs
+        parallel.predict_values(players)
+        assert parallel.model is single.model and single.model.n_jobs == saved_n_jobs
+
+        fitted = PlayerProfiler().create_player_profiles(stats)
+        profiler = PlayerProfiler(registry=ModelRegistry(directory))
+        profiler.kmeans.fit = profiler.kmeans.fit_predict = no_training
+        served = profiler.create_player_profiles(stats)
+        assert (served['player_cluster'] == fitted['player_cluster']).all()
+
+
+if __name__ == "__main__":
+    print("🔍 Tests du moteur de scouting")
+    print("=" * 50)
+
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+
+    print("\n🎉 Tous les tests sont réussis !")